@@ -8,6 +8,7 @@ from agents.validation_agent import run_validation
 from agents.analysis_agent import run_analysis
 from agents.synthesis_agent import run_synthesis
 from utils.cli_logger import analysis_logger, error_logger
+from utils.tracing import tracer
 
 class AgentState(TypedDict):
     ticker: str
@@ -19,6 +20,12 @@ class AgentState(TypedDict):
 
 #Node Wrappers
 
+def _node_attrs(state: AgentState) -> Dict[str, Any]:
+    """Span attributes for graph node traces."""
+    return {"ticker": state.get("ticker")}
+
+
+@tracer.traced("graph.data_collection", category="graph", attributes=_node_attrs)
 async def data_collection_node(state: AgentState):
     from utils.cli_logger import logger
     ticker = state.get("ticker")
@@ -58,6 +65,7 @@ async def data_collection_node(state: AgentState):
             }
         }
 
+@tracer.traced("graph.validation", category="graph", attributes=_node_attrs)
 async def validation_node(state: AgentState):
     from utils.cli_logger import logger
     ticker = state.get("ticker")
@@ -119,12 +127,14 @@ async def validation_node(state: AgentState):
             "conflicts": []
         }
 
+@tracer.traced("graph.human_review", category="graph", attributes=_node_attrs)
 async def human_review_node(state: AgentState):
     # This node is a pass-through. 
     # The interrupt happens BEFORE this node is executed.
     # When we resume, the state (specifically data_result) will have been updated by the user.
     return {}
 
+@tracer.traced("graph.analysis", category="graph", attributes=_node_attrs)
 async def analysis_node(state: AgentState):
     from utils.cli_logger import logger
     ticker = state["ticker"]
@@ -164,6 +174,7 @@ async def analysis_node(state: AgentState):
             }
         }
 
+@tracer.traced("graph.synthesis", category="graph", attributes=_node_attrs)
 async def synthesis_node(state: AgentState):
     from utils.cli_logger import logger
     ticker = state["ticker"]
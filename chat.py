@@ -308,7 +308,8 @@ async def handle_chat_message(user_input: str, history: list, agent, interface:
     
     try:
         if interface == "cli":
-            with console.status("[bold green]Thinking...[/bold green]"):
+            from utils.cli_logger import logger
+            with logger.live_status("[bold green]Thinking...[/bold green]"):
                 result = await agent.ainvoke({"messages": history})
         else:
             result = await agent.ainvoke({"messages": history})
@@ -327,7 +328,7 @@ async def handle_chat_message(user_input: str, history: list, agent, interface:
         msg = f"Error: {e}"
         return f"🤖 {msg}" if interface == "whatsapp" else f"[red]{msg}[/red]", True
 
-async def run_analysis_workflow(ticker: str, user_id: str = None, save_file: bool = True, auto_save: bool = False):
+async def run_analysis_workflow(ticker: str, user_id: str = None, save_file: bool = True, auto_save: bool = False, trace: bool = False):
     """
     Async implementation of the analysis workflow using LangGraph.
     Features clean CLI logging with spinners and progress tracking.
@@ -337,7 +338,27 @@ async def run_analysis_workflow(ticker: str, user_id: str = None, save_file: boo
         user_id: User identifier for database storage
         save_file: Whether to save report to markdown file
         auto_save: If True, skip confirmation prompt and save to both file and database
+        trace: If True, record spans for the run and write a Chrome trace JSON to logs/traces/
     """
+    if not trace:
+        return await _run_analysis_workflow(ticker, user_id, save_file, auto_save)
+
+    from utils.cli_logger import logger
+    from utils.tracing import tracer, default_trace_path
+
+    tracer.start()
+    try:
+        with tracer.span("analysis", category="run", input=ticker):
+            return await _run_analysis_workflow(ticker, user_id, save_file, auto_save)
+    finally:
+        tracer.stop()
+        trace_name = re.sub(r'[^A-Za-z0-9_.-]', '_', ticker.strip().upper())
+        trace_path = tracer.export_chrome_trace(default_trace_path(trace_name))
+        logger.log_success(f"Trace saved to: {trace_path} (open in ui.perfetto.dev or chrome://tracing)")
+
+
+async def _run_analysis_workflow(ticker: str, user_id: str = None, save_file: bool = True, auto_save: bool = False):
+    """Analysis workflow body (see `run_analysis_workflow`)."""
     from utils.cli_logger import logger
     import time
     
@@ -515,7 +536,8 @@ def analyze(
     user_id: str = None,
     save_file: bool = typer.Option(True, "--save-file/--no-save-file", help="Save report to markdown file"),
     stream: bool = typer.Option(True, "--stream/--no-stream", help="Stream agent events in real-time"),
-    auto_save: bool = typer.Option(False, "--auto-save", help="Skip confirmation prompt, save to both file and database")
+    auto_save: bool = typer.Option(False, "--auto-save", help="Skip confirmation prompt, save to both file and database"),
+    trace: bool = typer.Option(False, "--trace", help="Record spans and write a Chrome trace / Perfetto JSON to logs/traces/")
 ):
     """
     Run multi-agent equity analysis on a stock ticker.
@@ -526,8 +548,9 @@ def analyze(
     - 'cancel': Discard the report
     
     Use --auto-save to skip the prompt and save to both automatically.
+    Use --trace to profile the run (graph nodes, tools, HTTP and LLM calls).
     """
-    asyncio.run(run_analysis_workflow(ticker, user_id, save_file, auto_save))
+    asyncio.run(run_analysis_workflow(ticker, user_id, save_file, auto_save, trace))
 
 
 async def run_chat_loop(initial_ticker: str | None = None) -> None:
@@ -554,7 +577,8 @@ async def run_chat_loop(initial_ticker: str | None = None) -> None:
         initial_msg = f"Tell me about {initial_ticker} based on the analysis."
         console.print(f"\n[bold green]You:[/bold green] {initial_msg}")
         chat_history.append({"role": "user", "content": initial_msg})
-        with console.status("[bold green]Thinking...[/bold green]"):
+        from utils.cli_logger import logger
+        with logger.live_status("[bold green]Thinking...[/bold green]"):
             msgs = _history_to_messages(chat_history)
             result = await agent.ainvoke({"messages": msgs})
             response = _normalize_content(result["messages"][-1].content)
@@ -634,6 +658,14 @@ async def run_whatsapp_bot_main():
     from context_engineering.prompts import chat_agent_prompt
     
     console.print(Panel.fit("[bold green]WhatsApp Bot Listener Running...[/bold green]\nWaiting for messages...", border_style="green"))
+
+    # Expose Prometheus metrics for the long-running bot
+    from utils.metrics import start_metrics_server
+    try:
+        start_metrics_server(config.METRICS_PORT)
+        console.print(f"[dim]📈 Metrics at http://127.0.0.1:{config.METRICS_PORT}/metrics[/dim]")
+    except OSError as e:
+        console.print(f"[yellow]⚠ Metrics server not started on port {config.METRICS_PORT}: {e}[/yellow]")
     
     client = WhatsAppClient()
     agent = build_chat_agent()
@@ -701,6 +733,81 @@ async def run_whatsapp_bot_main():
     finally:
         console.print("[bold red]Bot shutdown complete.[/bold red]")
 
+@app.command()
+def metrics(
+    port: int = typer.Option(None, help="Metrics port of the running bot. Defaults to METRICS_PORT."),
+    prometheus: bool = typer.Option(False, "--prometheus", help="Print raw Prometheus text instead of tables")
+):
+    """
+    Show a metrics snapshot (latency percentiles, error counts, cache hit rates).
+    Reads from the running WhatsApp bot; falls back to this process's (empty) registry.
+    """
+    import json
+    import urllib.request
+    from rich.table import Table
+    from utils.metrics import registry
+
+    port = port or config.METRICS_PORT
+    endpoint = "metrics" if prometheus else "snapshot"
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/{endpoint}", timeout=3) as resp:
+            payload = resp.read().decode("utf-8")
+        source = f"bot on port {port}"
+    except OSError:
+        console.print(f"[yellow]⚠ No metrics server on port {port}; showing this process only.[/yellow]")
+        payload = registry.render_prometheus() if prometheus else json.dumps(registry.snapshot())
+        source = "local process"
+
+    if prometheus:
+        console.print(payload, markup=False, highlight=False)
+        return
+
+    snap = json.loads(payload)
+    console.print(f"[bold cyan]Metrics snapshot[/bold cyan] [dim]({source}, uptime {snap.get('uptime_seconds', 0)}s)[/dim]")
+
+    def _labels(labels: dict) -> str:
+        return ", ".join(f"{k}={v}" for k, v in labels.items() if v)
+
+    def _fmt(val, unit=""):
+        if val is None:
+            return "-"
+        if unit == "s":
+            return f"{val * 1000:.0f}ms" if val < 1 else f"{val:.2f}s"
+        return f"{val:,.0f}"
+
+    if snap["histograms"]:
+        table = Table(title="Histograms")
+        for col in ["Metric", "Labels", "Count", "Mean", "p50", "p95", "p99"]:
+            table.add_column(col, style="cyan" if col == "Metric" else None)
+        for h in snap["histograms"]:
+            unit = "s" if h["name"].endswith("_seconds") else ""
+            table.add_row(h["name"].removeprefix(registry.prefix), _labels(h["labels"]), str(h["count"]), _fmt(h["mean"], unit),
+                          _fmt(h["p50"], unit), _fmt(h["p95"], unit), _fmt(h["p99"], unit))
+        console.print(table)
+
+    scalars = snap["counters"] + snap["gauges"]
+    if scalars:
+        table = Table(title="Counters & Gauges")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Labels")
+        table.add_column("Value", justify="right")
+        for c in scalars:
+            table.add_row(c["name"].removeprefix(registry.prefix), _labels(c["labels"]), f"{c['value']:,.0f}")
+        console.print(table)
+
+    # Cache hit rates
+    caches = {}
+    for c in snap["counters"]:
+        if c["name"].endswith("cache_requests_total"):
+            caches.setdefault(c["labels"]["cache"], {})[c["labels"]["result"]] = c["value"]
+    for name, counts in caches.items():
+        total = counts.get("hit", 0) + counts.get("miss", 0)
+        if total:
+            console.print(f"[green]Cache '{name}' hit rate: {counts.get('hit', 0) / total:.1%} ({total:.0f} lookups)[/green]")
+
+    if not snap["histograms"] and not scalars:
+        console.print("[dim]No metrics recorded yet.[/dim]")
+
 @app.command()
 def start(ticker: str = typer.Argument(None)):
     """Start the chat interface."""
@@ -62,7 +62,7 @@ analysis_agent_prompt = ChatPromptTemplate.from_messages([
      "\n"
      "## 📈 Technical & Risk Profile "
      "- **MOMENTUM**: Trend (Bullish/Bearish), 200-Week SMA status, RSI, MACD. "
-     "- **RISK**: Volatility, Sharpe, Beta, Max Drawdown, VaR 95%. "
+     "- **RISK**: Volatility, Sharpe, Beta, Max Drawdown (deepest episode with peak/trough/recovery dates, current drawdown), VaR 95%. "
      "\n"
      "## 🟢 GREEN FLAGS "
      "MANDATORY FORMAT - Every bullet MUST begin with a category tag in brackets. "
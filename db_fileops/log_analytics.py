@@ -0,0 +1,340 @@
+"""
+Log analytics utility for the structured JSON logs in logs/
+
+Streams api_calls.log, analysis.log and errors.log (including rotated
+backups .1 .. .5) line by line and reports latency percentiles, phase
+durations, error rates over time windows and the slowest runs.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to allow imports from utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Iterator, Tuple, Dict, Any, List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+
+app = typer.Typer()
+console = Console()
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+BACKUP_COUNT = 5  # Matches RotatingFileHandler(backupCount=5) in utils/cli_logger.py
+
+
+def _log_files(name: str, log_dir: str) -> List[Path]:
+    """Return a log file and its rotated backups, oldest first (name.5 ... name.1, name)."""
+    base = Path(log_dir) / name
+    files = [Path(f"{base}.{i}") for i in range(BACKUP_COUNT, 0, -1)]
+    files.append(base)
+    return [f for f in files if f.exists()]
+
+
+def _parse_since(since: Optional[str]) -> Optional[datetime]:
+    """Parse '--since' as a relative window (30m, 24h, 7d) or a date (YYYY-MM-DD)."""
+    if not since:
+        return None
+    units = {"m": "minutes", "h": "hours", "d": "days"}
+    if since[-1] in units and since[:-1].isdigit():
+        return datetime.utcnow() - timedelta(**{units[since[-1]]: int(since[:-1])})
+    try:
+        return datetime.strptime(since, "%Y-%m-%d")
+    except ValueError:
+        raise typer.BadParameter("Use a window like 30m, 24h, 7d or a date YYYY-MM-DD")
+
+
+def _iter_records(name: str, log_dir: str, since: Optional[datetime] = None) -> Iterator[Tuple[datetime, Dict[str, Any]]]:
+    """
+    Stream (timestamp, record) pairs from a log and its backups without loading files whole.
+    Malformed lines are skipped. Timestamps are UTC (as written by JSONFormatter).
+    """
+    for path in _log_files(name, log_dir):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    ts = datetime.fromisoformat(record["timestamp"].rstrip("Z"))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+                if since and ts < since:
+                    continue
+                yield ts, record
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile of an already sorted list (q in 0..100)."""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * q / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_values[low]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:,.0f}ms" if value < 1000 else f"{value / 1000:.2f}s"
+
+
+def _fmt_s(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def _window_start(ts: datetime, window: str) -> datetime:
+    if window == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if window == "week":
+        day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+        return day - timedelta(days=day.weekday())
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@app.command()
+def latency(
+    since: Optional[str] = typer.Option(None, help="Only include entries newer than this (30m, 24h, 7d or YYYY-MM-DD)"),
+    service: Optional[str] = typer.Option(None, help="Only include one service (yfinance, ddgs, google_news, alpha_vantage)"),
+    log_dir: str = typer.Option(LOG_DIR, help="Directory containing the JSON logs"),
+):
+    """
+    Latency percentiles (p50/p95/p99) and error rate per service and endpoint.
+
+    Example:
+        python db_fileops/log_analytics.py latency --since 7d
+    """
+    cutoff = _parse_since(since)
+    durations: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+    failures: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    for _, record in _iter_records("api_calls.log", log_dir, cutoff):
+        data = record.get("data") or {}
+        if data.get("event") != "api_response":
+            continue
+        if service and data.get("service") != service:
+            continue
+        key = (data.get("service", "?"), data.get("endpoint") or "-")
+        durations[key].append(float(data.get("duration_ms", 0.0)))
+        if data.get("status") != "success":
+            failures[key] += 1
+
+    if not durations:
+        console.print("[yellow]No API responses found in the logs.[/yellow]")
+        return
+
+    table = Table(title="API Latency by Service / Endpoint")
+    table.add_column("Service", style="cyan")
+    table.add_column("Endpoint", style="magenta")
+    for col in ["Calls", "Errors", "p50", "p95", "p99", "Max"]:
+        table.add_column(col, justify="right")
+
+    for key in sorted(durations, key=lambda k: -len(durations[k])):
+        values = sorted(durations[key])
+        errors = failures[key]
+        error_str = f"{errors} ({errors / len(values):.1%})" if errors else "0"
+        table.add_row(
+            key[0], key[1], str(len(values)), f"[red]{error_str}[/red]" if errors else error_str,
+            _fmt_ms(_percentile(values, 50)), _fmt_ms(_percentile(values, 95)),
+            _fmt_ms(_percentile(values, 99)), _fmt_ms(values[-1]),
+        )
+
+    console.print(table)
+
+
+@app.command()
+def phases(
+    since: Optional[str] = typer.Option(None, help="Only include entries newer than this (30m, 24h, 7d or YYYY-MM-DD)"),
+    ticker: Optional[str] = typer.Option(None, help="Only include one ticker"),
+    log_dir: str = typer.Option(LOG_DIR, help="Directory containing the JSON logs"),
+):
+    """
+    Phase duration distribution per ticker (Data Collection, Validation, Analysis, Synthesis).
+
+    Example:
+        python db_fileops/log_analytics.py phases --ticker AAPL
+    """
+    cutoff = _parse_since(since)
+    durations: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+
+    for _, record in _iter_records("analysis.log", log_dir, cutoff):
+        data = record.get("data") or {}
+        if data.get("event") != "phase_complete":
+            continue
+        if ticker and data.get("ticker") != ticker.upper():
+            continue
+        durations[(data.get("ticker", "?"), data.get("phase", "?"))].append(float(data.get("duration_seconds", 0.0)))
+
+    if not durations:
+        console.print("[yellow]No completed phases found in the logs.[/yellow]")
+        return
+
+    table = Table(title="Phase Durations by Ticker")
+    table.add_column("Ticker", style="yellow")
+    table.add_column("Phase", style="cyan")
+    for col in ["Runs", "Mean", "p50", "p95", "Max"]:
+        table.add_column(col, justify="right")
+
+    for key in sorted(durations):
+        values = sorted(durations[key])
+        table.add_row(
+            key[0], key[1], str(len(values)), _fmt_s(sum(values) / len(values)),
+            _fmt_s(_percentile(values, 50)), _fmt_s(_percentile(values, 95)), _fmt_s(values[-1]),
+        )
+
+    console.print(table)
+
+
+@app.command()
+def errors(
+    window: str = typer.Option("day", help="Time window: hour, day or week"),
+    since: Optional[str] = typer.Option(None, help="Only include entries newer than this (30m, 24h, 7d or YYYY-MM-DD)"),
+    service: Optional[str] = typer.Option(None, help="Only include one service"),
+    log_dir: str = typer.Option(LOG_DIR, help="Directory containing the JSON logs"),
+):
+    """
+    API error rate and logged exceptions per time window.
+
+    Example:
+        python db_fileops/log_analytics.py errors --window hour --since 24h
+    """
+    if window not in ("hour", "day", "week"):
+        raise typer.BadParameter("window must be hour, day or week")
+    cutoff = _parse_since(since)
+
+    calls: Dict[datetime, int] = defaultdict(int)
+    failed: Dict[datetime, int] = defaultdict(int)
+    exceptions: Dict[datetime, int] = defaultdict(int)
+
+    for ts, record in _iter_records("api_calls.log", log_dir, cutoff):
+        data = record.get("data") or {}
+        if data.get("event") != "api_response":
+            continue
+        if service and data.get("service") != service:
+            continue
+        bucket = _window_start(ts, window)
+        calls[bucket] += 1
+        if data.get("status") != "success":
+            failed[bucket] += 1
+
+    for ts, record in _iter_records("errors.log", log_dir, cutoff):
+        exceptions[_window_start(ts, window)] += 1
+
+    buckets = sorted(set(calls) | set(exceptions))
+    if not buckets:
+        console.print("[yellow]No API calls or errors found in the logs.[/yellow]")
+        return
+
+    fmt = "%Y-%m-%d %H:00" if window == "hour" else "%Y-%m-%d"
+    table = Table(title=f"Error Rate per {window.title()} (UTC)")
+    table.add_column("Window", style="cyan")
+    for col in ["API Calls", "Failed", "Error Rate", "Exceptions"]:
+        table.add_column(col, justify="right")
+
+    for bucket in buckets:
+        total = calls.get(bucket, 0)
+        bad = failed.get(bucket, 0)
+        rate = bad / total if total else 0.0
+        style = "red" if rate >= 0.1 else "yellow" if rate > 0 else "green"
+        table.add_row(
+            bucket.strftime(fmt), str(total), str(bad),
+            f"[{style}]{rate:.1%}[/{style}]", str(exceptions.get(bucket, 0)),
+        )
+
+    console.print(table)
+
+
+@app.command()
+def slowest(
+    limit: int = typer.Option(10, help="Number of runs to show"),
+    since: Optional[str] = typer.Option(None, help="Only include entries newer than this (30m, 24h, 7d or YYYY-MM-DD)"),
+    log_dir: str = typer.Option(LOG_DIR, help="Directory containing the JSON logs"),
+):
+    """
+    Slowest analysis runs, reconstructed from phase events in analysis.log.
+
+    A run starts at the 'Data Collection' phase_start of a ticker and collects
+    every phase_complete for that ticker until the next run starts.
+    """
+    cutoff = _parse_since(since)
+    open_runs: Dict[str, Dict[str, Any]] = {}
+    runs: List[Dict[str, Any]] = []
+
+    for ts, record in _iter_records("analysis.log", log_dir, cutoff):
+        data = record.get("data") or {}
+        event = data.get("event")
+        run_ticker = data.get("ticker")
+        if not run_ticker:
+            continue
+        if event == "phase_start" and data.get("phase") == "Data Collection":
+            if run_ticker in open_runs:
+                runs.append(open_runs.pop(run_ticker))
+            open_runs[run_ticker] = {"ticker": run_ticker, "started": ts, "ended": ts, "phases": {}}
+        elif event == "phase_complete" and run_ticker in open_runs:
+            run = open_runs[run_ticker]
+            run["phases"][data.get("phase", "?")] = float(data.get("duration_seconds", 0.0))
+            run["ended"] = ts
+
+    runs.extend(open_runs.values())
+    runs = [r for r in runs if r["phases"]]
+    if not runs:
+        console.print("[yellow]No analysis runs found in the logs.[/yellow]")
+        return
+
+    for run in runs:
+        run["wall"] = (run["ended"] - run["started"]).total_seconds()
+    runs.sort(key=lambda r: r["wall"], reverse=True)
+
+    phase_names = ["Data Collection", "Validation", "Analysis", "Synthesis"]
+    table = Table(title=f"Slowest Runs (Top {min(limit, len(runs))} of {len(runs)})")
+    table.add_column("Started (UTC)", style="dim")
+    table.add_column("Ticker", style="yellow")
+    table.add_column("Wall", justify="right", style="bold")
+    for phase in phase_names:
+        table.add_column(phase, justify="right")
+
+    for run in runs[:limit]:
+        table.add_row(
+            run["started"].strftime("%Y-%m-%d %H:%M:%S"), run["ticker"], _fmt_s(run["wall"]),
+            *[_fmt_s(run["phases"].get(phase)) for phase in phase_names],
+        )
+
+    console.print(table)
+
+
+@app.command()
+def summary(log_dir: str = typer.Option(LOG_DIR, help="Directory containing the JSON logs")):
+    """Show which log files (including rotated backups) exist and the time range they cover."""
+    lines = []
+    for name in ["api_calls.log", "analysis.log", "errors.log"]:
+        files = _log_files(name, log_dir)
+        if not files:
+            lines.append(f"[bold cyan]{name}:[/bold cyan] [dim]not found[/dim]")
+            continue
+        size_mb = sum(f.stat().st_size for f in files) / (1024 * 1024)
+        first = last = None
+        count = 0
+        for ts, _ in _iter_records(name, log_dir):
+            first = first or ts
+            last = ts
+            count += 1
+        span = f"{first:%Y-%m-%d %H:%M} → {last:%Y-%m-%d %H:%M}" if first else "empty"
+        lines.append(f"[bold cyan]{name}:[/bold cyan] {len(files)} file(s), {size_mb:.2f} MB, {count:,} records ({span})")
+
+    console.print(Panel("\n".join(lines), title="Structured Logs", border_style="cyan"))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,595 @@
+"""
+Benchmark harness: rust_finance vs NumPy / pandas
+
+Times every exported rust_finance function from Python, so FFI and argument
+conversion are included, next to an equivalent NumPy / pandas implementation.
+Series functions run over lengths 100 .. 1M, batch functions over 1 .. 1,000
+assets (5 years of days). Each measurement records up to three variants:
+
+- rust_ndarray: float64 NumPy input (read in place)
+- rust_list:    the same data passed as a Python list, with .tolist() counted
+- numpy:        the NumPy / pandas baseline
+
+Results go to a JSON file (one record per function / size / variant) that can
+be compared between commits:
+
+    python rust_finance/benches/compare_numpy.py run --output before.json
+    python rust_finance/benches/compare_numpy.py run --output after.json
+    python rust_finance/benches/compare_numpy.py compare before.json after.json
+"""
+
+import json
+import os
+import platform
+import subprocess
+import timeit
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import typer
+from rich.console import Console
+from rich.table import Table
+
+import rust_finance as rf
+
+app = typer.Typer()
+console = Console()
+
+SERIES_LENGTHS = [100, 1_000, 10_000, 100_000, 1_000_000]
+BATCH_WIDTHS = [1, 10, 100, 1_000]
+BATCH_DAYS = 1_260  # 5 years
+TRADING_DAYS = 252
+RESULTS_VERSION = 1
+
+
+# ============================================================================
+# Inputs
+# ============================================================================
+
+def _returns(n: int, seed: int = 1) -> np.ndarray:
+    """Deterministic daily returns (~1.2% daily volatility)."""
+    return np.random.default_rng(seed).normal(0.0003, 0.012, n)
+
+
+def _prices(n: int, seed: int = 1) -> np.ndarray:
+    return 100.0 * np.cumprod(1.0 + _returns(n, seed))
+
+
+def _return_matrix(width: int) -> np.ndarray:
+    """(assets, days) returns with a common market factor."""
+    rng = np.random.default_rng(width)
+    market = rng.normal(0.0003, 0.01, BATCH_DAYS)
+    betas = rng.uniform(0.5, 1.5, (width, 1))
+    return betas * market + rng.normal(0.0, 0.008, (width, BATCH_DAYS))
+
+
+def _price_matrix(width: int) -> np.ndarray:
+    return 100.0 * np.cumprod(1.0 + _return_matrix(width), axis=1)
+
+
+def _factor_inputs(width: int) -> tuple:
+    """(assets, days) returns, (4, assets) scores and (5, days) factor returns (equal-weight market + 4 long-short)."""
+    returns = _return_matrix(width)
+    scores = np.random.default_rng(width + 1).normal(size=(4, width))
+    long_short = np.random.default_rng(7).normal(0.0, 0.005, (4, BATCH_DAYS))
+    return returns, scores, np.vstack([returns.mean(axis=0), long_short])
+
+
+# ============================================================================
+# NumPy / pandas baselines
+# ============================================================================
+
+def _np_volatility(r):
+    return r.std() * np.sqrt(TRADING_DAYS)
+
+
+def _np_sharpe(r, rf_rate=0.0):
+    return (r.mean() * TRADING_DAYS - rf_rate) / _np_volatility(r)
+
+
+def _np_var_95(r):
+    return np.partition(r, int(len(r) * 0.05))[int(len(r) * 0.05)]
+
+
+def _np_max_drawdown(p):
+    return (p / np.maximum.accumulate(p) - 1.0).min()
+
+
+def _np_beta(s, m):
+    return np.cov(s, m, bias=True)[0, 1] / m.var()
+
+
+def _pd_risk_metrics(p):
+    r = pd.Series(p).pct_change().dropna()
+    downside = np.sqrt((np.minimum(r, 0.0) ** 2).mean() * TRADING_DAYS)
+    drawdown = _np_max_drawdown(p)
+    cagr = (p[-1] / p[0]) ** (TRADING_DAYS / (len(p) - 1)) - 1.0
+    tail = {}
+    for level in (0.95, 0.99):
+        var = r.quantile(1.0 - level)
+        tail[level] = (var, r[r <= var].mean())
+    return {
+        "volatility": r.std(ddof=0) * np.sqrt(TRADING_DAYS),
+        "sortino": r.mean() * TRADING_DAYS / downside,
+        "calmar": cagr / abs(drawdown),
+        "skew": r.skew(),
+        "kurt": r.kurt(),
+        "tail": tail,
+    }
+
+
+def _pd_risk_panel(matrix):
+    df = pd.DataFrame(matrix.T)
+    r = df.pct_change().iloc[1:]
+    drawdown = (df / df.cummax() - 1.0).min()
+    return {
+        "volatility": r.std(ddof=0) * np.sqrt(TRADING_DAYS),
+        "sharpe": r.mean() / r.std(ddof=0) * np.sqrt(TRADING_DAYS),
+        "max_drawdown": drawdown,
+        "var_95": r.quantile(0.05),
+        "skew": r.skew(),
+        "kurt": r.kurt(),
+    }
+
+
+def _np_covariance(r):
+    cov = np.atleast_2d(np.cov(r, bias=True))
+    return cov, np.corrcoef(r)
+
+
+def _np_portfolio_risk(r, w):
+    cov = np.atleast_2d(np.cov(r, bias=True))
+    sigma_w = cov @ w
+    vol = np.sqrt(w @ sigma_w)
+    contributions = w * sigma_w / vol
+    return vol, contributions, (w @ np.sqrt(np.diag(cov))) / vol
+
+
+def _np_factor_returns(r, scores, quantile=0.3):
+    out = []
+    for row in scores:
+        order = np.argsort(row, kind="stable")
+        leg = min(max(int(round(quantile * len(order))), 1), len(order) // 2)
+        out.append(r[order[-leg:]].mean(axis=0) - r[order[:leg]].mean(axis=0) if leg else np.full(r.shape[1], np.nan))
+    return np.array(out)
+
+
+def _np_factor_exposures(r, factors):
+    x = np.column_stack([np.ones(factors.shape[1]), factors.T])
+    coef, residuals, _, _ = np.linalg.lstsq(x, r.T, rcond=None)
+    dof = x.shape[0] - x.shape[1]
+    r_squared = 1.0 - residuals / ((r - r.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    return coef[1:].T, coef[0] * TRADING_DAYS, r_squared, np.sqrt(residuals / dof * TRADING_DAYS)
+
+
+def _np_var_mc(r, horizon=10, paths=100_000, seed=42):
+    rng = np.random.default_rng(seed)
+    sims = np.prod(1.0 + rng.normal(r.mean(), r.std(), (paths, horizon)), axis=1) - 1.0
+    var = np.quantile(sims, [0.05, 0.01])
+    return var, [sims[sims <= v].mean() for v in var]
+
+
+def _np_portfolio_var_mc(r, w, horizon=10, paths=100_000, seed=42):
+    return _np_var_mc(w @ r, horizon, paths, seed)
+
+
+def _pd_rolling_risk(r, window=63):
+    s = pd.Series(r).rolling(window)
+    std = s.std(ddof=0)
+    return std * np.sqrt(TRADING_DAYS), s.mean() * TRADING_DAYS / (std * np.sqrt(TRADING_DAYS))
+
+
+def _pd_ema(p, period):
+    return pd.Series(p).ewm(span=period, adjust=False).mean()
+
+
+def _pd_rsi(p, period=14):
+    delta = pd.Series(p).diff()
+    gain = delta.clip(lower=0.0).ewm(alpha=1.0 / period, adjust=False).mean()
+    loss = (-delta.clip(upper=0.0)).ewm(alpha=1.0 / period, adjust=False).mean()
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+def _pd_macd(p, fast=12, slow=26, signal=9):
+    line = _pd_ema(p, fast) - _pd_ema(p, slow)
+    sig = line.ewm(span=signal, adjust=False).mean()
+    return line, sig, line - sig
+
+
+def _pd_cross_regime(p, fast=50, slow=200):
+    s = pd.Series(p)
+    return np.sign(s.rolling(fast).mean() - s.rolling(slow).mean())
+
+
+def _pd_scan_crossovers(p, fast=50, slow=200):
+    regime = _pd_cross_regime(p, fast, slow)
+    return np.flatnonzero(regime.diff().fillna(0.0).to_numpy() != 0)
+
+
+def _pd_last_bar_cross(p):
+    regime = _pd_cross_regime(p).iloc[-2:]
+    return regime.iloc[0] != regime.iloc[1]
+
+
+def _pd_indicator_series(p):
+    s = pd.Series(p)
+    return s.rolling(50).mean(), s.rolling(200).mean(), _pd_rsi(p, 14)
+
+
+def _ohlcv(n: int, seed: int = 3) -> tuple:
+    rng = np.random.default_rng(seed)
+    close = _prices(n, seed)
+    spread = close * rng.uniform(0.002, 0.02, n)
+    return close + spread, close - spread, close, rng.lognormal(13.0, 0.4, n).round()
+
+
+def _pd_ohlcv_indicators(high, low, close, volume):
+    h, l, c, v = (pd.Series(x) for x in (high, low, close, volume))
+    mid, std = c.rolling(20).mean(), c.rolling(20).std(ddof=0)
+    tr = pd.concat([h - l, (h - c.shift()).abs(), (l - c.shift()).abs()], axis=1).max(axis=1)
+    atr = tr.ewm(alpha=1 / 14, adjust=False).mean()
+    lowest, highest = l.rolling(14).min(), h.rolling(14).max()
+    k = 100 * (c - lowest) / (highest - lowest)
+    up, down = h.diff(), -l.diff()
+    plus = 100 * up.where((up > down) & (up > 0), 0.0).ewm(alpha=1 / 14, adjust=False).mean() / atr
+    minus = 100 * down.where((down > up) & (down > 0), 0.0).ewm(alpha=1 / 14, adjust=False).mean() / atr
+    adx = (100 * (plus - minus).abs() / (plus + minus)).ewm(alpha=1 / 14, adjust=False).mean()
+    obv = (np.sign(c.diff()).fillna(0) * v).cumsum()
+    typical = (h + l + c) / 3
+    vwap = (typical * v).rolling(20).sum() / v.rolling(20).sum()
+    flow = typical * v
+    pos = flow.where(typical.diff() > 0, 0.0).rolling(14).sum()
+    neg = flow.where(typical.diff() < 0, 0.0).rolling(14).sum()
+    mfi = 100 - 100 / (1 + pos / neg)
+    advs = [v.rolling(p).mean() for p in (10, 50, 200)]
+    z = (v - v.shift().rolling(50).mean()) / v.shift().rolling(50).std(ddof=0)
+    return mid + 2 * std, mid - 2 * std, atr, k, k.rolling(3).mean(), adx, obv, vwap, mfi, advs, z
+
+
+def _py_drawdown_episodes(prices, top_n=5, min_depth=0.05):
+    """Bar-by-bar Python loop over the drawdown path (what the report would need without the kernel)."""
+    episodes, peak, open_episode = [], (0, prices[0]), None
+    for i, price in enumerate(prices):
+        if price >= peak[1]:
+            if open_episode:
+                episodes.append((*open_episode, i))
+                open_episode = None
+            peak = (i, price)
+        else:
+            depth = price / peak[1] - 1
+            if open_episode is None or depth < open_episode[0]:
+                open_episode = (depth, peak[0], i)
+    if open_episode:
+        episodes.append((*open_episode, None))
+    return sorted(e for e in episodes if e[0] <= -min_depth)[:top_n]
+
+
+def _pd_benchmark_beta(prices, dates, benchmark, benchmark_dates, lookbacks=(63, 252, 756)):
+    joined = pd.concat([pd.Series(prices, index=dates), pd.Series(benchmark, index=benchmark_dates)], axis=1, join="inner").dropna()
+    rets = joined.pct_change().dropna()
+    out = {}
+    for n in lookbacks:
+        window = rets.iloc[-n:]
+        out[n] = (window.cov().iloc[0, 1] / window.iloc[:, 1].var(), window.corr().iloc[0, 1])
+    return out
+
+
+def _statements(width: int) -> np.ndarray:
+    """(lines, 5 periods) statement values, oldest first, with a missing period every third line."""
+    values = np.random.default_rng(width).normal(1.0, 0.6, (width, 5)).cumsum(axis=1) * 1e9
+    values[::3, 0] = np.nan
+    return values
+
+
+def _py_statement_trends(matrix, periods_per_year=4.0):
+    """What _safe_trend used to do: one cleaning loop and a trend call per line, plus CAGR / % change."""
+    out = []
+    for row in matrix:
+        clean = [float(v) for v in row if v is not None and np.isfinite(v)]
+        if len(clean) < 2:
+            out.append(None)
+            continue
+        x = np.arange(len(clean))
+        out.append((_py_detect_trend(np.array(clean)), np.polyfit(x, clean, 1)[0],
+                    (clean[-1] / clean[0]) ** (periods_per_year / (len(clean) - 1)) - 1 if clean[0] > 0 < clean[-1] else np.nan,
+                    (clean[-1] - clean[-2]) / abs(clean[-2]) * 100))
+    return out
+
+
+def _statement_lines(width: int) -> tuple:
+    """11 aligned line items shaped (width, 5 years), ebit first and operating cash flow last."""
+    scale = np.array([1, 0.1, 10, 3, 4, 2, 8, 1, -0.5, 0.8, 1])[:, None, None]
+    return tuple(np.random.default_rng(width).normal(1.0, 0.5, (11, width, 5)) * scale)
+
+
+def _py_fundamental_ratios(ebit, interest, assets, current_liabilities, equity, debt, revenue, fcf, capex, net_income, cfo):
+    """The scalar arithmetic _fetch_deep_financials used to do, once per ticker and period."""
+    out = []
+    for cells in zip(*(m.ravel().tolist() for m in (ebit, interest, assets, current_liabilities, equity, debt, revenue, fcf, capex, net_income, cfo))):
+        e, i, a, cl, eq, d, rev, f, c, ni, o = cells
+        try:
+            out.append((e / (a - cl), ni / eq, d / eq, e / abs(i) if i else float("inf"), f / rev, abs(c) / rev, (ni - o) / a))
+        except ZeroDivisionError:
+            out.append(None)
+    return out
+
+
+def _business_days(n: int) -> np.ndarray:
+    """n weekdays as int64 days since epoch, starting 1990-01-01."""
+    return pd.bdate_range("1990-01-01", periods=n).values.astype("datetime64[D]").astype(np.int64)
+
+
+def _pd_resample(days, values):
+    """The pandas resamples _fetch_deep_financials used (weekly last) plus the other timeframes."""
+    s = pd.Series(values, index=pd.to_datetime(days, unit="D"))
+    return [s.resample(rule).agg(["first", "max", "min", "last", "sum", "count"]) for rule in ("W", "ME", "QE", "YE")]
+
+
+def _py_detect_trend(values):
+    half = len(values) // 2
+    first, second = values[:half].mean(), values[half:].mean()
+    change = (second - first) / max(abs(first), 1.0)
+    return "increasing" if change > 0.05 else "decreasing" if change < -0.05 else "stable"
+
+
+# ============================================================================
+# Cases
+# ============================================================================
+
+@dataclass
+class Case:
+    """One exported function: how to build inputs for a size and call each side."""
+    name: str
+    kind: str  # "series" (size = length), "batch" (size = assets) or "scalar"
+    make: Callable[[int], tuple]
+    rust: Callable[..., Any]
+    baseline: Optional[Callable[..., Any]]
+    list_input: bool = True  # also time the Python list path
+    max_size: Optional[int] = None
+
+
+def _series(fn):
+    return lambda n: (fn(n),)
+
+
+_HISTORY = _prices(BATCH_DAYS, 5)
+
+
+def _streaming(cls, *params):
+    """A stream seeded with 5 years of history plus the next price; the baseline recomputes from scratch."""
+    def make(_):
+        stream = cls(*params)
+        stream.seed(_HISTORY)
+        return stream, float(_HISTORY[-1])
+    return make
+
+
+def _recompute(fn):
+    return lambda stream, price: fn(np.append(_HISTORY, price))
+
+
+CASES: List[Case] = [
+    # Risk
+    Case("calculate_volatility", "series", _series(_returns), rf.calculate_volatility, _np_volatility),
+    Case("calculate_sharpe_ratio", "series", _series(_returns), lambda r: rf.calculate_sharpe_ratio(r, 0.0), _np_sharpe),
+    Case("calculate_var_95", "series", _series(_returns), rf.calculate_var_95, _np_var_95),
+    Case("calculate_max_drawdown", "series", _series(_prices), rf.calculate_max_drawdown, _np_max_drawdown),
+    Case("calculate_beta", "series", lambda n: (_returns(n, 1), _returns(n, 2)), rf.calculate_beta, _np_beta),
+    Case("calculate_risk_metrics", "series", _series(_prices), rf.calculate_risk_metrics, _pd_risk_metrics),
+    Case("calculate_drawdown_episodes", "series", _series(_prices), rf.calculate_drawdown_episodes, _py_drawdown_episodes),
+    Case("calculate_rolling_risk", "series", _series(_returns), rf.calculate_rolling_risk, _pd_rolling_risk),
+    Case(
+        "calculate_benchmark_beta", "series", lambda n: (_prices(n, 1), np.arange(n, dtype=np.int64), _prices(n, 2), np.arange(n, dtype=np.int64)),
+        lambda p, d, b, bd: rf.calculate_benchmark_beta(p, d, b, bd), _pd_benchmark_beta, list_input=False,
+    ),
+    Case("calculate_risk_panel", "batch", lambda w: (_price_matrix(w),), rf.calculate_risk_panel, _pd_risk_panel, list_input=False),
+    # Portfolio
+    Case("calculate_covariance", "batch", lambda w: (_return_matrix(w),), rf.calculate_covariance, _np_covariance, list_input=False),
+    Case(
+        "calculate_portfolio_risk", "batch", lambda w: (_return_matrix(w), np.full(w, 1.0 / w)),
+        rf.calculate_portfolio_risk, _np_portfolio_risk, list_input=False,
+    ),
+    # No NumPy-only long-only optimizer to compare against; the projected-gradient solve is O(N^2) per step
+    Case("optimize_portfolio", "batch", lambda w: (_return_matrix(w),), rf.optimize_portfolio, None, list_input=False, max_size=100),
+    # Factors
+    Case(
+        "calculate_factor_returns", "batch", lambda w: _factor_inputs(w)[:2],
+        rf.calculate_factor_returns, _np_factor_returns, list_input=False,
+    ),
+    Case(
+        "calculate_factor_exposures", "batch", lambda w: _factor_inputs(w)[::2],
+        rf.calculate_factor_exposures, _np_factor_exposures, list_input=False,
+    ),
+    # Simulation (100k paths, 10 days)
+    Case(
+        "calculate_var", "series", lambda n: (_returns(n),),
+        lambda r: rf.calculate_var(r, "monte_carlo", 10), _np_var_mc, max_size=10_000,
+    ),
+    Case(
+        "calculate_portfolio_var", "batch", lambda w: (_return_matrix(w), np.full(w, 1.0 / w)),
+        lambda r, w: rf.calculate_portfolio_var(r, w, "monte_carlo", 10), _np_portfolio_var_mc, list_input=False,
+    ),
+    # Technicals
+    Case("calculate_sma", "series", _series(_prices), lambda p: rf.calculate_sma(p, 200), lambda p: p[-200:].mean()),
+    Case("calculate_ema", "series", _series(_prices), lambda p: rf.calculate_ema(p, 20), lambda p: _pd_ema(p, 20).iloc[-1]),
+    Case("calculate_rsi", "series", _series(_prices), lambda p: rf.calculate_rsi(p, 14), lambda p: _pd_rsi(p).iloc[-1]),
+    Case("calculate_macd", "series", _series(_prices), rf.calculate_macd, lambda p: [s.iloc[-2:] for s in _pd_macd(p)]),
+    Case("detect_golden_cross", "series", _series(_prices), rf.detect_golden_cross, _pd_last_bar_cross),
+    Case("detect_death_cross", "series", _series(_prices), rf.detect_death_cross, _pd_last_bar_cross),
+    Case("scan_crossovers", "series", _series(_prices), rf.scan_crossovers, _pd_scan_crossovers),
+    Case("calculate_sma_series", "series", _series(_prices), lambda p: rf.calculate_sma_series(p, 50), lambda p: pd.Series(p).rolling(50).mean()),
+    Case("calculate_ema_series", "series", _series(_prices), lambda p: rf.calculate_ema_series(p, 20), lambda p: _pd_ema(p, 20)),
+    Case("calculate_rsi_series", "series", _series(_prices), lambda p: rf.calculate_rsi_series(p, 14), _pd_rsi),
+    Case("calculate_macd_series", "series", _series(_prices), rf.calculate_macd_series, _pd_macd),
+    Case("calculate_indicator_series", "series", _series(_prices), rf.calculate_indicator_series, _pd_indicator_series),
+    Case("calculate_ohlcv_indicators", "series", _ohlcv, rf.calculate_ohlcv_indicators, _pd_ohlcv_indicators),
+    Case("aggregate_bars", "series", lambda n: (_business_days(n), _prices(n)), rf.aggregate_bars, _pd_resample),
+    # Streaming indicators (one O(1) update vs recomputing over the history)
+    Case("StreamingEma", "scalar", _streaming(rf.StreamingEma, 20), lambda s, p: s.update(p), _recompute(lambda p: _pd_ema(p, 20).iloc[-1]), list_input=False),
+    Case("StreamingRsi", "scalar", _streaming(rf.StreamingRsi, 14), lambda s, p: s.update(p), _recompute(lambda p: _pd_rsi(p).iloc[-1]), list_input=False),
+    Case("StreamingMacd", "scalar", _streaming(rf.StreamingMacd), lambda s, p: s.update(p), _recompute(lambda p: [m.iloc[-1] for m in _pd_macd(p)]), list_input=False),
+    Case("StreamingSma", "scalar", _streaming(rf.StreamingSma, 50), lambda s, p: s.update(p), _recompute(lambda p: p[-50:].mean()), list_input=False),
+    Case(
+        "StreamingVolatility", "scalar", _streaming(rf.StreamingVolatility, 63), lambda s, p: s.update(p),
+        _recompute(lambda p: _np_volatility(p[-64:][1:] / p[-64:][:-1] - 1.0)), list_input=False,
+    ),
+    Case("StreamingDrawdown", "scalar", _streaming(rf.StreamingDrawdown), lambda s, p: s.update(p), _recompute(lambda p: p[-1] / p.max() - 1.0), list_input=False),
+    # Utilities
+    Case("detect_trend", "series", _series(_prices), rf.detect_trend, _py_detect_trend),
+    Case("calculate_cagr", "scalar", lambda _: (100.0, 180.0, 5.0), rf.calculate_cagr, lambda s, e, y: (e / s) ** (1 / y) - 1, list_input=False),
+    Case("calculate_pct_change", "scalar", lambda _: (100.0, 112.0), rf.calculate_pct_change, lambda o, n: (n - o) / o * 100, list_input=False),
+    Case("detect_volume_spike", "scalar", lambda _: (2.0e6, 1.2e6), rf.detect_volume_spike, lambda c, a: c > a * 1.5, list_input=False),
+    Case(
+        "calculate_fundamental_ratios", "batch", _statement_lines, rf.calculate_fundamental_ratios, _py_fundamental_ratios,
+        list_input=False,
+    ),
+    Case(
+        "calculate_statement_trends", "batch", lambda w: (_statements(w),),
+        lambda m: rf.calculate_statement_trends(m, 4.0), _py_statement_trends, list_input=False,
+    ),
+]
+
+
+# ============================================================================
+# Timing
+# ============================================================================
+
+def _time_call(fn: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Per-call seconds: best and median of `repeat` samples, each looped for >= min_time."""
+    timer = timeit.Timer(fn)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    samples = [timer.timeit(loops) / loops for _ in range(repeat)]
+    return {"best_s": min(samples), "median_s": float(np.median(samples)), "loops": loops}
+
+
+def _sizes(case: Case, series_lengths: List[int], batch_widths: List[int]) -> List[int]:
+    sizes = {"series": series_lengths, "batch": batch_widths, "scalar": [1]}[case.kind]
+    return [s for s in sizes if case.max_size is None or s <= case.max_size]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_sizes(value: Optional[str], default: List[int]) -> List[int]:
+    return [int(v) for v in value.split(",")] if value else default
+
+
+@app.command()
+def run(
+    output: str = typer.Option("rust_finance_bench.json", help="Results file (JSON)"),
+    only: Optional[str] = typer.Option(None, help="Comma-separated function names"),
+    lengths: Optional[str] = typer.Option(None, help="Series lengths, e.g. 100,10000"),
+    widths: Optional[str] = typer.Option(None, help="Batch widths (assets), e.g. 1,100"),
+    repeat: int = typer.Option(5, help="Timing samples per measurement"),
+    min_time: float = typer.Option(0.05, help="Minimum seconds per sample"),
+):
+    """Time rust_finance against NumPy / pandas and write a results file."""
+    series_lengths = _parse_sizes(lengths, SERIES_LENGTHS)
+    batch_widths = _parse_sizes(widths, BATCH_WIDTHS)
+    selected = set(only.split(",")) if only else None
+    cases = [c for c in CASES if selected is None or c.name in selected]
+
+    exported = sorted(n for n in dir(rf) if not n.startswith("_") and callable(getattr(rf, n)))
+    uncovered = sorted(set(exported) - {c.name for c in CASES})
+    if uncovered:
+        console.print(f"[yellow]No benchmark case for: {', '.join(uncovered)}[/yellow]")
+
+    records = []
+    for case in cases:
+        for size in _sizes(case, series_lengths, batch_widths):
+            args = case.make(size)
+            variants = {"rust_ndarray": lambda: case.rust(*args)}
+            if case.list_input:
+                variants["rust_list"] = lambda: case.rust(*[a.tolist() for a in args])
+            if case.baseline is not None:
+                variants["numpy"] = lambda: case.baseline(*args)
+
+            timings = {name: _time_call(fn, repeat, min_time) for name, fn in variants.items()}
+            baseline = timings.get("numpy", {}).get("best_s")
+            for name, timing in timings.items():
+                records.append({
+                    "function": case.name,
+                    "kind": case.kind,
+                    "size": size,
+                    "variant": name,
+                    **timing,
+                    "speedup_vs_numpy": baseline / timing["best_s"] if baseline else None,
+                })
+            summary = "  ".join(f"{name}={t['best_s'] * 1e6:,.1f}µs" for name, t in timings.items())
+            console.print(f"{case.name:<28} {size:>9,}  {summary}")
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "uncovered_functions": uncovered,
+        "results": records,
+    }
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    console.print(f"[green]Wrote {len(records)} measurements to {output}[/green]")
+
+
+@app.command()
+def compare(
+    before: str = typer.Argument(..., help="Baseline results file"),
+    after: str = typer.Argument(..., help="New results file"),
+    variant: str = typer.Option("rust_ndarray", help="Variant to compare"),
+    threshold: float = typer.Option(0.10, help="Highlight changes larger than this fraction"),
+):
+    """Compare two results files (e.g. from two commits)."""
+    def _load(path):
+        with open(path) as f:
+            data = json.load(f)
+        table = {(r["function"], r["size"]): r for r in data["results"] if r["variant"] == variant}
+        return data, table
+
+    before_data, old = _load(before)
+    after_data, new = _load(after)
+
+    table = Table(title=f"{variant}: {before_data.get('commit')} → {after_data.get('commit')}")
+    table.add_column("Function", style="cyan")
+    table.add_column("Size", justify="right")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("vs NumPy", justify="right")
+
+    for key in sorted(set(old) & set(new)):
+        b, a = old[key]["best_s"], new[key]["best_s"]
+        change = a / b - 1.0
+        style = "red" if change > threshold else "green" if change < -threshold else ""
+        speedup = new[key].get("speedup_vs_numpy")
+        table.add_row(
+            key[0], f"{key[1]:,}", f"{b * 1e6:,.1f}µs", f"{a * 1e6:,.1f}µs",
+            f"[{style}]{change:+.1%}[/{style}]" if style else f"{change:+.1%}",
+            f"{speedup:.1f}x" if speedup else "-",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,169 @@
+//! Criterion benches for the pure Rust kernels (no Python / FFI overhead).
+//!
+//!   cd rust_finance && cargo bench --no-default-features
+//!
+//! Series lengths run from 100 to 1M points; batch kernels from 1 to 1,000 assets;
+//! streaming indicators time a single update after seeding.
+//! The Python-side comparison (FFI, conversion and NumPy/pandas baselines) lives in
+//! `benches/compare_numpy.py`.
+
+use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
+
+use rust_finance::factors::{factor_exposures, factor_returns};
+use rust_finance::ohlcv::{ohlcv_indicators, OhlcvParams};
+use rust_finance::portfolio::{aligned_rows, min_variance_weights, moments, portfolio_risk, Shrinkage};
+use rust_finance::risk::{drawdown_profile, max_drawdown, risk_metrics, risk_panel, sharpe_ratio, var_95, volatility};
+use rust_finance::rolling::rolling_risk;
+use rust_finance::simulation::{value_at_risk, Rng, VarMethod};
+use rust_finance::streaming::{DrawdownState, EmaState, RsiState, SmaState, VolatilityState};
+use rust_finance::technicals::{crossover_events, ema_series, macd, macd_series, rsi, rsi_series, sma, sma_series, MacdState};
+
+const SERIES_LENGTHS: [usize; 5] = [100, 1_000, 10_000, 100_000, 1_000_000];
+const BATCH_WIDTHS: [usize; 4] = [1, 10, 100, 1_000];
+const BATCH_DAYS: usize = 1_260; // 5 years
+
+/// Deterministic daily returns (~1.2% daily volatility)
+fn returns(n: usize, seed: u64) -> Vec<f64> {
+    let mut rng = Rng::new(seed, 0);
+    (0..n).map(|_| 0.0003 + 0.012 * rng.normal()).collect()
+}
+
+/// Geometric price path from `returns`
+fn prices(n: usize, seed: u64) -> Vec<f64> {
+    let mut price = 100.0;
+    returns(n, seed).into_iter().map(|r| {
+        price *= 1.0 + r;
+        price
+    }).collect()
+}
+
+fn bench_scalar_risk(c: &mut Criterion) {
+    let mut group = c.benchmark_group("risk_scalar");
+    for &n in &SERIES_LENGTHS {
+        let r = returns(n, 1);
+        let p = prices(n, 1);
+        group.throughput(Throughput::Elements(n as u64));
+        group.bench_with_input(BenchmarkId::new("volatility", n), &r, |b, r| b.iter(|| volatility(black_box(r))));
+        group.bench_with_input(BenchmarkId::new("sharpe_ratio", n), &r, |b, r| b.iter(|| sharpe_ratio(black_box(r), 0.0)));
+        group.bench_with_input(BenchmarkId::new("var_95", n), &r, |b, r| b.iter(|| var_95(black_box(r))));
+        group.bench_with_input(BenchmarkId::new("max_drawdown", n), &p, |b, p| b.iter(|| max_drawdown(black_box(p))));
+        group.bench_with_input(BenchmarkId::new("drawdown_profile", n), &p, |b, p| b.iter(|| drawdown_profile(black_box(p), 0.05)));
+        group.bench_with_input(BenchmarkId::new("risk_metrics", n), &p, |b, p| {
+            b.iter(|| risk_metrics(black_box(p), &[0.95, 0.99], 0.0))
+        });
+        group.bench_with_input(BenchmarkId::new("rolling_risk_63", n), &r, |b, r| {
+            b.iter(|| rolling_risk(black_box(r), None, 63, 1, 0.0))
+        });
+    }
+    group.finish();
+}
+
+fn bench_technicals(c: &mut Criterion) {
+    let mut group = c.benchmark_group("technicals");
+    for &n in &SERIES_LENGTHS {
+        let p = prices(n, 2);
+        group.throughput(Throughput::Elements(n as u64));
+        group.bench_with_input(BenchmarkId::new("sma_200", n), &p, |b, p| b.iter(|| sma(black_box(p), 200)));
+        group.bench_with_input(BenchmarkId::new("rsi_14", n), &p, |b, p| b.iter(|| rsi(black_box(p), 14)));
+        group.bench_with_input(BenchmarkId::new("macd", n), &p, |b, p| b.iter(|| macd(black_box(p), 12, 26, 9)));
+        group.bench_with_input(BenchmarkId::new("sma_series_50", n), &p, |b, p| b.iter(|| sma_series(black_box(p), 50)));
+        group.bench_with_input(BenchmarkId::new("ema_series_20", n), &p, |b, p| b.iter(|| ema_series(black_box(p), 20)));
+        group.bench_with_input(BenchmarkId::new("rsi_series_14", n), &p, |b, p| b.iter(|| rsi_series(black_box(p), 14)));
+        group.bench_with_input(BenchmarkId::new("macd_series", n), &p, |b, p| b.iter(|| macd_series(black_box(p), 12, 26, 9)));
+        group.bench_with_input(BenchmarkId::new("crossover_events", n), &p, |b, p| {
+            b.iter(|| crossover_events(black_box(p), 50, 200))
+        });
+        let high: Vec<f64> = p.iter().map(|x| x * 1.01).collect();
+        let low: Vec<f64> = p.iter().map(|x| x * 0.99).collect();
+        let volume: Vec<f64> = returns(n, 3).iter().map(|r| 1.0e6 * (1.0 + 20.0 * r.abs())).collect();
+        let params = OhlcvParams::default();
+        group.bench_with_input(BenchmarkId::new("ohlcv_indicators", n), &p, |b, p| {
+            b.iter(|| ohlcv_indicators(black_box(&high), black_box(&low), black_box(p), black_box(&volume), &params))
+        });
+    }
+    group.finish();
+}
+
+fn bench_batches(c: &mut Criterion) {
+    let mut group = c.benchmark_group("batch");
+    group.sample_size(20);
+    for &width in &BATCH_WIDTHS {
+        let matrix: Vec<f64> = (0..width).flat_map(|i| prices(BATCH_DAYS, 100 + i as u64)).collect();
+        group.throughput(Throughput::Elements((width * BATCH_DAYS) as u64));
+        group.bench_with_input(BenchmarkId::new("risk_panel", width), &matrix, |b, m| {
+            b.iter(|| risk_panel(black_box(m), BATCH_DAYS, true, &[0.95], 0.0))
+        });
+        let rets: Vec<f64> = (0..width).flat_map(|i| returns(BATCH_DAYS, 100 + i as u64)).collect();
+        let scores: Vec<f64> = returns(4 * width, 5);
+        group.bench_with_input(BenchmarkId::new("factor_returns", width), &rets, |b, r| {
+            b.iter(|| factor_returns(black_box(r), width, BATCH_DAYS, &scores, 0.3))
+        });
+        let factors: Vec<f64> = returns(5 * BATCH_DAYS, 6);
+        group.bench_with_input(BenchmarkId::new("factor_exposures", width), &rets, |b, r| {
+            b.iter(|| factor_exposures(black_box(r), BATCH_DAYS, &factors, 5))
+        });
+
+        // Portfolio kernels above ~100 holdings are not a realistic use, keep the suite fast
+        if width <= 100 {
+            let weights = vec![1.0 / width as f64; width];
+            group.bench_with_input(BenchmarkId::new("covariance_ledoit_wolf", width), &rets, |b, r| {
+                b.iter(|| {
+                    let (aligned, days) = aligned_rows(black_box(r), width, BATCH_DAYS);
+                    moments(&aligned, width, days, Shrinkage::LedoitWolf)
+                })
+            });
+            let m = moments(&rets, width, BATCH_DAYS, Shrinkage::None);
+            group.bench_with_input(BenchmarkId::new("portfolio_risk", width), &m, |b, m| {
+                b.iter(|| portfolio_risk(black_box(m), &weights))
+            });
+            group.bench_with_input(BenchmarkId::new("min_variance", width), &m, |b, m| {
+                b.iter(|| min_variance_weights(black_box(m)))
+            });
+        }
+    }
+    group.finish();
+}
+
+fn bench_simulation(c: &mut Criterion) {
+    let mut group = c.benchmark_group("simulation");
+    group.sample_size(10);
+    let r = returns(BATCH_DAYS, 3);
+    for (name, method) in [("historical", VarMethod::Historical), ("monte_carlo", VarMethod::MonteCarlo)] {
+        group.bench_function(BenchmarkId::new(name, "100k_paths_10d"), |b| {
+            b.iter(|| value_at_risk(black_box(&r), method, 10, &[0.95, 0.99], 100_000, 42))
+        });
+    }
+    group.finish();
+}
+
+/// One update of a stream seeded with 5 years of history
+fn bench_streaming(c: &mut Criterion) {
+    let mut group = c.benchmark_group("streaming_update");
+    let history = prices(BATCH_DAYS, 4);
+    let price = history[BATCH_DAYS - 1];
+
+    let mut ema = EmaState::new(20);
+    let mut rsi = RsiState::new(14);
+    let mut macd = MacdState::new(12, 26, 9);
+    let mut sma = SmaState::new(50);
+    let mut vol = VolatilityState::new(63);
+    let mut drawdown = DrawdownState::new();
+    for &p in &history {
+        ema.update(p);
+        rsi.update(p);
+        macd.update(p);
+        sma.update(p);
+        vol.update(p);
+        drawdown.update(p);
+    }
+    group.bench_function("ema_20", |b| b.iter(|| ema.update(black_box(price))));
+    group.bench_function("rsi_14", |b| b.iter(|| rsi.update(black_box(price))));
+    group.bench_function("macd", |b| b.iter(|| macd.update(black_box(price))));
+    group.bench_function("sma_50", |b| b.iter(|| sma.update(black_box(price))));
+    group.bench_function("volatility_63", |b| b.iter(|| vol.update(black_box(price))));
+    group.bench_function("drawdown", |b| b.iter(|| drawdown.update(black_box(price))));
+    group.finish();
+}
+
+criterion_group!(benches, bench_scalar_risk, bench_technicals, bench_batches, bench_simulation, bench_streaming);
+criterion_main!(benches);
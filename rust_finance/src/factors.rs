@@ -0,0 +1,254 @@
+//! Factors module
+//! Long-short factor returns from cross-sectional scores and batched
+//! multi-factor regressions (loadings, alpha, R², idiosyncratic volatility)
+//!
+//! Returns matrices are shaped (assets, days) like `calculate_risk_panel`;
+//! factor matrices are shaped (factors, days). NaN marks a missing day: each
+//! regression uses the days where the asset and every factor have a value, so
+//! tickers with different histories can share one call. Assets are fitted in
+//! parallel; alpha and idiosyncratic volatility are annualized.
+
+use numpy::ndarray::Array2;
+use numpy::IntoPyArray;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+use rayon::prelude::*;
+
+use crate::input::Matrix;
+
+const TRADING_DAYS: f64 = 252.0;
+
+/// Daily long-short returns for one factor.
+///
+/// Assets with a finite score are ranked; the top `quantile` of them form the
+/// equal-weighted long leg and the bottom `quantile` the short leg (at least one
+/// asset each, never overlapping). Each day is the mean return of the long leg
+/// minus that of the short leg over the legs' assets with a return that day,
+/// NaN when a leg has none. All NaN when fewer than two assets are scored.
+pub fn long_short_returns(returns: &[f64], n_assets: usize, n_days: usize, scores: &[f64], quantile: f64) -> Vec<f64> {
+    let mut ranked: Vec<usize> = (0..n_assets).filter(|&i| scores[i].is_finite()).collect();
+    if ranked.len() < 2 {
+        return vec![f64::NAN; n_days];
+    }
+    ranked.sort_by(|&a, &b| scores[a].total_cmp(&scores[b]).then(a.cmp(&b)));
+    let leg = ((quantile * ranked.len() as f64).round() as usize).clamp(1, ranked.len() / 2);
+    let (short, long) = (&ranked[..leg], &ranked[ranked.len() - leg..]);
+
+    let leg_mean = |assets: &[usize], day: usize| {
+        let (sum, count) = assets.iter()
+            .map(|&i| returns[i * n_days + day])
+            .filter(|r| r.is_finite())
+            .fold((0.0, 0usize), |(s, c), r| (s + r, c + 1));
+        if count > 0 { sum / count as f64 } else { f64::NAN }
+    };
+    (0..n_days).map(|day| leg_mean(long, day) - leg_mean(short, day)).collect()
+}
+
+/// Long-short returns for every row of `scores` (factors x assets), row-major (factors, days)
+pub fn factor_returns(returns: &[f64], n_assets: usize, n_days: usize, scores: &[f64], quantile: f64) -> Vec<f64> {
+    if n_assets == 0 {
+        return Vec::new();
+    }
+    scores.par_chunks(n_assets)
+        .map(|row| long_short_returns(returns, n_assets, n_days, row, quantile))
+        .collect::<Vec<Vec<f64>>>()
+        .concat()
+}
+
+/// Least-squares fit of one asset on the factors
+#[derive(Debug, Clone)]
+pub struct FactorFit {
+    /// Days used (asset and every factor finite)
+    pub observations: usize,
+    /// One loading per factor
+    pub loadings: Vec<f64>,
+    /// Annualized intercept
+    pub alpha: f64,
+    pub r_squared: f64,
+    /// Annualized standard deviation of the residuals (degrees-of-freedom adjusted)
+    pub idiosyncratic_volatility: f64,
+}
+
+impl FactorFit {
+    fn undefined(observations: usize, n_factors: usize) -> Self {
+        FactorFit {
+            observations,
+            loadings: vec![f64::NAN; n_factors],
+            alpha: f64::NAN,
+            r_squared: f64::NAN,
+            idiosyncratic_volatility: f64::NAN,
+        }
+    }
+}
+
+/// Solve `a x = b` in place for a symmetric positive definite `a` (row-major n x n)
+/// by Cholesky decomposition. None when `a` is singular (collinear factors).
+fn solve_spd(a: &mut [f64], b: &mut [f64], n: usize) -> Option<()> {
+    let scale = (0..n).map(|i| a[i * n + i]).fold(0.0, f64::max);
+    for j in 0..n {
+        let mut d = a[j * n + j];
+        for k in 0..j {
+            d -= a[j * n + k] * a[j * n + k];
+        }
+        if !(d > 1e-12 * scale) {
+            return None;
+        }
+        let d = d.sqrt();
+        a[j * n + j] = d;
+        for i in j + 1..n {
+            let mut s = a[i * n + j];
+            for k in 0..j {
+                s -= a[i * n + k] * a[j * n + k];
+            }
+            a[i * n + j] = s / d;
+        }
+    }
+    // L y = b, then L' x = y
+    for i in 0..n {
+        for k in 0..i {
+            b[i] -= a[i * n + k] * b[k];
+        }
+        b[i] /= a[i * n + i];
+    }
+    for i in (0..n).rev() {
+        for k in i + 1..n {
+            b[i] -= a[k * n + i] * b[k];
+        }
+        b[i] /= a[i * n + i];
+    }
+    Some(())
+}
+
+/// Regress one asset's daily returns on the factor rows (row-major (factors, days)).
+///
+/// Works on demeaned data (two passes) so the intercept does not degrade the
+/// conditioning; needs more usable days than factors + 1.
+pub fn factor_regression(asset: &[f64], factors: &[f64], n_factors: usize) -> FactorFit {
+    let n_days = asset.len();
+    let usable = |day: usize| asset[day].is_finite() && (0..n_factors).all(|f| factors[f * n_days + day].is_finite());
+    let days: Vec<usize> = (0..n_days).filter(|&d| usable(d)).collect();
+    let n = days.len();
+    if n <= n_factors + 1 {
+        return FactorFit::undefined(n, n_factors);
+    }
+
+    let mean_y = days.iter().map(|&d| asset[d]).sum::<f64>() / n as f64;
+    let mean_x: Vec<f64> = (0..n_factors)
+        .map(|f| days.iter().map(|&d| factors[f * n_days + d]).sum::<f64>() / n as f64)
+        .collect();
+
+    let mut xtx = vec![0.0; n_factors * n_factors];
+    let mut xty = vec![0.0; n_factors];
+    let mut syy = 0.0;
+    let mut x = vec![0.0; n_factors];
+    for &d in &days {
+        let y = asset[d] - mean_y;
+        for f in 0..n_factors {
+            x[f] = factors[f * n_days + d] - mean_x[f];
+        }
+        for i in 0..n_factors {
+            xty[i] += x[i] * y;
+            for j in 0..=i {
+                xtx[i * n_factors + j] += x[i] * x[j];
+            }
+        }
+        syy += y * y;
+    }
+    for i in 0..n_factors {
+        for j in 0..i {
+            xtx[j * n_factors + i] = xtx[i * n_factors + j];
+        }
+    }
+
+    let mut loadings = xty.clone();
+    if solve_spd(&mut xtx, &mut loadings, n_factors).is_none() {
+        return FactorFit::undefined(n, n_factors);
+    }
+    let explained: f64 = loadings.iter().zip(&xty).map(|(b, c)| b * c).sum();
+    let residual = (syy - explained).max(0.0);
+    let intercept = mean_y - loadings.iter().zip(&mean_x).map(|(b, m)| b * m).sum::<f64>();
+    FactorFit {
+        observations: n,
+        loadings,
+        alpha: intercept * TRADING_DAYS,
+        r_squared: if syy > 0.0 { 1.0 - residual / syy } else { f64::NAN },
+        idiosyncratic_volatility: (residual / (n - n_factors - 1) as f64).sqrt() * TRADING_DAYS.sqrt(),
+    }
+}
+
+/// `factor_regression` for every row of an (assets, days) returns matrix, in parallel
+pub fn factor_exposures(returns: &[f64], n_days: usize, factors: &[f64], n_factors: usize) -> Vec<FactorFit> {
+    if n_days == 0 {
+        return Vec::new();
+    }
+    returns.par_chunks(n_days)
+        .map(|row| factor_regression(row, factors, n_factors))
+        .collect()
+}
+
+// === Python wrappers ===
+
+/// Daily long-short factor returns from cross-sectional scores.
+///
+/// `returns` is an (assets, days) daily returns matrix; `scores` is (factors, assets),
+/// one characteristic per asset and factor, oriented so that high scores are bought
+/// (NaN leaves the asset out of that factor). `quantile` is the share of ranked assets
+/// in each leg. Returns a (factors, days) NumPy array.
+#[pyfunction]
+#[pyo3(signature = (returns, scores, quantile=0.3))]
+pub fn calculate_factor_returns<'py>(
+    py: Python<'py>,
+    returns: Matrix<'py>,
+    scores: Matrix<'py>,
+    quantile: f64,
+) -> PyResult<Bound<'py, numpy::PyArray2<f64>>> {
+    let (n_assets, n_days) = (returns.rows(), returns.cols());
+    if scores.cols() != n_assets {
+        return Err(PyValueError::new_err("scores must have one column per asset (row of returns)"));
+    }
+    if !(quantile > 0.0 && quantile <= 0.5) {
+        return Err(PyValueError::new_err("quantile must be in (0, 0.5]"));
+    }
+    let n_factors = scores.rows();
+    let (data, scores) = (returns.as_slice(), scores.as_slice());
+    let values = py.allow_threads(|| factor_returns(data, n_assets, n_days, scores, quantile));
+    let values = if n_assets == 0 { vec![f64::NAN; n_factors * n_days] } else { values };
+    Ok(Array2::from_shape_vec((n_factors, n_days), values).expect("factors x days matrix").into_pyarray_bound(py))
+}
+
+/// Factor loadings of many assets in one call.
+///
+/// `returns` is an (assets, days) daily returns matrix and `factors` a (factors, days)
+/// matrix of factor returns on the same days. Each asset is regressed with an
+/// intercept on the days where it and every factor have a value.
+/// Returns a dict: loadings (assets, factors), alpha (annualized), r_squared,
+/// idiosyncratic_volatility (annualized) and observations, one value per asset.
+/// Fits with too few days or collinear factors are NaN.
+#[pyfunction]
+pub fn calculate_factor_exposures<'py>(
+    py: Python<'py>,
+    returns: Matrix<'py>,
+    factors: Matrix<'py>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let (n_assets, n_days, n_factors) = (returns.rows(), returns.cols(), factors.rows());
+    if factors.cols() != n_days {
+        return Err(PyValueError::new_err("returns and factors must cover the same days (columns)"));
+    }
+    let (data, factor_data) = (returns.as_slice(), factors.as_slice());
+    let fits = py.allow_threads(|| factor_exposures(data, n_days, factor_data, n_factors));
+    let fits = if fits.len() == n_assets { fits } else { vec![FactorFit::undefined(0, n_factors); n_assets] };
+
+    let loadings: Vec<f64> = fits.iter().flat_map(|f| f.loadings.iter().copied()).collect();
+    let column = |f: fn(&FactorFit) -> f64| fits.iter().map(f).collect::<Vec<f64>>();
+    let result = PyDict::new_bound(py);
+    result.set_item(
+        "loadings",
+        Array2::from_shape_vec((n_assets, n_factors), loadings).expect("assets x factors matrix").into_pyarray_bound(py),
+    )?;
+    result.set_item("alpha", column(|f| f.alpha).into_pyarray_bound(py))?;
+    result.set_item("r_squared", column(|f| f.r_squared).into_pyarray_bound(py))?;
+    result.set_item("idiosyncratic_volatility", column(|f| f.idiosyncratic_volatility).into_pyarray_bound(py))?;
+    result.set_item("observations", fits.iter().map(|f| f.observations as i64).collect::<Vec<i64>>().into_pyarray_bound(py))?;
+    Ok(result)
+}
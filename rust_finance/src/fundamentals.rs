@@ -0,0 +1,183 @@
+//! Fundamentals module
+//! ROCE, ROE, Debt-to-Equity, Interest Coverage, FCF Margin, CapEx Intensity
+//! and Accruals for every period of aligned financial statements
+//!
+//! Line items are matrices shaped (tickers, periods), one cell per statement
+//! period (any order, as long as every line uses the same one). Ratios are
+//! computed cell by cell; a missing (NaN) input or an undefined denominator
+//! gives NaN for that cell only.
+
+use numpy::ndarray::Array2;
+use numpy::IntoPyArray;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::input::Matrix;
+
+/// Statement line items for one or more tickers, row-major (tickers, periods).
+/// Optional lines may be empty slices, which yield NaN ratios.
+pub struct StatementLines<'a> {
+    pub ebit: &'a [f64],
+    pub interest_expense: &'a [f64],
+    pub total_assets: &'a [f64],
+    pub current_liabilities: &'a [f64],
+    pub equity: &'a [f64],
+    pub total_debt: &'a [f64],
+    pub revenue: &'a [f64],
+    pub free_cash_flow: &'a [f64],
+    pub capex: &'a [f64],
+    pub net_income: &'a [f64],
+    pub operating_cashflow: &'a [f64],
+}
+
+/// Ratio matrices, same layout as the inputs
+#[derive(Debug, Clone)]
+pub struct FundamentalRatios {
+    pub roce: Vec<f64>,
+    pub roe: Vec<f64>,
+    pub debt_to_equity: Vec<f64>,
+    pub icr: Vec<f64>,
+    pub fcf_margin: Vec<f64>,
+    pub capex_intensity: Vec<f64>,
+    pub accruals: Vec<f64>,
+}
+
+/// EBIT / (Total Assets - Current Liabilities)
+pub fn roce(ebit: f64, total_assets: f64, current_liabilities: f64) -> f64 {
+    let capital_employed = total_assets - current_liabilities;
+    if capital_employed != 0.0 { ebit / capital_employed } else { f64::NAN }
+}
+
+/// Net Income / Equity; NaN for zero or negative equity
+pub fn roe(net_income: f64, equity: f64) -> f64 {
+    if equity > 0.0 { net_income / equity } else { f64::NAN }
+}
+
+/// Total Debt / Equity as a plain ratio (1.5 = 150%); NaN for zero or negative equity
+pub fn debt_to_equity(total_debt: f64, equity: f64) -> f64 {
+    if equity > 0.0 { total_debt / equity } else { f64::NAN }
+}
+
+/// EBIT / |Interest Expense|. Zero interest with positive EBIT is +inf (no
+/// interest burden); zero interest with zero or negative EBIT is NaN.
+pub fn icr(ebit: f64, interest_expense: f64) -> f64 {
+    let interest = interest_expense.abs();
+    if interest > 0.0 {
+        ebit / interest
+    } else if interest == 0.0 && ebit > 0.0 {
+        f64::INFINITY
+    } else {
+        f64::NAN
+    }
+}
+
+/// Free Cash Flow / Revenue
+pub fn fcf_margin(free_cash_flow: f64, revenue: f64) -> f64 {
+    if revenue > 0.0 { free_cash_flow / revenue } else { f64::NAN }
+}
+
+/// |CapEx| / Revenue (cash-flow statements report CapEx as a negative outflow)
+pub fn capex_intensity(capex: f64, revenue: f64) -> f64 {
+    if revenue > 0.0 { capex.abs() / revenue } else { f64::NAN }
+}
+
+/// (Net Income - Operating Cash Flow) / Total Assets; high values mean earnings
+/// are running ahead of cash
+pub fn accruals(net_income: f64, operating_cashflow: f64, total_assets: f64) -> f64 {
+    if total_assets > 0.0 { (net_income - operating_cashflow) / total_assets } else { f64::NAN }
+}
+
+/// Element `i` of an optional line (NaN when the line was not given)
+fn at(line: &[f64], i: usize) -> f64 {
+    line.get(i).copied().unwrap_or(f64::NAN)
+}
+
+/// Every ratio for every (ticker, period) cell of `lines`, which hold `cells` values each
+pub fn fundamental_ratios(lines: &StatementLines, cells: usize) -> FundamentalRatios {
+    let mut ratios = FundamentalRatios {
+        roce: Vec::with_capacity(cells),
+        roe: Vec::with_capacity(cells),
+        debt_to_equity: Vec::with_capacity(cells),
+        icr: Vec::with_capacity(cells),
+        fcf_margin: Vec::with_capacity(cells),
+        capex_intensity: Vec::with_capacity(cells),
+        accruals: Vec::with_capacity(cells),
+    };
+    for i in 0..cells {
+        let (ebit, assets, equity, revenue) = (at(lines.ebit, i), at(lines.total_assets, i), at(lines.equity, i), at(lines.revenue, i));
+        let net_income = at(lines.net_income, i);
+        ratios.roce.push(roce(ebit, assets, at(lines.current_liabilities, i)));
+        ratios.roe.push(roe(net_income, equity));
+        ratios.debt_to_equity.push(debt_to_equity(at(lines.total_debt, i), equity));
+        ratios.icr.push(icr(ebit, at(lines.interest_expense, i)));
+        ratios.fcf_margin.push(fcf_margin(at(lines.free_cash_flow, i), revenue));
+        ratios.capex_intensity.push(capex_intensity(at(lines.capex, i), revenue));
+        ratios.accruals.push(accruals(net_income, at(lines.operating_cashflow, i), assets));
+    }
+    ratios
+}
+
+/// Fundamental ratios for every period of aligned statements in one call.
+///
+/// Each line item is a 2-D float64 array shaped (tickers, periods) (use
+/// `values[np.newaxis, :]` for one ticker); all given lines must share that
+/// shape. NaN marks a missing line item. Lines left as None give NaN ratios.
+/// Returns a dict of (tickers, periods) NumPy arrays: roce, roe,
+/// debt_to_equity, icr (+inf when there is no interest to cover), fcf_margin,
+/// capex_intensity and accruals.
+#[pyfunction]
+#[pyo3(signature = (
+    ebit, interest_expense, total_assets, current_liabilities, equity, total_debt,
+    revenue=None, free_cash_flow=None, capex=None, net_income=None, operating_cashflow=None
+))]
+#[allow(clippy::too_many_arguments)]
+pub fn calculate_fundamental_ratios<'py>(
+    py: Python<'py>,
+    ebit: Matrix<'py>,
+    interest_expense: Matrix<'py>,
+    total_assets: Matrix<'py>,
+    current_liabilities: Matrix<'py>,
+    equity: Matrix<'py>,
+    total_debt: Matrix<'py>,
+    revenue: Option<Matrix<'py>>,
+    free_cash_flow: Option<Matrix<'py>>,
+    capex: Option<Matrix<'py>>,
+    net_income: Option<Matrix<'py>>,
+    operating_cashflow: Option<Matrix<'py>>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let shape = (ebit.rows(), ebit.cols());
+    let given = [&interest_expense, &total_assets, &current_liabilities, &equity, &total_debt]
+        .into_iter()
+        .chain([&revenue, &free_cash_flow, &capex, &net_income, &operating_cashflow].into_iter().flatten());
+    for line in given {
+        if (line.rows(), line.cols()) != shape {
+            return Err(pyo3::exceptions::PyValueError::new_err("every line item must have the same (tickers, periods) shape"));
+        }
+    }
+    let optional = |line: &Option<Matrix<'py>>| line.as_ref().map(|m| m.as_slice()).unwrap_or(&[]);
+    let lines = StatementLines {
+        ebit: ebit.as_slice(),
+        interest_expense: interest_expense.as_slice(),
+        total_assets: total_assets.as_slice(),
+        current_liabilities: current_liabilities.as_slice(),
+        equity: equity.as_slice(),
+        total_debt: total_debt.as_slice(),
+        revenue: optional(&revenue),
+        free_cash_flow: optional(&free_cash_flow),
+        capex: optional(&capex),
+        net_income: optional(&net_income),
+        operating_cashflow: optional(&operating_cashflow),
+    };
+    let ratios = fundamental_ratios(&lines, shape.0 * shape.1);
+
+    let matrix = |values: Vec<f64>| Array2::from_shape_vec(shape, values).expect("tickers x periods matrix").into_pyarray_bound(py);
+    let result = PyDict::new_bound(py);
+    result.set_item("roce", matrix(ratios.roce))?;
+    result.set_item("roe", matrix(ratios.roe))?;
+    result.set_item("debt_to_equity", matrix(ratios.debt_to_equity))?;
+    result.set_item("icr", matrix(ratios.icr))?;
+    result.set_item("fcf_margin", matrix(ratios.fcf_margin))?;
+    result.set_item("capex_intensity", matrix(ratios.capex_intensity))?;
+    result.set_item("accruals", matrix(ratios.accruals))?;
+    Ok(result)
+}
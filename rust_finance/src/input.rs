@@ -0,0 +1,145 @@
+//! Input conversion for price / return series and matrices
+//! Accepts NumPy float64 arrays, buffer-protocol objects and plain lists
+//! (int64 arrays / lists for dates)
+
+use numpy::{PyArray1, PyArrayMethods, PyReadonlyArray1, PyReadonlyArray2, PyUntypedArrayMethods};
+use pyo3::buffer::PyBuffer;
+use pyo3::prelude::*;
+
+/// A 1-D float64 series borrowed from Python where possible.
+///
+/// - Contiguous NumPy float64 arrays and C-contiguous float64 buffers
+///   (memoryview, array.array('d'), ...) are read in place (zero-copy).
+/// - Strided arrays / buffers are gathered into one contiguous copy.
+/// - Anything else (lists, tuples, pandas Series of other dtypes) is
+///   extracted element by element, as before.
+pub enum Series<'py> {
+    Array(PyReadonlyArray1<'py, f64>),
+    Buffer(PyBuffer<f64>),
+    Owned(Vec<f64>),
+}
+
+impl<'py> Series<'py> {
+    /// View the series as a contiguous slice
+    pub fn as_slice(&self) -> &[f64] {
+        match self {
+            // Contiguity was checked during extraction
+            Series::Array(arr) => arr.as_slice().unwrap_or(&[]),
+            Series::Buffer(buf) => unsafe {
+                // SAFETY: the buffer is C-contiguous float64, 1-D, and stays
+                // alive (and exported read-only) for as long as `self`
+                std::slice::from_raw_parts(buf.buf_ptr() as *const f64, buf.item_count())
+            },
+            Series::Owned(values) => values.as_slice(),
+        }
+    }
+
+    pub fn len(&self) -> usize {
+        self.as_slice().len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+}
+
+impl<'py> FromPyObject<'py> for Series<'py> {
+    fn extract_bound(ob: &Bound<'py, PyAny>) -> PyResult<Self> {
+        if let Ok(arr) = ob.downcast::<PyArray1<f64>>() {
+            let readonly = arr.try_readonly()?;
+            if readonly.as_slice().is_ok() {
+                return Ok(Series::Array(readonly));
+            }
+            return Ok(Series::Owned(readonly.as_array().to_vec()));
+        }
+
+        if let Ok(buf) = PyBuffer::<f64>::get_bound(ob) {
+            if buf.dimensions() == 1 {
+                if buf.is_c_contiguous() {
+                    return Ok(Series::Buffer(buf));
+                }
+                return Ok(Series::Owned(buf.to_vec(ob.py())?));
+            }
+        }
+
+        Ok(Series::Owned(ob.extract::<Vec<f64>>()?))
+    }
+}
+
+/// A 2-D float64 matrix shaped (assets, days), row-major.
+///
+/// C-contiguous arrays are read in place; any other layout (Fortran order such as
+/// `df.to_numpy().T` for a dates x tickers DataFrame, strided slices) is copied
+/// once in logical row-major order.
+pub enum Matrix<'py> {
+    Array(PyReadonlyArray2<'py, f64>),
+    Owned(Vec<f64>, usize, usize),
+}
+
+impl<'py> Matrix<'py> {
+    pub fn as_slice(&self) -> &[f64] {
+        match self {
+            // C-contiguity was checked during extraction
+            Matrix::Array(arr) => arr.as_slice().unwrap_or(&[]),
+            Matrix::Owned(values, _, _) => values.as_slice(),
+        }
+    }
+
+    /// Number of rows (assets)
+    pub fn rows(&self) -> usize {
+        match self {
+            Matrix::Array(arr) => arr.shape()[0],
+            Matrix::Owned(_, rows, _) => *rows,
+        }
+    }
+
+    /// Number of columns (days)
+    pub fn cols(&self) -> usize {
+        match self {
+            Matrix::Array(arr) => arr.shape()[1],
+            Matrix::Owned(_, _, cols) => *cols,
+        }
+    }
+}
+
+impl<'py> FromPyObject<'py> for Matrix<'py> {
+    fn extract_bound(ob: &Bound<'py, PyAny>) -> PyResult<Self> {
+        let readonly = ob.extract::<PyReadonlyArray2<'py, f64>>()?;
+        // as_slice() also accepts F-contiguous arrays, whose buffer is column-major
+        if readonly.is_c_contiguous() {
+            return Ok(Matrix::Array(readonly));
+        }
+        let (rows, cols) = (readonly.shape()[0], readonly.shape()[1]);
+        Ok(Matrix::Owned(readonly.as_array().iter().copied().collect(), rows, cols))
+    }
+}
+
+/// A 1-D int64 series of dates (e.g. days since epoch), read in place from a
+/// contiguous NumPy int64 array, otherwise copied (strided arrays, lists).
+pub enum Dates<'py> {
+    Array(PyReadonlyArray1<'py, i64>),
+    Owned(Vec<i64>),
+}
+
+impl<'py> Dates<'py> {
+    pub fn as_slice(&self) -> &[i64] {
+        match self {
+            // Contiguity was checked during extraction
+            Dates::Array(arr) => arr.as_slice().unwrap_or(&[]),
+            Dates::Owned(values) => values.as_slice(),
+        }
+    }
+}
+
+impl<'py> FromPyObject<'py> for Dates<'py> {
+    fn extract_bound(ob: &Bound<'py, PyAny>) -> PyResult<Self> {
+        if let Ok(arr) = ob.downcast::<PyArray1<i64>>() {
+            let readonly = arr.try_readonly()?;
+            if readonly.as_slice().is_ok() {
+                return Ok(Dates::Array(readonly));
+            }
+            return Ok(Dates::Owned(readonly.as_array().to_vec()));
+        }
+        Ok(Dates::Owned(ob.extract::<Vec<i64>>()?))
+    }
+}
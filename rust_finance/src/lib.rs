@@ -2,15 +2,38 @@
 //! High-performance financial calculations for FIntrepidQ
 //!
 //! Modules:
-//! - risk: VaR, Sharpe, Volatility, Max Drawdown, Beta
-//! - technicals: RSI, MACD, SMA, EMA, Golden/Death Cross
-//! - utils: Trend detection, CAGR, percentage changes
+//! - factors: Long-short factor returns (size, value, momentum, low-vol, ...) and batched factor regressions
+//! - fundamentals: ROCE, ROE, D/E, ICR, FCF margin, CapEx intensity, accruals over statement matrices
+//! - ohlcv: Fused OHLCV pack (Bollinger, ATR, Stochastic, ADX, OBV, VWAP, MFI, volume averages / z-score)
+//! - portfolio: Covariance/Correlation (shrinkage), Risk Contributions, Min-Variance / Max-Sharpe weights
+//! - risk: VaR, Sharpe, Volatility, Max Drawdown, Beta, fused risk block, batch risk panel, date-aligned benchmark beta, drawdown episodes
+//! - rolling: Rolling Volatility, Sharpe, Beta, Correlation
+//! - simulation: Parametric, Historical-bootstrap and Monte Carlo VaR/CVaR (multi-day, portfolios)
+//! - streaming: Stateful EMA, RSI, MACD, SMA, Volatility and Drawdown classes (O(1) per bar, serializable)
+//! - timeframes: Weekly / Monthly / Quarterly / Yearly OHLC, last and sum bars in one pass
+//! - technicals: RSI, MACD, SMA, EMA, Golden/Death Cross scanning
+//! - utils: Trend detection, CAGR, percentage changes, batch financial-statement trends
+//!
+//! The kernel modules are public so `benches/` can time the pure Rust functions
+//! without the Python layer.
+//!
+//! Series arguments accept NumPy float64 arrays (read in place), any float64
+//! buffer-protocol object, or plain Python lists (see `input::Series`).
 
 use pyo3::prelude::*;
 
-mod risk;
-mod technicals;
-mod utils;
+pub mod factors;
+pub mod fundamentals;
+mod input;
+pub mod ohlcv;
+pub mod portfolio;
+pub mod risk;
+pub mod rolling;
+pub mod simulation;
+pub mod streaming;
+pub mod technicals;
+pub mod timeframes;
+pub mod utils;
 
 /// Python module entry point
 #[pymodule]
@@ -21,6 +44,26 @@ fn rust_finance(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(risk::calculate_var_95, m)?)?;
     m.add_function(wrap_pyfunction!(risk::calculate_max_drawdown, m)?)?;
     m.add_function(wrap_pyfunction!(risk::calculate_beta, m)?)?;
+    m.add_function(wrap_pyfunction!(risk::calculate_risk_metrics, m)?)?;
+    m.add_function(wrap_pyfunction!(risk::calculate_risk_panel, m)?)?;
+    m.add_function(wrap_pyfunction!(risk::calculate_benchmark_beta, m)?)?;
+    m.add_function(wrap_pyfunction!(risk::calculate_drawdown_episodes, m)?)?;
+    
+    // Portfolio construction (returns matrices, GIL released)
+    m.add_function(wrap_pyfunction!(portfolio::calculate_covariance, m)?)?;
+    m.add_function(wrap_pyfunction!(portfolio::calculate_portfolio_risk, m)?)?;
+    m.add_function(wrap_pyfunction!(portfolio::optimize_portfolio, m)?)?;
+    
+    // Factor models (long-short factor returns, loadings / R² / idiosyncratic vol per asset)
+    m.add_function(wrap_pyfunction!(factors::calculate_factor_returns, m)?)?;
+    m.add_function(wrap_pyfunction!(factors::calculate_factor_exposures, m)?)?;
+    
+    // Rolling-window risk
+    m.add_function(wrap_pyfunction!(rolling::calculate_rolling_risk, m)?)?;
+    
+    // VaR / CVaR simulation (seeded, multi-threaded)
+    m.add_function(wrap_pyfunction!(simulation::calculate_var, m)?)?;
+    m.add_function(wrap_pyfunction!(simulation::calculate_portfolio_var, m)?)?;
     
     // Technical indicators
     m.add_function(wrap_pyfunction!(technicals::calculate_sma, m)?)?;
@@ -29,12 +72,34 @@ fn rust_finance(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(technicals::calculate_macd, m)?)?;
     m.add_function(wrap_pyfunction!(technicals::detect_golden_cross, m)?)?;
     m.add_function(wrap_pyfunction!(technicals::detect_death_cross, m)?)?;
+    m.add_function(wrap_pyfunction!(technicals::scan_crossovers, m)?)?;
+    
+    // Full-series indicators (NumPy arrays)
+    m.add_function(wrap_pyfunction!(technicals::calculate_sma_series, m)?)?;
+    m.add_function(wrap_pyfunction!(technicals::calculate_ema_series, m)?)?;
+    m.add_function(wrap_pyfunction!(technicals::calculate_rsi_series, m)?)?;
+    m.add_function(wrap_pyfunction!(technicals::calculate_macd_series, m)?)?;
+    m.add_function(wrap_pyfunction!(technicals::calculate_indicator_series, m)?)?;
+    m.add_function(wrap_pyfunction!(ohlcv::calculate_ohlcv_indicators, m)?)?;
+    m.add_function(wrap_pyfunction!(timeframes::aggregate_bars, m)?)?;
+    
+    // Streaming indicators (seed once, O(1) updates, to_state / from_state)
+    m.add_class::<streaming::StreamingEma>()?;
+    m.add_class::<streaming::StreamingRsi>()?;
+    m.add_class::<streaming::StreamingMacd>()?;
+    m.add_class::<streaming::StreamingSma>()?;
+    m.add_class::<streaming::StreamingVolatility>()?;
+    m.add_class::<streaming::StreamingDrawdown>()?;
     
     // Utility functions
     m.add_function(wrap_pyfunction!(utils::detect_trend, m)?)?;
     m.add_function(wrap_pyfunction!(utils::calculate_cagr, m)?)?;
     m.add_function(wrap_pyfunction!(utils::calculate_pct_change, m)?)?;
     m.add_function(wrap_pyfunction!(utils::detect_volume_spike, m)?)?;
+    m.add_function(wrap_pyfunction!(utils::calculate_statement_trends, m)?)?;
+    
+    // Fundamentals (statement matrices)
+    m.add_function(wrap_pyfunction!(fundamentals::calculate_fundamental_ratios, m)?)?;
     
     Ok(())
 }
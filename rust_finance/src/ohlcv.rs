@@ -0,0 +1,381 @@
+//! OHLCV indicator pack
+//! Bollinger Bands, ATR, Stochastic, ADX/DMI, OBV, VWAP, MFI, average daily volume
+//! and volume z-scores from high / low / close / volume in one pass
+//!
+//! Every indicator is returned as a full series (NaN during warm-up), like
+//! `calculate_indicator_series`. Wilder smoothing (ATR, ADX) is seeded with the
+//! simple average of the first `period` values; rolling windows keep running
+//! sums / monotonic deques so each bar costs O(1). Bars where any of high, low,
+//! close or volume is NaN / infinite are skipped: they are NaN in every output
+//! and the windows, Wilder state and running totals continue over the other bars.
+
+use std::collections::VecDeque;
+
+use numpy::IntoPyArray;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::input::Series;
+use crate::rolling::WindowMoments;
+
+/// Periods for `ohlcv_indicators`
+#[derive(Clone, Debug)]
+pub struct OhlcvParams {
+    pub bollinger_period: usize,
+    pub bollinger_std: f64,
+    pub atr_period: usize,
+    pub stochastic_period: usize,
+    pub stochastic_smooth: usize,
+    pub adx_period: usize,
+    pub mfi_period: usize,
+    pub vwap_period: usize,
+    pub volume_periods: Vec<usize>,
+    pub zscore_period: usize,
+}
+
+impl Default for OhlcvParams {
+    fn default() -> Self {
+        OhlcvParams {
+            bollinger_period: 20,
+            bollinger_std: 2.0,
+            atr_period: 14,
+            stochastic_period: 14,
+            stochastic_smooth: 3,
+            adx_period: 14,
+            mfi_period: 14,
+            vwap_period: 20,
+            volume_periods: vec![10, 50, 200],
+            zscore_period: 50,
+        }
+    }
+}
+
+/// Sliding max / min over the last `window` values (monotonic deques of indices)
+struct WindowExtremes {
+    window: usize,
+    maxima: VecDeque<(usize, f64)>,
+    minima: VecDeque<(usize, f64)>,
+}
+
+impl WindowExtremes {
+    fn new(window: usize) -> Self {
+        WindowExtremes { window, maxima: VecDeque::new(), minima: VecDeque::new() }
+    }
+
+    fn push(&mut self, i: usize, high: f64, low: f64) -> (f64, f64) {
+        while self.maxima.back().map_or(false, |&(_, v)| v <= high) {
+            self.maxima.pop_back();
+        }
+        self.maxima.push_back((i, high));
+        while self.minima.back().map_or(false, |&(_, v)| v >= low) {
+            self.minima.pop_back();
+        }
+        self.minima.push_back((i, low));
+        while self.maxima.front().map_or(false, |&(j, _)| j + self.window <= i) {
+            self.maxima.pop_front();
+        }
+        while self.minima.front().map_or(false, |&(j, _)| j + self.window <= i) {
+            self.minima.pop_front();
+        }
+        (self.maxima[0].1, self.minima[0].1)
+    }
+}
+
+/// Wilder smoothing seeded with the simple average of the first `period` values
+struct Wilder {
+    period: usize,
+    count: usize,
+    value: f64,
+}
+
+impl Wilder {
+    fn new(period: usize) -> Self {
+        Wilder { period, count: 0, value: 0.0 }
+    }
+
+    /// Feed one value; returns the smoothed value once `period` values are seen
+    fn update(&mut self, x: f64) -> f64 {
+        let p = self.period as f64;
+        self.count += 1;
+        if self.count <= self.period {
+            self.value += x;
+            if self.count < self.period {
+                return f64::NAN;
+            }
+            self.value /= p;
+        } else {
+            self.value = (self.value * (p - 1.0) + x) / p;
+        }
+        self.value
+    }
+}
+
+/// Sum of the `period` values ending at bar `end`, from running totals
+fn window_sum(sums: &[f64], end: usize, period: usize) -> f64 {
+    sums[end + 1] - sums[end + 1 - period]
+}
+
+/// All OHLCV indicators over aligned high / low / close / volume series.
+/// Keys: bollinger_{middle,upper,lower,bandwidth,percent_b}, atr, stochastic_{k,d},
+/// plus_di, minus_di, adx, obv, vwap, mfi, adv_<p> per volume period, volume_zscore.
+/// Bars with a non-finite value are left out (NaN in every series).
+pub fn ohlcv_indicators(high: &[f64], low: &[f64], close: &[f64], volume: &[f64], params: &OhlcvParams) -> Vec<(String, Vec<f64>)> {
+    let n = high.len().min(low.len()).min(close.len()).min(volume.len());
+    let usable: Vec<usize> = (0..n)
+        .filter(|&i| high[i].is_finite() && low[i].is_finite() && close[i].is_finite() && volume[i].is_finite())
+        .collect();
+    if usable.len() == n {
+        return finite_ohlcv_indicators(&high[..n], &low[..n], &close[..n], &volume[..n], params);
+    }
+    // Compute over the usable bars only, then put each value back at its bar
+    let gather = |values: &[f64]| usable.iter().map(|&i| values[i]).collect::<Vec<f64>>();
+    finite_ohlcv_indicators(&gather(high), &gather(low), &gather(close), &gather(volume), params)
+        .into_iter()
+        .map(|(name, values)| {
+            let mut full = vec![f64::NAN; n];
+            for (&i, value) in usable.iter().zip(values) {
+                full[i] = value;
+            }
+            (name, full)
+        })
+        .collect()
+}
+
+/// `ohlcv_indicators` over bars that are all finite
+fn finite_ohlcv_indicators(high: &[f64], low: &[f64], close: &[f64], volume: &[f64], params: &OhlcvParams) -> Vec<(String, Vec<f64>)> {
+    let n = high.len();
+    let nan = || vec![f64::NAN; n];
+    let (mut bb_mid, mut bb_up, mut bb_low, mut bb_width, mut bb_pct) = (nan(), nan(), nan(), nan(), nan());
+    let (mut atr, mut stoch_k, mut stoch_d) = (nan(), nan(), nan());
+    let (mut plus_di, mut minus_di, mut adx) = (nan(), nan(), nan());
+    let (mut obv, mut vwap, mut mfi, mut zscore) = (nan(), nan(), nan(), nan());
+    let mut adv: Vec<Vec<f64>> = params.volume_periods.iter().map(|_| nan()).collect();
+
+    let bb_period = params.bollinger_period;
+    let mut bb_moments = WindowMoments::default();
+    let mut atr_smooth = Wilder::new(params.atr_period.max(1));
+    let mut extremes = WindowExtremes::new(params.stochastic_period.max(1));
+    let mut k_window: VecDeque<f64> = VecDeque::new();
+    let mut k_sum = 0.0;
+    let adx_p = params.adx_period.max(1) as f64;
+    let (mut s_tr, mut s_pdm, mut s_mdm) = (0.0, 0.0, 0.0);
+    let mut adx_smooth = Wilder::new(params.adx_period.max(1));
+    let mut obv_total = 0.0;
+    // Running totals (index i + 1 holds the sum through bar i) for the windowed sums
+    let mut volume_sums = Vec::with_capacity(n + 1);
+    let mut pv_sums = Vec::with_capacity(n + 1);
+    let mut pos_flow_sums = Vec::with_capacity(n + 1);
+    let mut neg_flow_sums = Vec::with_capacity(n + 1);
+    volume_sums.push(0.0);
+    pv_sums.push(0.0);
+    pos_flow_sums.push(0.0);
+    neg_flow_sums.push(0.0);
+    let mut volume_moments = WindowMoments::default();
+
+    for i in 0..n {
+        let (h, l, c, v) = (high[i], low[i], close[i], volume[i]);
+        let typical = (h + l + c) / 3.0;
+
+        // Bollinger Bands (population std of the last `period` closes)
+        if bb_period > 0 {
+            bb_moments.add(c, 0.0);
+            if i >= bb_period {
+                bb_moments.remove(close[i - bb_period], 0.0);
+            }
+            if i + 1 >= bb_period {
+                let mid = bb_moments.mean_x();
+                // A one-bar window has no spread (add-then-remove would leave rounding residue)
+                let std = if bb_period > 1 { bb_moments.var_x().sqrt() } else { 0.0 };
+                let band = params.bollinger_std * std;
+                bb_mid[i] = mid;
+                bb_up[i] = mid + band;
+                bb_low[i] = mid - band;
+                bb_width[i] = if mid != 0.0 { 2.0 * band / mid } else { f64::NAN };
+                bb_pct[i] = if band > 0.0 { (c - (mid - band)) / (2.0 * band) } else { f64::NAN };
+            }
+        }
+
+        // True range (high - low on the first bar) and ATR
+        let tr = if i == 0 {
+            h - l
+        } else {
+            let prev = close[i - 1];
+            (h - l).max((h - prev).abs()).max((l - prev).abs())
+        };
+        if params.atr_period > 0 {
+            atr[i] = atr_smooth.update(tr);
+        }
+
+        // Stochastic %K over `period` highs / lows, %D = SMA(`smooth`) of %K
+        if params.stochastic_period > 0 {
+            let (highest, lowest) = extremes.push(i, h, l);
+            if i + 1 >= params.stochastic_period {
+                let k = if highest > lowest { 100.0 * (c - lowest) / (highest - lowest) } else { 50.0 };
+                stoch_k[i] = k;
+                k_window.push_back(k);
+                k_sum += k;
+                if k_window.len() > params.stochastic_smooth {
+                    k_sum -= k_window.pop_front().unwrap_or(0.0);
+                }
+                if params.stochastic_smooth > 0 && k_window.len() == params.stochastic_smooth {
+                    stoch_d[i] = k_sum / params.stochastic_smooth as f64;
+                }
+            }
+        }
+
+        // Directional movement (Wilder sums over `period` bars), DI and ADX
+        if params.adx_period > 0 && i > 0 {
+            let up = h - high[i - 1];
+            let down = low[i - 1] - l;
+            let pdm = if up > down && up > 0.0 { up } else { 0.0 };
+            let mdm = if down > up && down > 0.0 { down } else { 0.0 };
+            if i <= params.adx_period {
+                s_tr += tr;
+                s_pdm += pdm;
+                s_mdm += mdm;
+            } else {
+                s_tr += tr - s_tr / adx_p;
+                s_pdm += pdm - s_pdm / adx_p;
+                s_mdm += mdm - s_mdm / adx_p;
+            }
+            if i >= params.adx_period {
+                let (pdi, mdi) = if s_tr > 0.0 { (100.0 * s_pdm / s_tr, 100.0 * s_mdm / s_tr) } else { (0.0, 0.0) };
+                plus_di[i] = pdi;
+                minus_di[i] = mdi;
+                let dx = if pdi + mdi > 0.0 { 100.0 * (pdi - mdi).abs() / (pdi + mdi) } else { 0.0 };
+                adx[i] = adx_smooth.update(dx);
+            }
+        }
+
+        // On-balance volume
+        if i > 0 {
+            if c > close[i - 1] {
+                obv_total += v;
+            } else if c < close[i - 1] {
+                obv_total -= v;
+            }
+        }
+        obv[i] = obv_total;
+
+        // Running totals: volume, typical price x volume, positive / negative money flow
+        let flow = typical * v;
+        let prev_typical = if i > 0 { (high[i - 1] + low[i - 1] + close[i - 1]) / 3.0 } else { typical };
+        volume_sums.push(volume_sums[i] + v);
+        pv_sums.push(pv_sums[i] + flow);
+        pos_flow_sums.push(pos_flow_sums[i] + if i > 0 && typical > prev_typical { flow } else { 0.0 });
+        neg_flow_sums.push(neg_flow_sums[i] + if i > 0 && typical < prev_typical { flow } else { 0.0 });
+
+        // Rolling VWAP of the typical price
+        let vp = params.vwap_period;
+        if vp > 0 && i + 1 >= vp {
+            let vol = window_sum(&volume_sums, i, vp);
+            vwap[i] = if vol > 0.0 { window_sum(&pv_sums, i, vp) / vol } else { f64::NAN };
+        }
+
+        // Money Flow Index over the last `period` flows (bars 1..)
+        let mp = params.mfi_period;
+        if mp > 0 && i >= mp {
+            let positive = window_sum(&pos_flow_sums, i, mp);
+            let negative = window_sum(&neg_flow_sums, i, mp);
+            mfi[i] = if negative == 0.0 { 100.0 } else { 100.0 - 100.0 / (1.0 + positive / negative) };
+        }
+
+        // Average daily volume
+        for (series, &period) in adv.iter_mut().zip(&params.volume_periods) {
+            if period > 0 && i + 1 >= period {
+                series[i] = window_sum(&volume_sums, i, period) / period as f64;
+            }
+        }
+
+        // Volume z-score against the previous `period` bars (the current bar is excluded)
+        let zp = params.zscore_period;
+        if zp > 1 {
+            if i >= zp {
+                let std = volume_moments.var_x().sqrt();
+                zscore[i] = if std > 0.0 { (v - volume_moments.mean_x()) / std } else { f64::NAN };
+                volume_moments.remove(volume[i - zp], 0.0);
+            }
+            volume_moments.add(v, 0.0);
+        }
+    }
+
+    let mut out = vec![
+        ("bollinger_middle".to_string(), bb_mid),
+        ("bollinger_upper".to_string(), bb_up),
+        ("bollinger_lower".to_string(), bb_low),
+        ("bollinger_bandwidth".to_string(), bb_width),
+        ("bollinger_percent_b".to_string(), bb_pct),
+        ("atr".to_string(), atr),
+        ("stochastic_k".to_string(), stoch_k),
+        ("stochastic_d".to_string(), stoch_d),
+        ("plus_di".to_string(), plus_di),
+        ("minus_di".to_string(), minus_di),
+        ("adx".to_string(), adx),
+        ("obv".to_string(), obv),
+        ("vwap".to_string(), vwap),
+        ("mfi".to_string(), mfi),
+    ];
+    for (series, period) in adv.into_iter().zip(&params.volume_periods) {
+        out.push((format!("adv_{}", period), series));
+    }
+    out.push(("volume_zscore".to_string(), zscore));
+    out
+}
+
+/// Bollinger Bands, ATR, Stochastic, ADX/DMI, OBV, VWAP, MFI, average daily volume
+/// and volume z-scores in one pass over aligned high / low / close / volume.
+///
+/// Returns a dict of NumPy arrays (NaN during warm-up) keyed bollinger_middle,
+/// bollinger_upper, bollinger_lower, bollinger_bandwidth ((upper - lower) / middle),
+/// bollinger_percent_b, atr, stochastic_k, stochastic_d, plus_di, minus_di, adx, obv,
+/// vwap (rolling, typical price), mfi, adv_<p> for each of `volume_periods`, and
+/// volume_zscore (today's volume vs the previous `zscore_period` days).
+/// Bars with a NaN / infinite high, low, close or volume are skipped (NaN in every
+/// series); periods then count the remaining bars.
+#[pyfunction]
+#[pyo3(signature = (
+    high, low, close, volume,
+    bollinger_period=20, bollinger_std=2.0, atr_period=14, stochastic_period=14, stochastic_smooth=3,
+    adx_period=14, mfi_period=14, vwap_period=20, volume_periods=vec![10, 50, 200], zscore_period=50,
+))]
+#[allow(clippy::too_many_arguments)]
+pub fn calculate_ohlcv_indicators<'py>(
+    py: Python<'py>,
+    high: Series<'py>,
+    low: Series<'py>,
+    close: Series<'py>,
+    volume: Series<'py>,
+    bollinger_period: usize,
+    bollinger_std: f64,
+    atr_period: usize,
+    stochastic_period: usize,
+    stochastic_smooth: usize,
+    adx_period: usize,
+    mfi_period: usize,
+    vwap_period: usize,
+    volume_periods: Vec<usize>,
+    zscore_period: usize,
+) -> PyResult<Bound<'py, PyDict>> {
+    let (high, low, close, volume) = (high.as_slice(), low.as_slice(), close.as_slice(), volume.as_slice());
+    if low.len() != high.len() || close.len() != high.len() || volume.len() != high.len() {
+        return Err(pyo3::exceptions::PyValueError::new_err("high, low, close and volume must have the same length"));
+    }
+    let params = OhlcvParams {
+        bollinger_period,
+        bollinger_std,
+        atr_period,
+        stochastic_period,
+        stochastic_smooth,
+        adx_period,
+        mfi_period,
+        vwap_period,
+        volume_periods,
+        zscore_period,
+    };
+    let series = py.allow_threads(|| ohlcv_indicators(high, low, close, volume, &params));
+    let result = PyDict::new_bound(py);
+    for (name, values) in series {
+        result.set_item(name, values.into_pyarray_bound(py))?;
+    }
+    Ok(result)
+}
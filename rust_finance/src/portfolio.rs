@@ -0,0 +1,425 @@
+//! Portfolio module
+//! Covariance / Correlation (with shrinkage), Portfolio Volatility,
+//! Risk Contributions, Diversification Ratio, Long-only Min-Variance / Max-Sharpe
+//!
+//! Returns matrices are shaped (assets, days), the same layout as
+//! `calculate_risk_panel` (`df.to_numpy().T` for a dates x tickers DataFrame is
+//! accepted but copied once; pass a C-contiguous array to read it in place).
+//! Days where any asset is missing (NaN) are dropped so every asset is aligned.
+//! Covariances are daily (population, 1/T); volatilities and returns are annualized.
+
+use numpy::ndarray::Array2;
+use numpy::IntoPyArray;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+use rayon::prelude::*;
+
+use crate::input::{Matrix, Series};
+
+const TRADING_DAYS: f64 = 252.0;
+const MAX_ITERATIONS: usize = 20_000;
+const TOLERANCE: f64 = 1e-12;
+
+/// Covariance shrinkage toward a scaled identity target
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum Shrinkage {
+    None,
+    /// Fixed intensity in [0, 1]
+    Fixed(f64),
+    /// Ledoit-Wolf (2004) optimal intensity
+    LedoitWolf,
+}
+
+/// Sample moments of an aligned returns matrix
+#[derive(Clone, Debug)]
+pub struct Moments {
+    pub n_assets: usize,
+    pub n_days: usize,
+    /// Mean daily return per asset
+    pub means: Vec<f64>,
+    /// Daily covariance, row-major n_assets x n_assets
+    pub cov: Vec<f64>,
+    /// Shrinkage intensity applied (0 = sample covariance)
+    pub shrinkage: f64,
+}
+
+/// Drop days (columns) where any asset has a non-finite return.
+/// Returns the aligned row-major matrix and the number of days kept.
+pub fn aligned_rows(data: &[f64], n_assets: usize, n_days: usize) -> (Vec<f64>, usize) {
+    let keep: Vec<usize> = (0..n_days)
+        .filter(|&t| (0..n_assets).all(|i| data[i * n_days + t].is_finite()))
+        .collect();
+    let mut out = Vec::with_capacity(n_assets * keep.len());
+    for i in 0..n_assets {
+        let row = &data[i * n_days..(i + 1) * n_days];
+        out.extend(keep.iter().map(|&t| row[t]));
+    }
+    (out, keep.len())
+}
+
+/// Means and (optionally shrunk) covariance of an aligned (assets x days) matrix.
+/// Covariance rows are computed in parallel.
+pub fn moments(data: &[f64], n_assets: usize, n_days: usize, shrinkage: Shrinkage) -> Moments {
+    let n = n_assets;
+    let t = n_days.max(1) as f64;
+
+    let means: Vec<f64> = data.par_chunks(n_days.max(1)).map(|row| row.iter().sum::<f64>() / t).collect();
+    let centered: Vec<f64> = data
+        .par_chunks(n_days.max(1))
+        .zip(means.par_iter())
+        .flat_map_iter(|(row, mean)| row.iter().map(move |x| x - mean))
+        .collect();
+
+    let mut cov = vec![0.0; n * n];
+    cov.par_chunks_mut(n.max(1)).enumerate().for_each(|(i, out_row)| {
+        let xi = &centered[i * n_days..(i + 1) * n_days];
+        for j in 0..n {
+            let xj = &centered[j * n_days..(j + 1) * n_days];
+            out_row[j] = xi.iter().zip(xj).map(|(a, b)| a * b).sum::<f64>() / t;
+        }
+    });
+
+    let intensity = match shrinkage {
+        Shrinkage::None => 0.0,
+        Shrinkage::Fixed(value) => value.clamp(0.0, 1.0),
+        Shrinkage::LedoitWolf => ledoit_wolf_intensity(&centered, &cov, n, n_days),
+    };
+    if intensity > 0.0 {
+        let mu = (0..n).map(|i| cov[i * n + i]).sum::<f64>() / n as f64;
+        for i in 0..n {
+            for j in 0..n {
+                let target = if i == j { mu } else { 0.0 };
+                cov[i * n + j] = intensity * target + (1.0 - intensity) * cov[i * n + j];
+            }
+        }
+    }
+
+    Moments { n_assets, n_days, means, cov, shrinkage: intensity }
+}
+
+/// Ledoit-Wolf optimal shrinkage toward mu * I for centered data.
+/// Uses sum_t ||x_t x_t' - S||^2 = sum_t |x_t|^4 - T ||S||^2, so the cost is O(N T).
+fn ledoit_wolf_intensity(centered: &[f64], cov: &[f64], n: usize, n_days: usize) -> f64 {
+    if n == 0 || n_days < 2 {
+        return 0.0;
+    }
+    let t = n_days as f64;
+    let nf = n as f64;
+    let mu = (0..n).map(|i| cov[i * n + i]).sum::<f64>() / nf;
+    let frobenius_sq: f64 = cov.iter().map(|v| v * v).sum();
+    let d2 = (0..n)
+        .flat_map(|i| (0..n).map(move |j| (i, j)))
+        .map(|(i, j)| {
+            let diff = cov[i * n + j] - if i == j { mu } else { 0.0 };
+            diff * diff
+        })
+        .sum::<f64>()
+        / nf;
+    if d2 <= 0.0 {
+        return 0.0;
+    }
+
+    let fourth: f64 = (0..n_days)
+        .into_par_iter()
+        .map(|day| {
+            let norm_sq: f64 = (0..n).map(|i| centered[i * n_days + day].powi(2)).sum();
+            norm_sq * norm_sq
+        })
+        .sum();
+    let b_bar2 = ((fourth - t * frobenius_sq) / (t * t) / nf).max(0.0);
+    (b_bar2.min(d2) / d2).clamp(0.0, 1.0)
+}
+
+/// Correlation matrix from a covariance matrix
+pub fn correlation(cov: &[f64], n: usize) -> Vec<f64> {
+    let std: Vec<f64> = (0..n).map(|i| cov[i * n + i].max(0.0).sqrt()).collect();
+    let mut corr = vec![f64::NAN; n * n];
+    for i in 0..n {
+        for j in 0..n {
+            if std[i] > 0.0 && std[j] > 0.0 {
+                corr[i * n + j] = cov[i * n + j] / (std[i] * std[j]);
+            }
+        }
+    }
+    corr
+}
+
+fn mat_vec(cov: &[f64], n: usize, w: &[f64]) -> Vec<f64> {
+    (0..n).map(|i| cov[i * n..(i + 1) * n].iter().zip(w).map(|(c, x)| c * x).sum()).collect()
+}
+
+/// Risk decomposition of a weighted portfolio
+#[derive(Clone, Debug)]
+pub struct PortfolioRisk {
+    /// Annualized portfolio volatility
+    pub volatility: f64,
+    /// Annualized expected return (mean daily return x 252)
+    pub expected_return: f64,
+    /// Annualized volatility contributed by each holding (sums to `volatility`)
+    pub risk_contributions: Vec<f64>,
+    /// Share of volatility per holding (sums to 1)
+    pub risk_contributions_pct: Vec<f64>,
+    /// Weighted average asset volatility / portfolio volatility (>= 1)
+    pub diversification_ratio: f64,
+}
+
+pub fn portfolio_risk(m: &Moments, weights: &[f64]) -> PortfolioRisk {
+    let n = m.n_assets;
+    let sigma_w = mat_vec(&m.cov, n, weights);
+    let variance: f64 = weights.iter().zip(&sigma_w).map(|(w, s)| w * s).sum();
+    let daily_vol = variance.max(0.0).sqrt();
+    let annual_scale = TRADING_DAYS.sqrt();
+
+    let (risk_contributions, risk_contributions_pct): (Vec<f64>, Vec<f64>) = if daily_vol > 0.0 {
+        weights
+            .iter()
+            .zip(&sigma_w)
+            .map(|(w, s)| (w * s / daily_vol * annual_scale, w * s / variance))
+            .unzip()
+    } else {
+        (vec![0.0; n], vec![f64::NAN; n])
+    };
+    let weighted_vol: f64 = (0..n).map(|i| weights[i] * m.cov[i * n + i].max(0.0).sqrt()).sum();
+
+    PortfolioRisk {
+        volatility: daily_vol * annual_scale,
+        expected_return: weights.iter().zip(&m.means).map(|(w, mu)| w * mu).sum::<f64>() * TRADING_DAYS,
+        risk_contributions,
+        risk_contributions_pct,
+        diversification_ratio: if daily_vol > 0.0 { weighted_vol / daily_vol } else { f64::NAN },
+    }
+}
+
+/// Euclidean projection onto the probability simplex {w >= 0, sum w = 1} (Duchi et al.)
+fn project_simplex(v: &mut [f64]) {
+    let mut sorted = v.to_vec();
+    sorted.sort_unstable_by(|a, b| b.total_cmp(a));
+    let mut cumulative = 0.0;
+    let mut theta = 0.0;
+    for (k, u) in sorted.iter().enumerate() {
+        cumulative += u;
+        let candidate = (cumulative - 1.0) / (k + 1) as f64;
+        if u - candidate > 0.0 {
+            theta = candidate;
+        }
+    }
+    for x in v.iter_mut() {
+        *x = (*x - theta).max(0.0);
+    }
+}
+
+/// Euclidean projection onto {y >= 0, a'y = 1} by bisection on the multiplier.
+/// Requires at least one positive a_i.
+fn project_halfspace_cone(v: &mut [f64], a: &[f64]) {
+    let constraint = |lambda: f64| -> f64 { v.iter().zip(a).map(|(z, ai)| ai * (z + lambda * ai).max(0.0)).sum() };
+    let (mut lo, mut hi) = (-1.0, 1.0);
+    while constraint(lo) > 1.0 {
+        lo *= 2.0;
+    }
+    while constraint(hi) < 1.0 {
+        hi *= 2.0;
+    }
+    for _ in 0..200 {
+        let mid = 0.5 * (lo + hi);
+        if constraint(mid) < 1.0 {
+            lo = mid;
+        } else {
+            hi = mid;
+        }
+        if hi - lo < 1e-15 * (1.0 + hi.abs()) {
+            break;
+        }
+    }
+    let lambda = 0.5 * (lo + hi);
+    for (z, ai) in v.iter_mut().zip(a) {
+        *z = (*z + lambda * ai).max(0.0);
+    }
+}
+
+/// Minimize x' cov x over a convex set with accelerated projected gradient (FISTA)
+fn minimize_quadratic(cov: &[f64], n: usize, start: Vec<f64>, project: impl Fn(&mut [f64])) -> Vec<f64> {
+    // Lipschitz constant of the gradient 2 * cov, bounded by the largest absolute row sum
+    let lipschitz = 2.0 * (0..n).map(|i| cov[i * n..(i + 1) * n].iter().map(|c| c.abs()).sum::<f64>()).fold(0.0, f64::max);
+    if lipschitz <= 0.0 {
+        return start;
+    }
+    let step = 1.0 / lipschitz;
+
+    let mut x = start.clone();
+    let mut y = start;
+    let mut momentum = 1.0_f64;
+    for _ in 0..MAX_ITERATIONS {
+        let gradient = mat_vec(cov, n, &y);
+        let mut next: Vec<f64> = y.iter().zip(&gradient).map(|(yi, g)| yi - step * 2.0 * g).collect();
+        project(&mut next);
+
+        let next_momentum = (1.0 + (1.0 + 4.0 * momentum * momentum).sqrt()) / 2.0;
+        let blend = (momentum - 1.0) / next_momentum;
+        let change = next.iter().zip(&x).map(|(a, b)| (a - b).abs()).fold(0.0, f64::max);
+        y = next.iter().zip(&x).map(|(a, b)| a + blend * (a - b)).collect();
+        x = next;
+        momentum = next_momentum;
+        if change < TOLERANCE {
+            break;
+        }
+    }
+    x
+}
+
+/// Long-only, fully invested minimum-variance weights
+pub fn min_variance_weights(m: &Moments) -> Vec<f64> {
+    let n = m.n_assets;
+    if n == 0 {
+        return Vec::new();
+    }
+    minimize_quadratic(&m.cov, n, vec![1.0 / n as f64; n], project_simplex)
+}
+
+/// Long-only, fully invested maximum-Sharpe (tangency) weights.
+/// Solves min y' cov y s.t. (mu - rf)' y = 1, y >= 0, then w = y / sum(y).
+/// None when no asset's expected return exceeds the risk-free rate.
+pub fn max_sharpe_weights(m: &Moments, risk_free_rate: f64) -> Option<Vec<f64>> {
+    let n = m.n_assets;
+    let excess: Vec<f64> = m.means.iter().map(|mu| mu * TRADING_DAYS - risk_free_rate).collect();
+    let best = excess.iter().cloned().fold(f64::NEG_INFINITY, f64::max);
+    if n == 0 || !(best > 0.0) {
+        return None;
+    }
+
+    let mut start = vec![0.0; n];
+    let best_index = excess.iter().position(|&e| e == best).unwrap_or(0);
+    start[best_index] = 1.0 / best;
+    let y = minimize_quadratic(&m.cov, n, start, |v| project_halfspace_cone(v, &excess));
+    let total: f64 = y.iter().sum();
+    if total <= 0.0 {
+        return None;
+    }
+    Some(y.iter().map(|v| v / total).collect())
+}
+
+// === Python wrappers ===
+
+/// Shrinkage argument: None, a fixed intensity in [0, 1], or "ledoit_wolf"
+#[derive(FromPyObject)]
+pub enum ShrinkageArg {
+    Intensity(f64),
+    Method(String),
+}
+
+pub(crate) fn parse_shrinkage(arg: Option<ShrinkageArg>) -> PyResult<Shrinkage> {
+    match arg {
+        None => Ok(Shrinkage::None),
+        Some(ShrinkageArg::Intensity(value)) if (0.0..=1.0).contains(&value) => Ok(Shrinkage::Fixed(value)),
+        Some(ShrinkageArg::Intensity(_)) => Err(PyValueError::new_err("shrinkage intensity must be between 0 and 1")),
+        Some(ShrinkageArg::Method(name)) if name == "ledoit_wolf" => Ok(Shrinkage::LedoitWolf),
+        Some(ShrinkageArg::Method(name)) => Err(PyValueError::new_err(format!("unknown shrinkage method '{}'", name))),
+    }
+}
+
+/// Align the returns matrix and compute its moments with the GIL released
+fn matrix_moments(py: Python<'_>, returns: &Matrix<'_>, shrinkage: Shrinkage) -> PyResult<Moments> {
+    let (n_assets, n_days) = (returns.rows(), returns.cols());
+    let data = returns.as_slice();
+    let m = py.allow_threads(|| {
+        let (aligned, kept) = aligned_rows(data, n_assets, n_days);
+        moments(&aligned, n_assets, kept, shrinkage)
+    });
+    if m.n_days < 2 {
+        return Err(PyValueError::new_err("need at least two days where every asset has a return"));
+    }
+    Ok(m)
+}
+
+fn square<'py>(py: Python<'py>, values: Vec<f64>, n: usize) -> Bound<'py, numpy::PyArray2<f64>> {
+    Array2::from_shape_vec((n, n), values).expect("n x n matrix").into_pyarray_bound(py)
+}
+
+fn risk_into_dict(result: &Bound<'_, PyDict>, risk: PortfolioRisk) -> PyResult<()> {
+    let py = result.py();
+    result.set_item("volatility", risk.volatility)?;
+    result.set_item("expected_return", risk.expected_return)?;
+    result.set_item("risk_contributions", risk.risk_contributions.into_pyarray_bound(py))?;
+    result.set_item("risk_contributions_pct", risk.risk_contributions_pct.into_pyarray_bound(py))?;
+    result.set_item("diversification_ratio", risk.diversification_ratio)?;
+    Ok(())
+}
+
+/// Covariance and correlation of an (assets, days) daily returns matrix.
+///
+/// `shrinkage`: None (sample), a fixed intensity in [0, 1], or "ledoit_wolf".
+/// Returns a dict: covariance (daily), correlation, shrinkage (intensity used), days (aligned days).
+#[pyfunction]
+#[pyo3(signature = (returns, shrinkage=None))]
+pub fn calculate_covariance<'py>(
+    py: Python<'py>,
+    returns: Matrix<'py>,
+    shrinkage: Option<ShrinkageArg>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let m = matrix_moments(py, &returns, parse_shrinkage(shrinkage)?)?;
+    let corr = correlation(&m.cov, m.n_assets);
+
+    let result = PyDict::new_bound(py);
+    result.set_item("covariance", square(py, m.cov, m.n_assets))?;
+    result.set_item("correlation", square(py, corr, m.n_assets))?;
+    result.set_item("shrinkage", m.shrinkage)?;
+    result.set_item("days", m.n_days)?;
+    Ok(result)
+}
+
+/// Risk of a weighted portfolio from an (assets, days) daily returns matrix.
+///
+/// Returns a dict: volatility and expected_return (annualized), risk_contributions
+/// (annualized volatility per holding, sums to volatility), risk_contributions_pct,
+/// diversification_ratio.
+#[pyfunction]
+#[pyo3(signature = (returns, weights, shrinkage=None))]
+pub fn calculate_portfolio_risk<'py>(
+    py: Python<'py>,
+    returns: Matrix<'py>,
+    weights: Series<'py>,
+    shrinkage: Option<ShrinkageArg>,
+) -> PyResult<Bound<'py, PyDict>> {
+    if weights.len() != returns.rows() {
+        return Err(PyValueError::new_err("weights must have one entry per asset (row)"));
+    }
+    let m = matrix_moments(py, &returns, parse_shrinkage(shrinkage)?)?;
+    let weights = weights.as_slice();
+    let risk = py.allow_threads(|| portfolio_risk(&m, weights));
+
+    let result = PyDict::new_bound(py);
+    risk_into_dict(&result, risk)?;
+    Ok(result)
+}
+
+/// Long-only, fully invested optimal weights from an (assets, days) daily returns matrix.
+///
+/// `objective`: "min_variance" or "max_sharpe" (`risk_free_rate` is annual).
+/// Returns a dict: weights plus the portfolio risk keys of `calculate_portfolio_risk`
+/// and sharpe_ratio.
+#[pyfunction]
+#[pyo3(signature = (returns, objective="min_variance", risk_free_rate=0.0, shrinkage=None))]
+pub fn optimize_portfolio<'py>(
+    py: Python<'py>,
+    returns: Matrix<'py>,
+    objective: &str,
+    risk_free_rate: f64,
+    shrinkage: Option<ShrinkageArg>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let m = matrix_moments(py, &returns, parse_shrinkage(shrinkage)?)?;
+    let weights = match objective {
+        "min_variance" => py.allow_threads(|| min_variance_weights(&m)),
+        "max_sharpe" => py
+            .allow_threads(|| max_sharpe_weights(&m, risk_free_rate))
+            .ok_or_else(|| PyValueError::new_err("max_sharpe needs at least one asset with expected return above the risk-free rate"))?,
+        _ => return Err(PyValueError::new_err("objective must be 'min_variance' or 'max_sharpe'")),
+    };
+    let risk = portfolio_risk(&m, &weights);
+    let sharpe = if risk.volatility > 0.0 { (risk.expected_return - risk_free_rate) / risk.volatility } else { f64::NAN };
+
+    let result = PyDict::new_bound(py);
+    result.set_item("weights", weights.into_pyarray_bound(py))?;
+    result.set_item("sharpe_ratio", sharpe)?;
+    risk_into_dict(&result, risk)?;
+    Ok(result)
+}
@@ -1,11 +1,21 @@
 //! Risk calculations module
 //! VaR, Sharpe Ratio, Volatility, Max Drawdown, Beta
+//!
+//! `calculate_risk_panel` computes the same metrics for many assets at once
+//! (rows in parallel with rayon, GIL released). `calculate_benchmark_beta`
+//! aligns a price series with a benchmark by date and reports beta and
+//! correlation over several lookbacks. `calculate_drawdown_episodes` breaks the
+//! drawdown path into peak / trough / recovery episodes.
 
+use numpy::IntoPyArray;
 use pyo3::prelude::*;
+use pyo3::types::{PyDict, PyList};
+use rayon::prelude::*;
 
-/// Calculate annualized volatility from daily returns
-#[pyfunction]
-pub fn calculate_volatility(returns: Vec<f64>) -> f64 {
+use crate::input::{Dates, Matrix, Series};
+
+/// Annualized volatility of daily returns (252 trading days)
+pub fn volatility(returns: &[f64]) -> f64 {
     if returns.is_empty() {
         return 0.0;
     }
@@ -19,9 +29,8 @@ pub fn calculate_volatility(returns: Vec<f64>) -> f64 {
     std_dev * (252.0_f64).sqrt()
 }
 
-/// Calculate Sharpe Ratio
-#[pyfunction]
-pub fn calculate_sharpe_ratio(returns: Vec<f64>, risk_free_rate: f64) -> f64 {
+/// Sharpe Ratio of daily returns against an annual risk-free rate
+pub fn sharpe_ratio(returns: &[f64], risk_free_rate: f64) -> f64 {
     if returns.is_empty() {
         return 0.0;
     }
@@ -30,7 +39,7 @@ pub fn calculate_sharpe_ratio(returns: Vec<f64>, risk_free_rate: f64) -> f64 {
     let mean_return = returns.iter().sum::<f64>() / n;
     let annualized_return = mean_return * 252.0;
     
-    let volatility = calculate_volatility(returns);
+    let volatility = volatility(returns);
     
     if volatility == 0.0 {
         return 0.0;
@@ -39,14 +48,13 @@ pub fn calculate_sharpe_ratio(returns: Vec<f64>, risk_free_rate: f64) -> f64 {
     (annualized_return - risk_free_rate) / volatility
 }
 
-/// Calculate Value at Risk at 95% confidence
-#[pyfunction]
-pub fn calculate_var_95(returns: Vec<f64>) -> f64 {
+/// 5th percentile of daily returns
+pub fn var_95(returns: &[f64]) -> f64 {
     if returns.is_empty() {
         return 0.0;
     }
     
-    let mut sorted_returns = returns.clone();
+    let mut sorted_returns = returns.to_vec();
     sorted_returns.sort_by(|a, b| a.partial_cmp(b).unwrap());
     
     // 5th percentile index
@@ -54,9 +62,8 @@ pub fn calculate_var_95(returns: Vec<f64>) -> f64 {
     sorted_returns[index.min(sorted_returns.len() - 1)]
 }
 
-/// Calculate Maximum Drawdown from prices
-#[pyfunction]
-pub fn calculate_max_drawdown(prices: Vec<f64>) -> f64 {
+/// Maximum peak-to-trough decline of a price series (negative fraction)
+pub fn max_drawdown(prices: &[f64]) -> f64 {
     if prices.is_empty() {
         return 0.0;
     }
@@ -77,9 +84,8 @@ pub fn calculate_max_drawdown(prices: Vec<f64>) -> f64 {
     -max_drawdown  // Return as negative value
 }
 
-/// Calculate Beta (stock vs market correlation)
-#[pyfunction]
-pub fn calculate_beta(stock_returns: Vec<f64>, market_returns: Vec<f64>) -> f64 {
+/// Beta of stock returns against market returns (1.0 when undefined)
+pub fn beta(stock_returns: &[f64], market_returns: &[f64]) -> f64 {
     if stock_returns.len() != market_returns.len() || stock_returns.is_empty() {
         return 1.0;  // Default to market beta
     }
@@ -103,3 +109,562 @@ pub fn calculate_beta(stock_returns: Vec<f64>, market_returns: Vec<f64>) -> f64
     
     covariance / market_variance
 }
+
+/// Daily returns of two price series over the dates they share.
+///
+/// Dates must be strictly increasing (e.g. days since epoch). Days where either
+/// price is missing, non-finite or non-positive are dropped before the join, so a
+/// gap on one side turns the next matched return into a multi-day return on both
+/// sides instead of misaligning them.
+pub fn aligned_returns(dates: &[i64], prices: &[f64], benchmark_dates: &[i64], benchmark_prices: &[f64]) -> (Vec<f64>, Vec<f64>) {
+    let valid = |p: f64| p.is_finite() && p > 0.0;
+    let mut stock = Vec::new();
+    let mut market = Vec::new();
+    let (mut i, mut j) = (0, 0);
+    let mut last: Option<(f64, f64)> = None;
+    while i < dates.len().min(prices.len()) && j < benchmark_dates.len().min(benchmark_prices.len()) {
+        if !valid(prices[i]) {
+            i += 1;
+        } else if !valid(benchmark_prices[j]) {
+            j += 1;
+        } else if dates[i] < benchmark_dates[j] {
+            i += 1;
+        } else if dates[i] > benchmark_dates[j] {
+            j += 1;
+        } else {
+            if let Some((prev_stock, prev_market)) = last {
+                stock.push(prices[i] / prev_stock - 1.0);
+                market.push(benchmark_prices[j] / prev_market - 1.0);
+            }
+            last = Some((prices[i], benchmark_prices[j]));
+            i += 1;
+            j += 1;
+        }
+    }
+    (stock, market)
+}
+
+/// Beta and correlation of aligned returns over one lookback
+#[derive(Clone, Debug)]
+pub struct BetaWindow {
+    pub lookback: usize,
+    pub beta: f64,
+    pub correlation: f64,
+}
+
+/// Beta / correlation over the last `lookback` aligned returns for each lookback.
+/// NaN when fewer than `lookback` aligned returns exist or the benchmark is flat.
+pub fn beta_profile(stock: &[f64], market: &[f64], lookbacks: &[usize]) -> Vec<BetaWindow> {
+    let n = stock.len().min(market.len());
+    lookbacks.iter().map(|&lookback| {
+        if lookback < 2 || n < lookback {
+            return BetaWindow { lookback, beta: f64::NAN, correlation: f64::NAN };
+        }
+        let (s, m) = (&stock[n - lookback..n], &market[n - lookback..n]);
+        let len = lookback as f64;
+        let mean_s = s.iter().sum::<f64>() / len;
+        let mean_m = m.iter().sum::<f64>() / len;
+        let (mut cov, mut var_s, mut var_m) = (0.0, 0.0, 0.0);
+        for (x, y) in s.iter().zip(m) {
+            let (dx, dy) = (x - mean_s, y - mean_m);
+            cov += dx * dy;
+            var_s += dx * dx;
+            var_m += dy * dy;
+        }
+        let beta = if var_m > 0.0 { cov / var_m } else { f64::NAN };
+        let correlation = if var_m > 0.0 && var_s > 0.0 { cov / (var_s * var_m).sqrt() } else { f64::NAN };
+        BetaWindow { lookback, beta, correlation }
+    }).collect()
+}
+
+/// One drawdown episode: from a running peak, through its trough, back to the peak (bar indices)
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub struct DrawdownEpisode {
+    pub peak: usize,
+    pub trough: usize,
+    /// First bar at or above the peak again; None while still under water
+    pub recovery: Option<usize>,
+    /// Trough / peak - 1 (negative)
+    pub depth: f64,
+}
+
+/// Drawdown path summary (see `drawdown_profile`)
+#[derive(Debug, Clone)]
+pub struct DrawdownProfile {
+    /// Episodes at least `min_depth` deep, oldest first
+    pub episodes: Vec<DrawdownEpisode>,
+    pub max_drawdown: f64,
+    /// Last price vs its running peak (0 at a new high)
+    pub current_drawdown: f64,
+    /// Share of valid bars below the running peak
+    pub time_under_water: f64,
+    /// Longest peak-to-recovery stretch in bars (an open episode counts up to the last bar)
+    pub longest_under_water: usize,
+    /// Bars since the last peak (0 at a new high)
+    pub current_under_water: usize,
+    /// Mean trough-to-recovery bars over recovered episodes; NaN if none recovered
+    pub average_recovery: f64,
+}
+
+/// Every drawdown episode of a price series in one pass.
+///
+/// Non-finite and non-positive prices are skipped; indices still refer to
+/// positions in `prices`. Episodes shallower than `min_depth` (e.g. 0.05 = 5%)
+/// are left out of `episodes` and `average_recovery` but count toward the
+/// under-water statistics.
+pub fn drawdown_profile(prices: &[f64], min_depth: f64) -> DrawdownProfile {
+    let mut episodes = Vec::new();
+    let mut peak: Option<(usize, f64)> = None;
+    let mut open: Option<DrawdownEpisode> = None;
+    let (mut valid, mut under, mut longest) = (0usize, 0usize, 0usize);
+    let mut max_dd = 0.0_f64;
+    let mut last = (0usize, f64::NAN);
+
+    for (i, &price) in prices.iter().enumerate() {
+        if !(price.is_finite() && price > 0.0) {
+            continue;
+        }
+        valid += 1;
+        last = (i, price);
+        match peak {
+            Some((peak_index, peak_price)) if price < peak_price => {
+                under += 1;
+                let drawdown = price / peak_price - 1.0;
+                let episode = open.get_or_insert(DrawdownEpisode { peak: peak_index, trough: i, recovery: None, depth: drawdown });
+                if drawdown < episode.depth {
+                    episode.depth = drawdown;
+                    episode.trough = i;
+                }
+                max_dd = max_dd.min(drawdown);
+            }
+            _ => {
+                if let Some(mut episode) = open.take() {
+                    episode.recovery = Some(i);
+                    longest = longest.max(i - episode.peak);
+                    if episode.depth <= -min_depth {
+                        episodes.push(episode);
+                    }
+                }
+                peak = Some((i, price));
+            }
+        }
+    }
+
+    let (current_drawdown, current_under_water) = match (open, peak) {
+        (Some(episode), Some((_, peak_price))) => {
+            longest = longest.max(last.0 - episode.peak);
+            if episode.depth <= -min_depth {
+                episodes.push(episode);
+            }
+            (last.1 / peak_price - 1.0, last.0 - episode.peak)
+        }
+        _ => (0.0, 0),
+    };
+
+    let recoveries: Vec<f64> = episodes.iter()
+        .filter_map(|e| e.recovery.map(|r| (r - e.trough) as f64))
+        .collect();
+    DrawdownProfile {
+        episodes,
+        max_drawdown: max_dd,
+        current_drawdown,
+        time_under_water: if valid > 0 { under as f64 / valid as f64 } else { f64::NAN },
+        longest_under_water: longest,
+        current_under_water,
+        average_recovery: if recoveries.is_empty() { f64::NAN } else { recoveries.iter().sum::<f64>() / recoveries.len() as f64 },
+    }
+}
+
+/// The `n` deepest episodes, deepest first (earlier peak first on ties)
+pub fn deepest_episodes(episodes: &[DrawdownEpisode], n: usize) -> Vec<DrawdownEpisode> {
+    let mut ranked = episodes.to_vec();
+    ranked.sort_by(|a, b| a.depth.total_cmp(&b.depth).then(a.peak.cmp(&b.peak)));
+    ranked.truncate(n);
+    ranked
+}
+
+/// Full risk block for one price series, from a single streaming pass
+#[derive(Clone, Debug)]
+pub struct RiskMetrics {
+    pub observations: usize,
+    pub total_return: f64,
+    pub cagr: f64,
+    pub volatility: f64,
+    pub sharpe_ratio: f64,
+    pub sortino_ratio: f64,
+    pub downside_deviation: f64,
+    pub calmar_ratio: f64,
+    pub max_drawdown: f64,
+    pub skewness: f64,
+    pub kurtosis: f64,
+    /// (confidence level, historical VaR, CVaR) per requested level, as daily returns
+    pub tail: Vec<(f64, f64, f64)>,
+}
+
+impl RiskMetrics {
+    fn empty(observations: usize, confidence_levels: &[f64]) -> Self {
+        RiskMetrics {
+            observations,
+            total_return: f64::NAN,
+            cagr: f64::NAN,
+            volatility: f64::NAN,
+            sharpe_ratio: f64::NAN,
+            sortino_ratio: f64::NAN,
+            downside_deviation: f64::NAN,
+            calmar_ratio: f64::NAN,
+            max_drawdown: f64::NAN,
+            skewness: f64::NAN,
+            kurtosis: f64::NAN,
+            tail: confidence_levels.iter().map(|&c| (c, f64::NAN, f64::NAN)).collect(),
+        }
+    }
+}
+
+/// Historical VaR and CVaR of `returns` at confidence `level` using selection (O(n)).
+/// VaR is the return at index floor(n * (1 - level)) in ascending order (as `var_95`),
+/// CVaR the mean of the returns at or below it. Reorders `returns`.
+pub fn tail_risk(returns: &mut [f64], level: f64) -> (f64, f64) {
+    if returns.is_empty() || !(0.0..1.0).contains(&level) {
+        return (f64::NAN, f64::NAN);
+    }
+    let index = (((returns.len() as f64) * (1.0 - level)).floor() as usize).min(returns.len() - 1);
+    let (below, var, _) = returns.select_nth_unstable_by(index, |a, b| a.total_cmp(b));
+    let var = *var;
+    let cvar = (below.iter().sum::<f64>() + var) / (index + 1) as f64;
+    (var, cvar)
+}
+
+/// Fused risk kernel: one pass over prices for moments (Welford, up to the 4th),
+/// downside deviation and drawdown, then one selection per VaR level.
+/// Non-finite and non-positive prices are skipped. Annualized with 252 trading days;
+/// `risk_free_rate` is annual. Kurtosis is excess kurtosis.
+pub fn risk_metrics(prices: &[f64], confidence_levels: &[f64], risk_free_rate: f64) -> RiskMetrics {
+    let daily_rf = risk_free_rate / 252.0;
+    let mut returns = Vec::with_capacity(prices.len());
+
+    let mut first = f64::NAN;
+    let mut prev = f64::NAN;
+    let mut peak = f64::NAN;
+    let mut max_dd = 0.0_f64;
+    let (mut n, mut mean, mut m2, mut m3, mut m4) = (0.0_f64, 0.0_f64, 0.0_f64, 0.0_f64, 0.0_f64);
+    let mut downside_sq = 0.0;
+
+    for &price in prices {
+        if !(price.is_finite() && price > 0.0) {
+            continue;
+        }
+        if first.is_nan() {
+            first = price;
+            prev = price;
+            peak = price;
+            continue;
+        }
+
+        let r = price / prev - 1.0;
+        prev = price;
+        returns.push(r);
+
+        // Welford / Terriberry update of central moments
+        let n1 = n;
+        n += 1.0;
+        let delta = r - mean;
+        let delta_n = delta / n;
+        let delta_n2 = delta_n * delta_n;
+        let term1 = delta * delta_n * n1;
+        mean += delta_n;
+        m4 += term1 * delta_n2 * (n * n - 3.0 * n + 3.0) + 6.0 * delta_n2 * m2 - 4.0 * delta_n * m3;
+        m3 += term1 * delta_n * (n - 2.0) - 3.0 * delta_n * m2;
+        m2 += term1;
+
+        let shortfall = (r - daily_rf).min(0.0);
+        downside_sq += shortfall * shortfall;
+
+        if price > peak {
+            peak = price;
+        }
+        max_dd = max_dd.max((peak - price) / peak);
+    }
+
+    let count = returns.len();
+    if count < 2 {
+        return RiskMetrics::empty(count, confidence_levels);
+    }
+
+    let annual = 252.0_f64;
+    let volatility = (m2 / n).sqrt() * annual.sqrt();
+    let downside_deviation = (downside_sq / n).sqrt() * annual.sqrt();
+    let excess_return = mean * annual - risk_free_rate;
+    let ratio = |denominator: f64| if denominator > 0.0 { excess_return / denominator } else { 0.0 };
+
+    let total_return = prev / first - 1.0;
+    let cagr = (prev / first).powf(annual / n) - 1.0;
+    let calmar_ratio = if max_dd > 0.0 { cagr / max_dd } else { f64::NAN };
+    let (skewness, kurtosis) = if m2 > 0.0 {
+        (n.sqrt() * m3 / m2.powf(1.5), n * m4 / (m2 * m2) - 3.0)
+    } else {
+        (0.0, 0.0)
+    };
+
+    let tail = confidence_levels
+        .iter()
+        .map(|&level| {
+            let (var, cvar) = tail_risk(&mut returns, level);
+            (level, var, cvar)
+        })
+        .collect();
+
+    RiskMetrics {
+        observations: count,
+        total_return,
+        cagr,
+        volatility,
+        sharpe_ratio: ratio(volatility),
+        sortino_ratio: ratio(downside_deviation),
+        downside_deviation,
+        calmar_ratio,
+        max_drawdown: -max_dd,
+        skewness,
+        kurtosis,
+        tail,
+    }
+}
+
+/// Risk block for one row of prices (or daily returns, compounded into an equity curve), NaN-aware
+pub fn risk_row(row: &[f64], is_prices: bool, confidence_levels: &[f64], risk_free_rate: f64) -> RiskMetrics {
+    if is_prices {
+        return risk_metrics(row, confidence_levels, risk_free_rate);
+    }
+    let mut equity = Vec::with_capacity(row.len() + 1);
+    let mut value = 1.0;
+    equity.push(value);
+    for r in row.iter().filter(|r| r.is_finite()) {
+        value *= 1.0 + r;
+        equity.push(value);
+    }
+    risk_metrics(&equity, confidence_levels, risk_free_rate)
+}
+
+/// Risk blocks for every row of a row-major (assets x days) matrix, rows in parallel
+pub fn risk_panel(data: &[f64], n_days: usize, is_prices: bool, confidence_levels: &[f64], risk_free_rate: f64) -> Vec<RiskMetrics> {
+    if n_days == 0 {
+        return Vec::new();
+    }
+    data.par_chunks(n_days)
+        .map(|row| risk_row(row, is_prices, confidence_levels, risk_free_rate))
+        .collect()
+}
+
+/// "95" for 0.95, "97.5" for 0.975
+pub(crate) fn level_label(level: f64) -> String {
+    let pct = (level * 1000.0).round() / 10.0;
+    if pct.fract() == 0.0 {
+        format!("{}", pct as i64)
+    } else {
+        format!("{}", pct)
+    }
+}
+
+/// Calculate annualized volatility from daily returns
+#[pyfunction]
+pub fn calculate_volatility(returns: Series) -> f64 {
+    volatility(returns.as_slice())
+}
+
+/// Calculate Sharpe Ratio
+#[pyfunction]
+pub fn calculate_sharpe_ratio(returns: Series, risk_free_rate: f64) -> f64 {
+    sharpe_ratio(returns.as_slice(), risk_free_rate)
+}
+
+/// Calculate Value at Risk at 95% confidence
+#[pyfunction]
+pub fn calculate_var_95(returns: Series) -> f64 {
+    var_95(returns.as_slice())
+}
+
+/// Calculate Maximum Drawdown from prices
+#[pyfunction]
+pub fn calculate_max_drawdown(prices: Series) -> f64 {
+    max_drawdown(prices.as_slice())
+}
+
+/// Calculate Beta (stock vs market correlation)
+#[pyfunction]
+pub fn calculate_beta(stock_returns: Series, market_returns: Series) -> f64 {
+    beta(stock_returns.as_slice(), market_returns.as_slice())
+}
+
+/// Beta and correlation of a price series against a benchmark, aligned by date.
+///
+/// `dates` / `benchmark_dates` are strictly increasing int64 day numbers (any
+/// consistent unit) for `prices` / `benchmark_prices`. Missing or non-positive
+/// prices are skipped and only shared dates are used (see `aligned_returns`).
+/// Returns a dict: observations (aligned daily returns) and beta_<n> /
+/// correlation_<n> for each lookback in days (NaN when the history is shorter).
+#[pyfunction]
+#[pyo3(signature = (prices, dates, benchmark_prices, benchmark_dates, lookbacks=vec![63, 252, 756]))]
+pub fn calculate_benchmark_beta<'py>(
+    py: Python<'py>,
+    prices: Series<'py>,
+    dates: Dates<'py>,
+    benchmark_prices: Series<'py>,
+    benchmark_dates: Dates<'py>,
+    lookbacks: Vec<usize>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let (prices, dates) = (prices.as_slice(), dates.as_slice());
+    let (benchmark_prices, benchmark_dates) = (benchmark_prices.as_slice(), benchmark_dates.as_slice());
+    if prices.len() != dates.len() || benchmark_prices.len() != benchmark_dates.len() {
+        return Err(pyo3::exceptions::PyValueError::new_err("prices and dates must have the same length"));
+    }
+    if dates.windows(2).any(|w| w[0] >= w[1]) || benchmark_dates.windows(2).any(|w| w[0] >= w[1]) {
+        return Err(pyo3::exceptions::PyValueError::new_err("dates must be strictly increasing"));
+    }
+    let (observations, windows) = py.allow_threads(|| {
+        let (stock, market) = aligned_returns(dates, prices, benchmark_dates, benchmark_prices);
+        (stock.len(), beta_profile(&stock, &market, &lookbacks))
+    });
+
+    let result = PyDict::new_bound(py);
+    result.set_item("observations", observations)?;
+    for window in windows {
+        result.set_item(format!("beta_{}", window.lookback), window.beta)?;
+        result.set_item(format!("correlation_{}", window.lookback), window.correlation)?;
+    }
+    Ok(result)
+}
+
+/// Drawdown episodes of a price series: the `top_n` deepest with their peak,
+/// trough and recovery bars, plus time under water and recovery statistics.
+///
+/// Durations are in bars (trading days); map indices to dates with the
+/// series' index. Episodes shallower than `min_depth` are ignored except in
+/// the under-water statistics (see `drawdown_profile`).
+/// Returns a dict:
+///   episodes: [{"depth", "peak_index", "trough_index", "recovery_index" | None,
+///               "peak_to_trough", "trough_to_recovery" | None, "duration"}, ...] (deepest first)
+///   episode_count, max_drawdown, current_drawdown, time_under_water,
+///   longest_under_water, current_under_water, average_recovery (NaN if none recovered)
+#[pyfunction]
+#[pyo3(signature = (prices, top_n=5, min_depth=0.05))]
+pub fn calculate_drawdown_episodes<'py>(
+    py: Python<'py>,
+    prices: Series<'py>,
+    top_n: usize,
+    min_depth: f64,
+) -> PyResult<Bound<'py, PyDict>> {
+    if !(0.0..1.0).contains(&min_depth) {
+        return Err(pyo3::exceptions::PyValueError::new_err("min_depth must be in [0, 1)"));
+    }
+    let prices = prices.as_slice();
+    let last = prices.iter().rposition(|p| p.is_finite() && *p > 0.0).unwrap_or(0);
+    let profile = py.allow_threads(|| drawdown_profile(prices, min_depth));
+
+    let episodes = PyList::empty_bound(py);
+    for episode in deepest_episodes(&profile.episodes, top_n) {
+        let item = PyDict::new_bound(py);
+        item.set_item("depth", episode.depth)?;
+        item.set_item("peak_index", episode.peak)?;
+        item.set_item("trough_index", episode.trough)?;
+        item.set_item("recovery_index", episode.recovery)?;
+        item.set_item("peak_to_trough", episode.trough - episode.peak)?;
+        item.set_item("trough_to_recovery", episode.recovery.map(|r| r - episode.trough))?;
+        item.set_item("duration", episode.recovery.unwrap_or(last) - episode.peak)?;
+        episodes.append(item)?;
+    }
+
+    let result = PyDict::new_bound(py);
+    result.set_item("episodes", episodes)?;
+    result.set_item("episode_count", profile.episodes.len())?;
+    result.set_item("max_drawdown", profile.max_drawdown)?;
+    result.set_item("current_drawdown", profile.current_drawdown)?;
+    result.set_item("time_under_water", profile.time_under_water)?;
+    result.set_item("longest_under_water", profile.longest_under_water)?;
+    result.set_item("current_under_water", profile.current_under_water)?;
+    result.set_item("average_recovery", profile.average_recovery)?;
+    Ok(result)
+}
+
+/// Fused risk block for one price series (single pass + selection-based VaR).
+///
+/// Returns a dict: observations, total_return, cagr, volatility, sharpe_ratio,
+/// sortino_ratio, downside_deviation, calmar_ratio, max_drawdown, skewness, kurtosis
+/// (excess), and var_<level> / cvar_<level> for each confidence level (e.g. var_95, cvar_99).
+/// Values are NaN with fewer than two valid prices.
+#[pyfunction]
+#[pyo3(signature = (prices, confidence_levels=vec![0.95, 0.99], risk_free_rate=0.0))]
+pub fn calculate_risk_metrics<'py>(
+    py: Python<'py>,
+    prices: Series<'py>,
+    confidence_levels: Vec<f64>,
+    risk_free_rate: f64,
+) -> PyResult<Bound<'py, PyDict>> {
+    let prices = prices.as_slice();
+    let metrics = py.allow_threads(|| risk_metrics(prices, &confidence_levels, risk_free_rate));
+
+    let result = PyDict::new_bound(py);
+    result.set_item("observations", metrics.observations)?;
+    result.set_item("total_return", metrics.total_return)?;
+    result.set_item("cagr", metrics.cagr)?;
+    result.set_item("volatility", metrics.volatility)?;
+    result.set_item("sharpe_ratio", metrics.sharpe_ratio)?;
+    result.set_item("sortino_ratio", metrics.sortino_ratio)?;
+    result.set_item("downside_deviation", metrics.downside_deviation)?;
+    result.set_item("calmar_ratio", metrics.calmar_ratio)?;
+    result.set_item("max_drawdown", metrics.max_drawdown)?;
+    result.set_item("skewness", metrics.skewness)?;
+    result.set_item("kurtosis", metrics.kurtosis)?;
+    for (level, var, cvar) in &metrics.tail {
+        let label = level_label(*level);
+        result.set_item(format!("var_{}", label), var)?;
+        result.set_item(format!("cvar_{}", label), cvar)?;
+    }
+    Ok(result)
+}
+
+/// Risk metrics for many assets in one call.
+///
+/// `matrix` is a 2-D float64 array shaped (assets, days); NaN marks missing days
+/// (e.g. before listing or on local holidays). `kind` is "prices" or "returns".
+/// Rows are processed in parallel with the GIL released.
+/// Returns a dict of NumPy arrays (one value per asset) with the same keys as
+/// `calculate_risk_metrics`.
+#[pyfunction]
+#[pyo3(signature = (matrix, kind="prices", risk_free_rate=0.0, confidence_levels=vec![0.95]))]
+pub fn calculate_risk_panel<'py>(
+    py: Python<'py>,
+    matrix: Matrix<'py>,
+    kind: &str,
+    risk_free_rate: f64,
+    confidence_levels: Vec<f64>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let is_prices = match kind {
+        "prices" => true,
+        "returns" => false,
+        _ => return Err(pyo3::exceptions::PyValueError::new_err("kind must be 'prices' or 'returns'")),
+    };
+    let n_days = matrix.cols();
+    let data = matrix.as_slice();
+    let rows = py.allow_threads(|| risk_panel(data, n_days, is_prices, &confidence_levels, risk_free_rate));
+
+    let column = |f: fn(&RiskMetrics) -> f64| rows.iter().map(f).collect::<Vec<f64>>();
+    let result = PyDict::new_bound(py);
+    result.set_item("observations", rows.iter().map(|r| r.observations as i64).collect::<Vec<i64>>().into_pyarray_bound(py))?;
+    result.set_item("total_return", column(|r| r.total_return).into_pyarray_bound(py))?;
+    result.set_item("cagr", column(|r| r.cagr).into_pyarray_bound(py))?;
+    result.set_item("volatility", column(|r| r.volatility).into_pyarray_bound(py))?;
+    result.set_item("sharpe_ratio", column(|r| r.sharpe_ratio).into_pyarray_bound(py))?;
+    result.set_item("sortino_ratio", column(|r| r.sortino_ratio).into_pyarray_bound(py))?;
+    result.set_item("downside_deviation", column(|r| r.downside_deviation).into_pyarray_bound(py))?;
+    result.set_item("calmar_ratio", column(|r| r.calmar_ratio).into_pyarray_bound(py))?;
+    result.set_item("max_drawdown", column(|r| r.max_drawdown).into_pyarray_bound(py))?;
+    result.set_item("skewness", column(|r| r.skewness).into_pyarray_bound(py))?;
+    result.set_item("kurtosis", column(|r| r.kurtosis).into_pyarray_bound(py))?;
+    for (i, level) in confidence_levels.iter().enumerate() {
+        let label = level_label(*level);
+        let var: Vec<f64> = rows.iter().map(|r| r.tail[i].1).collect();
+        let cvar: Vec<f64> = rows.iter().map(|r| r.tail[i].2).collect();
+        result.set_item(format!("var_{}", label), var.into_pyarray_bound(py))?;
+        result.set_item(format!("cvar_{}", label), cvar.into_pyarray_bound(py))?;
+    }
+    Ok(result)
+}
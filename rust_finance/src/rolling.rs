@@ -0,0 +1,183 @@
+//! Rolling-window risk module
+//! Volatility, Sharpe, Beta and Correlation over sliding windows in O(n)
+//!
+//! Window statistics are updated incrementally (Welford add / remove), so each
+//! bar costs O(1) regardless of the window length. Non-finite returns never
+//! enter the moments: each window covers its finite bars only.
+
+use numpy::IntoPyArray;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::input::Series;
+
+/// Sliding mean / variance / covariance of (x, y) pairs with Welford updates
+#[derive(Clone, Copy, Debug, Default)]
+pub struct WindowMoments {
+    n: f64,
+    mean_x: f64,
+    mean_y: f64,
+    m2_x: f64,
+    m2_y: f64,
+    c_xy: f64,
+}
+
+impl WindowMoments {
+    pub fn add(&mut self, x: f64, y: f64) {
+        self.n += 1.0;
+        let dx = x - self.mean_x;
+        let dy = y - self.mean_y;
+        self.mean_x += dx / self.n;
+        self.mean_y += dy / self.n;
+        self.m2_x += dx * (x - self.mean_x);
+        self.m2_y += dy * (y - self.mean_y);
+        self.c_xy += dx * (y - self.mean_y);
+    }
+
+    pub fn remove(&mut self, x: f64, y: f64) {
+        if self.n <= 1.0 {
+            *self = WindowMoments::default();
+            return;
+        }
+        self.n -= 1.0;
+        let dx = x - self.mean_x;
+        let dy = y - self.mean_y;
+        self.mean_x -= dx / self.n;
+        self.mean_y -= dy / self.n;
+        self.m2_x -= dx * (x - self.mean_x);
+        self.m2_y -= dy * (y - self.mean_y);
+        self.c_xy -= dx * (y - self.mean_y);
+    }
+
+    /// Observations currently in the window
+    pub fn count(&self) -> usize {
+        self.n as usize
+    }
+
+    pub fn mean_x(&self) -> f64 {
+        self.mean_x
+    }
+
+    /// Population variance of x
+    pub fn var_x(&self) -> f64 {
+        (self.m2_x / self.n).max(0.0)
+    }
+
+    pub fn var_y(&self) -> f64 {
+        (self.m2_y / self.n).max(0.0)
+    }
+
+    pub fn cov(&self) -> f64 {
+        self.c_xy / self.n
+    }
+}
+
+/// Rolling statistics at the end of each evaluated window
+#[derive(Clone, Debug, Default)]
+pub struct RollingRisk {
+    /// Index (into the returns) of the last bar in each window
+    pub index: Vec<usize>,
+    pub volatility: Vec<f64>,
+    pub sharpe_ratio: Vec<f64>,
+    pub beta: Vec<f64>,
+    pub correlation: Vec<f64>,
+}
+
+/// Rolling annualized volatility and Sharpe of `returns` and, with a benchmark
+/// of the same length, rolling beta and correlation.
+/// Windows are evaluated every `step` bars counted back from the last bar, so
+/// the most recent window is always included. Bars where the return (or the
+/// benchmark) is NaN / infinite are left out of every window containing them;
+/// a window with fewer than two usable bars is NaN.
+pub fn rolling_risk(
+    returns: &[f64],
+    benchmark: Option<&[f64]>,
+    window: usize,
+    step: usize,
+    risk_free_rate: f64,
+) -> RollingRisk {
+    let n = returns.len();
+    let mut out = RollingRisk::default();
+    if window < 2 || step == 0 || n < window {
+        return out;
+    }
+    let benchmark = benchmark.filter(|b| b.len() == n);
+    let annual = 252.0_f64;
+
+    let pair = |i: usize| {
+        let y = benchmark.map_or(0.0, |b| b[i]);
+        (returns[i].is_finite() && y.is_finite()).then_some((returns[i], y))
+    };
+    let mut moments = WindowMoments::default();
+    for i in 0..n {
+        if let Some((x, y)) = pair(i) {
+            moments.add(x, y);
+        }
+        if i >= window {
+            if let Some((x, y)) = pair(i - window) {
+                moments.remove(x, y);
+            }
+        }
+        if i + 1 < window || (n - 1 - i) % step != 0 {
+            continue;
+        }
+
+        out.index.push(i);
+        if moments.count() < 2 {
+            out.volatility.push(f64::NAN);
+            out.sharpe_ratio.push(f64::NAN);
+            if benchmark.is_some() {
+                out.beta.push(f64::NAN);
+                out.correlation.push(f64::NAN);
+            }
+            continue;
+        }
+        let vol = moments.var_x().sqrt() * annual.sqrt();
+        out.volatility.push(vol);
+        out.sharpe_ratio.push(if vol > 0.0 { (moments.mean_x() * annual - risk_free_rate) / vol } else { 0.0 });
+        if benchmark.is_some() {
+            let (var_x, var_y, cov) = (moments.var_x(), moments.var_y(), moments.cov());
+            out.beta.push(if var_y > 0.0 { cov / var_y } else { f64::NAN });
+            out.correlation.push(if var_x > 0.0 && var_y > 0.0 { cov / (var_x * var_y).sqrt() } else { f64::NAN });
+        }
+    }
+    out
+}
+
+/// Rolling risk over daily returns.
+///
+/// Returns a dict of NumPy arrays, one entry per evaluated window:
+///   index (window end position), volatility, sharpe_ratio,
+///   and beta / correlation when `benchmark` returns (same length, aligned) are given.
+/// Windows are evaluated every `step` bars counting back from the latest bar;
+/// NaN bars are skipped within each window (NaN when fewer than two remain).
+#[pyfunction]
+#[pyo3(signature = (returns, window=63, step=1, benchmark=None, risk_free_rate=0.0))]
+pub fn calculate_rolling_risk<'py>(
+    py: Python<'py>,
+    returns: Series<'py>,
+    window: usize,
+    step: usize,
+    benchmark: Option<Series<'py>>,
+    risk_free_rate: f64,
+) -> PyResult<Bound<'py, PyDict>> {
+    let returns = returns.as_slice();
+    let benchmark = benchmark.as_ref().map(|b| b.as_slice());
+    if let Some(b) = benchmark {
+        if b.len() != returns.len() {
+            return Err(pyo3::exceptions::PyValueError::new_err("benchmark must have the same length as returns"));
+        }
+    }
+    let rolling = py.allow_threads(|| rolling_risk(returns, benchmark, window, step, risk_free_rate));
+
+    let result = PyDict::new_bound(py);
+    let index: Vec<i64> = rolling.index.iter().map(|&i| i as i64).collect();
+    result.set_item("index", index.into_pyarray_bound(py))?;
+    result.set_item("volatility", rolling.volatility.into_pyarray_bound(py))?;
+    result.set_item("sharpe_ratio", rolling.sharpe_ratio.into_pyarray_bound(py))?;
+    if benchmark.is_some() {
+        result.set_item("beta", rolling.beta.into_pyarray_bound(py))?;
+        result.set_item("correlation", rolling.correlation.into_pyarray_bound(py))?;
+    }
+    Ok(result)
+}
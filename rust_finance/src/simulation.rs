@@ -0,0 +1,316 @@
+//! Simulation module
+//! Parametric, Historical-bootstrap and Monte Carlo VaR / CVaR
+//! for single assets and weighted portfolios over multi-day horizons
+//!
+//! Portfolios are held at constant weights (rebalanced daily), so each simulated
+//! day's portfolio return is w' r. Horizon returns are compounded: prod(1 + r) - 1.
+//! VaR / CVaR are returned as horizon returns (negative = loss), matching `var_95`.
+
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+use rayon::prelude::*;
+
+use crate::input::{Matrix, Series};
+use crate::portfolio::{aligned_rows, moments, parse_shrinkage, ShrinkageArg};
+use crate::risk::tail_risk;
+
+/// Paths per RNG stream. Streams are fixed by (seed, chunk index), so results do not
+/// depend on the number of threads.
+const PATHS_PER_CHUNK: usize = 4096;
+
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum VarMethod {
+    /// Normal distribution of horizon returns (closed form)
+    Parametric,
+    /// Resample historical daily returns with replacement
+    Historical,
+    /// Normal daily returns with the sample mean / volatility
+    MonteCarlo,
+}
+
+/// xoshiro256** seeded through SplitMix64, with Box-Muller normals
+pub struct Rng {
+    state: [u64; 4],
+    spare_normal: Option<f64>,
+}
+
+fn splitmix64(x: &mut u64) -> u64 {
+    *x = x.wrapping_add(0x9E37_79B9_7F4A_7C15);
+    let mut z = *x;
+    z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+    z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+    z ^ (z >> 31)
+}
+
+impl Rng {
+    pub fn new(seed: u64, stream: u64) -> Self {
+        let mut x = seed ^ stream.wrapping_mul(0xD1B5_4A32_D192_ED03);
+        let state = [splitmix64(&mut x), splitmix64(&mut x), splitmix64(&mut x), splitmix64(&mut x)];
+        Rng { state, spare_normal: None }
+    }
+
+    pub fn next_u64(&mut self) -> u64 {
+        let s = &mut self.state;
+        let result = s[1].wrapping_mul(5).rotate_left(7).wrapping_mul(9);
+        let t = s[1] << 17;
+        s[2] ^= s[0];
+        s[3] ^= s[1];
+        s[1] ^= s[2];
+        s[0] ^= s[3];
+        s[2] ^= t;
+        s[3] = s[3].rotate_left(45);
+        result
+    }
+
+    /// Uniform in [0, 1)
+    pub fn uniform(&mut self) -> f64 {
+        (self.next_u64() >> 11) as f64 * (1.0 / (1u64 << 53) as f64)
+    }
+
+    /// Uniform index in [0, n)
+    pub fn index(&mut self, n: usize) -> usize {
+        ((self.next_u64() >> 32) * n as u64 >> 32) as usize
+    }
+
+    pub fn normal(&mut self) -> f64 {
+        if let Some(z) = self.spare_normal.take() {
+            return z;
+        }
+        let u1 = 1.0 - self.uniform(); // (0, 1]
+        let u2 = self.uniform();
+        let radius = (-2.0 * u1.ln()).sqrt();
+        let angle = std::f64::consts::TAU * u2;
+        self.spare_normal = Some(radius * angle.sin());
+        radius * angle.cos()
+    }
+}
+
+/// Standard normal CDF inverse (Acklam's rational approximation, |error| < 1.2e-9)
+pub fn normal_quantile(p: f64) -> f64 {
+    const A: [f64; 6] = [-3.969683028665376e1, 2.209460984245205e2, -2.759285104469687e2, 1.383577518672690e2, -3.066479806614716e1, 2.506628277459239];
+    const B: [f64; 5] = [-5.447609879822406e1, 1.615858368580409e2, -1.556989798598866e2, 6.680131188771972e1, -1.328068155288572e1];
+    const C: [f64; 6] = [-7.784894002430293e-3, -3.223964580411365e-1, -2.400758277161838, -2.549732539343734, 4.374664141464968, 2.938163982698783];
+    const D: [f64; 4] = [7.784695709041462e-3, 3.224671290700398e-1, 2.445134137142996, 3.754408661907416];
+    const P_LOW: f64 = 0.02425;
+
+    if !(p > 0.0 && p < 1.0) {
+        return f64::NAN;
+    }
+    if p < P_LOW {
+        let q = (-2.0 * p.ln()).sqrt();
+        (((((C[0] * q + C[1]) * q + C[2]) * q + C[3]) * q + C[4]) * q + C[5]) / ((((D[0] * q + D[1]) * q + D[2]) * q + D[3]) * q + 1.0)
+    } else if p <= 1.0 - P_LOW {
+        let q = p - 0.5;
+        let r = q * q;
+        (((((A[0] * r + A[1]) * r + A[2]) * r + A[3]) * r + A[4]) * r + A[5]) * q / (((((B[0] * r + B[1]) * r + B[2]) * r + B[3]) * r + B[4]) * r + 1.0)
+    } else {
+        -normal_quantile(1.0 - p)
+    }
+}
+
+/// Result of a VaR run
+#[derive(Clone, Debug)]
+pub struct VarResult {
+    /// Mean horizon return (simulated, or the normal mean for parametric)
+    pub expected_return: f64,
+    /// Horizon return volatility
+    pub volatility: f64,
+    /// (confidence level, VaR, CVaR)
+    pub tail: Vec<(f64, f64, f64)>,
+}
+
+/// Closed-form normal VaR / CVaR of the h-day return with mean h * mu and
+/// standard deviation sqrt(h) * sigma.
+pub fn parametric_var(mean_daily: f64, std_daily: f64, horizon_days: usize, confidence_levels: &[f64]) -> VarResult {
+    let h = horizon_days as f64;
+    let (mean, std) = (mean_daily * h, std_daily * h.sqrt());
+    let density = |z: f64| (-0.5 * z * z).exp() / (2.0 * std::f64::consts::PI).sqrt();
+    let tail = confidence_levels
+        .iter()
+        .map(|&level| {
+            let z = normal_quantile(1.0 - level);
+            (level, mean + z * std, mean - std * density(z) / (1.0 - level))
+        })
+        .collect();
+    VarResult { expected_return: mean, volatility: std, tail }
+}
+
+/// Simulate `n_paths` compounded `horizon_days` returns in parallel.
+/// Historical draws from `daily_returns`; Monte Carlo draws N(mean, std).
+pub fn simulate_paths(
+    method: VarMethod,
+    daily_returns: &[f64],
+    mean_daily: f64,
+    std_daily: f64,
+    horizon_days: usize,
+    n_paths: usize,
+    seed: u64,
+) -> Vec<f64> {
+    let mut paths = vec![0.0; n_paths];
+    paths.par_chunks_mut(PATHS_PER_CHUNK).enumerate().for_each(|(chunk, out)| {
+        let mut rng = Rng::new(seed, chunk as u64);
+        for path in out.iter_mut() {
+            let mut growth = 1.0;
+            for _ in 0..horizon_days {
+                let r = match method {
+                    VarMethod::Historical => daily_returns[rng.index(daily_returns.len())],
+                    _ => mean_daily + std_daily * rng.normal(),
+                };
+                growth *= 1.0 + r;
+            }
+            *path = growth - 1.0;
+        }
+    });
+    paths
+}
+
+/// VaR / CVaR of a daily portfolio return series over `horizon_days`
+pub fn value_at_risk(
+    daily_returns: &[f64],
+    method: VarMethod,
+    horizon_days: usize,
+    confidence_levels: &[f64],
+    n_paths: usize,
+    seed: u64,
+) -> VarResult {
+    let n = daily_returns.len() as f64;
+    let mean = daily_returns.iter().sum::<f64>() / n;
+    let std = (daily_returns.iter().map(|r| (r - mean).powi(2)).sum::<f64>() / n).sqrt();
+    if method == VarMethod::Parametric {
+        return parametric_var(mean, std, horizon_days, confidence_levels);
+    }
+
+    let mut paths = simulate_paths(method, daily_returns, mean, std, horizon_days, n_paths, seed);
+    let sim_mean = paths.iter().sum::<f64>() / n_paths as f64;
+    let sim_std = (paths.iter().map(|r| (r - sim_mean).powi(2)).sum::<f64>() / n_paths as f64).sqrt();
+    let tail = confidence_levels
+        .iter()
+        .map(|&level| {
+            let (var, cvar) = tail_risk(&mut paths, level);
+            (level, var, cvar)
+        })
+        .collect();
+    VarResult { expected_return: sim_mean, volatility: sim_std, tail }
+}
+
+/// Constant-weight portfolio daily returns from an aligned (assets x days) matrix
+pub fn portfolio_returns(aligned: &[f64], n_days: usize, weights: &[f64]) -> Vec<f64> {
+    (0..n_days)
+        .map(|t| weights.iter().enumerate().map(|(i, w)| w * aligned[i * n_days + t]).sum())
+        .collect()
+}
+
+// === Python wrappers ===
+
+fn parse_method(method: &str) -> PyResult<VarMethod> {
+    match method {
+        "parametric" => Ok(VarMethod::Parametric),
+        "historical" => Ok(VarMethod::Historical),
+        "monte_carlo" => Ok(VarMethod::MonteCarlo),
+        _ => Err(PyValueError::new_err("method must be 'parametric', 'historical' or 'monte_carlo'")),
+    }
+}
+
+fn check_run(horizon_days: usize, n_paths: usize, confidence_levels: &[f64]) -> PyResult<()> {
+    if horizon_days == 0 || n_paths == 0 {
+        return Err(PyValueError::new_err("horizon_days and n_paths must be positive"));
+    }
+    if confidence_levels.iter().any(|c| !(0.0..1.0).contains(c) || *c == 0.0) {
+        return Err(PyValueError::new_err("confidence levels must be between 0 and 1"));
+    }
+    Ok(())
+}
+
+fn var_into_dict<'py>(py: Python<'py>, method: &str, horizon_days: usize, n_paths: usize, result: VarResult) -> PyResult<Bound<'py, PyDict>> {
+    let out = PyDict::new_bound(py);
+    out.set_item("method", method)?;
+    out.set_item("horizon_days", horizon_days)?;
+    out.set_item("paths", if method == "parametric" { 0 } else { n_paths })?;
+    out.set_item("expected_return", result.expected_return)?;
+    out.set_item("volatility", result.volatility)?;
+    for (level, var, cvar) in result.tail {
+        let label = crate::risk::level_label(level);
+        out.set_item(format!("var_{}", label), var)?;
+        out.set_item(format!("cvar_{}", label), cvar)?;
+    }
+    Ok(out)
+}
+
+/// VaR / CVaR of one asset's daily returns over a multi-day horizon.
+///
+/// `method`: "parametric" (normal, closed form), "historical" (bootstrap of past days)
+/// or "monte_carlo" (normal daily returns). Simulations are reproducible for a given
+/// `seed` and run across threads with the GIL released. Non-finite returns are skipped.
+/// Returns a dict: method, horizon_days, paths, expected_return and volatility of the
+/// horizon return, and var_<level> / cvar_<level> as horizon returns (negative = loss).
+#[pyfunction]
+#[pyo3(signature = (returns, method="monte_carlo", horizon_days=1, confidence_levels=vec![0.95, 0.99], n_paths=100_000, seed=42))]
+pub fn calculate_var<'py>(
+    py: Python<'py>,
+    returns: Series<'py>,
+    method: &str,
+    horizon_days: usize,
+    confidence_levels: Vec<f64>,
+    n_paths: usize,
+    seed: u64,
+) -> PyResult<Bound<'py, PyDict>> {
+    let var_method = parse_method(method)?;
+    check_run(horizon_days, n_paths, &confidence_levels)?;
+    let returns = returns.as_slice();
+    let result = py.allow_threads(|| {
+        let clean: Vec<f64> = returns.iter().copied().filter(|r| r.is_finite()).collect();
+        (clean.len() >= 2).then(|| value_at_risk(&clean, var_method, horizon_days, &confidence_levels, n_paths, seed))
+    });
+    let result = result.ok_or_else(|| PyValueError::new_err("need at least two finite returns"))?;
+    var_into_dict(py, method, horizon_days, n_paths, result)
+}
+
+/// VaR / CVaR of a constant-weight portfolio over a multi-day horizon.
+///
+/// `returns` is an (assets, days) daily returns matrix (days with any NaN are dropped)
+/// and `weights` has one entry per asset. Parametric VaR uses the (optionally shrunk)
+/// covariance (`shrinkage` as in `calculate_covariance`). Other arguments and the returned dict
+/// are as in `calculate_var`.
+#[pyfunction]
+#[pyo3(signature = (returns, weights, method="monte_carlo", horizon_days=1, confidence_levels=vec![0.95, 0.99], n_paths=100_000, seed=42, shrinkage=None))]
+#[allow(clippy::too_many_arguments)]
+pub fn calculate_portfolio_var<'py>(
+    py: Python<'py>,
+    returns: Matrix<'py>,
+    weights: Series<'py>,
+    method: &str,
+    horizon_days: usize,
+    confidence_levels: Vec<f64>,
+    n_paths: usize,
+    seed: u64,
+    shrinkage: Option<ShrinkageArg>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let var_method = parse_method(method)?;
+    check_run(horizon_days, n_paths, &confidence_levels)?;
+    if weights.len() != returns.rows() {
+        return Err(PyValueError::new_err("weights must have one entry per asset (row)"));
+    }
+    let shrinkage = parse_shrinkage(shrinkage)?;
+
+    let (n_assets, n_days) = (returns.rows(), returns.cols());
+    let (data, weights) = (returns.as_slice(), weights.as_slice());
+    let result = py.allow_threads(|| {
+        let (aligned, kept) = aligned_rows(data, n_assets, n_days);
+        if kept < 2 {
+            return None;
+        }
+        if var_method == VarMethod::Parametric {
+            let m = moments(&aligned, n_assets, kept, shrinkage);
+            let mean = weights.iter().zip(&m.means).map(|(w, mu)| w * mu).sum::<f64>();
+            let variance: f64 = (0..n_assets)
+                .map(|i| weights[i] * (0..n_assets).map(|j| m.cov[i * n_assets + j] * weights[j]).sum::<f64>())
+                .sum();
+            return Some(parametric_var(mean, variance.max(0.0).sqrt(), horizon_days, &confidence_levels));
+        }
+        let daily = portfolio_returns(&aligned, kept, weights);
+        Some(value_at_risk(&daily, var_method, horizon_days, &confidence_levels, n_paths, seed))
+    });
+    let result = result.ok_or_else(|| PyValueError::new_err("need at least two days where every asset has a return"))?;
+    var_into_dict(py, method, horizon_days, n_paths, result)
+}
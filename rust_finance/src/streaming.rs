@@ -0,0 +1,735 @@
+//! Streaming indicators module
+//! Stateful EMA, Wilder RSI, MACD, rolling SMA, rolling volatility and running drawdown
+//!
+//! Each indicator is seeded once from history and then updated in O(1) per new
+//! bar, so an intraday refresh costs one `update()` per ticker instead of a full
+//! recomputation. Values match the `*_series` / rolling kernels on the same
+//! prices (NaN during warm-up). Non-finite prices are ignored, so a missing quote
+//! leaves the state unchanged.
+//!
+//! States serialize to plain dicts (`to_state()` / `from_state()`, also used by
+//! pickle) so they can be persisted between runs.
+
+use std::collections::VecDeque;
+
+use pyo3::exceptions::{PyKeyError, PyValueError};
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::input::Series;
+use crate::rolling::WindowMoments;
+use crate::technicals::MacdState;
+
+/// Exponential Moving Average seeded with the first price (matches `ema_series`)
+#[derive(Clone, Debug)]
+pub struct EmaState {
+    period: usize,
+    multiplier: f64,
+    value: f64,
+    count: usize,
+}
+
+impl EmaState {
+    pub fn new(period: usize) -> Self {
+        EmaState { period, multiplier: 2.0 / (period as f64 + 1.0), value: f64::NAN, count: 0 }
+    }
+
+    pub fn update(&mut self, price: f64) -> f64 {
+        if !price.is_finite() {
+            return self.value;
+        }
+        self.value = if self.count == 0 { price } else { (price - self.value) * self.multiplier + self.value };
+        self.count += 1;
+        self.value
+    }
+}
+
+/// Wilder RSI: simple average of the first `period` changes, then Wilder smoothing
+/// (matches `rsi_series`). During warm-up the averages hold running sums.
+#[derive(Clone, Debug)]
+pub struct RsiState {
+    period: usize,
+    last_price: f64,
+    avg_gain: f64,
+    avg_loss: f64,
+    count: usize,
+}
+
+impl RsiState {
+    pub fn new(period: usize) -> Self {
+        RsiState { period, last_price: f64::NAN, avg_gain: 0.0, avg_loss: 0.0, count: 0 }
+    }
+
+    pub fn value(&self) -> f64 {
+        if self.count <= self.period {
+            f64::NAN
+        } else if self.avg_loss == 0.0 {
+            100.0
+        } else {
+            100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        }
+    }
+
+    pub fn update(&mut self, price: f64) -> f64 {
+        if !price.is_finite() {
+            return self.value();
+        }
+        if self.count > 0 {
+            let change = price - self.last_price;
+            let (gain, loss) = if change > 0.0 { (change, 0.0) } else { (0.0, -change) };
+            let p = self.period as f64;
+            if self.count <= self.period {
+                self.avg_gain += gain;
+                self.avg_loss += loss;
+                if self.count == self.period {
+                    self.avg_gain /= p;
+                    self.avg_loss /= p;
+                }
+            } else {
+                self.avg_gain = (self.avg_gain * (p - 1.0) + gain) / p;
+                self.avg_loss = (self.avg_loss * (p - 1.0) + loss) / p;
+            }
+        }
+        self.last_price = price;
+        self.count += 1;
+        self.value()
+    }
+}
+
+/// Simple Moving Average over the last `period` prices with a running sum.
+/// The sum is recomputed from the window once per `period` bars so rounding
+/// error does not accumulate over long streams.
+#[derive(Clone, Debug)]
+pub struct SmaState {
+    period: usize,
+    window: VecDeque<f64>,
+    sum: f64,
+    since_refresh: usize,
+}
+
+impl SmaState {
+    pub fn new(period: usize) -> Self {
+        SmaState { period, window: VecDeque::with_capacity(period + 1), sum: 0.0, since_refresh: 0 }
+    }
+
+    pub fn value(&self) -> f64 {
+        if self.period > 0 && self.window.len() == self.period {
+            self.sum / self.period as f64
+        } else {
+            f64::NAN
+        }
+    }
+
+    pub fn update(&mut self, price: f64) -> f64 {
+        if !price.is_finite() {
+            return self.value();
+        }
+        self.window.push_back(price);
+        self.sum += price;
+        if self.window.len() > self.period {
+            self.sum -= self.window.pop_front().unwrap_or(0.0);
+        }
+        self.since_refresh += 1;
+        if self.since_refresh >= self.period {
+            self.sum = self.window.iter().sum();
+            self.since_refresh = 0;
+        }
+        self.value()
+    }
+}
+
+/// Annualized volatility of the last `window` simple returns (matches
+/// `rolling_risk`). Window moments are rebuilt once per `window` bars.
+#[derive(Clone, Debug)]
+pub struct VolatilityState {
+    window: usize,
+    last_price: f64,
+    returns: VecDeque<f64>,
+    moments: WindowMoments,
+    since_refresh: usize,
+}
+
+impl VolatilityState {
+    pub fn new(window: usize) -> Self {
+        VolatilityState {
+            window,
+            last_price: f64::NAN,
+            returns: VecDeque::with_capacity(window + 1),
+            moments: WindowMoments::default(),
+            since_refresh: 0,
+        }
+    }
+
+    /// Restore from the stored returns window
+    fn from_returns(window: usize, last_price: f64, returns: Vec<f64>) -> Self {
+        let mut state = VolatilityState::new(window);
+        state.last_price = last_price;
+        for r in returns {
+            state.push_return(r);
+        }
+        state
+    }
+
+    pub fn value(&self) -> f64 {
+        if self.window >= 2 && self.returns.len() == self.window {
+            (self.moments.var_x() * 252.0).sqrt()
+        } else {
+            f64::NAN
+        }
+    }
+
+    fn push_return(&mut self, r: f64) {
+        self.returns.push_back(r);
+        self.moments.add(r, 0.0);
+        if self.returns.len() > self.window {
+            let old = self.returns.pop_front().unwrap_or(0.0);
+            self.moments.remove(old, 0.0);
+        }
+        self.since_refresh += 1;
+        if self.since_refresh >= self.window {
+            self.moments = WindowMoments::default();
+            for &x in &self.returns {
+                self.moments.add(x, 0.0);
+            }
+            self.since_refresh = 0;
+        }
+    }
+
+    pub fn update(&mut self, price: f64) -> f64 {
+        if !price.is_finite() {
+            return self.value();
+        }
+        if self.last_price.is_finite() && self.last_price != 0.0 {
+            self.push_return(price / self.last_price - 1.0);
+        }
+        self.last_price = price;
+        self.value()
+    }
+}
+
+/// Running drawdown from the peak so far (negative fraction) and the worst one seen
+/// (matches `max_drawdown`)
+#[derive(Clone, Debug)]
+pub struct DrawdownState {
+    peak: f64,
+    current: f64,
+    max_drawdown: f64,
+    count: usize,
+}
+
+impl DrawdownState {
+    pub fn new() -> Self {
+        DrawdownState { peak: f64::NAN, current: 0.0, max_drawdown: 0.0, count: 0 }
+    }
+
+    pub fn update(&mut self, price: f64) -> f64 {
+        if !price.is_finite() {
+            return self.current;
+        }
+        if self.count == 0 || price > self.peak {
+            self.peak = price;
+        }
+        self.current = if self.peak != 0.0 { (price - self.peak) / self.peak } else { 0.0 };
+        self.max_drawdown = self.max_drawdown.min(self.current);
+        self.count += 1;
+        self.current
+    }
+}
+
+impl Default for DrawdownState {
+    fn default() -> Self {
+        DrawdownState::new()
+    }
+}
+
+// === Python classes ===
+
+fn field<'py, T: FromPyObject<'py>>(state: &Bound<'py, PyDict>, key: &str) -> PyResult<T> {
+    match state.get_item(key)? {
+        Some(value) => T::extract_bound(&value),
+        None => Err(PyKeyError::new_err(format!("state is missing '{key}'"))),
+    }
+}
+
+fn check_kind(state: &Bound<'_, PyDict>, kind: &str) -> PyResult<()> {
+    let found: String = field(state, "kind")?;
+    if found != kind {
+        return Err(PyValueError::new_err(format!("expected a '{kind}' state, got '{found}'")));
+    }
+    Ok(())
+}
+
+fn check_period(name: &str, value: usize) -> PyResult<usize> {
+    if value == 0 {
+        return Err(PyValueError::new_err(format!("{name} must be positive")));
+    }
+    Ok(value)
+}
+
+/// Streaming EMA: `StreamingEma(period)`, `seed(prices)`, `update(price) -> ema`
+#[pyclass(module = "rust_finance")]
+#[derive(Clone)]
+pub struct StreamingEma {
+    state: EmaState,
+}
+
+#[pymethods]
+impl StreamingEma {
+    #[new]
+    #[pyo3(signature = (period=20))]
+    fn new(period: usize) -> PyResult<Self> {
+        Ok(StreamingEma { state: EmaState::new(check_period("period", period)?) })
+    }
+
+    /// Feed one price; returns the current EMA
+    fn update(&mut self, price: f64) -> f64 {
+        self.state.update(price)
+    }
+
+    /// Feed a price history (same as calling `update` on each); returns the current EMA
+    fn seed(&mut self, py: Python<'_>, prices: Series) -> f64 {
+        let state = &mut self.state;
+        let prices = prices.as_slice();
+        py.allow_threads(|| prices.iter().fold(state.value, |_, &p| state.update(p)))
+    }
+
+    #[getter]
+    fn value(&self) -> f64 {
+        self.state.value
+    }
+
+    #[getter]
+    fn count(&self) -> usize {
+        self.state.count
+    }
+
+    #[getter]
+    fn period(&self) -> usize {
+        self.state.period
+    }
+
+    fn to_state<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let state = PyDict::new_bound(py);
+        state.set_item("kind", "ema")?;
+        state.set_item("period", self.state.period)?;
+        state.set_item("value", self.state.value)?;
+        state.set_item("count", self.state.count)?;
+        Ok(state)
+    }
+
+    #[staticmethod]
+    fn from_state(state: &Bound<'_, PyDict>) -> PyResult<Self> {
+        check_kind(state, "ema")?;
+        let mut restored = StreamingEma::new(field(state, "period")?)?;
+        restored.state.value = field(state, "value")?;
+        restored.state.count = field(state, "count")?;
+        Ok(restored)
+    }
+
+    fn __reduce__<'py>(slf: &Bound<'py, Self>) -> PyResult<(Bound<'py, PyAny>, (Bound<'py, PyDict>,))> {
+        Ok((slf.get_type().getattr("from_state")?, (slf.borrow().to_state(slf.py())?,)))
+    }
+
+    fn __repr__(&self) -> String {
+        format!("StreamingEma(period={}, value={}, count={})", self.state.period, self.state.value, self.state.count)
+    }
+}
+
+/// Streaming Wilder RSI: `StreamingRsi(period)`, `seed(prices)`, `update(price) -> rsi`
+#[pyclass(module = "rust_finance")]
+#[derive(Clone)]
+pub struct StreamingRsi {
+    state: RsiState,
+}
+
+#[pymethods]
+impl StreamingRsi {
+    #[new]
+    #[pyo3(signature = (period=14))]
+    fn new(period: usize) -> PyResult<Self> {
+        Ok(StreamingRsi { state: RsiState::new(check_period("period", period)?) })
+    }
+
+    /// Feed one price; returns the current RSI (NaN until `period` changes are seen)
+    fn update(&mut self, price: f64) -> f64 {
+        self.state.update(price)
+    }
+
+    /// Feed a price history (same as calling `update` on each); returns the current RSI
+    fn seed(&mut self, py: Python<'_>, prices: Series) -> f64 {
+        let state = &mut self.state;
+        let prices = prices.as_slice();
+        py.allow_threads(|| prices.iter().fold(state.value(), |_, &p| state.update(p)))
+    }
+
+    #[getter]
+    fn value(&self) -> f64 {
+        self.state.value()
+    }
+
+    #[getter]
+    fn count(&self) -> usize {
+        self.state.count
+    }
+
+    #[getter]
+    fn period(&self) -> usize {
+        self.state.period
+    }
+
+    fn to_state<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let state = PyDict::new_bound(py);
+        state.set_item("kind", "rsi")?;
+        state.set_item("period", self.state.period)?;
+        state.set_item("last_price", self.state.last_price)?;
+        state.set_item("avg_gain", self.state.avg_gain)?;
+        state.set_item("avg_loss", self.state.avg_loss)?;
+        state.set_item("count", self.state.count)?;
+        Ok(state)
+    }
+
+    #[staticmethod]
+    fn from_state(state: &Bound<'_, PyDict>) -> PyResult<Self> {
+        check_kind(state, "rsi")?;
+        let mut restored = StreamingRsi::new(field(state, "period")?)?;
+        restored.state.last_price = field(state, "last_price")?;
+        restored.state.avg_gain = field(state, "avg_gain")?;
+        restored.state.avg_loss = field(state, "avg_loss")?;
+        restored.state.count = field(state, "count")?;
+        Ok(restored)
+    }
+
+    fn __reduce__<'py>(slf: &Bound<'py, Self>) -> PyResult<(Bound<'py, PyAny>, (Bound<'py, PyDict>,))> {
+        Ok((slf.get_type().getattr("from_state")?, (slf.borrow().to_state(slf.py())?,)))
+    }
+
+    fn __repr__(&self) -> String {
+        format!("StreamingRsi(period={}, value={}, count={})", self.state.period, self.state.value(), self.state.count)
+    }
+}
+
+/// Streaming MACD: `StreamingMacd(fast, slow, signal)`, `seed(prices)`,
+/// `update(price) -> (macd, signal, histogram)`
+#[pyclass(module = "rust_finance")]
+#[derive(Clone)]
+pub struct StreamingMacd {
+    fast: usize,
+    slow: usize,
+    signal: usize,
+    state: MacdState,
+}
+
+#[pymethods]
+impl StreamingMacd {
+    #[new]
+    #[pyo3(signature = (fast=12, slow=26, signal=9))]
+    fn new(fast: usize, slow: usize, signal: usize) -> PyResult<Self> {
+        let (fast, slow, signal) = (check_period("fast", fast)?, check_period("slow", slow)?, check_period("signal", signal)?);
+        Ok(StreamingMacd {
+            fast,
+            slow,
+            signal,
+            state: MacdState::new(fast, slow, signal),
+        })
+    }
+
+    /// Feed one price; returns (macd, signal, histogram), NaN during warm-up
+    fn update(&mut self, price: f64) -> (f64, f64, f64) {
+        if price.is_finite() {
+            return self.state.update(price);
+        }
+        self.value()
+    }
+
+    /// Feed a price history (same as calling `update` on each); returns the current values
+    fn seed(&mut self, py: Python<'_>, prices: Series) -> (f64, f64, f64) {
+        let prices = prices.as_slice();
+        py.allow_threads(|| {
+            for &price in prices {
+                self.update(price);
+            }
+        });
+        self.value()
+    }
+
+    /// Current (macd, signal, histogram), rebuilt from the EMAs with `MacdState`'s warm-up rules
+    #[getter]
+    fn value(&self) -> (f64, f64, f64) {
+        let count = self.state.count;
+        if count < self.slow {
+            return (f64::NAN, f64::NAN, f64::NAN);
+        }
+        let line = self.state.ema_fast - self.state.ema_slow;
+        if count + 1 < self.slow + self.signal {
+            return (line, f64::NAN, f64::NAN);
+        }
+        (line, self.state.ema_signal, line - self.state.ema_signal)
+    }
+
+    #[getter]
+    fn count(&self) -> usize {
+        self.state.count
+    }
+
+    fn to_state<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let state = PyDict::new_bound(py);
+        state.set_item("kind", "macd")?;
+        state.set_item("fast", self.fast)?;
+        state.set_item("slow", self.slow)?;
+        state.set_item("signal", self.signal)?;
+        state.set_item("ema_fast", self.state.ema_fast)?;
+        state.set_item("ema_slow", self.state.ema_slow)?;
+        state.set_item("ema_signal", self.state.ema_signal)?;
+        state.set_item("count", self.state.count)?;
+        Ok(state)
+    }
+
+    #[staticmethod]
+    fn from_state(state: &Bound<'_, PyDict>) -> PyResult<Self> {
+        check_kind(state, "macd")?;
+        let mut restored = StreamingMacd::new(field(state, "fast")?, field(state, "slow")?, field(state, "signal")?)?;
+        restored.state.ema_fast = field(state, "ema_fast")?;
+        restored.state.ema_slow = field(state, "ema_slow")?;
+        restored.state.ema_signal = field(state, "ema_signal")?;
+        restored.state.count = field(state, "count")?;
+        Ok(restored)
+    }
+
+    fn __reduce__<'py>(slf: &Bound<'py, Self>) -> PyResult<(Bound<'py, PyAny>, (Bound<'py, PyDict>,))> {
+        Ok((slf.get_type().getattr("from_state")?, (slf.borrow().to_state(slf.py())?,)))
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "StreamingMacd(fast={}, slow={}, signal={}, value={:?}, count={})",
+            self.fast, self.slow, self.signal, self.value(), self.state.count
+        )
+    }
+}
+
+/// Streaming rolling SMA: `StreamingSma(period)`, `seed(prices)`, `update(price) -> sma`
+#[pyclass(module = "rust_finance")]
+#[derive(Clone)]
+pub struct StreamingSma {
+    state: SmaState,
+}
+
+#[pymethods]
+impl StreamingSma {
+    #[new]
+    #[pyo3(signature = (period=50))]
+    fn new(period: usize) -> PyResult<Self> {
+        Ok(StreamingSma { state: SmaState::new(check_period("period", period)?) })
+    }
+
+    /// Feed one price; returns the current SMA (NaN until `period` prices are seen)
+    fn update(&mut self, price: f64) -> f64 {
+        self.state.update(price)
+    }
+
+    /// Feed a price history (same as calling `update` on each); returns the current SMA
+    fn seed(&mut self, py: Python<'_>, prices: Series) -> f64 {
+        let state = &mut self.state;
+        let prices = prices.as_slice();
+        py.allow_threads(|| prices.iter().fold(state.value(), |_, &p| state.update(p)))
+    }
+
+    #[getter]
+    fn value(&self) -> f64 {
+        self.state.value()
+    }
+
+    #[getter]
+    fn count(&self) -> usize {
+        self.state.window.len()
+    }
+
+    #[getter]
+    fn period(&self) -> usize {
+        self.state.period
+    }
+
+    fn to_state<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let state = PyDict::new_bound(py);
+        state.set_item("kind", "sma")?;
+        state.set_item("period", self.state.period)?;
+        state.set_item("window", self.state.window.iter().copied().collect::<Vec<f64>>())?;
+        Ok(state)
+    }
+
+    #[staticmethod]
+    fn from_state(state: &Bound<'_, PyDict>) -> PyResult<Self> {
+        check_kind(state, "sma")?;
+        let mut restored = StreamingSma::new(field(state, "period")?)?;
+        let window: Vec<f64> = field(state, "window")?;
+        for price in window {
+            restored.state.update(price);
+        }
+        Ok(restored)
+    }
+
+    fn __reduce__<'py>(slf: &Bound<'py, Self>) -> PyResult<(Bound<'py, PyAny>, (Bound<'py, PyDict>,))> {
+        Ok((slf.get_type().getattr("from_state")?, (slf.borrow().to_state(slf.py())?,)))
+    }
+
+    fn __repr__(&self) -> String {
+        format!("StreamingSma(period={}, value={}, count={})", self.state.period, self.state.value(), self.state.window.len())
+    }
+}
+
+/// Streaming rolling volatility of prices: `StreamingVolatility(window)`,
+/// `seed(prices)`, `update(price) -> annualized volatility`
+#[pyclass(module = "rust_finance")]
+#[derive(Clone)]
+pub struct StreamingVolatility {
+    state: VolatilityState,
+}
+
+#[pymethods]
+impl StreamingVolatility {
+    #[new]
+    #[pyo3(signature = (window=63))]
+    fn new(window: usize) -> PyResult<Self> {
+        if window < 2 {
+            return Err(PyValueError::new_err("window must be at least 2"));
+        }
+        Ok(StreamingVolatility { state: VolatilityState::new(window) })
+    }
+
+    /// Feed one price; returns the annualized volatility of the last `window` returns
+    fn update(&mut self, price: f64) -> f64 {
+        self.state.update(price)
+    }
+
+    /// Feed a price history (same as calling `update` on each); returns the current volatility
+    fn seed(&mut self, py: Python<'_>, prices: Series) -> f64 {
+        let state = &mut self.state;
+        let prices = prices.as_slice();
+        py.allow_threads(|| prices.iter().fold(state.value(), |_, &p| state.update(p)))
+    }
+
+    #[getter]
+    fn value(&self) -> f64 {
+        self.state.value()
+    }
+
+    #[getter]
+    fn count(&self) -> usize {
+        self.state.returns.len()
+    }
+
+    #[getter]
+    fn window(&self) -> usize {
+        self.state.window
+    }
+
+    fn to_state<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let state = PyDict::new_bound(py);
+        state.set_item("kind", "volatility")?;
+        state.set_item("window", self.state.window)?;
+        state.set_item("last_price", self.state.last_price)?;
+        state.set_item("returns", self.state.returns.iter().copied().collect::<Vec<f64>>())?;
+        Ok(state)
+    }
+
+    #[staticmethod]
+    fn from_state(state: &Bound<'_, PyDict>) -> PyResult<Self> {
+        check_kind(state, "volatility")?;
+        let mut restored = StreamingVolatility::new(field(state, "window")?)?;
+        restored.state = VolatilityState::from_returns(restored.state.window, field(state, "last_price")?, field(state, "returns")?);
+        Ok(restored)
+    }
+
+    fn __reduce__<'py>(slf: &Bound<'py, Self>) -> PyResult<(Bound<'py, PyAny>, (Bound<'py, PyDict>,))> {
+        Ok((slf.get_type().getattr("from_state")?, (slf.borrow().to_state(slf.py())?,)))
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "StreamingVolatility(window={}, value={}, count={})",
+            self.state.window, self.state.value(), self.state.returns.len()
+        )
+    }
+}
+
+/// Streaming drawdown: `StreamingDrawdown()`, `seed(prices)`,
+/// `update(price) -> current drawdown`; `max_drawdown` holds the worst so far
+#[pyclass(module = "rust_finance")]
+#[derive(Clone, Default)]
+pub struct StreamingDrawdown {
+    state: DrawdownState,
+}
+
+#[pymethods]
+impl StreamingDrawdown {
+    #[new]
+    fn new() -> Self {
+        StreamingDrawdown::default()
+    }
+
+    /// Feed one price; returns the drawdown from the running peak (<= 0)
+    fn update(&mut self, price: f64) -> f64 {
+        self.state.update(price)
+    }
+
+    /// Feed a price history (same as calling `update` on each); returns the current drawdown
+    fn seed(&mut self, py: Python<'_>, prices: Series) -> f64 {
+        let state = &mut self.state;
+        let prices = prices.as_slice();
+        py.allow_threads(|| prices.iter().fold(state.current, |_, &p| state.update(p)))
+    }
+
+    #[getter]
+    fn value(&self) -> f64 {
+        self.state.current
+    }
+
+    #[getter]
+    fn max_drawdown(&self) -> f64 {
+        self.state.max_drawdown
+    }
+
+    #[getter]
+    fn peak(&self) -> f64 {
+        self.state.peak
+    }
+
+    #[getter]
+    fn count(&self) -> usize {
+        self.state.count
+    }
+
+    fn to_state<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let state = PyDict::new_bound(py);
+        state.set_item("kind", "drawdown")?;
+        state.set_item("peak", self.state.peak)?;
+        state.set_item("current", self.state.current)?;
+        state.set_item("max_drawdown", self.state.max_drawdown)?;
+        state.set_item("count", self.state.count)?;
+        Ok(state)
+    }
+
+    #[staticmethod]
+    fn from_state(state: &Bound<'_, PyDict>) -> PyResult<Self> {
+        check_kind(state, "drawdown")?;
+        Ok(StreamingDrawdown {
+            state: DrawdownState {
+                peak: field(state, "peak")?,
+                current: field(state, "current")?,
+                max_drawdown: field(state, "max_drawdown")?,
+                count: field(state, "count")?,
+            },
+        })
+    }
+
+    fn __reduce__<'py>(slf: &Bound<'py, Self>) -> PyResult<(Bound<'py, PyAny>, (Bound<'py, PyDict>,))> {
+        Ok((slf.get_type().getattr("from_state")?, (slf.borrow().to_state(slf.py())?,)))
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "StreamingDrawdown(value={}, max_drawdown={}, count={})",
+            self.state.current, self.state.max_drawdown, self.state.count
+        )
+    }
+}
@@ -1,22 +1,26 @@
 //! Technical indicators module
 //! RSI, MACD, SMA, EMA, Golden/Death Cross detection
+//!
+//! Scalar functions return the latest value; `*_series` functions compute the
+//! whole indicator in one O(n) pass and return NumPy arrays (NaN during warm-up).
 
+use numpy::{IntoPyArray, PyArray1, PyReadonlyArray1};
 use pyo3::prelude::*;
+use pyo3::types::{PyDict, PyList};
 
-/// Calculate Simple Moving Average
-#[pyfunction]
-pub fn calculate_sma(prices: Vec<f64>, period: usize) -> f64 {
+use crate::input::Series;
+
+/// Simple Moving Average of the last `period` prices
+pub fn sma(prices: &[f64], period: usize) -> f64 {
     if prices.len() < period || period == 0 {
         return 0.0;
     }
     
-    let recent: Vec<&f64> = prices.iter().rev().take(period).collect();
-    recent.iter().copied().sum::<f64>() / period as f64
+    prices[prices.len() - period..].iter().sum::<f64>() / period as f64
 }
 
-/// Calculate Exponential Moving Average
-#[pyfunction]
-pub fn calculate_ema(prices: Vec<f64>, period: usize) -> f64 {
+/// Exponential Moving Average seeded with the first price
+pub fn ema(prices: &[f64], period: usize) -> f64 {
     if prices.is_empty() || period == 0 {
         return 0.0;
     }
@@ -31,30 +35,25 @@ pub fn calculate_ema(prices: Vec<f64>, period: usize) -> f64 {
     ema
 }
 
-/// Calculate RSI (Relative Strength Index)
-#[pyfunction]
-pub fn calculate_rsi(prices: Vec<f64>, period: usize) -> f64 {
+/// RSI from the average gain / loss of the last `period` changes
+pub fn rsi(prices: &[f64], period: usize) -> f64 {
     if prices.len() < period + 1 {
         return 50.0;  // Neutral default
     }
     
-    let mut gains = Vec::new();
-    let mut losses = Vec::new();
-    
-    for i in 1..prices.len() {
-        let change = prices[i] - prices[i - 1];
+    // Use last 'period' changes
+    let mut gains = 0.0;
+    let mut losses = 0.0;
+    for window in prices[prices.len() - period - 1..].windows(2) {
+        let change = window[1] - window[0];
         if change > 0.0 {
-            gains.push(change);
-            losses.push(0.0);
+            gains += change;
         } else {
-            gains.push(0.0);
-            losses.push(change.abs());
+            losses += change.abs();
         }
     }
-    
-    // Use last 'period' values
-    let recent_gains: f64 = gains.iter().rev().take(period).sum::<f64>() / period as f64;
-    let recent_losses: f64 = losses.iter().rev().take(period).sum::<f64>() / period as f64;
+    let recent_gains = gains / period as f64;
+    let recent_losses = losses / period as f64;
     
     if recent_losses == 0.0 {
         return 100.0;
@@ -64,57 +63,430 @@ pub fn calculate_rsi(prices: Vec<f64>, period: usize) -> f64 {
     100.0 - (100.0 / (1.0 + rs))
 }
 
-/// Calculate MACD (returns macd_line, signal_line, histogram)
-#[pyfunction]
-pub fn calculate_macd(prices: Vec<f64>) -> (f64, f64, f64) {
-    if prices.len() < 26 {
-        return (0.0, 0.0, 0.0);
+/// Incremental MACD: the fast and slow EMAs of price and the signal EMA of their
+/// difference, updated together per bar. EMAs are seeded with the first price; the
+/// signal EMA is seeded with the first MACD value (bar `slow - 1`).
+#[derive(Clone, Copy, Debug)]
+pub struct MacdState {
+    fast_k: f64,
+    slow_k: f64,
+    signal_k: f64,
+    slow: usize,
+    signal: usize,
+    pub(crate) ema_fast: f64,
+    pub(crate) ema_slow: f64,
+    pub(crate) ema_signal: f64,
+    pub(crate) count: usize,
+}
+
+impl MacdState {
+    pub fn new(fast: usize, slow: usize, signal: usize) -> Self {
+        MacdState {
+            fast_k: 2.0 / (fast as f64 + 1.0),
+            slow_k: 2.0 / (slow as f64 + 1.0),
+            signal_k: 2.0 / (signal as f64 + 1.0),
+            slow,
+            signal,
+            ema_fast: 0.0,
+            ema_slow: 0.0,
+            ema_signal: 0.0,
+            count: 0,
+        }
+    }
+
+    /// Feed one price; returns (macd_line, signal_line, histogram), NaN during warm-up
+    pub fn update(&mut self, price: f64) -> (f64, f64, f64) {
+        if self.count == 0 {
+            self.ema_fast = price;
+            self.ema_slow = price;
+        } else {
+            self.ema_fast += (price - self.ema_fast) * self.fast_k;
+            self.ema_slow += (price - self.ema_slow) * self.slow_k;
+        }
+        self.count += 1;
+
+        if self.count < self.slow {
+            return (f64::NAN, f64::NAN, f64::NAN);
+        }
+        let line = self.ema_fast - self.ema_slow;
+        if self.count == self.slow {
+            self.ema_signal = line;
+        } else {
+            self.ema_signal += (line - self.ema_signal) * self.signal_k;
+        }
+        if self.count + 1 < self.slow + self.signal {
+            return (line, f64::NAN, f64::NAN);
+        }
+        (line, self.ema_signal, line - self.ema_signal)
     }
-    
-    let ema_12 = calculate_ema(prices.clone(), 12);
-    let ema_26 = calculate_ema(prices.clone(), 26);
-    let macd_line = ema_12 - ema_26;
-    
-    // For signal line, we'd need MACD history - simplified here
-    let signal_line = macd_line * 0.9;  // Approximation
-    let histogram = macd_line - signal_line;
-    
-    (macd_line, signal_line, histogram)
 }
 
-/// Detect Golden Cross (SMA50 crosses above SMA200)
-#[pyfunction]
-pub fn detect_golden_cross(prices: Vec<f64>) -> bool {
+/// MACD for the last two bars in one pass without allocating:
+/// ((macd, signal, histogram) now, (macd, signal, histogram) on the previous bar).
+/// Values are NaN until there is enough history.
+pub fn macd(prices: &[f64], fast: usize, slow: usize, signal: usize) -> ((f64, f64, f64), (f64, f64, f64)) {
+    let nan = (f64::NAN, f64::NAN, f64::NAN);
+    if fast == 0 || slow == 0 || signal == 0 {
+        return (nan, nan);
+    }
+    let mut state = MacdState::new(fast, slow, signal);
+    let mut previous = nan;
+    let mut current = nan;
+    for &price in prices {
+        previous = current;
+        current = state.update(price);
+    }
+    (current, previous)
+}
+
+// === Full-series kernels (O(n), NaN until enough data) ===
+
+/// Running sum of prices, shared by every SMA period in one pass
+fn cumulative_sum(prices: &[f64]) -> Vec<f64> {
+    let mut sums = Vec::with_capacity(prices.len() + 1);
+    let mut total = 0.0;
+    sums.push(total);
+    for price in prices {
+        total += price;
+        sums.push(total);
+    }
+    sums
+}
+
+fn sma_series_from_sums(sums: &[f64], period: usize) -> Vec<f64> {
+    let n = sums.len() - 1;
+    let mut out = vec![f64::NAN; n];
+    if period == 0 || n < period {
+        return out;
+    }
+    for i in period - 1..n {
+        out[i] = (sums[i + 1] - sums[i + 1 - period]) / period as f64;
+    }
+    out
+}
+
+/// Simple Moving Average at every point
+pub fn sma_series(prices: &[f64], period: usize) -> Vec<f64> {
+    sma_series_from_sums(&cumulative_sum(prices), period)
+}
+
+/// Exponential Moving Average at every point, seeded with the first price (matches `ema`)
+pub fn ema_series(prices: &[f64], period: usize) -> Vec<f64> {
+    if prices.is_empty() || period == 0 {
+        return vec![f64::NAN; prices.len()];
+    }
+    let multiplier = 2.0 / (period as f64 + 1.0);
+    let mut out = Vec::with_capacity(prices.len());
+    let mut ema = prices[0];
+    out.push(ema);
+    for price in prices.iter().skip(1) {
+        ema = (price - ema) * multiplier + ema;
+        out.push(ema);
+    }
+    out
+}
+
+/// Wilder RSI at every point: simple average of the first `period` changes, then Wilder smoothing
+pub fn rsi_series(prices: &[f64], period: usize) -> Vec<f64> {
+    let n = prices.len();
+    let mut out = vec![f64::NAN; n];
+    if period == 0 || n < period + 1 {
+        return out;
+    }
+
+    let to_rsi = |avg_gain: f64, avg_loss: f64| {
+        if avg_loss == 0.0 {
+            100.0
+        } else {
+            100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        }
+    };
+
+    let mut avg_gain = 0.0;
+    let mut avg_loss = 0.0;
+    for i in 1..=period {
+        let change = prices[i] - prices[i - 1];
+        if change > 0.0 {
+            avg_gain += change;
+        } else {
+            avg_loss -= change;
+        }
+    }
+    avg_gain /= period as f64;
+    avg_loss /= period as f64;
+    out[period] = to_rsi(avg_gain, avg_loss);
+
+    let p = period as f64;
+    for i in period + 1..n {
+        let change = prices[i] - prices[i - 1];
+        let (gain, loss) = if change > 0.0 { (change, 0.0) } else { (0.0, -change) };
+        avg_gain = (avg_gain * (p - 1.0) + gain) / p;
+        avg_loss = (avg_loss * (p - 1.0) + loss) / p;
+        out[i] = to_rsi(avg_gain, avg_loss);
+    }
+    out
+}
+
+/// MACD line, signal line and histogram at every point (see `MacdState` for warm-up)
+pub fn macd_series(prices: &[f64], fast: usize, slow: usize, signal: usize) -> (Vec<f64>, Vec<f64>, Vec<f64>) {
+    let n = prices.len();
+    if fast == 0 || slow == 0 || signal == 0 {
+        return (vec![f64::NAN; n], vec![f64::NAN; n], vec![f64::NAN; n]);
+    }
+    let mut line = Vec::with_capacity(n);
+    let mut signal_line = Vec::with_capacity(n);
+    let mut histogram = Vec::with_capacity(n);
+    let mut state = MacdState::new(fast, slow, signal);
+    for &price in prices {
+        let (m, s, h) = state.update(price);
+        line.push(m);
+        signal_line.push(s);
+        histogram.push(h);
+    }
+    (line, signal_line, histogram)
+}
+
+/// Several indicators over one price series, sharing the SMA running sum.
+/// Keys: sma_<p>, ema_<p>, rsi_<p>, macd, macd_signal, macd_hist
+pub fn indicator_series(
+    prices: &[f64],
+    sma_periods: &[usize],
+    ema_periods: &[usize],
+    rsi_periods: &[usize],
+    macd: Option<(usize, usize, usize)>,
+) -> Vec<(String, Vec<f64>)> {
+    let mut out = Vec::new();
+    if !sma_periods.is_empty() {
+        let sums = cumulative_sum(prices);
+        for &period in sma_periods {
+            out.push((format!("sma_{}", period), sma_series_from_sums(&sums, period)));
+        }
+    }
+    for &period in ema_periods {
+        out.push((format!("ema_{}", period), ema_series(prices, period)));
+    }
+    for &period in rsi_periods {
+        out.push((format!("rsi_{}", period), rsi_series(prices, period)));
+    }
+    if let Some((fast, slow, signal)) = macd {
+        let (line, signal_line, histogram) = macd_series(prices, fast, slow, signal);
+        out.push(("macd".to_string(), line));
+        out.push(("macd_signal".to_string(), signal_line));
+        out.push(("macd_hist".to_string(), histogram));
+    }
+    out
+}
+
+/// A moving-average crossover: `golden` when the fast MA moves above the slow MA
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub struct CrossEvent {
+    pub index: usize,
+    pub golden: bool,
+}
+
+/// Every crossover of SMA(fast) and SMA(slow) in one rolling pass.
+/// Returns the events and the current regime: 1 (fast above slow), -1 (below), 0 (unknown).
+/// A touch (equal MAs) is not a cross; the cross is recorded when the order actually flips.
+pub fn crossover_events(prices: &[f64], fast: usize, slow: usize) -> (Vec<CrossEvent>, i8) {
+    let mut events = Vec::new();
+    if fast == 0 || slow == 0 || fast == slow {
+        return (events, 0);
+    }
+
+    let warmup = fast.max(slow) - 1;
+    let mut sum_fast = 0.0;
+    let mut sum_slow = 0.0;
+    let mut regime: i8 = 0;
+    for i in 0..prices.len() {
+        sum_fast += prices[i];
+        sum_slow += prices[i];
+        if i >= fast {
+            sum_fast -= prices[i - fast];
+        }
+        if i >= slow {
+            sum_slow -= prices[i - slow];
+        }
+        if i < warmup {
+            continue;
+        }
+
+        let diff = sum_fast / fast as f64 - sum_slow / slow as f64;
+        let sign: i8 = if diff > 0.0 { 1 } else if diff < 0.0 { -1 } else { 0 };
+        if sign == 0 {
+            continue;
+        }
+        if regime != 0 && sign != regime {
+            events.push(CrossEvent { index: i, golden: sign > 0 });
+        }
+        regime = sign;
+    }
+    (events, regime)
+}
+
+/// Golden (Some(true)) or death (Some(false)) cross of SMA50 / SMA200 on the last bar
+fn last_bar_cross(prices: &[f64]) -> Option<bool> {
     if prices.len() < 201 {
-        return false;
+        return None;
     }
-    
-    let sma_50_now = calculate_sma(prices.clone(), 50);
-    let sma_200_now = calculate_sma(prices.clone(), 200);
-    
-    // Check previous day
-    let prices_prev: Vec<f64> = prices[..prices.len()-1].to_vec();
-    let sma_50_prev = calculate_sma(prices_prev.clone(), 50);
-    let sma_200_prev = calculate_sma(prices_prev, 200);
-    
-    // Golden cross: SMA50 was below SMA200, now above
-    sma_50_prev < sma_200_prev && sma_50_now > sma_200_now
+    // Only the last two SMA pairs matter, so scan just the last 201 prices
+    let tail = &prices[prices.len() - 201..];
+    let (events, _) = crossover_events(tail, 50, 200);
+    events.last().filter(|e| e.index == tail.len() - 1).map(|e| e.golden)
 }
 
-/// Detect Death Cross (SMA50 crosses below SMA200)
+/// Calculate Simple Moving Average
 #[pyfunction]
-pub fn detect_death_cross(prices: Vec<f64>) -> bool {
-    if prices.len() < 201 {
-        return false;
+pub fn calculate_sma(prices: Series, period: usize) -> f64 {
+    sma(prices.as_slice(), period)
+}
+
+/// Calculate Exponential Moving Average
+#[pyfunction]
+pub fn calculate_ema(prices: Series, period: usize) -> f64 {
+    ema(prices.as_slice(), period)
+}
+
+/// Calculate RSI (Relative Strength Index)
+#[pyfunction]
+pub fn calculate_rsi(prices: Series, period: usize) -> f64 {
+    rsi(prices.as_slice(), period)
+}
+
+/// Calculate MACD in one pass with a real signal EMA.
+/// Returns ((macd_line, signal_line, histogram), (previous bar's macd_line, signal_line, histogram));
+/// compare the two histograms to detect a signal-line crossover. NaN until enough history.
+#[pyfunction]
+#[pyo3(signature = (prices, fast=12, slow=26, signal=9))]
+pub fn calculate_macd(prices: Series, fast: usize, slow: usize, signal: usize) -> ((f64, f64, f64), (f64, f64, f64)) {
+    macd(prices.as_slice(), fast, slow, signal)
+}
+
+/// Scan a price series for every crossover of SMA(fast) and SMA(slow) in one O(n) pass.
+///
+/// `timestamps` (optional, same length, e.g. `DatetimeIndex.asi8`) are echoed on each event.
+/// Returns a dict:
+///   events: [{"index", "type": "golden" | "death", "timestamp"?}, ...] (oldest first)
+///   last_cross: "golden" | "death" | None
+///   days_since_last_cross: bars since the last cross | None
+///   regime: "bullish" (fast above slow) | "bearish" | None
+#[pyfunction]
+#[pyo3(signature = (prices, fast=50, slow=200, timestamps=None))]
+pub fn scan_crossovers<'py>(
+    py: Python<'py>,
+    prices: Series<'py>,
+    fast: usize,
+    slow: usize,
+    timestamps: Option<PyReadonlyArray1<'py, i64>>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let prices = prices.as_slice();
+    let timestamps = timestamps.as_ref().map(|t| t.as_array());
+    if let Some(ts) = &timestamps {
+        if ts.len() != prices.len() {
+            return Err(pyo3::exceptions::PyValueError::new_err("timestamps must have the same length as prices"));
+        }
     }
-    
-    let sma_50_now = calculate_sma(prices.clone(), 50);
-    let sma_200_now = calculate_sma(prices.clone(), 200);
-    
-    let prices_prev: Vec<f64> = prices[..prices.len()-1].to_vec();
-    let sma_50_prev = calculate_sma(prices_prev.clone(), 50);
-    let sma_200_prev = calculate_sma(prices_prev, 200);
-    
-    // Death cross: SMA50 was above SMA200, now below
-    sma_50_prev > sma_200_prev && sma_50_now < sma_200_now
+    let (events, regime) = py.allow_threads(|| crossover_events(prices, fast, slow));
+
+    let kind = |golden: bool| if golden { "golden" } else { "death" };
+    let event_list = PyList::empty_bound(py);
+    for event in &events {
+        let item = PyDict::new_bound(py);
+        item.set_item("index", event.index)?;
+        item.set_item("type", kind(event.golden))?;
+        if let Some(ts) = &timestamps {
+            item.set_item("timestamp", ts[event.index])?;
+        }
+        event_list.append(item)?;
+    }
+
+    let result = PyDict::new_bound(py);
+    result.set_item("events", event_list)?;
+    result.set_item("fast", fast)?;
+    result.set_item("slow", slow)?;
+    match events.last() {
+        Some(last) => {
+            result.set_item("last_cross", kind(last.golden))?;
+            result.set_item("days_since_last_cross", prices.len() - 1 - last.index)?;
+        }
+        None => {
+            result.set_item("last_cross", py.None())?;
+            result.set_item("days_since_last_cross", py.None())?;
+        }
+    }
+    match regime {
+        1 => result.set_item("regime", "bullish")?,
+        -1 => result.set_item("regime", "bearish")?,
+        _ => result.set_item("regime", py.None())?,
+    }
+    Ok(result)
+}
+
+/// Detect Golden Cross (SMA50 crosses above SMA200 on the last bar)
+#[pyfunction]
+pub fn detect_golden_cross(prices: Series) -> bool {
+    last_bar_cross(prices.as_slice()) == Some(true)
+}
+
+/// Detect Death Cross (SMA50 crosses below SMA200 on the last bar)
+#[pyfunction]
+pub fn detect_death_cross(prices: Series) -> bool {
+    last_bar_cross(prices.as_slice()) == Some(false)
+}
+
+/// Simple Moving Average for every bar (NumPy array, NaN during warm-up)
+#[pyfunction]
+pub fn calculate_sma_series<'py>(py: Python<'py>, prices: Series<'py>, period: usize) -> Bound<'py, PyArray1<f64>> {
+    let prices = prices.as_slice();
+    py.allow_threads(|| sma_series(prices, period)).into_pyarray_bound(py)
+}
+
+/// Exponential Moving Average for every bar (NumPy array)
+#[pyfunction]
+pub fn calculate_ema_series<'py>(py: Python<'py>, prices: Series<'py>, period: usize) -> Bound<'py, PyArray1<f64>> {
+    let prices = prices.as_slice();
+    py.allow_threads(|| ema_series(prices, period)).into_pyarray_bound(py)
+}
+
+/// Wilder RSI for every bar (NumPy array, NaN during warm-up)
+#[pyfunction]
+#[pyo3(signature = (prices, period=14))]
+pub fn calculate_rsi_series<'py>(py: Python<'py>, prices: Series<'py>, period: usize) -> Bound<'py, PyArray1<f64>> {
+    let prices = prices.as_slice();
+    py.allow_threads(|| rsi_series(prices, period)).into_pyarray_bound(py)
+}
+
+/// MACD line, signal line and histogram for every bar (three NumPy arrays)
+#[pyfunction]
+#[pyo3(signature = (prices, fast=12, slow=26, signal=9))]
+pub fn calculate_macd_series<'py>(
+    py: Python<'py>,
+    prices: Series<'py>,
+    fast: usize,
+    slow: usize,
+    signal: usize,
+) -> (Bound<'py, PyArray1<f64>>, Bound<'py, PyArray1<f64>>, Bound<'py, PyArray1<f64>>) {
+    let prices = prices.as_slice();
+    let (line, signal_line, histogram) = py.allow_threads(|| macd_series(prices, fast, slow, signal));
+    (line.into_pyarray_bound(py), signal_line.into_pyarray_bound(py), histogram.into_pyarray_bound(py))
+}
+
+/// Compute several indicators and periods in one call.
+/// Returns a dict of NumPy arrays keyed sma_<p>, ema_<p>, rsi_<p>, macd, macd_signal, macd_hist.
+#[pyfunction]
+#[pyo3(signature = (prices, sma_periods=vec![50, 200], ema_periods=vec![], rsi_periods=vec![14], macd=Some((12, 26, 9))))]
+pub fn calculate_indicator_series<'py>(
+    py: Python<'py>,
+    prices: Series<'py>,
+    sma_periods: Vec<usize>,
+    ema_periods: Vec<usize>,
+    rsi_periods: Vec<usize>,
+    macd: Option<(usize, usize, usize)>,
+) -> PyResult<Bound<'py, PyDict>> {
+    let prices = prices.as_slice();
+    let series = py.allow_threads(|| indicator_series(prices, &sma_periods, &ema_periods, &rsi_periods, macd));
+    let result = PyDict::new_bound(py);
+    for (name, values) in series {
+        result.set_item(name, values.into_pyarray_bound(py))?;
+    }
+    Ok(result)
 }
@@ -0,0 +1,221 @@
+//! Timeframes module
+//! Weekly, Monthly, Quarterly and Yearly bars from a daily series in one pass
+//!
+//! Dates are int64 days since 1970-01-01 (see `input::Dates`). Periods are
+//! calendar periods labelled by their last calendar day, like pandas
+//! `resample("W" | "ME" | "QE" | "YE")`: weeks run Monday to Sunday.
+//! NaN / inf values are skipped; a period whose values are all missing still
+//! produces a bar (NaN prices, zero sum and count).
+
+use numpy::IntoPyArray;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::input::{Dates, Series};
+
+/// Calendar period a bar covers
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum Frequency {
+    Weekly,
+    Monthly,
+    Quarterly,
+    Yearly,
+}
+
+impl Frequency {
+    /// "W", "M", "Q" or "Y"
+    pub fn parse(code: &str) -> Option<Self> {
+        match code {
+            "W" => Some(Frequency::Weekly),
+            "M" => Some(Frequency::Monthly),
+            "Q" => Some(Frequency::Quarterly),
+            "Y" => Some(Frequency::Yearly),
+            _ => None,
+        }
+    }
+
+    pub fn code(&self) -> &'static str {
+        match self {
+            Frequency::Weekly => "W",
+            Frequency::Monthly => "M",
+            Frequency::Quarterly => "Q",
+            Frequency::Yearly => "Y",
+        }
+    }
+
+    /// Consecutive integer id of the period containing `day`
+    pub fn period(&self, day: i64) -> i64 {
+        self.period_of(day, month_index(day))
+    }
+
+    /// `period` when the month index of `day` is already known
+    fn period_of(&self, day: i64, month: i64) -> i64 {
+        match self {
+            // 1970-01-01 was a Thursday; +3 moves week boundaries to Mondays
+            Frequency::Weekly => (day + 3).div_euclid(7),
+            Frequency::Monthly => month,
+            Frequency::Quarterly => month.div_euclid(3),
+            Frequency::Yearly => month.div_euclid(12),
+        }
+    }
+
+    /// Last calendar day of a period id
+    pub fn period_end(&self, period: i64) -> i64 {
+        let first_of_month = |months: i64| days_from_civil(months.div_euclid(12), (months.rem_euclid(12) + 1) as u32, 1);
+        match self {
+            Frequency::Weekly => period * 7 + 3,
+            Frequency::Monthly => first_of_month(period + 1) - 1,
+            Frequency::Quarterly => first_of_month(period * 3 + 3) - 1,
+            Frequency::Yearly => first_of_month(period * 12 + 12) - 1,
+        }
+    }
+}
+
+/// Days since 1970-01-01 for a proleptic Gregorian date (H. Hinnant's algorithm)
+pub fn days_from_civil(year: i64, month: u32, day: u32) -> i64 {
+    let y = if month <= 2 { year - 1 } else { year };
+    let era = y.div_euclid(400);
+    let yoe = y - era * 400;
+    let m = month as i64;
+    let doy = (153 * (if m > 2 { m - 3 } else { m + 9 }) + 2) / 5 + day as i64 - 1;
+    let doe = yoe * 365 + yoe / 4 - yoe / 100 + doy;
+    era * 146_097 + doe - 719_468
+}
+
+/// (year, month) of a day number
+pub fn civil_from_days(day: i64) -> (i64, u32) {
+    let z = day + 719_468;
+    let era = z.div_euclid(146_097);
+    let doe = z - era * 146_097;
+    let yoe = (doe - doe / 1460 + doe / 36_524 - doe / 146_096) / 365;
+    let doy = doe - (365 * yoe + yoe / 4 - yoe / 100);
+    let mp = (5 * doy + 2) / 153;
+    let month = if mp < 10 { mp + 3 } else { mp - 9 } as u32;
+    let year = yoe + era * 400 + if month <= 2 { 1 } else { 0 };
+    (year, month)
+}
+
+/// Months since January of year 0 (year * 12 + month - 1)
+fn month_index(day: i64) -> i64 {
+    let (year, month) = civil_from_days(day);
+    year * 12 + month as i64 - 1
+}
+
+/// Bars for one frequency, oldest first
+#[derive(Debug, Clone, Default)]
+pub struct Bars {
+    /// Last calendar day of each period (days since epoch)
+    pub period_end: Vec<i64>,
+    pub open: Vec<f64>,
+    pub high: Vec<f64>,
+    pub low: Vec<f64>,
+    /// Last valid value in the period (resample(...).last())
+    pub close: Vec<f64>,
+    pub sum: Vec<f64>,
+    /// Valid values in the period
+    pub count: Vec<i64>,
+}
+
+impl Bars {
+    fn open_bar(&mut self, frequency: Frequency, period: i64) {
+        self.period_end.push(frequency.period_end(period));
+        self.open.push(f64::NAN);
+        self.high.push(f64::NAN);
+        self.low.push(f64::NAN);
+        self.close.push(f64::NAN);
+        self.sum.push(0.0);
+        self.count.push(0);
+    }
+
+    fn add(&mut self, value: f64) {
+        let i = self.close.len() - 1;
+        if self.count[i] == 0 {
+            self.open[i] = value;
+            self.high[i] = value;
+            self.low[i] = value;
+        } else {
+            self.high[i] = self.high[i].max(value);
+            self.low[i] = self.low[i].min(value);
+        }
+        self.close[i] = value;
+        self.sum[i] += value;
+        self.count[i] += 1;
+    }
+}
+
+/// Aggregate a daily series into bars for every frequency in a single pass.
+///
+/// `days` must be sorted ascending (repeated days are fine). With `fill_gaps`,
+/// calendar periods without any observation between the first and last one are
+/// emitted as empty bars (pandas resample behaviour); otherwise they are skipped.
+pub fn aggregate(days: &[i64], values: &[f64], frequencies: &[Frequency], fill_gaps: bool) -> Vec<Bars> {
+    let mut bars = vec![Bars::default(); frequencies.len()];
+    let mut current: Vec<Option<i64>> = vec![None; frequencies.len()];
+    let calendar = frequencies.iter().any(|f| *f != Frequency::Weekly);
+    for (&day, &value) in days.iter().zip(values) {
+        // One calendar conversion per day, shared by the month / quarter / year bars
+        let month = if calendar { month_index(day) } else { 0 };
+        for (k, frequency) in frequencies.iter().enumerate() {
+            let period = frequency.period_of(day, month);
+            if current[k] != Some(period) {
+                if let (true, Some(previous)) = (fill_gaps, current[k]) {
+                    for gap in previous + 1..period {
+                        bars[k].open_bar(*frequency, gap);
+                    }
+                }
+                bars[k].open_bar(*frequency, period);
+                current[k] = Some(period);
+            }
+            if value.is_finite() {
+                bars[k].add(value);
+            }
+        }
+    }
+    bars
+}
+
+/// Weekly / monthly / quarterly / yearly bars from one daily series.
+///
+/// `dates` are int64 days since 1970-01-01, sorted ascending, one per value.
+/// `frequencies` are any of "W", "M", "Q", "Y".
+/// Returns a dict keyed by frequency, each a dict of NumPy arrays (oldest first):
+/// period_end (days since epoch), open, high, low, close, sum, count.
+/// The arrays feed straight into the indicator kernels, e.g.
+/// `calculate_sma(bars["W"]["close"], 200)`.
+#[pyfunction]
+#[pyo3(signature = (dates, values, frequencies=vec!["W".to_string(), "M".to_string(), "Q".to_string(), "Y".to_string()], fill_gaps=false))]
+pub fn aggregate_bars<'py>(
+    py: Python<'py>,
+    dates: Dates<'py>,
+    values: Series<'py>,
+    frequencies: Vec<String>,
+    fill_gaps: bool,
+) -> PyResult<Bound<'py, PyDict>> {
+    let (days, values) = (dates.as_slice(), values.as_slice());
+    if days.len() != values.len() {
+        return Err(pyo3::exceptions::PyValueError::new_err("dates and values must have the same length"));
+    }
+    if days.windows(2).any(|w| w[0] > w[1]) {
+        return Err(pyo3::exceptions::PyValueError::new_err("dates must be sorted ascending"));
+    }
+    let parsed = frequencies.iter()
+        .map(|code| Frequency::parse(code).ok_or_else(|| {
+            pyo3::exceptions::PyValueError::new_err(format!("unknown frequency '{}' (use W, M, Q or Y)", code))
+        }))
+        .collect::<PyResult<Vec<Frequency>>>()?;
+    let all_bars = py.allow_threads(|| aggregate(days, values, &parsed, fill_gaps));
+
+    let result = PyDict::new_bound(py);
+    for (frequency, bars) in parsed.iter().zip(all_bars) {
+        let entry = PyDict::new_bound(py);
+        entry.set_item("period_end", bars.period_end.into_pyarray_bound(py))?;
+        entry.set_item("open", bars.open.into_pyarray_bound(py))?;
+        entry.set_item("high", bars.high.into_pyarray_bound(py))?;
+        entry.set_item("low", bars.low.into_pyarray_bound(py))?;
+        entry.set_item("close", bars.close.into_pyarray_bound(py))?;
+        entry.set_item("sum", bars.sum.into_pyarray_bound(py))?;
+        entry.set_item("count", bars.count.into_pyarray_bound(py))?;
+        result.set_item(frequency.code(), entry)?;
+    }
+    Ok(result)
+}
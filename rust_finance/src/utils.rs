@@ -1,11 +1,16 @@
 //! Utility functions for trend detection and data processing
 
+use numpy::IntoPyArray;
 use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::input::{Matrix, Series};
 
 /// Detect trend direction from a series of values
 /// Returns: "increasing", "decreasing", or "stable"
 #[pyfunction]
-pub fn detect_trend(values: Vec<f64>) -> String {
+pub fn detect_trend(values: Series) -> String {
+    let values = values.as_slice();
     if values.len() < 2 {
         return "stable".to_string();
     }
@@ -49,3 +54,130 @@ pub fn calculate_pct_change(old_value: f64, new_value: f64) -> f64 {
 pub fn detect_volume_spike(current_volume: f64, avg_volume: f64) -> bool {
     current_volume > avg_volume * 1.5
 }
+
+/// Growth statistics for one financial-statement line (see `statement_trend`)
+#[derive(Debug, Clone, Copy)]
+pub struct StatementTrend {
+    pub observations: usize,
+    /// "increasing", "decreasing", "stable" or "unknown" (fewer than two values)
+    pub trend: &'static str,
+    /// Least-squares slope per period
+    pub slope: f64,
+    pub r_squared: f64,
+    /// First to last valid value, per year; NaN unless both are positive
+    pub cagr: f64,
+    /// Last valid value vs the one before it, % of |previous| (QoQ or YoY)
+    pub pct_change: f64,
+    /// Share of period-over-period changes that were increases (0..1)
+    pub consistency: f64,
+}
+
+/// Trend, slope, CAGR, latest % change and consistency for one statement line.
+///
+/// `values` run oldest to newest, one per period; NaN / inf mark missing periods
+/// and are skipped (gaps still count toward the time axis). The label compares
+/// the fitted change over the window with max(|mean|, 1): above `threshold` is
+/// "increasing", below -`threshold` is "decreasing".
+pub fn statement_trend(values: &[f64], periods_per_year: f64, threshold: f64) -> StatementTrend {
+    let points: Vec<(f64, f64)> = values.iter().enumerate()
+        .filter(|(_, v)| v.is_finite())
+        .map(|(i, &v)| (i as f64, v))
+        .collect();
+    let n = points.len();
+    if n < 2 {
+        return StatementTrend {
+            observations: n,
+            trend: "unknown",
+            slope: f64::NAN,
+            r_squared: f64::NAN,
+            cagr: f64::NAN,
+            pct_change: f64::NAN,
+            consistency: f64::NAN,
+        };
+    }
+
+    let mean_x = points.iter().map(|p| p.0).sum::<f64>() / n as f64;
+    let mean_y = points.iter().map(|p| p.1).sum::<f64>() / n as f64;
+    let (mut sxx, mut sxy, mut syy) = (0.0, 0.0, 0.0);
+    for &(x, y) in &points {
+        sxx += (x - mean_x) * (x - mean_x);
+        sxy += (x - mean_x) * (y - mean_y);
+        syy += (y - mean_y) * (y - mean_y);
+    }
+    let slope = sxy / sxx;
+    let r_squared = if syy > 0.0 { sxy * sxy / (sxx * syy) } else { f64::NAN };
+
+    let (first, last) = (points[0], points[n - 1]);
+    let span = last.0 - first.0;
+    let change = slope * span / mean_y.abs().max(1.0);
+    let trend = if change > threshold {
+        "increasing"
+    } else if change < -threshold {
+        "decreasing"
+    } else {
+        "stable"
+    };
+
+    let years = span / periods_per_year;
+    let cagr = if first.1 > 0.0 && last.1 > 0.0 && years > 0.0 {
+        (last.1 / first.1).powf(1.0 / years) - 1.0
+    } else {
+        f64::NAN
+    };
+    let previous = points[n - 2].1;
+    let pct_change = if previous != 0.0 { (last.1 - previous) / previous.abs() * 100.0 } else { f64::NAN };
+    let increases = points.windows(2).filter(|w| w[1].1 > w[0].1).count();
+
+    StatementTrend {
+        observations: n,
+        trend,
+        slope,
+        r_squared,
+        cagr,
+        pct_change,
+        consistency: increases as f64 / (n - 1) as f64,
+    }
+}
+
+/// `statement_trend` for every row of a (series, periods) matrix laid out row-major
+pub fn statement_trends(data: &[f64], n_series: usize, n_periods: usize, periods_per_year: f64, threshold: f64) -> Vec<StatementTrend> {
+    if n_periods == 0 {
+        return vec![statement_trend(&[], periods_per_year, threshold); n_series];
+    }
+    // A statement has a few dozen short lines; the per-row work is too small to spread over threads
+    data.chunks(n_periods)
+        .map(|row| statement_trend(row, periods_per_year, threshold))
+        .collect()
+}
+
+/// Trend and growth statistics for many financial-statement series in one call.
+///
+/// `matrix` is a 2-D float64 array shaped (series, periods), oldest period first,
+/// NaN-padded where a series is shorter or a period is missing.
+/// `periods_per_year` is 4 for quarterly and 1 for annual statements.
+/// Returns a dict: trend (list of labels) and NumPy arrays observations, slope,
+/// r_squared, cagr, pct_change and consistency (one value per series).
+#[pyfunction]
+#[pyo3(signature = (matrix, periods_per_year=1.0, threshold=0.05))]
+pub fn calculate_statement_trends<'py>(
+    py: Python<'py>,
+    matrix: Matrix<'py>,
+    periods_per_year: f64,
+    threshold: f64,
+) -> PyResult<Bound<'py, PyDict>> {
+    if !(periods_per_year > 0.0) {
+        return Err(pyo3::exceptions::PyValueError::new_err("periods_per_year must be positive"));
+    }
+    let rows = statement_trends(matrix.as_slice(), matrix.rows(), matrix.cols(), periods_per_year, threshold);
+
+    let column = |f: fn(&StatementTrend) -> f64| rows.iter().map(f).collect::<Vec<f64>>();
+    let result = PyDict::new_bound(py);
+    result.set_item("trend", rows.iter().map(|r| r.trend).collect::<Vec<&str>>())?;
+    result.set_item("observations", rows.iter().map(|r| r.observations as i64).collect::<Vec<i64>>().into_pyarray_bound(py))?;
+    result.set_item("slope", column(|r| r.slope).into_pyarray_bound(py))?;
+    result.set_item("r_squared", column(|r| r.r_squared).into_pyarray_bound(py))?;
+    result.set_item("cagr", column(|r| r.cagr).into_pyarray_bound(py))?;
+    result.set_item("pct_change", column(|r| r.pct_change).into_pyarray_bound(py))?;
+    result.set_item("consistency", column(|r| r.consistency).into_pyarray_bound(py))?;
+    Ok(result)
+}
@@ -2,6 +2,8 @@ import requests
 from typing import Optional, Dict, Any
 from langchain_core.tools import StructuredTool
 from utils import config
+from utils.tracing import tracer
+from utils.cli_logger import api_logger
 
 
 class AlphaVantageAPIKeyError(Exception):
@@ -38,7 +40,12 @@ class AlphaVantageClient:
         }
         
         try:
-            response = requests.get(self.BASE_URL, params=params)
+            with tracer.span(f"alpha_vantage.{function}", category="http", ticker=symbol, endpoint=function) as span, \
+                    api_logger.call("alpha_vantage", function, symbol) as call:
+                response = requests.get(self.BASE_URL, params=params)
+                call["data_size"] = len(response.content)
+                call["status"] = "success" if response.ok else f"http_{response.status_code}"
+                span.set_attributes(status=response.status_code, bytes=call["data_size"])
             response.raise_for_status()
             data = response.json()
             
@@ -75,6 +82,7 @@ class AlphaVantageClient:
 
 # --- Tool Definitions ---
 
+@tracer.traced("tool.alpha_vantage_data", category="tool", attributes=lambda ticker: {"ticker": ticker})
 def _get_alpha_vantage_data(ticker: str) -> Dict[str, Any]:
     """
     Fetch comprehensive financial data from Alpha Vantage.
@@ -119,6 +127,7 @@ def _get_alpha_vantage_data(ticker: str) -> Dict[str, Any]:
         "data": data
     }
 
+@tracer.traced("tool.alpha_vantage_news", category="tool", attributes=lambda ticker: {"ticker": ticker})
 def _get_alpha_vantage_news(ticker: str) -> Dict[str, Any]:
     """
     Fetch news and sentiment data from Alpha Vantage.
@@ -14,32 +14,35 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 import yfinance as yf
 from ddgs import DDGS
 from cachetools import cached, TTLCache
+from cachetools.keys import hashkey
 import pandas as pd
 import numpy as np
 
 from utils.cli_logger import api_logger, error_logger
+from utils.config import BENCHMARK_TICKER, BENCHMARK_CACHE_DIR, BENCHMARK_CACHE_HOURS, PRICE_STORE_DIR
+from utils.tracing import tracer
+from utils import metrics
 
-# Import Rust accelerated functions
-from rust_finance import (
-    # Risk calculations
-    calculate_volatility as rust_volatility,
-    calculate_sharpe_ratio as rust_sharpe,
-    calculate_max_drawdown as rust_max_drawdown,
-    calculate_var_95 as rust_var_95,
-    # Technical indicators
-    calculate_sma as rust_sma,
-    calculate_rsi as rust_rsi,
-    calculate_macd as rust_macd,
-    # Utilities
-    detect_trend as rust_detect_trend,
-    detect_volume_spike as rust_volume_spike,
-)
-print("🦀 rust_finance loaded - using Rust accelerated calculations")
+# Finance kernels: rust_finance when installed, vectorized NumPy otherwise (see tools/finance_kernels)
+from tools import finance_kernels as kernels
+from tools.price_store import PriceStore
+print(f"🧮 finance kernels loaded - backend: {kernels.describe()}")
 
 
 # Cache for 1 hour (3600 seconds)
 cache = TTLCache(maxsize=100, ttl=3600)
 
+# Benchmark closes are shared by every ticker in the process (and on disk, see _get_benchmark_history)
+benchmark_cache = TTLCache(maxsize=8, ttl=BENCHMARK_CACHE_HOURS * 3600)
+BETA_LOOKBACKS = {"3m": 63, "1y": 252, "3y": 756}  # Shared trading days
+
+# 1y closes of a comparison universe, shared by the risk panel and the factor exposures
+universe_cache = TTLCache(maxsize=16, ttl=3600)
+price_store = None  # PriceStore in PRICE_STORE_DIR, opened on first use (see _get_price_store)
+FACTOR_NAMES = ("market", "size", "value", "momentum", "low_volatility")
+FACTOR_QUANTILE = 0.3  # Share of ranked tickers in each long / short leg
+PRICE_REBASE_TOLERANCE = 1e-4  # Relative change in a stored adjusted close that means a split / dividend re-based it
+
 
 def _sanitize_for_json(obj):
     """
@@ -108,27 +111,139 @@ def _extract_domain(url: str) -> str:
         return "unknown"
 
 
-def _safe_trend(values: list, increasing: bool = True, use_abs: bool = False) -> str:
-    """
-    Detect trend using Rust. Handles None/NaN/empty lists.
+def _statement_trends(series: Dict[str, list], periods_per_year: float, use_abs: tuple = ()) -> Dict[str, Dict[str, Any]]:
     """
-    if not values or len(values) < 2:
-        return "unknown"
-    
-    # Clean values (remove None/NaN)
-    clean_values = []
-    for v in values:
-        if v is not None:
-            try:
-                if not (np.isnan(v) or np.isinf(v)):
-                    clean_values.append(float(abs(v) if use_abs else v))
-            except (TypeError, ValueError):
-                pass
+    Trend and growth stats for statement lines in one kernel call.
     
-    if len(clean_values) < 2:
-        return "unknown"
+    Each list is newest first (yfinance column order); None/NaN/inf count as missing
+    periods. Returns {name: {"trend", "slope", "r_squared", "cagr", "pct_change",
+    "consistency"}} with None where a value is undefined.
+    """
+    names = list(series)
+    width = max((len(values) for values in series.values()), default=0)
+    matrix = np.full((len(names), width), np.nan)
+    for row, name in enumerate(names):
+        values = pd.to_numeric(pd.Series(series[name], dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+        if name in use_abs:
+            values = np.abs(values)
+        # Oldest first, newest periods aligned in the last column
+        matrix[row, width - len(values):] = values[::-1]
     
-    return rust_detect_trend(clean_values)
+    stats = kernels.calculate_statement_trends(matrix, periods_per_year)
+    result = {}
+    for row, name in enumerate(names):
+        result[name] = {"trend": stats["trend"][row]}
+        for key in ("slope", "r_squared", "cagr", "pct_change", "consistency"):
+            value = float(stats[key][row])
+            result[name][key] = value if np.isfinite(value) else None
+    return result
+
+
+def _statement_line(frame: pd.DataFrame, periods, *names: str) -> np.ndarray:
+    """First of `names` found in a yfinance statement, reindexed to `periods` (NaN where missing)."""
+    for name in names:
+        if name in frame.index:
+            return pd.to_numeric(frame.loc[name].reindex(periods), errors="coerce").to_numpy(dtype=np.float64)
+    return np.full(len(periods), np.nan)
+
+
+def _icr_level(val) -> str:
+    if val is None or np.isnan(val): return "unknown"
+    if val == float('inf') or val > 10.0: return "exceptional"
+    if val > 3.0: return "strong"
+    if val >= 2.0: return "acceptable"
+    if val >= 1.5: return "fair"
+    if val >= 1.0: return "risk"
+    return "high risk"
+
+
+def _yf_fetch(ticker: str, endpoint: str, fetch):
+    """
+    Run a single yfinance provider call inside a trace span.
+
+    Args:
+        ticker: Stock ticker symbol (span attribute)
+        endpoint: Provider endpoint label, e.g. 'history' or 'quarterly_financials'
+        fetch: Zero-argument callable performing the request
+    """
+    with tracer.span(f"yfinance.{endpoint}", category="http", ticker=ticker, endpoint=endpoint) as span, \
+            api_logger.call("yfinance", endpoint, ticker) as call:
+        result = fetch()
+        try:
+            call["data_size"] = len(result)
+            span.set_attribute("rows", call["data_size"])
+        except TypeError:
+            pass
+        return result
+
+
+# BENCHMARK HISTORY & LOCAL BETA
+
+
+def _benchmark_for(ticker: str) -> str:
+    """Benchmark symbol for `ticker`: BENCHMARK_TICKER, or by exchange suffix when it is 'auto'."""
+    if BENCHMARK_TICKER.lower() != "auto":
+        return BENCHMARK_TICKER
+    return "^NSEI" if ticker.upper().endswith((".NS", ".BO")) else "SPY"
+
+
+def _day_numbers(index: pd.DatetimeIndex) -> np.ndarray:
+    """Exchange-local calendar date of each bar as int64 days since epoch."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values.astype("datetime64[D]").astype(np.int64)
+
+
+@cached(benchmark_cache)
+def _get_benchmark_history(symbol: str) -> pd.Series:
+    """
+    5y daily closes for a benchmark, indexed by date.
+
+    Read from BENCHMARK_CACHE_DIR while the file is younger than BENCHMARK_CACHE_HOURS,
+    otherwise fetched from yfinance and written back. A stale copy is used if the fetch fails.
+    """
+    path = Path(BENCHMARK_CACHE_DIR) / f"{re.sub(r'[^A-Za-z0-9._-]', '_', symbol)}.csv"
+    if path.exists() and time.time() - path.stat().st_mtime < BENCHMARK_CACHE_HOURS * 3600:
+        return pd.read_csv(path, index_col=0, parse_dates=True)["Close"]
+    try:
+        hist = _yf_fetch(symbol, "history", lambda: yf.Ticker(symbol).history(period="5y"))
+        if hist.empty:
+            raise ValueError(f"no price history for benchmark {symbol}")
+    except Exception:
+        if path.exists():
+            return pd.read_csv(path, index_col=0, parse_dates=True)["Close"]
+        raise
+    index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+    closes = pd.Series(hist["Close"].to_numpy(dtype=np.float64), index=index.normalize(), name="Close")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    closes.to_csv(path, index_label="Date")
+    return closes
+
+
+def _local_beta(ticker: str, closes: pd.Series) -> Dict[str, Any]:
+    """
+    Beta / correlation of `closes` against the ticker's benchmark over BETA_LOOKBACKS.
+
+    Dates are aligned and gaps handled in the kernel; lookbacks without enough shared
+    history are None. Returns {} when the benchmark cannot be loaded.
+    """
+    symbol = _benchmark_for(ticker)
+    try:
+        benchmark = _get_benchmark_history(symbol)
+    except Exception:
+        error_logger.log_exception(f"_get_benchmark_history({symbol})", ticker)
+        return {}
+    result = kernels.calculate_benchmark_beta(
+        closes.to_numpy(dtype=np.float64), _day_numbers(closes.index),
+        benchmark.to_numpy(dtype=np.float64), _day_numbers(benchmark.index),
+        list(BETA_LOOKBACKS.values()),
+    )
+    finite = lambda v: float(v) if np.isfinite(v) else None
+    local = {"benchmark": symbol}
+    for label, days in BETA_LOOKBACKS.items():
+        local[f"beta_{label}"] = finite(result[f"beta_{days}"])
+        local[f"correlation_{label}"] = finite(result[f"correlation_{days}"])
+    return local
 
 
 # SKILL LOADER TOOL
@@ -168,13 +283,6 @@ load_skill_tool = StructuredTool.from_function(
 # QUANT TOOL: DEEP FINANCIALS (YFINANCE)
 
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((ConnectionError, TimeoutError, OSError)),
-    reraise=True
-)
-@cached(cache)
 def _get_deep_financials(ticker: str) -> Dict[str, Any]:
     """
     Fetch specific quantitative metrics for a stock using yfinance.
@@ -184,28 +292,47 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
 
     Returns a structured dict; the agent should interpret it using skills.
     """
+    with tracer.span("tool.get_deep_financials", category="tool", ticker=ticker) as span:
+        cache_hit = hashkey(ticker) in cache
+        span.set_attribute("cache_hit", cache_hit)
+        result = _fetch_deep_financials(ticker)
+        metrics.observe_cache("deep_financials", cache_hit, len(cache))
+        return result
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type((ConnectionError, TimeoutError, OSError)),
+    reraise=True
+)
+@cached(cache)
+def _fetch_deep_financials(ticker: str) -> Dict[str, Any]:
+    """Uncached yfinance fetch behind `_get_deep_financials` (1hr TTL cache)."""
     ticker = ticker.upper().strip()
     start_time = time.time()
     print(f" [Quant Tool] Fetching Deep Financials for {ticker}...")
-    api_logger.log_request("yfinance", "get_info", ticker)
+    api_logger.log_request("yfinance", "get_deep_financials", ticker)
 
 
     try:
         stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _yf_fetch(ticker, "info", lambda: stock.info)
         
         #1. Historical Data & Technicals 
         # Extended to 5y to support 200-week SMA (200 weeks ≈ 4 years)
-        hist = stock.history(period="5y")
+        hist = _yf_fetch(ticker, "history", lambda: stock.history(period="5y"))
         technicals = {}
         risk_metrics = {}
+        ohlcv = {}
         
         if not hist.empty:
-            prices_list = hist['Close'].tolist()
+            # float64 NumPy views are read in place by the kernels (no list building / copying)
+            prices = hist['Close'].to_numpy(dtype=np.float64)
             
-            # Weekly data for 200-week SMA
-            weekly_close = hist['Close'].resample('W').last()
-            weekly_prices = weekly_close.tolist()
+            # Weekly / monthly closes for the 200-week and 10-month SMAs (one calendar pass over the daily bars)
+            bars = kernels.aggregate_bars(_day_numbers(hist.index), prices, ["W", "M"])
+            weekly_prices, monthly_prices = bars["W"]["close"], bars["M"]["close"]
             
             # Helper to safely extract values
             def _safe_value(val):
@@ -219,47 +346,161 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
                     return val
             
             #1. Technical Indicators (Rust)
-            current_price = prices_list[-1] if prices_list else None
-            sma_50 = rust_sma(prices_list, 50) if len(prices_list) >= 50 else None
-            sma_200 = rust_sma(prices_list, 200) if len(prices_list) >= 200 else None
-            sma_200_weeks = rust_sma(weekly_prices, 200) if len(weekly_prices) >= 200 else None
-            rsi = rust_rsi(prices_list, 14) if len(prices_list) >= 15 else None
-            macd_result = rust_macd(prices_list) if len(prices_list) >= 26 else (None, None, None)
+            # One Rust pass for SMA 50/200 and Wilder RSI(14); NaN until enough history
+            current_price = prices[-1] if len(prices) else None
+            indicators = kernels.calculate_indicator_series(prices, sma_periods=[50, 200], rsi_periods=[14], macd=None)
+            sma_200_weeks = kernels.calculate_sma(weekly_prices, 200) if len(weekly_prices) >= 200 else None
+            sma_10_months = kernels.calculate_sma(monthly_prices, 10) if len(monthly_prices) >= 10 else None
+            
+            # MACD(12, 26, 9) for today and yesterday in one pass; a histogram sign flip is a signal-line cross
+            (macd_line, macd_signal, macd_hist), (_, _, prev_macd_hist) = kernels.calculate_macd(prices, 12, 26, 9)
+            macd_crossover = None
+            if not (np.isnan(macd_hist) or np.isnan(prev_macd_hist)):
+                if prev_macd_hist <= 0 < macd_hist:
+                    macd_crossover = "bullish"
+                elif prev_macd_hist >= 0 > macd_hist:
+                    macd_crossover = "bearish"
+            
+            # Bollinger, ATR, Stochastic, ADX, OBV, VWAP, MFI and volume stats in one pass over OHLCV
+            ohlcv = kernels.calculate_ohlcv_indicators(
+                hist['High'].to_numpy(dtype=np.float64),
+                hist['Low'].to_numpy(dtype=np.float64),
+                prices,
+                hist['Volume'].to_numpy(dtype=np.float64),
+            )
+            
+            def _latest(name, source=indicators):
+                series = source.get(name)
+                return _safe_value(series[-1]) if series is not None and len(series) else None
+            
+            atr = _latest("atr", ohlcv)
+            
+            # SMA 50/200 crossover history over the 5y window (one rolling pass)
+            crosses = kernels.scan_crossovers(prices, 50, 200)
+            cross_dates = [hist.index[e["index"]].strftime('%Y-%m-%d') for e in crosses["events"]]
+            recent_crosses = [
+                {"type": e["type"], "date": date}
+                for e, date in zip(crosses["events"][-3:], cross_dates[-3:])
+            ]
             
             technicals = {
                 "current_price": _safe_value(current_price),
-                "sma_50": _safe_value(sma_50),
-                "sma_200": _safe_value(sma_200),
+                "sma_50": _latest("sma_50"),
+                "sma_200": _latest("sma_200"),
                 "sma_200_weeks": _safe_value(sma_200_weeks),
-                "rsi": _safe_value(rsi),
-                "macd": _safe_value(macd_result[0]) if macd_result else None,
-                "macd_signal": _safe_value(macd_result[1]) if macd_result else None,
+                "sma_10_months": _safe_value(sma_10_months),
+                "rsi": _latest("rsi_14"),
+                "macd": _safe_value(macd_line),
+                "macd_signal": _safe_value(macd_signal),
+                "macd_histogram": _safe_value(macd_hist),
+                "macd_crossover": macd_crossover,
+                "ma_regime": crosses["regime"],
+                "last_ma_cross": crosses["last_cross"],
+                "last_ma_cross_date": cross_dates[-1] if cross_dates else None,
+                "days_since_ma_cross": crosses["days_since_last_cross"],
+                "recent_ma_crosses": recent_crosses,
+                # OHLCV momentum (20-day Bollinger, 14-day ATR / Stochastic / ADX / MFI, 20-day VWAP)
+                "bollinger_upper": _latest("bollinger_upper", ohlcv),
+                "bollinger_lower": _latest("bollinger_lower", ohlcv),
+                "bollinger_percent_b": _latest("bollinger_percent_b", ohlcv),
+                "bollinger_bandwidth": _latest("bollinger_bandwidth", ohlcv),
+                "atr": atr,
+                "atr_percent": _safe_value(atr / current_price) if atr is not None and current_price else None,
+                "stochastic_k": _latest("stochastic_k", ohlcv),
+                "stochastic_d": _latest("stochastic_d", ohlcv),
+                "adx": _latest("adx", ohlcv),
+                "plus_di": _latest("plus_di", ohlcv),
+                "minus_di": _latest("minus_di", ohlcv),
+                "mfi": _latest("mfi", ohlcv),
+                "vwap_20": _latest("vwap", ohlcv),
+                "obv_trend_20d": kernels.detect_trend(ohlcv["obv"][-20:]) if len(ohlcv["obv"]) >= 20 else "unknown",
             }
             
-            #2. Risk Metrics (Rust)
-            daily_returns = hist['Close'].pct_change().dropna()
-            returns_list = daily_returns.tolist()
-            
-            volatility = rust_volatility(returns_list) if returns_list else 0.0
-            sharpe = rust_sharpe(returns_list, 0.0) if returns_list else 0.0
-            max_drawdown = rust_max_drawdown(prices_list) if prices_list else 0.0
-            var_95 = rust_var_95(returns_list) if returns_list else 0.0
+            #2. Risk Metrics (Rust, one fused pass over prices)
+            risk = kernels.calculate_risk_metrics(prices, [0.95, 0.99], 0.0)
             
             risk_metrics = {
-                "volatility_annualized": volatility,
-                "max_drawdown": max_drawdown,
-                "sharpe_ratio": sharpe,
-                "value_at_risk_95": var_95,
+                "volatility_annualized": _safe_value(risk["volatility"]),
+                "max_drawdown": _safe_value(risk["max_drawdown"]),
+                "sharpe_ratio": _safe_value(risk["sharpe_ratio"]),
+                "sortino_ratio": _safe_value(risk["sortino_ratio"]),
+                "downside_deviation": _safe_value(risk["downside_deviation"]),
+                "calmar_ratio": _safe_value(risk["calmar_ratio"]),
+                "value_at_risk_95": _safe_value(risk["var_95"]),
+                "cvar_95": _safe_value(risk["cvar_95"]),
+                "value_at_risk_99": _safe_value(risk["var_99"]),
+                "cvar_99": _safe_value(risk["cvar_99"]),
+                "skewness": _safe_value(risk["skewness"]),
+                "kurtosis": _safe_value(risk["kurtosis"]),
             }
+            
+            # Rolling 3-month (63-day) volatility / Sharpe: current value vs its last year of readings
+            returns = hist['Close'].pct_change().dropna().to_numpy(dtype=np.float64)
+            rolling = kernels.calculate_rolling_risk(returns, 63, 1)
+            
+            def _current_and_percentile(series):
+                if series is None or len(series) == 0:
+                    return None, None
+                last_year = series[-252:]
+                current = series[-1]
+                return _safe_value(current), round(float((last_year <= current).mean() * 100), 1)
+            
+            vol_now, vol_pct = _current_and_percentile(rolling.get("volatility"))
+            sharpe_now, sharpe_pct = _current_and_percentile(rolling.get("sharpe_ratio"))
+            risk_metrics.update({
+                "rolling_volatility_3m": vol_now,
+                "rolling_volatility_3m_percentile_1y": vol_pct,
+                "rolling_sharpe_3m": sharpe_now,
+                "rolling_sharpe_3m_percentile_1y": sharpe_pct,
+            })
+            
+            # Drawdown episodes (5 deepest of at least 5%) with peak / trough / recovery dates
+            drawdowns = kernels.calculate_drawdown_episodes(prices, 5, 0.05)
+            bar_date = lambda i: hist.index[i].strftime('%Y-%m-%d') if i is not None else None
+            risk_metrics.update({
+                "current_drawdown": _safe_value(drawdowns["current_drawdown"]),
+                "time_under_water": _safe_value(drawdowns["time_under_water"]),
+                "longest_under_water_days": drawdowns["longest_under_water"],
+                "current_under_water_days": drawdowns["current_under_water"],
+                "average_recovery_days": _safe_value(drawdowns["average_recovery"]),
+                "drawdown_episode_count": drawdowns["episode_count"],
+                "drawdown_episodes": [
+                    {
+                        "depth": _safe_value(e["depth"]),
+                        "peak_date": bar_date(e["peak_index"]),
+                        "trough_date": bar_date(e["trough_index"]),
+                        "recovery_date": bar_date(e["recovery_index"]),
+                        "days_to_trough": e["peak_to_trough"],
+                        "days_to_recover": e["trough_to_recovery"],
+                    }
+                    for e in drawdowns["episodes"]
+                ],
+            })
+            
+            # Beta / correlation vs the benchmark (one shared history fetch, aligned by date in the kernel)
+            risk_metrics.update(_local_beta(ticker, hist['Close']))
+            
+            # 10-day VaR / CVaR: Monte Carlo (100k seeded paths) and historical bootstrap
+            if len(returns) >= 2:
+                mc = kernels.calculate_var(returns, "monte_carlo", 10, [0.95, 0.99], 100_000, 42)
+                boot = kernels.calculate_var(returns, "historical", 10, [0.95], 100_000, 42)
+                risk_metrics.update({
+                    "var_95_10d_monte_carlo": _safe_value(mc["var_95"]),
+                    "cvar_95_10d_monte_carlo": _safe_value(mc["cvar_95"]),
+                    "var_99_10d_monte_carlo": _safe_value(mc["var_99"]),
+                    "cvar_99_10d_monte_carlo": _safe_value(mc["cvar_99"]),
+                    "var_95_10d_historical": _safe_value(boot["var_95"]),
+                    "cvar_95_10d_historical": _safe_value(boot["cvar_95"]),
+                })
 
         #3. Financial Trends (Quarterly & Annual)
         # Comprehensive trend analysis: both quarterly and annual
         financial_trends = {}
         try:
             #QUARTERLY TRENDS
-            q_fin = stock.quarterly_financials
-            q_bal = stock.quarterly_balance_sheet
-            q_cf = stock.quarterly_cashflow
+            q_fin = _yf_fetch(ticker, "quarterly_financials", lambda: stock.quarterly_financials)
+            q_bal = _yf_fetch(ticker, "quarterly_balance_sheet", lambda: stock.quarterly_balance_sheet)
+            q_cf = _yf_fetch(ticker, "quarterly_cashflow", lambda: stock.quarterly_cashflow)
             
             quarterly_data = {}
             if not q_fin.empty and not q_bal.empty:
@@ -313,19 +554,24 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
                     "fcf_quarters": recent_fcf,
                     "ebit_quarters": recent_ebit,
                     "interest_quarters": recent_interest,
-                    # Quarterly trends (Q-o-Q) with safe comparison
-                    "revenue_trend_qoq": _safe_trend(recent_rev, increasing=True),
-                    "debt_trend_qoq": _safe_trend(recent_debt, increasing=False),
-                    "capex_trend_qoq": _safe_trend(recent_capex, increasing=True, use_abs=True),
-                    "retained_earnings_trend_qoq": _safe_trend(recent_retained_earnings, increasing=True),
-                    "net_income_trend_qoq": _safe_trend(recent_net_income, increasing=True),
-                    "fcf_trend_qoq": _safe_trend(recent_fcf, increasing=True),
                 }
+                # Quarterly trends (Q-o-Q): one batch call for every line
+                quarterly_stats = _statement_trends({
+                    "revenue": recent_rev,
+                    "debt": recent_debt,
+                    "capex": recent_capex,
+                    "retained_earnings": recent_retained_earnings,
+                    "net_income": recent_net_income,
+                    "fcf": recent_fcf,
+                }, periods_per_year=4, use_abs=("capex",))
+                for name, stats in quarterly_stats.items():
+                    quarterly_data[f"{name}_trend_qoq"] = stats.pop("trend")
+                quarterly_data["growth_qoq"] = quarterly_stats
             
             #ANNUAL TRENDS 
-            a_fin = stock.financials  # Annual financials
-            a_bal = stock.balance_sheet  # Annual balance sheet
-            a_cf = stock.cashflow  # Annual cashflow
+            a_fin = _yf_fetch(ticker, "financials", lambda: stock.financials)  # Annual financials
+            a_bal = _yf_fetch(ticker, "balance_sheet", lambda: stock.balance_sheet)  # Annual balance sheet
+            a_cf = _yf_fetch(ticker, "cashflow", lambda: stock.cashflow)  # Annual cashflow
             
             annual_data = {}
             if not a_fin.empty and not a_bal.empty:
@@ -387,15 +633,20 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
                     "fcf_annual": annual_fcf,
                     "ebit_annual": annual_ebit,
                     "interest_annual": annual_interest,
-                    # Annual trends (Y-o-Y) with safe comparison
-                    "revenue_trend_yoy": _safe_trend(annual_rev, increasing=True),
-                    "debt_trend_yoy": _safe_trend(annual_debt, increasing=False),
-                    "capex_trend_yoy": _safe_trend(annual_capex, increasing=True, use_abs=True),
-                    "retained_earnings_trend_yoy": _safe_trend(annual_retained_earnings, increasing=True),
-                    "net_income_trend_yoy": _safe_trend(annual_net_income, increasing=True),
-                    "assets_trend_yoy": _safe_trend(annual_assets, increasing=True),
-                    "fcf_trend_yoy": _safe_trend(annual_fcf, increasing=True),
                 }
+                # Annual trends (Y-o-Y): one batch call for every line
+                annual_stats = _statement_trends({
+                    "revenue": annual_rev,
+                    "debt": annual_debt,
+                    "capex": annual_capex,
+                    "retained_earnings": annual_retained_earnings,
+                    "net_income": annual_net_income,
+                    "assets": annual_assets,
+                    "fcf": annual_fcf,
+                }, periods_per_year=1, use_abs=("capex",))
+                for name, stats in annual_stats.items():
+                    annual_data[f"{name}_trend_yoy"] = stats.pop("trend")
+                annual_data["growth_yoy"] = annual_stats
             
             # Combine both quarterly and annual trends
             financial_trends = {
@@ -408,34 +659,41 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
         
         #4. Volume Trends (NEW)
         volume_trends = {}
-        if not hist.empty and 'Volume' in hist.columns:
-            # Calculate average volume for different periods
-            avg_volume_10d = hist['Volume'].tail(10).mean()
-            avg_volume_50d = hist['Volume'].tail(50).mean()
-            avg_volume_200d = hist['Volume'].tail(200).mean()
+        if ohlcv:
+            # Average daily volume and spike z-score come from the OHLCV pass above
+            def _volume(name):
+                value = ohlcv[name][-1]
+                return int(value) if np.isfinite(value) else None
             
-            # Recent volume spike detection
-            latest_volume = hist['Volume'].iloc[-1]
-            volume_spike = latest_volume > (avg_volume_50d * 1.5)  # 50% above average
+            latest_volume = int(hist['Volume'].iloc[-1])
+            avg_volume_10d, avg_volume_50d = _volume("adv_10"), _volume("adv_50")
+            zscore = ohlcv["volume_zscore"][-1]
             
             volume_trends = {
-                "latest_volume": int(latest_volume),
-                "avg_volume_10d": int(avg_volume_10d),
-                "avg_volume_50d": int(avg_volume_50d),
-                "avg_volume_200d": int(avg_volume_200d),
-                "volume_spike": volume_spike,
-                "volume_trend": "increasing" if avg_volume_10d > avg_volume_50d else "decreasing"
+                "latest_volume": latest_volume,
+                "avg_volume_10d": avg_volume_10d,
+                "avg_volume_50d": avg_volume_50d,
+                "avg_volume_200d": _volume("adv_200"),
+                "volume_zscore_50d": float(zscore) if np.isfinite(zscore) else None,
+                # 50% above the 50-day average
+                "volume_spike": bool(avg_volume_50d and kernels.detect_volume_spike(latest_volume, avg_volume_50d)),
+                "volume_trend": (
+                    "unknown" if avg_volume_10d is None or avg_volume_50d is None
+                    else "increasing" if avg_volume_10d > avg_volume_50d else "decreasing"
+                ),
             }
         
         #5. Dividend Yield Trend (NEW)
         dividend_trends = {}
         try:
-            dividends = stock.dividends
+            dividends = _yf_fetch(ticker, "dividends", lambda: stock.dividends)
             if not dividends.empty and len(dividends) > 0:
-                # Get annual dividends for last 3 years
-                annual_divs = dividends.resample('YE').sum()  # 'YE' = Year End (Y is deprecated)
-                recent_annual_divs = annual_divs.tail(3).tolist()
-                div_years = [d.strftime('%Y') for d in annual_divs.tail(3).index]
+                # Get annual dividends for last 3 years (years without a payout count as 0)
+                annual_divs = kernels.aggregate_bars(
+                    _day_numbers(dividends.index), dividends.to_numpy(dtype=np.float64), ["Y"], fill_gaps=True
+                )["Y"]
+                recent_annual_divs = annual_divs["sum"][-3:].tolist()
+                div_years = [d.strftime('%Y') for d in pd.to_datetime(annual_divs["period_end"][-3:], unit="D")]
                 
                 dividend_trends = {
                     "annual_dividends": recent_annual_divs,
@@ -445,113 +703,74 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
         except Exception as e:
             print(f"Warning: Could not fetch dividend trends: {e}")
 
-        #6. ROCE Calculation (NEW)
-        # ROCE = EBIT / (Total Assets - Current Liabilities)
-        roce = None
+        #6. Fundamental Ratios (every annual period in one kernel call)
+        # ROCE = EBIT / (Total Assets - Current Liabilities), ICR = EBIT / Interest Expense,
+        # plus ROE, D/E, FCF margin, CapEx intensity and accruals
+        fundamental_ratios = {}
         try:
-            # Try to get from annual financials first
             if not a_fin.empty and not a_bal.empty:
-                # EBIT
-                ebit = None
-                if 'EBIT' in a_fin.index:
-                    ebit = a_fin.loc['EBIT'].iloc[0]
-                elif 'Pretax Income' in a_fin.index and 'Interest Expense' in a_fin.index:
-                     # Approximation: EBIT ~ Pretax Income + Interest Expense
-                     ebit = a_fin.loc['Pretax Income'].iloc[0] + abs(a_fin.loc['Interest Expense'].iloc[0])
-
-                # Capital Employed
-                total_assets = a_bal.loc['Total Assets'].iloc[0] if 'Total Assets' in a_bal.index else None
-                current_liabilities = None
-                if 'Total Current Liabilities' in a_bal.index:
-                    current_liabilities = a_bal.loc['Total Current Liabilities'].iloc[0]
-                elif 'Current Liabilities' in a_bal.index: # Sometimes named differently
-                     current_liabilities = a_bal.loc['Current Liabilities'].iloc[0]
-                
-                if ebit is not None and total_assets is not None and current_liabilities is not None:
-                    capital_employed = total_assets - current_liabilities
-                    if capital_employed != 0:
-                        roce = ebit / capital_employed
-
-        except Exception as e:
-            print(f"Warning: Could not calculate ROCE: {e}")
-
-        # 7. Debt-to-Equity Calculation (Fallback)
-        # If info doesn't provide debt_to_equity, calculate from balance sheet
-        debt_to_equity_calculated = None
-        try:
-            # First try to get from info
-            debt_to_equity_calculated = info.get("debtToEquity")
-            
-            # yfinance returns D/E as percentage (e.g., 152.41 instead of 1.52)
-            # Normalize to standard ratio format for SKILL.md thresholds (>2.0 = high leverage)
-            if debt_to_equity_calculated is not None:
-                debt_to_equity_calculated = debt_to_equity_calculated / 100
-            
-            # If not available, calculate from balance sheet
-            if debt_to_equity_calculated is None and not a_bal.empty:
-                total_debt = info.get("totalDebt", 0) or 0
+                periods = a_fin.columns  # [Newest, ..., Oldest]
                 
-                # Get stockholders equity from balance sheet
-                stockholders_equity = None
-                if 'Stockholders Equity' in a_bal.index:
-                    stockholders_equity = a_bal.loc['Stockholders Equity'].iloc[0]
-                elif 'Total Stockholders Equity' in a_bal.index:
-                    stockholders_equity = a_bal.loc['Total Stockholders Equity'].iloc[0]
-                elif 'Total Equity Gross Minority Interest' in a_bal.index:
-                    stockholders_equity = a_bal.loc['Total Equity Gross Minority Interest'].iloc[0]
+                ebit = _statement_line(a_fin, periods, 'EBIT')
+                interest = _statement_line(a_fin, periods, 'Interest Expense', 'Interest Expense Non Operating')
+                if np.isnan(interest).all() and 'Net Interest Income' in a_fin.index:
+                    # If Net Interest Income is negative, it's net expense
+                    net_interest = _statement_line(a_fin, periods, 'Net Interest Income')
+                    interest = np.where(np.isnan(net_interest), np.nan, np.maximum(-net_interest, 0.0))
+                # Approximation where EBIT is missing: EBIT ~ Pretax Income + Interest Expense
+                ebit = np.where(np.isnan(ebit), _statement_line(a_fin, periods, 'Pretax Income') + np.abs(interest), ebit)
                 
-                if stockholders_equity is not None and stockholders_equity != 0:
-                    debt_to_equity_calculated = total_debt / stockholders_equity
-                elif total_debt == 0:
-                    # If no debt and no equity data, debt_to_equity is 0
-                    debt_to_equity_calculated = 0.0
-                    
+                cf = a_cf if not a_cf.empty else pd.DataFrame(columns=periods)
+                lines = {
+                    "ebit": ebit,
+                    "interest_expense": interest,
+                    "total_assets": _statement_line(a_bal, periods, 'Total Assets'),
+                    "current_liabilities": _statement_line(a_bal, periods, 'Total Current Liabilities', 'Current Liabilities'),
+                    "equity": _statement_line(a_bal, periods, 'Stockholders Equity', 'Total Stockholders Equity', 'Total Equity Gross Minority Interest'),
+                    "total_debt": _statement_line(a_bal, periods, 'Total Debt'),
+                    "revenue": _statement_line(a_fin, periods, 'Total Revenue'),
+                    "free_cash_flow": _statement_line(cf, periods, 'Free Cash Flow'),
+                    "capex": _statement_line(cf, periods, 'Capital Expenditure', 'Capital Expenditures'),
+                    "net_income": _statement_line(a_fin, periods, 'Net Income'),
+                    "operating_cashflow": _statement_line(cf, periods, 'Operating Cash Flow', 'Total Cash From Operating Activities'),
+                }
+                # One ticker: (1, periods) matrices
+                ratios = kernels.calculate_fundamental_ratios(**{name: line[np.newaxis, :] for name, line in lines.items()})
+                fundamental_ratios = {"period_dates": [d.strftime('%Y-%m-%d') for d in periods]}
+                fundamental_ratios.update({name: values[0] for name, values in ratios.items()})
         except Exception as e:
-            print(f"Warning: Could not calculate debt_to_equity: {e}")
-
-        # 8. ICR Calculation (NEW)
-        # ICR = EBIT / Interest Expense
+            print(f"Warning: Could not calculate fundamental ratios: {e}")
+        
+        def _latest_ratio(name):
+            values = fundamental_ratios.get(name)
+            return float(values[0]) if values is not None and len(values) and not np.isnan(values[0]) else None
+        
+        roce = _latest_ratio("roce")
+        
+        # 7. Debt-to-Equity
+        # yfinance returns D/E as percentage (e.g., 152.41 instead of 1.52)
+        # Normalize to standard ratio format for SKILL.md thresholds (>2.0 = high leverage)
+        debt_to_equity_calculated = info.get("debtToEquity")
+        if debt_to_equity_calculated is not None:
+            debt_to_equity_calculated = debt_to_equity_calculated / 100
+        else:
+            # Fall back to the latest balance sheet
+            debt_to_equity_calculated = _latest_ratio("debt_to_equity")
+            if debt_to_equity_calculated is None and not (info.get("totalDebt") or 0):
+                # If no debt and no equity data, debt_to_equity is 0
+                debt_to_equity_calculated = 0.0
+        
+        # 8. ICR Analysis (history from the ratio pass; inf = no interest to cover)
         icr_analysis = {}
-        try:
-            # Safely calculate ICR from annual data
-            annual_ebit_list = annual_data.get("ebit_annual", [])
-            annual_int_list = annual_data.get("interest_annual", [])
-            
-            icr_values = []
-            for i in range(min(len(annual_ebit_list), len(annual_int_list))):
-                ebit = annual_ebit_list[i]
-                interest = abs(annual_int_list[i]) if annual_int_list[i] is not None else None
-                if ebit is not None:
-                    if interest and interest != 0:
-                        icr_values.append(ebit / interest)
-                    elif interest == 0:
-                        # If zero interest, ICR is technically infinite (Very Strong)
-                        # We use a high constant or Handle it in level categorization
-                        icr_values.append(float('inf'))
-                    else:
-                        icr_values.append(None)
-                else:
-                    icr_values.append(None)
-            
+        if "icr" in fundamental_ratios:
+            icr_values = [None if np.isnan(v) else float(v) for v in fundamental_ratios["icr"]]
             latest_icr = icr_values[0] if icr_values else None
-            
-            def _get_icr_level(val):
-                if val is None: return "unknown"
-                if val == float('inf') or val > 10.0: return "exceptional"
-                if val > 3.0: return "strong"
-                if val >= 2.0: return "acceptable"
-                if val >= 1.5: return "fair"
-                if val >= 1.0: return "risk"
-                return "high risk"
-
             icr_analysis = {
                 "icr_value": latest_icr,
-                "icr_level": _get_icr_level(latest_icr),
+                "icr_level": _icr_level(latest_icr),
                 "icr_history_annual": icr_values,
-                "icr_trend_yoy": _safe_trend(icr_values, increasing=True)
+                "icr_trend_yoy": _statement_trends({"icr": icr_values}, periods_per_year=1)["icr"]["trend"]
             }
-        except Exception as e:
-            print(f"Warning: Could not calculate ICR analysis: {e}")
 
         # Add FCF trend to financial_trends
         if "financial_trends" in locals() or "financial_trends" in globals():
@@ -560,6 +779,9 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
                 "yoy": annual_data.get("fcf_trend_yoy", "unknown")
             }
 
+        # Prefer the locally computed beta (longest lookback with enough history) over yfinance's info field
+        local_beta = next((risk_metrics[k] for k in ("beta_3y", "beta_1y") if risk_metrics.get(k) is not None), None)
+
         financial_data = {
             "ticker": ticker,
             # Basic Info
@@ -588,7 +810,8 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
             "return_on_capital_employed": roce,
             
             # Risk
-            "beta": info.get("beta"),
+            "beta": local_beta if local_beta is not None else info.get("beta"),
+            "beta_source": "local" if local_beta is not None else ("yfinance" if info.get("beta") is not None else None),
             
             # Debt & Cash
             "debt_to_equity": debt_to_equity_calculated,
@@ -601,6 +824,7 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
             "risk_metrics": risk_metrics,
             "financial_trends": financial_trends,
             "icr_analysis": icr_analysis,
+            "fundamental_ratios": fundamental_ratios,
             "volume_trends": volume_trends,
             "dividend_trends": dividend_trends,
             "company_name": info.get("longName")
@@ -609,6 +833,9 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
         # Sanitize all values to ensure JSON/literal_eval compatibility
         financial_data = _sanitize_for_json(financial_data)
 
+        duration_ms = (time.time() - start_time) * 1000
+        api_logger.log_response("yfinance", "success", duration_ms, endpoint="get_deep_financials", ticker=ticker)
+
         return {
             "status": "success",
             "data": financial_data,
@@ -616,7 +843,7 @@ def _get_deep_financials(ticker: str) -> Dict[str, Any]:
 
     except Exception as e:
         duration_ms = (time.time() - start_time) * 1000
-        api_logger.log_response("yfinance", "error", duration_ms)
+        api_logger.log_response("yfinance", "error", duration_ms, endpoint="get_deep_financials", ticker=ticker)
         error_logger.log_exception("_get_deep_financials", ticker)
         return {
             "status": "error",
@@ -639,6 +866,7 @@ get_deep_financials_tool = StructuredTool.from_function(
 # NEWS TOOL: STRATEGIC TRIGGERS (DUCKDUCKGO)
 
 
+@tracer.traced("tool.check_strategic_triggers", category="tool", attributes=lambda ticker: {"ticker": ticker})
 def _check_strategic_triggers(ticker: str) -> Dict[str, Any]:
     """
     Search news for qualitative 'green flag' or 'red flag' strategic signals.
@@ -696,8 +924,12 @@ def _check_strategic_triggers(ticker: str) -> Dict[str, Any]:
         max_retries = 2
         for attempt in range(max_retries + 1):
             try:
-                with DDGS() as ddgs:
-                    results = list(ddgs.news(q, max_results=3))
+                with tracer.span("ddgs.news", category="http", ticker=ticker, query=q, attempt=attempt) as span, \
+                        api_logger.call("ddgs", "news", ticker) as call:
+                    with DDGS() as ddgs:
+                        results = list(ddgs.news(q, max_results=3))
+                    call["data_size"] = len(results)
+                    span.set_attribute("results", len(results))
                 if results:
                     for r in results:
                         source = _extract_domain(r.get('url', ''))
@@ -737,7 +969,7 @@ def _check_strategic_triggers(ticker: str) -> Dict[str, Any]:
 
     # Log API response
     duration_ms = (time.time() - start_time) * 1000
-    api_logger.log_response("ddgs", "success", duration_ms, len(signals))
+    api_logger.log_response("ddgs", "success", duration_ms, len(signals), endpoint="news_search", ticker=ticker)
 
     return {
         "status": "success",
@@ -768,6 +1000,7 @@ check_strategic_triggers_tool = StructuredTool.from_function(
 # WEB SEARCH TOOL (GENERAL)
 
 
+@tracer.traced("tool.search_web", category="tool", attributes=lambda query: {"query": query})
 def _search_web(query: str) -> List[Dict[str, str]]:
     """
     Perform a general web search for a given query.
@@ -781,10 +1014,14 @@ def _search_web(query: str) -> List[Dict[str, str]]:
     print(f" [Web Search] Searching for: {query}...")
     results = []
     try:
-        with DDGS() as ddgs:
-            # text() is the general search method in duckduckgo_search
-            # It returns a generator, so we convert to list
-            search_results = list(ddgs.text(query, max_results=5))
+        with tracer.span("ddgs.text", category="http", query=query) as span, \
+                api_logger.call("ddgs", "text") as call:
+            with DDGS() as ddgs:
+                # text() is the general search method in duckduckgo_search
+                # It returns a generator, so we convert to list
+                search_results = list(ddgs.text(query, max_results=5))
+            call["data_size"] = len(search_results)
+            span.set_attribute("results", len(search_results))
             
         for r in search_results:
             results.append({
@@ -842,7 +1079,8 @@ def _resolve_google_news_url(url: str) -> str:
         return url
     try:
         from googlenewsdecoder import gnewsdecoder
-        result = gnewsdecoder(url, interval=1)
+        with tracer.span("google_news.decode_url", category="http"):
+            result = gnewsdecoder(url, interval=1)
         if result.get("status"):
             return result["decoded_url"]
         return url
@@ -853,6 +1091,7 @@ def _resolve_google_news_url(url: str) -> str:
         print(f"Error resolving URL {url}: {e}")
         return url
 
+@tracer.traced("tool.search_google_news", category="tool", attributes=lambda query, max_results=10: {"query": query})
 def _search_google_news(query: str, max_results: int = 10) -> List[Dict[str, str]]:
     """
     Search Google News for articles matching a given query.
@@ -866,14 +1105,19 @@ def _search_google_news(query: str, max_results: int = 10) -> List[Dict[str, str
     search_url = f"https://news.google.com/rss/search?q={query.replace(' ', '%20')}&hl=en-US&gl=US&ceid=US:en"
 
     try:
-        response = requests.get(search_url, timeout=10)
+        with tracer.span("google_news.rss", category="http", query=query) as span, \
+                api_logger.call("google_news", "rss") as call:
+            response = requests.get(search_url, timeout=10)
+            call["data_size"] = len(response.content)
+            call["status"] = "success" if response.status_code == 200 else f"http_{response.status_code}"
+            span.set_attributes(status=response.status_code, bytes=call["data_size"])
         if response.status_code != 200:
             return []
         
         results = _parse_rss_content(response.text, max_results)
         
         urls_to_resolve = [result.url for result in results]
-        with ThreadPoolExecutor() as executor:
+        with tracer.span("google_news.resolve_urls", category="tool", urls=len(urls_to_resolve)), ThreadPoolExecutor() as executor:
             resolved_urls = list(executor.map(_resolve_google_news_url, urls_to_resolve))
 
         final_results = []
@@ -927,7 +1171,7 @@ def resolve_ticker(query: str) -> str:
     try:
         # Use DuckDuckGo to find the ticker
         search_query = f"stock ticker symbol for {query}"
-        with DDGS() as ddgs:
+        with tracer.span("ddgs.text", category="http", query=search_query), DDGS() as ddgs:
             results = list(ddgs.text(search_query, max_results=1))
             
         if results:
@@ -983,6 +1227,7 @@ def resolve_ticker(query: str) -> str:
 
 # SECTOR COMPARISON TOOLS
 
+@tracer.traced("tool.get_competitors", category="tool", attributes=lambda ticker: {"ticker": ticker})
 def _get_competitors(ticker: str) -> Dict[str, Any]:
     """
     Find top competitors for a given stock ticker using web search.
@@ -1053,6 +1298,205 @@ def _get_competitors(ticker: str) -> Dict[str, Any]:
     }
 
 
+def _get_price_store() -> PriceStore:
+    """Process-wide memory-mapped universe price store (PRICE_STORE_DIR)."""
+    global price_store
+    if price_store is None:
+        price_store = PriceStore(PRICE_STORE_DIR)
+    return price_store
+
+
+@cached(universe_cache)
+def _get_universe_closes(tickers: tuple) -> pd.DataFrame:
+    """
+    1y adjusted daily closes (dates x tickers); NaN where a ticker did not trade. Days on which
+    none of `tickers` traded (another exchange's sessions in the shared store) are left out.
+
+    Served from the price store: tickers without stored prices get one batched 1y download,
+    stored ones only the days since the last stored date, both written into the store in
+    place. If that refresh fails the stored prices are used as they are.
+
+    Closes are adjusted as of each download, so the refresh re-reads every stored ticker's
+    last stored day. When that close moved by more than PRICE_REBASE_TOLERANCE (a split or
+    dividend since the stored history was written), the ticker's row is cleared and its full
+    1y history downloaded again, instead of joining prices on two adjustment bases.
+    """
+    store = _get_price_store()
+
+    def _download(symbols: List[str], **period):
+        frame = _yf_fetch(",".join(symbols), "download",
+                          lambda: yf.download(symbols, progress=False, auto_adjust=True, **period))
+        closes, volumes = frame["Close"], frame["Volume"]
+        if isinstance(closes, pd.Series):
+            closes, volumes = closes.to_frame(symbols[0]), volumes.to_frame(symbols[0])
+        return closes.reindex(columns=symbols), volumes.reindex(columns=symbols)
+
+    def _last_stored(ticker: str) -> int:
+        return int(np.flatnonzero(np.isfinite(store.series(ticker)))[-1])
+
+    def _rebased(ticker: str, closes: pd.Series) -> bool:
+        column = _last_stored(ticker)
+        fresh = closes[_day_numbers(closes.index) == store.dates[column]].dropna()
+        stored_close = store.series(ticker)[column]
+        return len(fresh) > 0 and abs(fresh.iloc[-1] / stored_close - 1.0) > PRICE_REBASE_TOLERANCE
+
+    new = [t for t in tickers if t not in store or not np.isfinite(store.series(t)).any()]
+    if new:
+        store.write_frame(*_download(new, period="1y"))
+    stored = [t for t in tickers if t not in new]
+    # Refresh from the oldest last close among the stored tickers (that day is rewritten too)
+    last = min((store.index[_last_stored(t)] for t in stored), default=None)
+    if last is not None and last < pd.Timestamp.today().normalize():
+        try:
+            closes, volumes = _download(stored, start=last.strftime("%Y-%m-%d"))
+            rebased = [t for t in stored if _rebased(t, closes[t])]
+            current = [t for t in stored if t not in rebased]
+            if current:
+                store.write_frame(closes[current], volumes[current])
+            if rebased:
+                history = _download(rebased, period="1y")
+                store.clear(rebased)
+                store.write_frame(*history)
+        except Exception:
+            error_logger.log_exception("_get_universe_closes refresh", ",".join(stored))
+    if not len(store):
+        return pd.DataFrame(columns=list(tickers), dtype=np.float64)
+    return store.frame(list(tickers), since=store.index[-1] - pd.DateOffset(years=1)).dropna(how="all")
+
+
+def _sector_risk_panel(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    1-year risk metrics for every ticker over the same trading days.
+    Closes from the universe price store and one risk-panel kernel call (tickers computed in parallel with Rust).
+    """
+    # Cached universe closes (as refreshed for _factor_exposures); drop days on which none of `tickers` traded
+    closes = _get_universe_closes(tuple(_analysed_universe(tickers))).reindex(columns=tickers).dropna(how="all")
+    if closes.empty:
+        return {}
+
+    # (tickers x days); NaN where a ticker did not trade
+    matrix = np.ascontiguousarray(closes.to_numpy(dtype=np.float64).T)
+    panel = kernels.calculate_risk_panel(matrix, "prices", 0.0)
+
+    def _clean(val):
+        val = float(val)
+        return None if np.isnan(val) else round(val, 4)
+
+    return {
+        t: {
+            "observations": int(panel["observations"][i]),
+            "total_return_1y": _clean(panel["total_return"][i]),
+            "volatility_1y": _clean(panel["volatility"][i]),
+            "sharpe_ratio_1y": _clean(panel["sharpe_ratio"][i]),
+            "sortino_ratio_1y": _clean(panel["sortino_ratio"][i]),
+            "var_95_1y": _clean(panel["var_95"][i]),
+            "cvar_95_1y": _clean(panel["cvar_95"][i]),
+            "max_drawdown_1y": _clean(panel["max_drawdown"][i]),
+        }
+        for i, t in enumerate(tickers)
+    }
+
+
+def _analysed_universe(tickers: List[str]) -> List[str]:
+    """`tickers` followed by every other ticker whose deep financials are still cached this session."""
+    universe = list(dict.fromkeys(tickers))
+    for key, value in list(cache.items()):
+        if value.get("status") == "success" and key[0] not in universe:
+            universe.append(key[0])
+    return universe
+
+
+def _factor_exposures(tickers: List[str]) -> Dict[str, Any]:
+    """
+    1y factor loadings for `tickers` against long-short factors built over the analysed universe.
+
+    Factors (FACTOR_NAMES): market (benchmark daily returns, equal-weighted universe as fallback)
+    and size (small minus big market cap), value (high minus low book-to-price), momentum
+    (12-1 month return) and low_volatility (low minus high daily volatility), each long the top
+    and short the bottom FACTOR_QUANTILE of the universe. The long-short factors need at least
+    4 ranked tickers; with fewer only the market loading is reported. Scores use current
+    fundamentals from the deep-financials cache, so tilts describe today's book, not a backtest.
+    """
+    universe = _analysed_universe(tickers)
+    _get_universe_closes(tuple(universe))  # Stores / refreshes the universe's prices
+    # Closes and returns from one read of the store (the cached frame above may predate
+    # days added since), then only the days the universe traded; returns line up with prices[:, 1:]
+    store = _get_price_store()
+    if not len(store):
+        return {}
+    since = store.index[-1] - pd.DateOffset(years=1)
+    closes = store.frame(universe, since=since)
+    traded = closes.notna().any(axis=1).to_numpy()
+    closes = closes[traded]
+    if len(closes) < 2:
+        return {}
+    prices = np.ascontiguousarray(closes.to_numpy(dtype=np.float64).T)
+    returns = np.ascontiguousarray(store.matrix("return", universe, since=since)[:, traded][:, 1:])
+
+    def _fundamental(ticker, key):
+        data = (cache.get(hashkey(ticker)) or {}).get("data") or {}
+        value = data.get(key)
+        return float(value) if isinstance(value, (int, float)) and value > 0 else np.nan
+
+    def _momentum(row):
+        valid = row[np.isfinite(row)]
+        return valid[-22] / valid[0] - 1.0 if len(valid) > 22 else np.nan
+
+    scores = np.array([
+        [-np.log(_fundamental(t, "market_cap")) for t in universe],
+        [1.0 / _fundamental(t, "price_to_book") for t in universe],
+        [_momentum(row) for row in prices],
+        [-np.nanstd(row) if np.isfinite(row).sum() > 20 else np.nan for row in returns],
+    ])
+    long_short = kernels.calculate_factor_returns(returns, scores, FACTOR_QUANTILE)
+
+    counts = np.isfinite(returns).sum(axis=0)
+    market = np.where(counts > 0, np.nansum(returns, axis=0) / np.maximum(counts, 1), np.nan)
+    try:
+        benchmark = _get_benchmark_history(_benchmark_for(tickers[0]))
+        index = closes.index.tz_localize(None) if closes.index.tz is not None else closes.index
+        aligned = benchmark.reindex(index.normalize()).to_numpy(dtype=np.float64)
+        market = aligned[1:] / aligned[:-1] - 1.0
+    except Exception:
+        error_logger.log_exception("_factor_exposures benchmark", tickers[0])
+
+    factors = np.vstack([market, long_short])
+    # Keep factors with at least ~3 months of returns, long-short ones only with 4+ ranked tickers.
+    # In a small universe two sorts can pick the same legs; keep the first of any duplicated series.
+    ranked = np.isfinite(scores).sum(axis=1)
+    usable = []
+    for i in range(len(FACTOR_NAMES)):
+        if np.isfinite(factors[i]).sum() < 63 or (i > 0 and ranked[i - 1] < 4):
+            continue
+        shared = np.all(np.isfinite(factors[usable + [i]]), axis=0)
+        if any(abs(np.corrcoef(factors[j, shared], factors[i, shared])[0, 1]) > 0.999 for j in usable):
+            continue
+        usable.append(i)
+    names = [FACTOR_NAMES[i] for i in usable]
+    rows = [universe.index(t) for t in tickers]
+    fit = kernels.calculate_factor_exposures(returns[rows], np.ascontiguousarray(factors[usable]))
+
+    def _clean(val):
+        val = float(val)
+        return None if not np.isfinite(val) else round(val, 4)
+
+    return {
+        "universe": universe,
+        "factors": names,
+        "tickers": {
+            t: {
+                "loadings": {name: _clean(fit["loadings"][i][j]) for j, name in enumerate(names)},
+                "alpha_annualized": _clean(fit["alpha"][i]),
+                "r_squared": _clean(fit["r_squared"][i]),
+                "idiosyncratic_volatility": _clean(fit["idiosyncratic_volatility"][i]),
+                "observations": int(fit["observations"][i]),
+            }
+            for i, t in enumerate(tickers)
+        },
+    }
+
+
+@tracer.traced("tool.get_sector_metrics", category="tool", attributes=lambda tickers: {"tickers": ",".join(tickers)})
 def _get_sector_metrics(tickers: List[str]) -> Dict[str, Any]:
     """
     Fetch and compare metrics for a list of tickers.
@@ -1080,6 +1524,20 @@ def _get_sector_metrics(tickers: List[str]) -> Dict[str, Any]:
     
     if not results:
         return {"status": "error", "error_message": "Could not fetch data for any tickers."}
+    
+    # Same-window risk for all peers in one batch call (5y per-ticker metrics above cover different histories)
+    try:
+        risk_panel = _sector_risk_panel(tickers)
+    except Exception as e:
+        print(f" ⚠️ Batch risk panel failed: {e}")
+        risk_panel = {}
+
+    # Loadings on market / size / value / momentum / low-vol factors built from every analysed ticker
+    try:
+        factor_exposures = _factor_exposures(tickers)
+    except Exception as e:
+        print(f" ⚠️ Factor exposures failed: {e}")
+        factor_exposures = {}
         
     # Calculate averages (excluding None values)
     def calc_avg(key, parent=None):
@@ -1119,8 +1577,12 @@ def _get_sector_metrics(tickers: List[str]) -> Dict[str, Any]:
         # Risk
         "volatility": calc_avg("volatility_annualized", "risk_metrics"),
         "sharpe_ratio": calc_avg("sharpe_ratio", "risk_metrics"),
+        "sortino_ratio": calc_avg("sortino_ratio", "risk_metrics"),
         "beta": calc_avg("beta"), # Beta is top-level in financial_data
         "max_drawdown": calc_avg("max_drawdown", "risk_metrics"),
+        "current_drawdown": calc_avg("current_drawdown", "risk_metrics"),
+        "time_under_water": calc_avg("time_under_water", "risk_metrics"),
+        "average_recovery_days": calc_avg("average_recovery_days", "risk_metrics"),
         "var_95": calc_avg("value_at_risk_95", "risk_metrics"),
         
         # Dividend
@@ -1133,7 +1595,9 @@ def _get_sector_metrics(tickers: List[str]) -> Dict[str, Any]:
         "data": {
             "target": target_ticker,
             "results": results,
-            "averages": averages
+            "averages": averages,
+            "risk_panel_1y": risk_panel,
+            "factor_exposures_1y": factor_exposures
         }
     }
 
@@ -0,0 +1,201 @@
+"""
+Finance kernel facade.
+
+One import point for the numeric kernels used by the tools, served by one of two
+interchangeable backends with the same API:
+
+- "rust":  the compiled rust_finance extension (when it is installed)
+- "numpy": tools/finance_kernels/numpy_backend.py (always available)
+
+FINANCE_BACKEND selects the default ("auto" = Rust when importable, else NumPy;
+an explicit "rust" without the built extension raises on import).
+FINANCE_BACKEND_PROFILE may point to a JSON file written by
+`python -m tools.finance_kernels profile`, which picks the faster backend per
+function on our input sizes. `set_backend()` switches at runtime.
+
+    from tools import finance_kernels as kernels
+    kernels.calculate_risk_metrics(prices, [0.95, 0.99], 0.0)
+
+Streaming indicator classes (STREAMING) are routed the same way; their states
+are plain dicts in the same format on both backends, so `stream_from_state()`
+can restore a persisted state on whichever backend is active.
+"""
+
+import json
+import os
+from types import ModuleType
+from typing import Callable, Dict, Iterable, Optional
+
+from utils.config import FINANCE_BACKEND, FINANCE_BACKEND_PROFILE
+from tools.finance_kernels import numpy_backend
+
+try:
+    import rust_finance as _rust_finance
+    # Without the built extension the rust_finance/ source folder imports as an empty namespace package
+    if not hasattr(_rust_finance, "calculate_risk_metrics"):
+        _rust_finance = None
+except ImportError:
+    _rust_finance = None
+
+BACKENDS = ("rust", "numpy")
+
+# Every kernel exported by rust_finance; numpy_backend implements the same names
+KERNELS = (
+    # Risk
+    "calculate_volatility",
+    "calculate_sharpe_ratio",
+    "calculate_var_95",
+    "calculate_max_drawdown",
+    "calculate_beta",
+    "calculate_risk_metrics",
+    "calculate_risk_panel",
+    "calculate_rolling_risk",
+    "calculate_benchmark_beta",
+    "calculate_drawdown_episodes",
+    # Portfolio
+    "calculate_covariance",
+    "calculate_portfolio_risk",
+    "optimize_portfolio",
+    # Factors
+    "calculate_factor_returns",
+    "calculate_factor_exposures",
+    # Simulation
+    "calculate_var",
+    "calculate_portfolio_var",
+    # Technicals
+    "calculate_sma",
+    "calculate_ema",
+    "calculate_rsi",
+    "calculate_macd",
+    "detect_golden_cross",
+    "detect_death_cross",
+    "scan_crossovers",
+    "calculate_sma_series",
+    "calculate_ema_series",
+    "calculate_rsi_series",
+    "calculate_macd_series",
+    "calculate_indicator_series",
+    "calculate_ohlcv_indicators",
+    "aggregate_bars",
+    # Fundamentals
+    "calculate_fundamental_ratios",
+    # Utilities
+    "detect_trend",
+    "calculate_cagr",
+    "calculate_pct_change",
+    "detect_volume_spike",
+    "calculate_statement_trends",
+)
+
+# Stateful indicator classes (seed once, O(1) update per bar); state "kind" -> class
+STREAMING = {
+    "ema": "StreamingEma",
+    "rsi": "StreamingRsi",
+    "macd": "StreamingMacd",
+    "sma": "StreamingSma",
+    "volatility": "StreamingVolatility",
+    "drawdown": "StreamingDrawdown",
+}
+
+_modules: Dict[str, ModuleType] = {"numpy": numpy_backend}
+if _rust_finance is not None:
+    _modules["rust"] = _rust_finance
+
+_selected: Dict[str, str] = {}
+
+
+def available_backends() -> list:
+    """Backends that can be used on this host."""
+    return [name for name in BACKENDS if name in _modules]
+
+
+def _serves(backend: str, function: str) -> bool:
+    return backend in _modules and hasattr(_modules[backend], function)
+
+
+def _resolve(backend: str, function: str) -> str:
+    """
+    Backend serving `function`. "auto" prefers Rust and falls back to NumPy per function;
+    an explicit backend that is not installed (or predates `function`) is an error.
+    """
+    if backend == "auto":
+        return next(name for name in BACKENDS if _serves(name, function))
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Options: auto, {', '.join(BACKENDS)}")
+    if backend not in _modules:
+        raise ValueError(f"Backend '{backend}' is not available here (installed: {', '.join(available_backends())}); use 'auto' to fall back")
+    if not _serves(backend, function):
+        raise ValueError(f"Backend '{backend}' does not provide '{function}'; rebuild it or use 'auto' to fall back")
+    return backend
+
+
+def set_backend(backend: str, functions: Optional[Iterable[str]] = None) -> None:
+    """Route `functions` (default: all kernels and streaming classes) to `backend` ("auto", "rust" or "numpy")."""
+    names = KERNELS + tuple(STREAMING.values())
+    for function in functions or names:
+        if function not in names:
+            raise ValueError(f"Unknown kernel '{function}'")
+        _selected[function] = _resolve(backend, function)
+
+
+def load_profile(path: str) -> Dict[str, str]:
+    """
+    Apply a per-function backend profile ({"backends": {function: backend}}); returns what was applied.
+    Entries this host cannot serve (e.g. a profile written where rust_finance is installed) are skipped.
+    """
+    with open(path) as f:
+        choices = json.load(f).get("backends", {})
+    applied = {}
+    for function, backend in choices.items():
+        if function in KERNELS + tuple(STREAMING.values()) and _serves(backend, function):
+            set_backend(backend, [function])
+            applied[function] = _selected[function]
+    return applied
+
+
+def active_backends() -> Dict[str, str]:
+    """Backend currently serving each kernel."""
+    return dict(_selected)
+
+
+def describe() -> str:
+    """Short summary for startup logs, e.g. 'rust (3 kernels on numpy)'."""
+    counts: Dict[str, int] = {}
+    for backend in _selected.values():
+        counts[backend] = counts.get(backend, 0) + 1
+    main = max(counts, key=counts.get)
+    others = [f"{count} kernels on {name}" for name, count in counts.items() if name != main]
+    return main + (f" ({', '.join(others)})" if others else "")
+
+
+def get_backend_module(backend: str) -> ModuleType:
+    """The module implementing `backend` (for parity checks and profiling)."""
+    if backend not in _modules:
+        raise ValueError(f"Backend '{backend}' is not available here")
+    return _modules[backend]
+
+
+def stream_from_state(state: Dict) -> object:
+    """Restore a streaming indicator from `to_state()` output on the backend serving its class."""
+    name = STREAMING.get(state.get("kind"))
+    if name is None:
+        raise ValueError(f"Unknown streaming state kind '{state.get('kind')}'")
+    return getattr(_modules[_selected[name]], name).from_state(state)
+
+
+def _dispatch(function: str) -> Callable:
+    def kernel(*args, **kwargs):
+        return getattr(_modules[_selected[function]], function)(*args, **kwargs)
+
+    kernel.__name__ = function
+    kernel.__qualname__ = function
+    kernel.__doc__ = getattr(_modules[_resolve("auto", function)], function).__doc__
+    return kernel
+
+
+set_backend(FINANCE_BACKEND)
+if FINANCE_BACKEND_PROFILE and os.path.exists(FINANCE_BACKEND_PROFILE):
+    load_profile(FINANCE_BACKEND_PROFILE)
+
+for _function in KERNELS + tuple(STREAMING.values()):
+    globals()[_function] = _dispatch(_function)
@@ -0,0 +1,368 @@
+"""
+Backend parity checks and per-function profiling for the finance kernels.
+
+    python -m tools.finance_kernels parity            # Rust vs NumPy outputs, exit 1 on mismatch
+    python -m tools.finance_kernels profile -o kernels_profile.json
+    FINANCE_BACKEND_PROFILE=kernels_profile.json python chat.py analyze MSFT
+
+Parity runs every kernel on typical (5y daily), short, warm-up-length and
+NaN-containing inputs (plus Fortran-ordered and sliced matrices) and compares the two backends' results. Monte Carlo and
+bootstrap VaR use different generators, so those are checked within a
+statistical tolerance instead of exactly. Streaming indicators are seeded,
+updated bar by bar and restored from a JSON round-trip of their state.
+"""
+
+import sys
+import os
+
+# Allow `python tools/finance_kernels` as well as `python -m tools.finance_kernels`
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import json
+import math
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from tools import finance_kernels as kernels
+
+app = typer.Typer()
+console = Console()
+
+EXACT_RTOL = 1e-7
+STATISTICAL_RTOL = 0.05
+STATISTICAL_ATOL = 1e-3  # simulated means sit near zero
+TYPICAL_DAYS = 1_260  # 5 years of daily bars, what _get_deep_financials passes
+TYPICAL_ASSETS = 20   # sector peers / small portfolio
+
+
+def _returns(n: int, seed: int = 1) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0.0004, 0.015, n)
+
+
+def _prices(n: int, seed: int = 1) -> np.ndarray:
+    return 100.0 * np.cumprod(1.0 + _returns(n, seed))
+
+
+def _matrix(assets: int, days: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, days)
+    return rng.uniform(0.5, 1.5, (assets, 1)) * market + rng.normal(0.0002, 0.01, (assets, days))
+
+
+def _ohlcv(n: int, seed: int = 3) -> tuple:
+    """(high, low, close, volume) bars around a _prices close path."""
+    rng = np.random.default_rng(seed)
+    close = _prices(n, seed)
+    spread = close * rng.uniform(0.002, 0.02, n)
+    volume = rng.lognormal(13.0, 0.4, n).round()
+    return close + spread, close - spread * rng.uniform(0.5, 1.5, n), close, volume
+
+
+def _with_gaps(values: np.ndarray) -> np.ndarray:
+    gapped = values.copy()
+    gapped[..., ::17] = np.nan
+    return gapped
+
+
+def _cases() -> Dict[str, List[Tuple[str, tuple, dict]]]:
+    """(label, args, kwargs) per kernel; the first case is the typical size used for profiling."""
+    prices, returns = _prices(TYPICAL_DAYS), _returns(TYPICAL_DAYS)
+    short = _prices(30)
+    matrix = _matrix(TYPICAL_ASSETS, TYPICAL_DAYS)
+    weights = np.full(TYPICAL_ASSETS, 1.0 / TYPICAL_ASSETS)
+    price_matrix = 100.0 * np.cumprod(1.0 + matrix, axis=1)
+    bench, days = _prices(TYPICAL_DAYS, 2), np.arange(TYPICAL_DAYS, dtype=np.int64) * 7 // 5  # 5 bars per 7 days
+    calendar = days + 19_000  # 2022 onwards, days since epoch
+    # 15 statement lines x 5 quarters, oldest first, with missing periods and sign changes
+    statements = np.random.default_rng(11).normal(0.2, 0.6, (15, 5)).cumsum(axis=1) * 1e9
+    statements[::4, 0] = np.nan
+    statements[5, 2:4] = [np.inf, 0.0]
+    # Statement line items for 20 tickers x 5 years (ebit, interest, assets, current liabilities, equity, debt, ...)
+    lines = np.random.default_rng(13).normal(1.0, 0.5, (11, TYPICAL_ASSETS, 5)) * np.array([1, 0.1, 10, 3, 4, 2, 8, 1, -0.5, 0.8, 1])[:, None, None]
+    lines[1, :3, 0] = 0.0
+    lines[4, 3:5] = -lines[4, 3:5]
+    lines[:, 7, 1] = np.nan
+    # Factor scores (4 characteristics x 20 assets, some unranked) and 5 daily factor return series
+    scores = np.random.default_rng(17).normal(size=(4, TYPICAL_ASSETS))
+    scores[2, :3] = np.nan
+    factors = np.vstack([matrix.mean(axis=0), matrix[:4] - matrix[4:8]])
+    # Non C-contiguous layouts: Fortran order (what df.to_numpy().T gives) and a strided slice
+    transposed = np.asfortranarray(matrix)
+    sliced = matrix[::2, 252:]
+
+    series_cases = lambda *extra: [("5y", (prices, *extra), {}), ("30d", (short, *extra), {}), ("2d", (short[:2], *extra), {})]
+    return {
+        "calculate_volatility": [("5y", (returns,), {}), ("1d", (returns[:1],), {})],
+        "calculate_sharpe_ratio": [("5y", (returns, 0.02), {}), ("empty", (returns[:0], 0.0), {})],
+        "calculate_var_95": [("5y", (returns,), {}), ("10d", (returns[:10],), {})],
+        "calculate_max_drawdown": [("5y", (prices,), {}), ("1d", (prices[:1],), {})],
+        "calculate_beta": [("5y", (returns, _returns(TYPICAL_DAYS, 2)), {}), ("mismatch", (returns, returns[:-1]), {})],
+        "calculate_risk_metrics": [
+            ("5y", (prices, [0.95, 0.99], 0.02), {}),
+            ("gaps", (_with_gaps(prices), [0.975], 0.0), {}),
+            ("2d", (prices[:2], [0.95], 0.0), {}),
+        ],
+        "calculate_risk_panel": [
+            ("20x5y", (price_matrix,), {"confidence_levels": [0.95, 0.99]}),
+            ("returns_gaps", (_with_gaps(matrix),), {"kind": "returns"}),
+            ("transposed", (transposed,), {"kind": "returns"}),
+            ("sliced", (sliced,), {"kind": "returns"}),
+        ],
+        "calculate_rolling_risk": [
+            ("5y", (returns, 63, 1), {"benchmark": _returns(TYPICAL_DAYS, 2)}),
+            ("step5", (returns, 21, 5), {}),
+            ("gaps", (_with_gaps(returns), 63, 1), {"benchmark": _with_gaps(_returns(TYPICAL_DAYS, 2)[::-1])}),
+            ("short", (returns[:10], 63, 1), {}),
+        ],
+        "calculate_benchmark_beta": [
+            ("5y", (prices, days, bench, days), {}),
+            ("holidays_gaps", (_with_gaps(prices), days, bench[::3][:-1], days[::3][:-1]), {"lookbacks": [21, 252]}),
+            ("short", (short, days[:30], bench, days), {}),
+        ],
+        "calculate_drawdown_episodes": [
+            ("5y", (prices,), {}),
+            ("all_dips_gaps", (_with_gaps(prices), 10, 0.0), {}),
+            ("short", (short, 3, 0.01), {}),
+        ],
+        "calculate_covariance": [
+            ("20x5y", (matrix,), {}),
+            ("ledoit_wolf", (_with_gaps(matrix),), {"shrinkage": "ledoit_wolf"}),
+            ("transposed", (transposed,), {}),
+            ("sliced", (sliced,), {}),
+        ],
+        "calculate_portfolio_risk": [
+            ("20x5y", (matrix, weights), {}),
+            ("shrunk", (matrix, weights), {"shrinkage": 0.3}),
+            ("transposed", (transposed, weights), {}),
+        ],
+        "optimize_portfolio": [
+            ("min_variance", (matrix,), {}),
+            ("max_sharpe", (matrix,), {"objective": "max_sharpe", "risk_free_rate": 0.01}),
+            ("transposed", (transposed,), {}),
+        ],
+        "calculate_factor_returns": [
+            ("20x5y", (matrix, scores), {}),
+            ("gaps_q10", (_with_gaps(matrix), scores), {"quantile": 0.1}),
+            ("transposed", (transposed, np.asfortranarray(scores)), {}),
+            ("sliced", (sliced, scores[:, ::2]), {}),
+        ],
+        "calculate_factor_exposures": [
+            ("20x5y", (matrix, factors), {}),
+            ("gaps", (_with_gaps(matrix), _with_gaps(factors[:, ::-1])), {}),
+            ("short", (matrix[:, :5], factors[:, :5]), {}),
+            ("transposed", (transposed, np.asfortranarray(factors)), {}),
+            ("sliced", (sliced, factors[:, 252:]), {}),
+        ],
+        "calculate_var": [
+            ("monte_carlo_10d", (returns, "monte_carlo", 10), {}),
+            ("historical_10d", (returns, "historical", 10), {}),
+            ("parametric_10d", (returns, "parametric", 10), {}),
+        ],
+        "calculate_portfolio_var": [
+            ("monte_carlo_10d", (matrix, weights, "monte_carlo", 10), {}),
+            ("parametric_lw", (matrix, weights, "parametric", 5), {"shrinkage": "ledoit_wolf"}),
+            ("parametric_transposed", (transposed, weights, "parametric", 5), {}),
+        ],
+        "calculate_sma": series_cases(200) + [("short_period", (short, 20), {})],
+        "calculate_ema": series_cases(20),
+        "calculate_rsi": series_cases(14),
+        "calculate_macd": series_cases(12, 26, 9),
+        "detect_golden_cross": [("5y", (prices,), {}), ("short", (short,), {})],
+        "detect_death_cross": [("5y", (prices,), {}), ("short", (short,), {})],
+        "scan_crossovers": [("5y", (prices, 50, 200), {}), ("fast", (prices, 5, 20), {}), ("short", (short, 50, 200), {})],
+        "calculate_sma_series": series_cases(50),
+        "calculate_ema_series": series_cases(20),
+        "calculate_rsi_series": series_cases(14),
+        "calculate_macd_series": series_cases(12, 26, 9),
+        "calculate_indicator_series": [
+            ("5y", (prices,), {}),
+            ("custom", (prices,), {"sma_periods": [5], "ema_periods": [8, 21], "rsi_periods": [7], "macd": None}),
+        ],
+        "calculate_ohlcv_indicators": [
+            ("5y", _ohlcv(TYPICAL_DAYS), {}),
+            ("custom", _ohlcv(TYPICAL_DAYS), {"bollinger_period": 10, "atr_period": 7, "volume_periods": [5, 20]}),
+            ("gaps", tuple(_with_gaps(x) for x in _ohlcv(TYPICAL_DAYS)), {}),
+            ("short", _ohlcv(30), {}),
+        ],
+        "calculate_fundamental_ratios": [
+            ("20x5y", tuple(lines), {}),
+            ("required_only", tuple(lines[:6]), {}),
+            ("1x1", tuple(line[:1, -1:] for line in lines), {}),
+            ("transposed", tuple(np.asfortranarray(line) for line in lines), {}),
+        ],
+        "aggregate_bars": [
+            ("5y", (calendar, prices), {}),
+            ("gaps_filled", (calendar[::9], _with_gaps(prices)[::9]), {"frequencies": ["W", "Y"], "fill_gaps": True}),
+            ("empty", (calendar[:0], prices[:0]), {}),
+        ],
+        "detect_trend": [("5y", (prices,), {}), ("quarters", (np.array([1.0, 1.2, 1.5, 1.9]),), {})],
+        "calculate_cagr": [("5y", (100.0, 180.0, 5.0), {}), ("zero", (0.0, 10.0, 1.0), {})],
+        "calculate_pct_change": [("up", (100.0, 112.0), {}), ("zero", (0.0, 5.0), {})],
+        "detect_volume_spike": [("spike", (2.0e6, 1.2e6), {}), ("normal", (1.0e6, 1.2e6), {})],
+        "calculate_statement_trends": [
+            ("quarterly", (statements,), {"periods_per_year": 4}),
+            ("annual_3y", (statements[:, -3:],), {}),
+            ("no_periods", (statements[:, :0],), {}),
+        ],
+    }
+
+
+def _stream_cases() -> Dict[str, List[Tuple[str, tuple, np.ndarray]]]:
+    """(label, constructor args, prices) per streaming class."""
+    prices, short = _prices(TYPICAL_DAYS), _prices(30)
+    return {
+        "StreamingEma": [("5y", (20,), prices), ("gaps", (20,), _with_gaps(prices))],
+        "StreamingRsi": [("5y", (14,), prices), ("warm_up", (14,), short[:12])],
+        "StreamingMacd": [("5y", (12, 26, 9), prices), ("warm_up", (12, 26, 9), short)],
+        "StreamingSma": [("5y", (50,), prices), ("warm_up", (50,), short)],
+        "StreamingVolatility": [("5y", (63,), prices), ("gaps", (21,), _with_gaps(prices))],
+        "StreamingDrawdown": [("5y", (), prices), ("gaps", (), _with_gaps(prices))],
+    }
+
+
+def _run_stream(backend: str, name: str, params: tuple, prices: np.ndarray) -> Any:
+    """Seed on all but the last bars, update through them, then restore the state on both backends."""
+    try:
+        stream = getattr(kernels.get_backend_module(backend), name)(*params)
+        seeded = stream.seed(prices[:-5])
+        updates = [stream.update(float(p)) for p in prices[-5:]]
+        state = json.loads(json.dumps(stream.to_state()))
+        return {
+            "seeded": seeded,
+            "updates": updates,
+            "state": state,
+            "restored": type(stream).from_state(state).value,
+            "restored_numpy": getattr(kernels.get_backend_module("numpy"), name).from_state(state).value,
+        }
+    except Exception as e:
+        return {"error": type(e).__name__}
+
+
+def _is_statistical(function: str, args: tuple) -> bool:
+    method = next((a for a in args if isinstance(a, str)), "monte_carlo")
+    return function in ("calculate_var", "calculate_portfolio_var") and method != "parametric"
+
+
+def _compare(a: Any, b: Any, rtol: float, atol: float, path: str = "") -> List[str]:
+    """Differences between two kernel results (dicts, sequences, arrays, numbers)."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        problems = [f"{path}: keys differ {sorted(set(a) ^ set(b))}"] if set(a) != set(b) else []
+        for key in sorted(set(a) & set(b)):
+            problems += _compare(a[key], b[key], rtol, atol, f"{path}.{key}")
+        return problems
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        if len(a) != len(b):
+            return [f"{path}: length {len(a)} != {len(b)}"]
+        return [p for i, (x, y) in enumerate(zip(a, b)) for p in _compare(x, y, rtol, atol, f"{path}[{i}]")]
+    if isinstance(a, (str, bool)) or a is None or b is None:
+        return [] if a == b else [f"{path}: {a!r} != {b!r}"]
+    x, y = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    if x.shape != y.shape:
+        return [f"{path}: shape {x.shape} != {y.shape}"]
+    if not np.array_equal(np.isnan(x), np.isnan(y)):
+        return [f"{path}: NaN positions differ"]
+    if not np.allclose(x, y, rtol=rtol, atol=atol, equal_nan=True):
+        worst = np.nanmax(np.abs(x - y)) if x.size else 0.0
+        return [f"{path}: max abs diff {worst:.3g}"]
+    return []
+
+
+def _call(backend: str, function: str, args: tuple, kwargs: dict) -> Any:
+    try:
+        return getattr(kernels.get_backend_module(backend), function)(*args, **kwargs)
+    except Exception as e:  # Errors must match across backends too
+        return {"error": type(e).__name__}
+
+
+@app.command()
+def parity(
+    function: str = typer.Option(None, "--function", "-f", help="Check one kernel only"),
+):
+    """Compare Rust and NumPy backend outputs on every kernel."""
+    if "rust" not in kernels.available_backends():
+        console.print("[yellow]rust_finance is not installed; nothing to compare against[/yellow]")
+        raise typer.Exit(0)
+
+    table = Table(title="Finance kernel parity (rust vs numpy)")
+    table.add_column("Kernel", style="cyan")
+    table.add_column("Case")
+    table.add_column("Result")
+    failures = 0
+    for name, cases in _cases().items():
+        if function and name != function:
+            continue
+        for label, args, kwargs in cases:
+            rtol = STATISTICAL_RTOL if _is_statistical(name, args) else EXACT_RTOL
+            if rtol == STATISTICAL_RTOL:
+                kwargs = {**kwargs, "n_paths": 200_000}
+            atol = STATISTICAL_ATOL if rtol == STATISTICAL_RTOL else EXACT_RTOL * 1e-3
+            problems = _compare(_call("rust", name, args, kwargs), _call("numpy", name, args, kwargs), rtol, atol)
+            failures += bool(problems)
+            table.add_row(name, label, "[green]ok[/green]" if not problems else f"[red]{'; '.join(problems)}[/red]")
+    for name, cases in _stream_cases().items():
+        if function and name != function:
+            continue
+        for label, params, prices in cases:
+            problems = _compare(_run_stream("rust", name, params, prices), _run_stream("numpy", name, params, prices), EXACT_RTOL, EXACT_RTOL * 1e-3)
+            failures += bool(problems)
+            table.add_row(name, label, "[green]ok[/green]" if not problems else f"[red]{'; '.join(problems)}[/red]")
+    console.print(table)
+    if failures:
+        console.print(f"[red]{failures} case(s) differ[/red]")
+        raise typer.Exit(1)
+
+
+def _best_time(fn: Callable[[], Any], repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    loops, elapsed = timer.autorange()
+    return min([elapsed / loops] + [timer.timeit(loops) / loops for _ in range(repeat - 1)])
+
+
+@app.command()
+def profile(
+    output: str = typer.Option("kernels_profile.json", "--output", "-o", help="Profile file for FINANCE_BACKEND_PROFILE"),
+    repeat: int = typer.Option(3, help="Timing samples per backend"),
+    margin: float = typer.Option(0.05, help="Keep Rust unless NumPy is faster by more than this fraction"),
+):
+    """Time both backends per kernel on typical inputs and write the faster choice."""
+    backends = kernels.available_backends()
+    timings: Dict[str, Dict[str, float]] = {}
+    choices: Dict[str, str] = {}
+    table = Table(title="Per-kernel backend choice")
+    table.add_column("Kernel", style="cyan")
+    for backend in backends:
+        table.add_column(backend, justify="right")
+    table.add_column("Choice")
+
+    for name, cases in _cases().items():
+        _, args, kwargs = cases[0]
+        timings[name] = {}
+        for backend in backends:
+            module = kernels.get_backend_module(backend)
+            timings[name][backend] = _best_time(lambda: getattr(module, name)(*args, **kwargs), repeat)
+        rust_time = timings[name].get("rust", math.inf)
+        choices[name] = "numpy" if timings[name]["numpy"] < rust_time * (1.0 - margin) else "rust"
+        if "rust" not in backends:
+            choices[name] = "numpy"
+        table.add_row(name, *(f"{timings[name][b] * 1e6:,.1f}µs" for b in backends), choices[name])
+
+    console.print(table)
+    with open(output, "w") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "typical_days": TYPICAL_DAYS,
+            "typical_assets": TYPICAL_ASSETS,
+            "timings_s": timings,
+            "backends": choices,
+        }, f, indent=2)
+    console.print(f"[green]Wrote {output}; set FINANCE_BACKEND_PROFILE={output} to use it[/green]")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,1360 @@
+"""
+Pure NumPy backend for the finance kernels.
+
+Mirrors the rust_finance API (names, arguments, return shapes and NaN / default
+conventions) so either backend can serve any call. Rolling means use cumulative
+sums, drawdowns use running maxima and quantiles use np.partition; EMA-style
+recursions go through pandas' ewm. Monte Carlo and bootstrap VaR draw from
+NumPy's generator, so they match Rust statistically rather than bit for bit.
+"""
+
+import math
+from collections import deque
+from statistics import NormalDist
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252.0
+_MAX_ITERATIONS = 20_000
+_TOLERANCE = 1e-12
+
+Shrinkage = Union[None, float, str]
+
+
+def _as_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64).ravel()
+
+
+def _as_matrix(values) -> np.ndarray:
+    matrix = np.asarray(values, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    if matrix.ndim != 2:
+        raise ValueError("expected a 2-D array shaped (assets, days)")
+    return matrix
+
+
+def _level_label(level: float) -> str:
+    """'95' for 0.95, '97.5' for 0.975 (same keys as the Rust backend)."""
+    pct = round(level * 1000.0) / 10.0
+    return str(int(pct)) if pct == int(pct) else str(pct)
+
+
+# ============================================================================
+# Risk
+# ============================================================================
+
+def calculate_volatility(returns) -> float:
+    r = _as_array(returns)
+    return float(r.std() * np.sqrt(TRADING_DAYS)) if len(r) else 0.0
+
+
+def calculate_sharpe_ratio(returns, risk_free_rate: float) -> float:
+    r = _as_array(returns)
+    if not len(r):
+        return 0.0
+    vol = calculate_volatility(r)
+    return float((r.mean() * TRADING_DAYS - risk_free_rate) / vol) if vol != 0.0 else 0.0
+
+
+def calculate_var_95(returns) -> float:
+    r = _as_array(returns)
+    if not len(r):
+        return 0.0
+    index = min(int(len(r) * 0.05), len(r) - 1)
+    return float(np.partition(r, index)[index])
+
+
+def calculate_max_drawdown(prices) -> float:
+    p = _as_array(prices)
+    if not len(p):
+        return 0.0
+    return float(min((p / np.maximum.accumulate(p) - 1.0).min(), 0.0))
+
+
+def calculate_beta(stock_returns, market_returns) -> float:
+    s, m = _as_array(stock_returns), _as_array(market_returns)
+    if len(s) != len(m) or not len(s):
+        return 1.0
+    market_variance = m.var()
+    if market_variance == 0.0:
+        return 1.0
+    return float(((s - s.mean()) * (m - m.mean())).mean() / market_variance)
+
+
+def _tail_risk(returns: np.ndarray, level: float) -> Tuple[float, float]:
+    """Historical VaR (return at index floor(n * (1 - level))) and CVaR (mean at or below it)."""
+    if not len(returns) or not 0.0 <= level < 1.0:
+        return np.nan, np.nan
+    index = min(int(len(returns) * (1.0 - level)), len(returns) - 1)
+    part = np.partition(returns, index)
+    return float(part[index]), float(part[: index + 1].mean())
+
+
+def _risk_block(prices: np.ndarray, confidence_levels: Sequence[float], risk_free_rate: float) -> Dict[str, float]:
+    p = prices[np.isfinite(prices) & (prices > 0)]
+    returns = p[1:] / p[:-1] - 1.0
+    n = len(returns)
+    block: Dict[str, float] = {"observations": max(n, 0)}
+    if n < 2:
+        block.update({key: np.nan for key in (
+            "total_return", "cagr", "volatility", "sharpe_ratio", "sortino_ratio", "downside_deviation",
+            "calmar_ratio", "max_drawdown", "skewness", "kurtosis",
+        )})
+        for level in confidence_levels:
+            block[f"var_{_level_label(level)}"] = np.nan
+            block[f"cvar_{_level_label(level)}"] = np.nan
+        return block
+
+    centered = returns - returns.mean()
+    m2 = (centered ** 2).sum()
+    m3 = (centered ** 3).sum()
+    m4 = (centered ** 4).sum()
+    volatility = np.sqrt(m2 / n * TRADING_DAYS)
+    downside = np.minimum(returns - risk_free_rate / TRADING_DAYS, 0.0)
+    downside_deviation = np.sqrt((downside ** 2).sum() / n * TRADING_DAYS)
+    excess = returns.mean() * TRADING_DAYS - risk_free_rate
+    max_dd = float((1.0 - p / np.maximum.accumulate(p)).max())
+    cagr = (p[-1] / p[0]) ** (TRADING_DAYS / n) - 1.0
+
+    block.update({
+        "total_return": float(p[-1] / p[0] - 1.0),
+        "cagr": float(cagr),
+        "volatility": float(volatility),
+        "sharpe_ratio": float(excess / volatility) if volatility > 0 else 0.0,
+        "sortino_ratio": float(excess / downside_deviation) if downside_deviation > 0 else 0.0,
+        "downside_deviation": float(downside_deviation),
+        "calmar_ratio": float(cagr / max_dd) if max_dd > 0 else np.nan,
+        "max_drawdown": -max_dd,
+        "skewness": float(np.sqrt(n) * m3 / m2 ** 1.5) if m2 > 0 else 0.0,
+        "kurtosis": float(n * m4 / (m2 * m2) - 3.0) if m2 > 0 else 0.0,
+    })
+    for level in confidence_levels:
+        var, cvar = _tail_risk(returns, level)
+        block[f"var_{_level_label(level)}"] = var
+        block[f"cvar_{_level_label(level)}"] = cvar
+    return block
+
+
+def calculate_risk_metrics(prices, confidence_levels: Sequence[float] = (0.95, 0.99), risk_free_rate: float = 0.0) -> Dict[str, float]:
+    return _risk_block(_as_array(prices), confidence_levels, risk_free_rate)
+
+
+def calculate_risk_panel(matrix, kind: str = "prices", risk_free_rate: float = 0.0, confidence_levels: Sequence[float] = (0.95,)) -> Dict[str, np.ndarray]:
+    if kind not in ("prices", "returns"):
+        raise ValueError("kind must be 'prices' or 'returns'")
+    rows = []
+    for row in _as_matrix(matrix):
+        if kind == "returns":
+            row = np.concatenate(([1.0], np.cumprod(1.0 + row[np.isfinite(row)])))
+        rows.append(_risk_block(row, confidence_levels, risk_free_rate))
+    keys = rows[0].keys() if rows else _risk_block(np.empty(0), confidence_levels, risk_free_rate).keys()
+    panel = {key: np.array([r[key] for r in rows], dtype=np.float64) for key in keys}
+    panel["observations"] = panel["observations"].astype(np.int64)
+    return panel
+
+
+def calculate_rolling_risk(returns, window: int = 63, step: int = 1, benchmark=None, risk_free_rate: float = 0.0) -> Dict[str, np.ndarray]:
+    r = _as_array(returns)
+    b = _as_array(benchmark) if benchmark is not None else None
+    if b is not None and len(b) != len(r):
+        raise ValueError("benchmark must have the same length as returns")
+    n = len(r)
+    if window < 2 or step == 0 or n < window:
+        ends = np.empty(0, dtype=np.int64)
+    else:
+        ends = np.arange(n - 1, window - 2, -step, dtype=np.int64)[::-1]
+
+    # Non-finite bars (in either series) are left out of every window containing them
+    valid = np.isfinite(r) if b is None else np.isfinite(r) & np.isfinite(b)
+    r = np.where(valid, r, 0.0)
+    b = np.where(valid, b, 0.0) if b is not None else None
+
+    def window_sums(x):
+        sums = np.concatenate(([0.0], np.cumsum(x)))
+        return sums[ends + 1] - sums[ends + 1 - window]
+
+    count = window_sums(valid.astype(np.float64))
+    enough = count >= 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = window_sums(r) / count
+        var = np.maximum(window_sums(r * r) / count - mean * mean, 0.0)
+        vol = np.where(enough, np.sqrt(var * TRADING_DAYS), np.nan)
+        sharpe = np.where(enough, np.where(vol > 0, (mean * TRADING_DAYS - risk_free_rate) / vol, 0.0), np.nan)
+    result = {"index": ends, "volatility": vol, "sharpe_ratio": sharpe}
+    if b is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_b = window_sums(b) / count
+            var_b = np.maximum(window_sums(b * b) / count - mean_b * mean_b, 0.0)
+            cov = window_sums(r * b) / count - mean * mean_b
+            result["beta"] = np.where(enough & (var_b > 0), cov / var_b, np.nan)
+            result["correlation"] = np.where(enough & (var > 0) & (var_b > 0), cov / np.sqrt(var * var_b), np.nan)
+    return result
+
+
+def _aligned_returns(dates: np.ndarray, prices: np.ndarray, benchmark_dates: np.ndarray, benchmark_prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns over the dates both series share, after dropping missing / non-positive prices."""
+    with np.errstate(invalid="ignore"):
+        keep, keep_b = np.isfinite(prices) & (prices > 0), np.isfinite(benchmark_prices) & (benchmark_prices > 0)
+    _, i, j = np.intersect1d(dates[keep], benchmark_dates[keep_b], assume_unique=True, return_indices=True)
+    p, b = prices[keep][i], benchmark_prices[keep_b][j]
+    return p[1:] / p[:-1] - 1.0, b[1:] / b[:-1] - 1.0
+
+
+def _drawdown_profile(prices, min_depth: float) -> Dict[str, Any]:
+    """Drawdown episodes as (depth, peak, trough, recovery) with original bar indices; see calculate_drawdown_episodes."""
+    p = _as_array(prices)
+    idx = np.flatnonzero(np.isfinite(p) & (p > 0))
+    p = p[idx]
+    if len(p) == 0:
+        return {"episodes": [], "max_drawdown": 0.0, "current_drawdown": 0.0, "time_under_water": np.nan,
+                "longest_under_water": 0, "current_under_water": 0, "last": 0}
+    peak = np.maximum.accumulate(p)
+    drawdown = p / peak - 1.0
+    under = p < peak
+    # Runs of consecutive under-water bars (in valid-bar positions)
+    edges = np.diff(np.r_[0, under.astype(np.int8), 0])
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    episodes, longest = [], 0
+    for start, end in zip(starts, ends):
+        trough = start + int(np.argmin(drawdown[start:end]))
+        recovery = int(idx[end]) if end < len(p) else None
+        peak_index = int(idx[start - 1])
+        longest = max(longest, (recovery if recovery is not None else int(idx[-1])) - peak_index)
+        if drawdown[trough] <= -min_depth:
+            episodes.append((float(drawdown[trough]), peak_index, int(idx[trough]), recovery))
+    current_under_water = int(idx[-1] - idx[starts[-1] - 1]) if under[-1] else 0
+    return {
+        "episodes": episodes,
+        "max_drawdown": float(min(drawdown.min(), 0.0)),
+        "current_drawdown": float(drawdown[-1]),
+        "time_under_water": float(under.mean()),
+        "longest_under_water": longest,
+        "current_under_water": current_under_water,
+        "last": int(idx[-1]),
+    }
+
+
+def calculate_drawdown_episodes(prices, top_n: int = 5, min_depth: float = 0.05) -> Dict[str, Any]:
+    if not 0.0 <= min_depth < 1.0:
+        raise ValueError("min_depth must be in [0, 1)")
+    profile = _drawdown_profile(prices, min_depth)
+    episodes = profile["episodes"]
+    recoveries = [recovery - trough for _, _, trough, recovery in episodes if recovery is not None]
+    deepest = sorted(episodes, key=lambda e: (e[0], e[1]))[:top_n]
+    return {
+        "episodes": [
+            {
+                "depth": depth,
+                "peak_index": peak,
+                "trough_index": trough,
+                "recovery_index": recovery,
+                "peak_to_trough": trough - peak,
+                "trough_to_recovery": None if recovery is None else recovery - trough,
+                "duration": (profile["last"] if recovery is None else recovery) - peak,
+            }
+            for depth, peak, trough, recovery in deepest
+        ],
+        "episode_count": len(episodes),
+        "max_drawdown": profile["max_drawdown"],
+        "current_drawdown": profile["current_drawdown"],
+        "time_under_water": profile["time_under_water"],
+        "longest_under_water": profile["longest_under_water"],
+        "current_under_water": profile["current_under_water"],
+        "average_recovery": float(np.mean(recoveries)) if recoveries else np.nan,
+    }
+
+
+def calculate_benchmark_beta(prices, dates, benchmark_prices, benchmark_dates, lookbacks: Sequence[int] = (63, 252, 756)) -> Dict[str, Any]:
+    p, b = _as_array(prices), _as_array(benchmark_prices)
+    d = np.ascontiguousarray(dates, dtype=np.int64).ravel()
+    db = np.ascontiguousarray(benchmark_dates, dtype=np.int64).ravel()
+    if len(p) != len(d) or len(b) != len(db):
+        raise ValueError("prices and dates must have the same length")
+    if np.any(np.diff(d) <= 0) or np.any(np.diff(db) <= 0):
+        raise ValueError("dates must be strictly increasing")
+    stock, market = _aligned_returns(d, p, db, b)
+    n = len(stock)
+    result: Dict[str, Any] = {"observations": n}
+    for lookback in lookbacks:
+        beta = correlation = np.nan
+        if 2 <= lookback <= n:
+            s, m = stock[-lookback:], market[-lookback:]
+            ds, dm = s - s.mean(), m - m.mean()
+            cov, var_s, var_m = (ds * dm).sum(), (ds * ds).sum(), (dm * dm).sum()
+            if var_m > 0:
+                beta = cov / var_m
+                if var_s > 0:
+                    correlation = cov / np.sqrt(var_s * var_m)
+        result[f"beta_{lookback}"] = float(beta)
+        result[f"correlation_{lookback}"] = float(correlation)
+    return result
+
+
+# ============================================================================
+# Portfolio
+# ============================================================================
+
+def _moments(returns, shrinkage: Shrinkage) -> Tuple[np.ndarray, np.ndarray, float, int]:
+    """Aligned means, (shrunk) population covariance, shrinkage intensity and days used."""
+    matrix = _as_matrix(returns)
+    aligned = matrix[:, np.isfinite(matrix).all(axis=0)]
+    n_assets, n_days = aligned.shape
+    if n_days < 2:
+        raise ValueError("need at least two days where every asset has a return")
+
+    if shrinkage is None:
+        intensity = None
+    elif isinstance(shrinkage, str):
+        if shrinkage != "ledoit_wolf":
+            raise ValueError(f"unknown shrinkage method '{shrinkage}'")
+        intensity = None
+    elif 0.0 <= shrinkage <= 1.0:
+        intensity = float(shrinkage)
+    else:
+        raise ValueError("shrinkage intensity must be between 0 and 1")
+
+    means = aligned.mean(axis=1)
+    centered = aligned - means[:, np.newaxis]
+    cov = centered @ centered.T / n_days
+    mu = np.trace(cov) / n_assets
+    target = mu * np.eye(n_assets)
+
+    if shrinkage == "ledoit_wolf":
+        d2 = ((cov - target) ** 2).sum() / n_assets
+        fourth = ((centered ** 2).sum(axis=0) ** 2).sum()
+        b_bar2 = max((fourth - n_days * (cov ** 2).sum()) / n_days ** 2 / n_assets, 0.0)
+        intensity = min(b_bar2, d2) / d2 if d2 > 0 else 0.0
+    intensity = intensity or 0.0
+    if intensity > 0:
+        cov = intensity * target + (1.0 - intensity) * cov
+    return means, cov, intensity, n_days
+
+
+def _correlation(cov: np.ndarray) -> np.ndarray:
+    std = np.sqrt(np.maximum(np.diag(cov), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    corr[np.outer(std, std) == 0] = np.nan
+    return corr
+
+
+def _portfolio_risk(means: np.ndarray, cov: np.ndarray, weights: np.ndarray) -> Dict[str, Any]:
+    sigma_w = cov @ weights
+    variance = float(weights @ sigma_w)
+    daily_vol = np.sqrt(max(variance, 0.0))
+    if daily_vol > 0:
+        contributions = weights * sigma_w / daily_vol * np.sqrt(TRADING_DAYS)
+        contributions_pct = weights * sigma_w / variance
+        diversification = float(weights @ np.sqrt(np.maximum(np.diag(cov), 0.0)) / daily_vol)
+    else:
+        contributions = np.zeros(len(weights))
+        contributions_pct = np.full(len(weights), np.nan)
+        diversification = np.nan
+    return {
+        "volatility": float(daily_vol * np.sqrt(TRADING_DAYS)),
+        "expected_return": float(weights @ means * TRADING_DAYS),
+        "risk_contributions": contributions,
+        "risk_contributions_pct": contributions_pct,
+        "diversification_ratio": diversification,
+    }
+
+
+def calculate_covariance(returns, shrinkage: Shrinkage = None) -> Dict[str, Any]:
+    _, cov, intensity, n_days = _moments(returns, shrinkage)
+    return {"covariance": cov, "correlation": _correlation(cov), "shrinkage": intensity, "days": n_days}
+
+
+def calculate_portfolio_risk(returns, weights, shrinkage: Shrinkage = None) -> Dict[str, Any]:
+    weights = _as_array(weights)
+    if len(weights) != _as_matrix(returns).shape[0]:
+        raise ValueError("weights must have one entry per asset (row)")
+    means, cov, _, _ = _moments(returns, shrinkage)
+    return _portfolio_risk(means, cov, weights)
+
+
+def _project_simplex(v: np.ndarray) -> np.ndarray:
+    u = np.sort(v)[::-1]
+    cumulative = np.cumsum(u) - 1.0
+    candidates = cumulative / np.arange(1, len(v) + 1)
+    theta = candidates[u - candidates > 0][-1] if (u - candidates > 0).any() else 0.0
+    return np.maximum(v - theta, 0.0)
+
+
+def _project_halfspace_cone(v: np.ndarray, a: np.ndarray) -> np.ndarray:
+    """Projection onto {y >= 0, a'y = 1} by bisection on the multiplier."""
+    def constraint(lam):
+        return float(a @ np.maximum(v + lam * a, 0.0))
+
+    lo, hi = -1.0, 1.0
+    while constraint(lo) > 1.0:
+        lo *= 2.0
+    while constraint(hi) < 1.0:
+        hi *= 2.0
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if constraint(mid) < 1.0:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo < 1e-15 * (1.0 + abs(hi)):
+            break
+    return np.maximum(v + 0.5 * (lo + hi) * a, 0.0)
+
+
+def _minimize_quadratic(cov: np.ndarray, start: np.ndarray, project) -> np.ndarray:
+    """Accelerated projected gradient (FISTA) on x' cov x, as in the Rust backend."""
+    lipschitz = 2.0 * np.abs(cov).sum(axis=1).max()
+    if lipschitz <= 0:
+        return start
+    step = 1.0 / lipschitz
+    x, y, momentum = start.copy(), start.copy(), 1.0
+    for _ in range(_MAX_ITERATIONS):
+        nxt = project(y - step * 2.0 * (cov @ y))
+        next_momentum = (1.0 + np.sqrt(1.0 + 4.0 * momentum * momentum)) / 2.0
+        change = np.abs(nxt - x).max()
+        y = nxt + (momentum - 1.0) / next_momentum * (nxt - x)
+        x, momentum = nxt, next_momentum
+        if change < _TOLERANCE:
+            break
+    return x
+
+
+def optimize_portfolio(returns, objective: str = "min_variance", risk_free_rate: float = 0.0, shrinkage: Shrinkage = None) -> Dict[str, Any]:
+    means, cov, _, _ = _moments(returns, shrinkage)
+    n = len(means)
+    if objective == "min_variance":
+        weights = _minimize_quadratic(cov, np.full(n, 1.0 / n), _project_simplex)
+    elif objective == "max_sharpe":
+        excess = means * TRADING_DAYS - risk_free_rate
+        best = excess.max() if n else -np.inf
+        if not best > 0:
+            raise ValueError("max_sharpe needs at least one asset with expected return above the risk-free rate")
+        start = np.zeros(n)
+        start[int(np.argmax(excess))] = 1.0 / best
+        y = _minimize_quadratic(cov, start, lambda v: _project_halfspace_cone(v, excess))
+        weights = y / y.sum()
+    else:
+        raise ValueError("objective must be 'min_variance' or 'max_sharpe'")
+
+    risk = _portfolio_risk(means, cov, weights)
+    sharpe = (risk["expected_return"] - risk_free_rate) / risk["volatility"] if risk["volatility"] > 0 else np.nan
+    return {"weights": weights, "sharpe_ratio": float(sharpe), **risk}
+
+
+# ============================================================================
+# Factors
+# ============================================================================
+
+def calculate_factor_returns(returns, scores, quantile: float = 0.3) -> np.ndarray:
+    data, scores = _as_matrix(returns), _as_matrix(scores)
+    n_assets, n_days = data.shape
+    if scores.shape[1] != n_assets:
+        raise ValueError("scores must have one column per asset (row of returns)")
+    if not 0.0 < quantile <= 0.5:
+        raise ValueError("quantile must be in (0, 0.5]")
+    out = np.full((scores.shape[0], n_days), np.nan)
+    finite = np.isfinite(data)
+    filled = np.where(finite, data, 0.0)
+    for f, row in enumerate(scores):
+        ranked = np.flatnonzero(np.isfinite(row))
+        if len(ranked) < 2:
+            continue
+        ranked = ranked[np.argsort(row[ranked], kind="stable")]
+        leg = min(max(int(math.floor(quantile * len(ranked) + 0.5)), 1), len(ranked) // 2)
+        legs = []
+        for assets in (ranked[-leg:], ranked[:leg]):
+            count = finite[assets].sum(axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                legs.append(np.where(count > 0, filled[assets].sum(axis=0) / count, np.nan))
+        out[f] = legs[0] - legs[1]
+    return out
+
+
+def _batched_cholesky_solve(a: np.ndarray, b: np.ndarray):
+    """Solve a[i] x = b[i] for stacked SPD matrices; `ok` is False where a pivot vanished (same test as Rust)."""
+    a, b = a.copy(), b.copy()
+    n = a.shape[-1]
+    ok = np.ones(len(a), dtype=bool)
+    scale = np.max(np.diagonal(a, axis1=1, axis2=2), axis=1, initial=0.0)
+    for j in range(n):
+        d = a[:, j, j] - np.sum(a[:, j, :j] ** 2, axis=1)
+        ok &= d > 1e-12 * scale
+        d = np.sqrt(np.where(ok, d, 1.0))
+        a[:, j, j] = d
+        for i in range(j + 1, n):
+            a[:, i, j] = (a[:, i, j] - np.sum(a[:, i, :j] * a[:, j, :j], axis=1)) / d
+    for i in range(n):
+        b[:, i] = (b[:, i] - np.sum(a[:, i, :i] * b[:, :i], axis=1)) / a[:, i, i]
+    for i in reversed(range(n)):
+        b[:, i] = (b[:, i] - np.sum(a[:, i + 1:, i] * b[:, i + 1:], axis=1)) / a[:, i, i]
+    return b, ok
+
+
+def calculate_factor_exposures(returns, factors) -> Dict[str, np.ndarray]:
+    data, factors = _as_matrix(returns), _as_matrix(factors)
+    n_assets, n_days = data.shape
+    k = factors.shape[0]
+    if factors.shape[1] != n_days:
+        raise ValueError("returns and factors must cover the same days (columns)")
+
+    # Per-asset usable days: the asset and every factor finite
+    mask = np.isfinite(data) & np.all(np.isfinite(factors), axis=0)
+    n = mask.sum(axis=1)
+    y = np.where(mask, data, 0.0)
+    x = np.where(np.all(np.isfinite(factors), axis=0), factors, 0.0)
+    safe_n = np.maximum(n, 1)
+    mean_y = y.sum(axis=1) / safe_n
+    mean_x = mask.astype(np.float64) @ x.T / safe_n[:, None]  # (assets, k)
+
+    yc = np.where(mask, y - mean_y[:, None], 0.0)
+    xc = np.where(mask[:, None, :], x[None, :, :] - mean_x[:, :, None], 0.0)  # (assets, k, days)
+    xtx = np.einsum("akd,ald->akl", xc, xc)
+    xty = np.einsum("akd,ad->ak", xc, yc)
+    syy = np.einsum("ad,ad->a", yc, yc)
+
+    loadings, ok = _batched_cholesky_solve(xtx, xty)
+    ok &= n > k + 1
+    explained = np.sum(loadings * xty, axis=1)
+    residual = np.maximum(syy - explained, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_squared = np.where(syy > 0, 1.0 - residual / syy, np.nan)
+        idio = np.sqrt(residual / (n - k - 1)) * np.sqrt(TRADING_DAYS)
+    alpha = (mean_y - np.sum(loadings * mean_x, axis=1)) * TRADING_DAYS
+    nan = lambda v: np.where(ok, v, np.nan)
+    return {
+        "loadings": np.where(ok[:, None], loadings, np.nan),
+        "alpha": nan(alpha),
+        "r_squared": nan(r_squared),
+        "idiosyncratic_volatility": nan(idio),
+        "observations": n.astype(np.int64),
+    }
+
+
+# ============================================================================
+# Simulation (VaR / CVaR)
+# ============================================================================
+
+_PATHS_PER_CHUNK = 65_536  # bounds memory: paths x horizon draws per chunk
+
+
+def _check_run(method: str, horizon_days: int, n_paths: int, confidence_levels: Sequence[float]) -> None:
+    if method not in ("parametric", "historical", "monte_carlo"):
+        raise ValueError("method must be 'parametric', 'historical' or 'monte_carlo'")
+    if horizon_days <= 0 or n_paths <= 0:
+        raise ValueError("horizon_days and n_paths must be positive")
+    if any(not 0.0 < c < 1.0 for c in confidence_levels):
+        raise ValueError("confidence levels must be between 0 and 1")
+
+
+def _parametric_var(mean: float, std: float, horizon_days: int, confidence_levels) -> Dict[str, Any]:
+    """Closed-form normal VaR / CVaR of the h-day return (mean h * mu, std sqrt(h) * sigma)."""
+    h_mean, h_std = mean * horizon_days, std * np.sqrt(horizon_days)
+    result: Dict[str, Any] = {
+        "method": "parametric", "horizon_days": horizon_days, "paths": 0,
+        "expected_return": float(h_mean), "volatility": float(h_std),
+    }
+    for level in confidence_levels:
+        z = NormalDist().inv_cdf(1.0 - level)
+        density = np.exp(-0.5 * z * z) / np.sqrt(2.0 * np.pi)
+        result[f"var_{_level_label(level)}"] = float(h_mean + z * h_std)
+        result[f"cvar_{_level_label(level)}"] = float(h_mean - h_std * density / (1.0 - level))
+    return result
+
+
+def _value_at_risk(daily: np.ndarray, method: str, horizon_days: int, confidence_levels, n_paths: int, seed: int) -> Dict[str, Any]:
+    mean, std = daily.mean(), daily.std()
+    if method == "parametric":
+        return _parametric_var(mean, std, horizon_days, confidence_levels)
+
+    result: Dict[str, Any] = {"method": method, "horizon_days": horizon_days}
+    rng = np.random.default_rng(seed)
+    paths = np.empty(n_paths)
+    for start in range(0, n_paths, _PATHS_PER_CHUNK):
+        size = min(_PATHS_PER_CHUNK, n_paths - start)
+        if method == "historical":
+            draws = daily[rng.integers(0, len(daily), (size, horizon_days))]
+        else:
+            draws = rng.normal(mean, std, (size, horizon_days))
+        paths[start:start + size] = np.prod(1.0 + draws, axis=1) - 1.0
+
+    result.update({"paths": n_paths, "expected_return": float(paths.mean()), "volatility": float(paths.std())})
+    for level in confidence_levels:
+        var, cvar = _tail_risk(paths, level)
+        result[f"var_{_level_label(level)}"] = var
+        result[f"cvar_{_level_label(level)}"] = cvar
+    return result
+
+
+def calculate_var(returns, method: str = "monte_carlo", horizon_days: int = 1, confidence_levels: Sequence[float] = (0.95, 0.99), n_paths: int = 100_000, seed: int = 42) -> Dict[str, Any]:
+    _check_run(method, horizon_days, n_paths, confidence_levels)
+    r = _as_array(returns)
+    r = r[np.isfinite(r)]
+    if len(r) < 2:
+        raise ValueError("need at least two finite returns")
+    return _value_at_risk(r, method, horizon_days, confidence_levels, n_paths, seed)
+
+
+def calculate_portfolio_var(returns, weights, method: str = "monte_carlo", horizon_days: int = 1, confidence_levels: Sequence[float] = (0.95, 0.99), n_paths: int = 100_000, seed: int = 42, shrinkage: Shrinkage = None) -> Dict[str, Any]:
+    _check_run(method, horizon_days, n_paths, confidence_levels)
+    matrix = _as_matrix(returns)
+    weights = _as_array(weights)
+    if len(weights) != matrix.shape[0]:
+        raise ValueError("weights must have one entry per asset (row)")
+    aligned = matrix[:, np.isfinite(matrix).all(axis=0)]
+    if aligned.shape[1] < 2:
+        raise ValueError("need at least two days where every asset has a return")
+    if method == "parametric":
+        means, cov, _, _ = _moments(aligned, shrinkage)
+        std = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+        return _parametric_var(float(weights @ means), std, horizon_days, confidence_levels)
+    return _value_at_risk(weights @ aligned, method, horizon_days, confidence_levels, n_paths, seed)
+
+
+# ============================================================================
+# Technicals
+# ============================================================================
+
+def calculate_sma(prices, period: int) -> float:
+    p = _as_array(prices)
+    if period == 0 or len(p) < period:
+        return 0.0
+    return float(p[-period:].mean())
+
+
+def calculate_ema(prices, period: int) -> float:
+    p = _as_array(prices)
+    if not len(p) or period == 0:
+        return 0.0
+    return float(calculate_ema_series(p, period)[-1])
+
+
+def calculate_rsi(prices, period: int) -> float:
+    p = _as_array(prices)
+    if len(p) < period + 1:
+        return 50.0
+    changes = np.diff(p[-period - 1:])
+    gains, losses = changes[changes > 0].sum(), -changes[changes <= 0].sum()
+    if losses == 0.0:
+        return 100.0
+    return float(100.0 - 100.0 / (1.0 + gains / losses))
+
+
+def calculate_sma_series(prices, period: int) -> np.ndarray:
+    p = _as_array(prices)
+    out = np.full(len(p), np.nan)
+    if period == 0 or len(p) < period:
+        return out
+    sums = np.concatenate(([0.0], np.cumsum(p)))
+    out[period - 1:] = (sums[period:] - sums[:-period]) / period
+    return out
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """EMA seeded with the first value (adjust=False)."""
+    return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def calculate_ema_series(prices, period: int) -> np.ndarray:
+    p = _as_array(prices)
+    if not len(p) or period == 0:
+        return np.full(len(p), np.nan)
+    return _ewm(p, 2.0 / (period + 1.0))
+
+
+def calculate_rsi_series(prices, period: int = 14) -> np.ndarray:
+    p = _as_array(prices)
+    out = np.full(len(p), np.nan)
+    if period == 0 or len(p) < period + 1:
+        return out
+    changes = np.diff(p)
+    gains, losses = np.maximum(changes, 0.0), np.maximum(-changes, 0.0)
+    # Wilder smoothing seeded with the simple average of the first `period` changes
+    avg_gain = _ewm(np.concatenate(([gains[:period].mean()], gains[period:])), 1.0 / period)
+    avg_loss = _ewm(np.concatenate(([losses[:period].mean()], losses[period:])), 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0.0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    out[period:] = rsi
+    return out
+
+
+def calculate_macd_series(prices, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    p = _as_array(prices)
+    n = len(p)
+    line, sig = np.full(n, np.nan), np.full(n, np.nan)
+    if fast == 0 or slow == 0 or signal == 0 or n < slow:
+        return line, sig, sig.copy()
+    line[slow - 1:] = (_ewm(p, 2.0 / (fast + 1.0)) - _ewm(p, 2.0 / (slow + 1.0)))[slow - 1:]
+    # Signal EMA seeded with the first MACD value (bar slow - 1), reported once `signal` values exist
+    ema_signal = _ewm(line[slow - 1:], 2.0 / (signal + 1.0))
+    first_signal = slow + signal - 2
+    sig[first_signal:] = ema_signal[first_signal - (slow - 1):]
+    return line, sig, line - sig
+
+
+def calculate_macd(prices, fast: int = 12, slow: int = 26, signal: int = 9):
+    line, sig, hist = calculate_macd_series(prices, fast, slow, signal)
+    nan = (np.nan, np.nan, np.nan)
+    current = (float(line[-1]), float(sig[-1]), float(hist[-1])) if len(line) >= 1 else nan
+    previous = (float(line[-2]), float(sig[-2]), float(hist[-2])) if len(line) >= 2 else nan
+    return current, previous
+
+
+def calculate_indicator_series(prices, sma_periods: Sequence[int] = (50, 200), ema_periods: Sequence[int] = (), rsi_periods: Sequence[int] = (14,), macd: Optional[Tuple[int, int, int]] = (12, 26, 9)) -> Dict[str, np.ndarray]:
+    p = _as_array(prices)
+    result = {}
+    for period in sma_periods:
+        result[f"sma_{period}"] = calculate_sma_series(p, period)
+    for period in ema_periods:
+        result[f"ema_{period}"] = calculate_ema_series(p, period)
+    for period in rsi_periods:
+        result[f"rsi_{period}"] = calculate_rsi_series(p, period)
+    if macd is not None:
+        result["macd"], result["macd_signal"], result["macd_hist"] = calculate_macd_series(p, *macd)
+    return result
+
+
+def _crossover_events(p: np.ndarray, fast: int, slow: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    """(event indices, golden flags, regime) for SMA(fast) vs SMA(slow); touches are not crosses."""
+    if fast == 0 or slow == 0 or fast == slow or len(p) < max(fast, slow):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool), 0
+    sign = np.sign(calculate_sma_series(p, fast) - calculate_sma_series(p, slow))
+    signed = np.flatnonzero(np.nan_to_num(sign) != 0)
+    if not len(signed):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool), 0
+    regimes = sign[signed]
+    flips = np.flatnonzero(regimes[1:] != regimes[:-1]) + 1
+    return signed[flips], regimes[flips] > 0, int(regimes[-1])
+
+
+def scan_crossovers(prices, fast: int = 50, slow: int = 200, timestamps=None) -> Dict[str, Any]:
+    p = _as_array(prices)
+    if timestamps is not None and len(timestamps) != len(p):
+        raise ValueError("timestamps must have the same length as prices")
+    indices, golden, regime = _crossover_events(p, fast, slow)
+    events: List[Dict[str, Any]] = []
+    for index, is_golden in zip(indices, golden):
+        event = {"index": int(index), "type": "golden" if is_golden else "death"}
+        if timestamps is not None:
+            event["timestamp"] = int(timestamps[index])
+        events.append(event)
+    return {
+        "events": events,
+        "fast": fast,
+        "slow": slow,
+        "last_cross": events[-1]["type"] if events else None,
+        "days_since_last_cross": len(p) - 1 - events[-1]["index"] if events else None,
+        "regime": {1: "bullish", -1: "bearish"}.get(regime),
+    }
+
+
+def _last_bar_cross(prices) -> Optional[bool]:
+    p = _as_array(prices)
+    if len(p) < 201:
+        return None
+    tail = p[-201:]
+    indices, golden, _ = _crossover_events(tail, 50, 200)
+    return bool(golden[-1]) if len(indices) and indices[-1] == len(tail) - 1 else None
+
+
+def detect_golden_cross(prices) -> bool:
+    return _last_bar_cross(prices) is True
+
+
+def detect_death_cross(prices) -> bool:
+    return _last_bar_cross(prices) is False
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing seeded with the mean of the first `period` values (NaN before)."""
+    out = np.full(len(values), np.nan)
+    if period > 0 and len(values) >= period:
+        out[period - 1:] = _ewm(np.concatenate(([values[:period].mean()], values[period:])), 1.0 / period)
+    return out
+
+
+def _window_sums(values: np.ndarray, period: int) -> np.ndarray:
+    """Sum of each `period` window ending at every bar (NaN before)."""
+    out = np.full(len(values), np.nan)
+    if period > 0 and len(values) >= period:
+        sums = np.concatenate(([0.0], np.cumsum(values)))
+        out[period - 1:] = sums[period:] - sums[:-period]
+    return out
+
+
+def calculate_ohlcv_indicators(
+    high, low, close, volume,
+    bollinger_period: int = 20, bollinger_std: float = 2.0, atr_period: int = 14, stochastic_period: int = 14,
+    stochastic_smooth: int = 3, adx_period: int = 14, mfi_period: int = 14, vwap_period: int = 20,
+    volume_periods: Sequence[int] = (10, 50, 200), zscore_period: int = 50,
+) -> Dict[str, np.ndarray]:
+    h, l, c, v = _as_array(high), _as_array(low), _as_array(close), _as_array(volume)
+    n = len(h)
+    if not (len(l) == len(c) == len(v) == n):
+        raise ValueError("high, low, close and volume must have the same length")
+    usable = np.isfinite(h) & np.isfinite(l) & np.isfinite(c) & np.isfinite(v)
+    if not usable.all():
+        # Compute over the usable bars only, then put each value back at its bar
+        params = dict(bollinger_period=bollinger_period, bollinger_std=bollinger_std, atr_period=atr_period,
+                      stochastic_period=stochastic_period, stochastic_smooth=stochastic_smooth, adx_period=adx_period,
+                      mfi_period=mfi_period, vwap_period=vwap_period, volume_periods=volume_periods, zscore_period=zscore_period)
+        compressed = calculate_ohlcv_indicators(h[usable], l[usable], c[usable], v[usable], **params)
+        out = {}
+        for name, values in compressed.items():
+            out[name] = np.full(n, np.nan)
+            out[name][usable] = values
+        return out
+    nan = lambda: np.full(n, np.nan)
+    windows = np.lib.stride_tricks.sliding_window_view
+    out: Dict[str, np.ndarray] = {}
+
+    # Bollinger Bands (population std)
+    mid, up, lo, width, pct = nan(), nan(), nan(), nan(), nan()
+    if bollinger_period > 0 and n >= bollinger_period:
+        w = windows(c, bollinger_period)
+        m, band = w.mean(axis=1), bollinger_std * w.std(axis=1)
+        tail = slice(bollinger_period - 1, None)
+        mid[tail], up[tail], lo[tail] = m, m + band, m - band
+        with np.errstate(divide="ignore", invalid="ignore"):
+            width[tail] = np.where(m != 0.0, 2.0 * band / m, np.nan)
+            pct[tail] = np.where(band > 0.0, (c[tail] - (m - band)) / (2.0 * band), np.nan)
+    out.update(bollinger_middle=mid, bollinger_upper=up, bollinger_lower=lo, bollinger_bandwidth=width, bollinger_percent_b=pct)
+
+    # True range and ATR
+    prev = np.concatenate(([np.nan], c[:-1]))
+    tr = np.fmax(h - l, np.fmax(np.abs(h - prev), np.abs(l - prev)))
+    out["atr"] = _wilder(tr, atr_period) if atr_period > 0 else nan()
+
+    # Stochastic %K / %D
+    k, d = nan(), nan()
+    if stochastic_period > 0 and n >= stochastic_period:
+        highest, lowest = windows(h, stochastic_period).max(axis=1), windows(l, stochastic_period).min(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k[stochastic_period - 1:] = np.where(highest > lowest, 100.0 * (c[stochastic_period - 1:] - lowest) / (highest - lowest), 50.0)
+        if stochastic_smooth > 0:
+            d = _window_sums(np.nan_to_num(k), stochastic_smooth) / stochastic_smooth
+            d[:stochastic_period + stochastic_smooth - 2] = np.nan
+    out.update(stochastic_k=k, stochastic_d=d)
+
+    # Directional movement, DI and ADX (Wilder)
+    pdi, mdi, adx = nan(), nan(), nan()
+    if adx_period > 0 and n > adx_period:
+        up_move, down_move = h[1:] - h[:-1], l[:-1] - l[1:]
+        pdm = np.where((up_move > down_move) & (up_move > 0.0), up_move, 0.0)
+        mdm = np.where((down_move > up_move) & (down_move > 0.0), down_move, 0.0)
+        avg_tr, avg_pdm, avg_mdm = (_wilder(x, adx_period)[adx_period - 1:] for x in (tr[1:], pdm, mdm))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            plus = np.where(avg_tr > 0.0, 100.0 * avg_pdm / avg_tr, 0.0)
+            minus = np.where(avg_tr > 0.0, 100.0 * avg_mdm / avg_tr, 0.0)
+            dx = np.where(plus + minus > 0.0, 100.0 * np.abs(plus - minus) / (plus + minus), 0.0)
+        pdi[adx_period:], mdi[adx_period:] = plus, minus
+        adx[adx_period:] = _wilder(dx, adx_period)
+    out.update(plus_di=pdi, minus_di=mdi, adx=adx)
+
+    # On-balance volume
+    out["obv"] = np.concatenate(([0.0], np.cumsum(np.sign(np.diff(c)) * v[1:]))) if n else nan()
+
+    # Rolling VWAP (typical price) and Money Flow Index
+    typical = (h + l + c) / 3.0
+    flow = typical * v
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_window = _window_sums(v, vwap_period)
+        out["vwap"] = np.where(volume_window > 0.0, _window_sums(flow, vwap_period) / volume_window, np.nan)
+    mfi = nan()
+    if mfi_period > 0 and n > mfi_period:
+        change = np.diff(typical)
+        positive = _window_sums(np.where(change > 0.0, flow[1:], 0.0), mfi_period)[mfi_period - 1:]
+        negative = _window_sums(np.where(change < 0.0, flow[1:], 0.0), mfi_period)[mfi_period - 1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mfi[mfi_period:] = np.where(negative == 0.0, 100.0, 100.0 - 100.0 / (1.0 + positive / negative))
+    out["mfi"] = mfi
+
+    # Average daily volume and today's volume z-score vs the previous `zscore_period` days
+    for period in volume_periods:
+        out[f"adv_{period}"] = _window_sums(v, period) / period if period > 0 else nan()
+    zscore = nan()
+    if zscore_period > 1 and n > zscore_period:
+        w = windows(v[:-1], zscore_period)
+        std = w.std(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscore[zscore_period:] = np.where(std > 0.0, (v[zscore_period:] - w.mean(axis=1)) / std, np.nan)
+    out["volume_zscore"] = zscore
+    return out
+
+
+# ============================================================================
+# Streaming indicators (O(1) per bar, state as plain dicts)
+# ============================================================================
+
+
+def _check_kind(state: Dict[str, Any], kind: str) -> None:
+    if state["kind"] != kind:
+        raise ValueError(f"expected a '{kind}' state, got '{state['kind']}'")
+
+
+def _check_period(name: str, value: int) -> int:
+    if value <= 0:
+        raise ValueError(f"{name} must be positive")
+    return int(value)
+
+
+class _Streaming:
+    """Shared seed / pickle / repr for the streaming indicators; non-finite prices are ignored."""
+
+    def update(self, price: float):
+        raise NotImplementedError
+
+    def seed(self, prices):
+        """Feed a price history (same as calling `update` on each); returns the current value."""
+        for price in _as_array(prices):
+            self.update(float(price))
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def __reduce__(self):
+        return type(self).from_state, (self.to_state(),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(value={self.value}, count={self.count})"
+
+
+class StreamingEma(_Streaming):
+    def __init__(self, period: int = 20):
+        self.period = _check_period("period", period)
+        self._multiplier = 2.0 / (self.period + 1.0)
+        self.value = math.nan
+        self.count = 0
+
+    def update(self, price: float) -> float:
+        if math.isfinite(price):
+            self.value = price if self.count == 0 else (price - self.value) * self._multiplier + self.value
+            self.count += 1
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"kind": "ema", "period": self.period, "value": self.value, "count": self.count}
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "StreamingEma":
+        _check_kind(state, "ema")
+        restored = StreamingEma(state["period"])
+        restored.value, restored.count = float(state["value"]), int(state["count"])
+        return restored
+
+
+class StreamingRsi(_Streaming):
+    """Wilder RSI; during warm-up the averages hold running sums (as in the Rust state)."""
+
+    def __init__(self, period: int = 14):
+        self.period = _check_period("period", period)
+        self.last_price = math.nan
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.count = 0
+
+    @property
+    def value(self) -> float:
+        if self.count <= self.period:
+            return math.nan
+        if self.avg_loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+    def update(self, price: float) -> float:
+        if not math.isfinite(price):
+            return self.value
+        if self.count > 0:
+            change = price - self.last_price
+            gain, loss = (change, 0.0) if change > 0.0 else (0.0, -change)
+            p = float(self.period)
+            if self.count <= self.period:
+                self.avg_gain += gain
+                self.avg_loss += loss
+                if self.count == self.period:
+                    self.avg_gain /= p
+                    self.avg_loss /= p
+            else:
+                self.avg_gain = (self.avg_gain * (p - 1.0) + gain) / p
+                self.avg_loss = (self.avg_loss * (p - 1.0) + loss) / p
+        self.last_price = price
+        self.count += 1
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"kind": "rsi", "period": self.period, "last_price": self.last_price,
+                "avg_gain": self.avg_gain, "avg_loss": self.avg_loss, "count": self.count}
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "StreamingRsi":
+        _check_kind(state, "rsi")
+        restored = StreamingRsi(state["period"])
+        restored.last_price = float(state["last_price"])
+        restored.avg_gain, restored.avg_loss = float(state["avg_gain"]), float(state["avg_loss"])
+        restored.count = int(state["count"])
+        return restored
+
+
+class StreamingMacd(_Streaming):
+    """EMAs seeded with the first price, signal seeded with the first MACD value (bar `slow - 1`)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = _check_period("fast", fast)
+        self.slow = _check_period("slow", slow)
+        self.signal = _check_period("signal", signal)
+        self.ema_fast = self.ema_slow = self.ema_signal = 0.0
+        self.count = 0
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        if self.count < self.slow:
+            return (math.nan, math.nan, math.nan)
+        line = self.ema_fast - self.ema_slow
+        if self.count + 1 < self.slow + self.signal:
+            return (line, math.nan, math.nan)
+        return (line, self.ema_signal, line - self.ema_signal)
+
+    def update(self, price: float) -> Tuple[float, float, float]:
+        if not math.isfinite(price):
+            return self.value
+        if self.count == 0:
+            self.ema_fast = self.ema_slow = price
+        else:
+            self.ema_fast += (price - self.ema_fast) * (2.0 / (self.fast + 1.0))
+            self.ema_slow += (price - self.ema_slow) * (2.0 / (self.slow + 1.0))
+        self.count += 1
+        if self.count >= self.slow:
+            line = self.ema_fast - self.ema_slow
+            if self.count == self.slow:
+                self.ema_signal = line
+            else:
+                self.ema_signal += (line - self.ema_signal) * (2.0 / (self.signal + 1.0))
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"kind": "macd", "fast": self.fast, "slow": self.slow, "signal": self.signal,
+                "ema_fast": self.ema_fast, "ema_slow": self.ema_slow, "ema_signal": self.ema_signal,
+                "count": self.count}
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "StreamingMacd":
+        _check_kind(state, "macd")
+        restored = StreamingMacd(state["fast"], state["slow"], state["signal"])
+        restored.ema_fast, restored.ema_slow = float(state["ema_fast"]), float(state["ema_slow"])
+        restored.ema_signal, restored.count = float(state["ema_signal"]), int(state["count"])
+        return restored
+
+
+class StreamingSma(_Streaming):
+    """Running-sum SMA; the sum is recomputed from the window once per `period` bars."""
+
+    def __init__(self, period: int = 50):
+        self.period = _check_period("period", period)
+        self._window: deque = deque()
+        self._sum = 0.0
+        self._since_refresh = 0
+
+    @property
+    def value(self) -> float:
+        return self._sum / self.period if len(self._window) == self.period else math.nan
+
+    @property
+    def count(self) -> int:
+        return len(self._window)
+
+    def update(self, price: float) -> float:
+        if not math.isfinite(price):
+            return self.value
+        self._window.append(price)
+        self._sum += price
+        if len(self._window) > self.period:
+            self._sum -= self._window.popleft()
+        self._since_refresh += 1
+        if self._since_refresh >= self.period:
+            self._sum = math.fsum(self._window)
+            self._since_refresh = 0
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"kind": "sma", "period": self.period, "window": list(self._window)}
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "StreamingSma":
+        _check_kind(state, "sma")
+        restored = StreamingSma(state["period"])
+        for price in state["window"]:
+            restored.update(float(price))
+        return restored
+
+
+class StreamingVolatility(_Streaming):
+    """Annualized volatility (population) of the last `window` simple returns."""
+
+    def __init__(self, window: int = 63):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = int(window)
+        self.last_price = math.nan
+        self._returns: deque = deque()
+        self._sum = self._sum_sq = 0.0
+        self._since_refresh = 0
+
+    @property
+    def value(self) -> float:
+        n = len(self._returns)
+        if n != self.window:
+            return math.nan
+        mean = self._sum / n
+        return math.sqrt(max(self._sum_sq / n - mean * mean, 0.0) * TRADING_DAYS)
+
+    @property
+    def count(self) -> int:
+        return len(self._returns)
+
+    def _push_return(self, r: float) -> None:
+        self._returns.append(r)
+        self._sum += r
+        self._sum_sq += r * r
+        if len(self._returns) > self.window:
+            old = self._returns.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._since_refresh += 1
+        if self._since_refresh >= self.window:
+            self._sum = math.fsum(self._returns)
+            self._sum_sq = math.fsum(x * x for x in self._returns)
+            self._since_refresh = 0
+
+    def update(self, price: float) -> float:
+        if not math.isfinite(price):
+            return self.value
+        if math.isfinite(self.last_price) and self.last_price != 0.0:
+            self._push_return(price / self.last_price - 1.0)
+        self.last_price = price
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"kind": "volatility", "window": self.window, "last_price": self.last_price, "returns": list(self._returns)}
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "StreamingVolatility":
+        _check_kind(state, "volatility")
+        restored = StreamingVolatility(state["window"])
+        restored.last_price = float(state["last_price"])
+        for r in state["returns"]:
+            restored._push_return(float(r))
+        return restored
+
+
+class StreamingDrawdown(_Streaming):
+    """Drawdown from the running peak (<= 0); `max_drawdown` is the worst seen so far."""
+
+    def __init__(self):
+        self.peak = math.nan
+        self.value = 0.0
+        self.max_drawdown = 0.0
+        self.count = 0
+
+    def update(self, price: float) -> float:
+        if not math.isfinite(price):
+            return self.value
+        if self.count == 0 or price > self.peak:
+            self.peak = price
+        self.value = (price - self.peak) / self.peak if self.peak != 0.0 else 0.0
+        self.max_drawdown = min(self.max_drawdown, self.value)
+        self.count += 1
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"kind": "drawdown", "peak": self.peak, "current": self.value,
+                "max_drawdown": self.max_drawdown, "count": self.count}
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> "StreamingDrawdown":
+        _check_kind(state, "drawdown")
+        restored = StreamingDrawdown()
+        restored.peak, restored.value = float(state["peak"]), float(state["current"])
+        restored.max_drawdown, restored.count = float(state["max_drawdown"]), int(state["count"])
+        return restored
+
+
+# ============================================================================
+# Utilities
+# ============================================================================
+
+def _period_ids(days: np.ndarray, frequency: str) -> Tuple[np.ndarray, Callable[[np.ndarray], np.ndarray]]:
+    """Consecutive period ids for `days` and a function mapping ids to their last calendar day."""
+    if frequency == "W":
+        return (days + 3) // 7, lambda ids: ids * 7 + 3
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)  # since 1970-01
+    step = {"M": 1, "Q": 3, "Y": 12}[frequency]
+    end = lambda ids: ((ids + 1) * step).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) - 1
+    return months // step, end
+
+
+def aggregate_bars(dates, values, frequencies: Sequence[str] = ("W", "M", "Q", "Y"), fill_gaps: bool = False) -> Dict[str, Dict[str, np.ndarray]]:
+    days, v = np.asarray(dates, dtype=np.int64), _as_array(values)
+    if len(days) != len(v):
+        raise ValueError("dates and values must have the same length")
+    if np.any(np.diff(days) < 0):
+        raise ValueError("dates must be sorted ascending")
+    for code in frequencies:
+        if code not in ("W", "M", "Q", "Y"):
+            raise ValueError(f"unknown frequency '{code}' (use W, M, Q or Y)")
+
+    result = {}
+    for code in frequencies:
+        ids, period_end = _period_ids(days, code)
+        periods = np.arange(ids[0], ids[-1] + 1) if fill_gaps and len(ids) else np.unique(ids)
+        slot = np.searchsorted(periods, ids)
+        valid = np.isfinite(v)
+        slot_v, val = slot[valid], v[valid]
+        count = np.bincount(slot_v, minlength=len(periods)).astype(np.int64)
+        bars = {name: np.full(len(periods), np.nan) for name in ("open", "high", "low", "close")}
+        if len(val):
+            starts = np.flatnonzero(np.r_[True, slot_v[1:] != slot_v[:-1]])
+            filled = slot_v[starts]
+            bars["open"][filled] = val[starts]
+            bars["close"][filled] = val[np.r_[starts[1:], len(val)] - 1]
+            bars["high"][filled] = np.maximum.reduceat(val, starts)
+            bars["low"][filled] = np.minimum.reduceat(val, starts)
+        result[code] = {
+            "period_end": period_end(periods).astype(np.int64),
+            "open": bars["open"],
+            "high": bars["high"],
+            "low": bars["low"],
+            "close": bars["close"],
+            "sum": np.bincount(slot_v, weights=val, minlength=len(periods)),
+            "count": count,
+        }
+    return result
+
+
+def detect_trend(values) -> str:
+    v = _as_array(values)
+    if len(v) < 2:
+        return "stable"
+    half = len(v) // 2
+    first, second = v[:half].mean(), v[half:].mean()
+    change = (second - first) / max(abs(first), 1.0)
+    if change > 0.05:
+        return "increasing"
+    if change < -0.05:
+        return "decreasing"
+    return "stable"
+
+
+def calculate_cagr(start_value: float, end_value: float, years: float) -> float:
+    if start_value <= 0 or years <= 0:
+        return 0.0
+    return (end_value / start_value) ** (1.0 / years) - 1.0
+
+
+def calculate_pct_change(old_value: float, new_value: float) -> float:
+    if old_value == 0:
+        return 0.0
+    return (new_value - old_value) / old_value * 100.0
+
+
+def detect_volume_spike(current_volume: float, avg_volume: float) -> bool:
+    return current_volume > avg_volume * 1.5
+
+
+def calculate_statement_trends(matrix, periods_per_year: float = 1.0, threshold: float = 0.05) -> Dict[str, Any]:
+    if not periods_per_year > 0:
+        raise ValueError("periods_per_year must be positive")
+    m = _as_matrix(matrix)
+    if m.shape[1] == 0:
+        m = np.full((m.shape[0], 1), np.nan)
+    valid = np.isfinite(m)
+    n = valid.sum(axis=1)
+    x = np.broadcast_to(np.arange(m.shape[1], dtype=np.float64), m.shape)
+    y = np.where(valid, m, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = np.where(valid, x, 0.0).sum(axis=1) / n
+        mean_y = y.sum(axis=1) / n
+        dx = np.where(valid, x - mean_x[:, None], 0.0)
+        dy = np.where(valid, m - mean_y[:, None], 0.0)
+        sxx, sxy, syy = (dx * dx).sum(axis=1), (dx * dy).sum(axis=1), (dy * dy).sum(axis=1)
+        slope = sxy / sxx
+        r_squared = np.where(syy > 0, sxy * sxy / (sxx * syy), np.nan)
+
+        # First / last / previous valid value per row
+        idx = np.where(valid, np.arange(m.shape[1]), -1)
+        last_i = idx.max(axis=1)
+        first_i = np.where(valid, np.arange(m.shape[1]), m.shape[1]).min(axis=1)
+        prev_i = np.where(idx < last_i[:, None], idx, -1).max(axis=1)
+        rows = np.arange(m.shape[0])
+        first = m[rows, np.clip(first_i, 0, m.shape[1] - 1)]
+        last = m[rows, np.clip(last_i, 0, None)]
+        previous = m[rows, np.clip(prev_i, 0, None)]
+        span = (last_i - first_i).astype(np.float64)
+
+        change = slope * span / np.maximum(np.abs(mean_y), 1.0)
+        years = span / periods_per_year
+        cagr = np.where((first > 0) & (last > 0) & (years > 0), (last / first) ** (1.0 / years) - 1.0, np.nan)
+        pct_change = np.where(previous != 0, (last - previous) / np.abs(previous) * 100.0, np.nan)
+
+        # Consecutive valid values (gaps skipped): forward-fill the last valid value along each row
+        filled = np.where(valid, m, np.nan)
+        carried = np.maximum.accumulate(np.where(valid, np.arange(m.shape[1]), -1), axis=1)
+        before = np.concatenate((np.full((m.shape[0], 1), -1), carried[:, :-1]), axis=1)
+        has_before = valid & (before >= 0)
+        prior = filled[rows[:, None], np.clip(before, 0, None)]
+        consistency = (has_before & (m > prior)).sum(axis=1) / (n - 1)
+
+    enough = n >= 2
+    trend = [
+        "unknown" if not ok else "increasing" if c > threshold else "decreasing" if c < -threshold else "stable"
+        for ok, c in zip(enough, change)
+    ]
+    nan = np.full(m.shape[0], np.nan)
+    return {
+        "trend": trend,
+        "observations": n.astype(np.int64),
+        "slope": np.where(enough, slope, nan),
+        "r_squared": np.where(enough, r_squared, nan),
+        "cagr": np.where(enough, cagr, nan),
+        "pct_change": np.where(enough, pct_change, nan),
+        "consistency": np.where(enough, consistency, nan),
+    }
+
+
+# ============================================================================
+# Fundamentals
+# ============================================================================
+
+def calculate_fundamental_ratios(ebit, interest_expense, total_assets, current_liabilities, equity, total_debt,
+                                 revenue=None, free_cash_flow=None, capex=None, net_income=None,
+                                 operating_cashflow=None) -> Dict[str, np.ndarray]:
+    shape = _as_matrix(ebit).shape
+    lines = {}
+    given = dict(ebit=ebit, interest_expense=interest_expense, total_assets=total_assets,
+                 current_liabilities=current_liabilities, equity=equity, total_debt=total_debt, revenue=revenue,
+                 free_cash_flow=free_cash_flow, capex=capex, net_income=net_income, operating_cashflow=operating_cashflow)
+    for name, line in given.items():
+        lines[name] = np.full(shape, np.nan) if line is None else _as_matrix(line)
+        if lines[name].shape != shape:
+            raise ValueError("every line item must have the same (tickers, periods) shape")
+
+    def ratio(num, den, ok):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(ok, num / np.where(ok, den, 1.0), np.nan)
+
+    capital_employed = lines["total_assets"] - lines["current_liabilities"]
+    equity, revenue, assets = lines["equity"], lines["revenue"], lines["total_assets"]
+    interest = np.abs(lines["interest_expense"])
+    icr = ratio(lines["ebit"], interest, interest > 0)
+    icr = np.where((interest == 0) & (lines["ebit"] > 0), np.inf, icr)
+    return {
+        "roce": ratio(lines["ebit"], capital_employed, capital_employed != 0),
+        "roe": ratio(lines["net_income"], equity, equity > 0),
+        "debt_to_equity": ratio(lines["total_debt"], equity, equity > 0),
+        "icr": icr,
+        "fcf_margin": ratio(lines["free_cash_flow"], revenue, revenue > 0),
+        "capex_intensity": ratio(np.abs(lines["capex"]), revenue, revenue > 0),
+        "accruals": ratio(lines["net_income"] - lines["operating_cashflow"], assets, assets > 0),
+    }
@@ -0,0 +1,287 @@
+"""
+Memory-mapped columnar price store for a ticker universe.
+
+Aligned daily closes, returns and volumes for many tickers live on disk as
+fixed-width float64 matrices, one file per field, read through np.memmap:
+
+    <dir>/directory.json   symbol directory (row order), days used, days reserved per row
+    <dir>/dates.i8         int64 days since 1970-01-01, one per column, ascending
+    <dir>/close.f8         float64 (symbols, capacity); NaN where a ticker did not trade
+    <dir>/return.f8        close / the ticker's previous stored close - 1
+    <dir>/volume.f8
+
+Each ticker's history is one contiguous row, so `series()` hands rust_finance a
+zero-copy view and a computation only pages in the rows it reads. New days go
+into the reserved columns in place; when those run out the files are rewritten
+once with GROWTH_DAYS more. New tickers append rows to the end of each file.
+The date index is the union of every day written, so tickers on different
+exchange calendars share it: a ticker is NaN on the other market's sessions and
+its returns run from its own previous close.
+The directory is replaced atomically after the data is flushed, so an
+interrupted write leaves the previous state readable.
+
+    store = PriceStore(".cache/prices")
+    store.write_frame(closes_df, volumes_df)          # dates x tickers, e.g. yf.download(...)
+    kernels.calculate_risk_metrics(store.series("AAPL"), [0.95], 0.0)
+    kernels.calculate_risk_panel(store.matrix("return"), "returns")
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("close", "return", "volume")
+GROWTH_DAYS = 252  # Columns reserved per row when the store is created or runs out of room
+VERSION = 1
+
+
+def _to_days(dates) -> np.ndarray:
+    """Calendar date of each timestamp as int64 days since epoch (timezones dropped)."""
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values.astype("datetime64[D]").astype(np.int64)
+
+
+class PriceStore:
+    """
+    Aligned daily closes, returns and volumes for a universe of tickers, memory-mapped from `path`.
+
+    Rows written for dates already in the index overwrite those cells and later dates extend
+    it in place; dates that fall between or before stored days (another exchange's sessions,
+    a backfill) are inserted by rewriting the files once. Closes are stored as given
+    (adjusted as of the download that wrote them); after a split or dividend the writer
+    must `clear()` the ticker and write its history again on the new basis, otherwise the
+    return across the join mixes the two adjustments.
+    """
+
+    def __init__(self, path, readonly: bool = False):
+        self.path = Path(path)
+        self.readonly = readonly
+        directory = self.path / "directory.json"
+        if directory.exists():
+            meta = json.loads(directory.read_text(encoding="utf-8"))
+            if meta.get("version") != VERSION:
+                raise ValueError(f"unsupported price store version {meta.get('version')} in {self.path}")
+            self._symbols: List[str] = list(meta["symbols"])
+            self._days: int = int(meta["days"])
+            self._capacity: int = int(meta["capacity"])
+        elif readonly:
+            raise FileNotFoundError(f"no price store at {self.path}")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._symbols, self._days, self._capacity = [], 0, GROWTH_DAYS
+            self._allocate(self._capacity)
+            self._write_directory()
+        self._rows = {symbol: i for i, symbol in enumerate(self._symbols)}
+        self._map()
+
+    # --- Layout ---
+
+    def _file(self, name: str, suffix: str = "") -> Path:
+        return self.path / (f"{name}.i8{suffix}" if name == "dates" else f"{name}.f8{suffix}")
+
+    def _allocate(self, capacity: int, suffix: str = ""):
+        """Create empty files for `capacity` days: NaN-filled field rows and a zeroed date index."""
+        np.zeros(capacity, dtype=np.int64).tofile(self._file("dates", suffix))
+        for field in FIELDS:
+            np.full((len(self._symbols), capacity), np.nan).tofile(self._file(field, suffix))
+
+    def _map(self):
+        mode = "r" if self.readonly else "r+"
+        self._dates = np.memmap(self._file("dates"), dtype=np.int64, mode=mode, shape=(self._capacity,))
+        shape = (len(self._symbols), self._capacity)
+        # An empty file cannot be mapped; a store without symbols has nothing to share anyway
+        self._fields: Dict[str, np.ndarray] = {
+            field: np.memmap(self._file(field), dtype=np.float64, mode=mode, shape=shape) if shape[0] else np.empty(shape)
+            for field in FIELDS
+        }
+
+    def _flush(self):
+        for array in (self._dates, *self._fields.values()):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def _write_directory(self):
+        meta = {"version": VERSION, "symbols": self._symbols, "days": self._days, "capacity": self._capacity}
+        tmp = self.path / "directory.json.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.path / "directory.json")
+
+    def _check_writable(self):
+        if self.readonly:
+            raise PermissionError(f"price store at {self.path} was opened read-only")
+
+    def _rewrite(self, dates: np.ndarray, days_needed: int):
+        """
+        Rewrite every file for the ascending day index `dates` (a superset of the stored days),
+        moving stored columns to their new positions, with GROWTH_DAYS more room when
+        `days_needed` no longer fits. The only writes that are not in place.
+        """
+        capacity = self._capacity if days_needed <= self._capacity else max(self._capacity + GROWTH_DAYS, days_needed)
+        columns = np.searchsorted(dates, self.dates)
+        self._allocate(capacity, suffix=".tmp")
+        rewritten = np.memmap(self._file("dates", ".tmp"), dtype=np.int64, mode="r+", shape=(capacity,))
+        rewritten[:len(dates)] = dates
+        rewritten.flush()
+        for field in FIELDS:
+            if self._symbols:
+                moved = np.memmap(self._file(field, ".tmp"), dtype=np.float64, mode="r+", shape=(len(self._symbols), capacity))
+                moved[:, columns] = self._fields[field][:, :self._days]
+                moved.flush()
+                del moved
+        del rewritten
+        self._dates = self._fields = None
+        os.replace(self._file("dates", ".tmp"), self._file("dates"))
+        for field in FIELDS:
+            os.replace(self._file(field, ".tmp"), self._file(field))
+        self._days, self._capacity = len(dates), capacity
+        self._write_directory()
+        self._map()
+
+    # --- Directory ---
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Stored days as int64 days since epoch (a view, do not modify)."""
+        return self._dates[:self._days]
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.to_datetime(self.dates, unit="D")
+
+    def __len__(self) -> int:
+        return self._days
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def _start(self, since) -> int:
+        """First column on or after `since` (any date-like; None = the first stored day)."""
+        if since is None:
+            return 0
+        return int(np.searchsorted(self.dates, _to_days([since])[0], side="left"))
+
+    def _row(self, symbol: str) -> int:
+        try:
+            return self._rows[symbol]
+        except KeyError:
+            raise KeyError(f"{symbol} is not in the price store") from None
+
+    # --- Reads ---
+
+    def series(self, symbol: str, field: str = "close", since=None) -> np.ndarray:
+        """One ticker's values, oldest first, as a zero-copy contiguous view of the mapped file."""
+        return self._fields[field][self._row(symbol), self._start(since):self._days]
+
+    def matrix(self, field: str = "close", symbols: Optional[Iterable[str]] = None, since=None) -> np.ndarray:
+        """
+        (symbols, days) float64 matrix in the layout the batch kernels take.
+
+        Zero-copy when every reserved column is used (or for a single ticker); otherwise the
+        requested rows and days are gathered into one C-contiguous copy.
+        """
+        start = self._start(since)
+        data = self._fields[field]
+        if symbols is None:
+            view = data[:, start:self._days]
+        else:
+            rows = [self._row(s) for s in symbols]
+            view = data[rows[0]:rows[0] + 1, start:self._days] if len(rows) == 1 else data[rows, start:self._days]
+        return view if view.flags.c_contiguous else np.ascontiguousarray(view)
+
+    def frame(self, symbols: Optional[Iterable[str]] = None, field: str = "close", since=None) -> pd.DataFrame:
+        """Dates x tickers DataFrame (a copy), the same shape as `yf.download(...)["Close"]`."""
+        symbols = self.symbols if symbols is None else list(symbols)
+        start = self._start(since)
+        values = self.matrix(field, symbols, since) if symbols else np.empty((0, self._days - start))
+        return pd.DataFrame(values.T, index=self.index[start:], columns=symbols)
+
+    # --- Writes ---
+
+    def add_symbols(self, symbols: Iterable[str]) -> List[str]:
+        """Append rows for tickers not yet in the store (in place); returns the ones added."""
+        self._check_writable()
+        new = [s for s in dict.fromkeys(symbols) if s not in self._rows]
+        if not new:
+            return []
+        self._flush()
+        rows = np.full((len(new), self._capacity), np.nan)
+        for field in FIELDS:
+            with open(self._file(field), "ab") as f:
+                rows.tofile(f)
+        self._symbols.extend(new)
+        self._rows = {symbol: i for i, symbol in enumerate(self._symbols)}
+        self._map()
+        self._write_directory()
+        return new
+
+    def clear(self, symbols: Iterable[str]):
+        """Erase the stored values of `symbols` (in place); their rows stay in the directory."""
+        self._check_writable()
+        rows = [self._row(s) for s in symbols]
+        if not rows:
+            return
+        for field in FIELDS:
+            self._fields[field][rows, :] = np.nan
+        self._flush()
+
+    def write_frame(self, closes: pd.DataFrame, volumes: Optional[pd.DataFrame] = None) -> int:
+        """
+        Write dates x tickers closes (and volumes) into the store; returns the number of new days.
+
+        NaN cells never erase stored values. Returns are recomputed from the first touched day on.
+        """
+        self._check_writable()
+        closes = closes.sort_index()
+        days = _to_days(closes.index)
+        self.add_symbols([str(c) for c in closes.columns])
+        if not len(days):
+            return 0
+
+        new_days = np.setdiff1d(days, self.dates)
+        if len(new_days) and self._days and new_days[0] < self.dates[-1]:
+            merged = np.union1d(self.dates, new_days)
+            self._rewrite(merged, len(merged))
+        elif len(new_days):
+            if self._days + len(new_days) > self._capacity:
+                self._rewrite(self.dates, self._days + len(new_days))
+            self._dates[self._days:self._days + len(new_days)] = new_days
+            self._days += len(new_days)
+        columns = np.searchsorted(self.dates, days)
+
+        for field, source in (("close", closes), ("volume", volumes)):
+            if source is None:
+                continue
+            values = source.reindex(index=closes.index, columns=closes.columns).to_numpy(dtype=np.float64)
+            data = self._fields[field]
+            for j, symbol in enumerate(closes.columns):
+                row = self._rows[str(symbol)]
+                current = data[row, columns]
+                data[row, columns] = np.where(np.isfinite(values[:, j]), values[:, j], current)
+
+        # Returns from the first touched column to the end, each against the row's previous close
+        first = int(columns.min())
+        close = self._fields["close"]
+        block = close[:, first:self._days]
+        history = np.isfinite(close[:, :first])
+        last = first - 1 - np.argmax(history[:, ::-1], axis=1) if first else np.zeros(len(self._symbols), dtype=np.int64)
+        seed = np.where(history.any(axis=1), close[np.arange(len(self._symbols)), last], np.nan)
+        filled = np.column_stack([seed, block])
+        latest = np.where(np.isfinite(filled), np.arange(filled.shape[1]), 0)
+        np.maximum.accumulate(latest, axis=1, out=latest)
+        previous = np.take_along_axis(filled, latest, axis=1)[:, :-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._fields["return"][:, first:self._days] = block / previous - 1.0
+
+        self._flush()
+        self._write_directory()
+        return len(new_days)
@@ -5,6 +5,8 @@ Features: Status spinners, live progress tables, timing metrics.
 """
 
 import time
+import threading
+from collections import Counter, deque
 from typing import Dict, Any, List, Optional
 from contextlib import contextmanager
 from rich.console import Console, Group
@@ -17,7 +19,6 @@ from rich.box import DOUBLE, ROUNDED
 from rich.table import Table
 from rich.live import Live
 from rich.spinner import Spinner
-from rich.status import Status
 
 console = Console(width=100)
 
@@ -34,6 +35,10 @@ HEADER_ART = """
 # Phase definitions for the workflow
 PHASES = ["Data Collection", "Validation", "Analysis", "Synthesis"]
 
+# Live view settings: frames per second and number of recent headlines shown
+LIVE_REFRESH_PER_SECOND = 4
+NEWS_TAIL_SIZE = 6
+
 
 class PhaseTracker:
     """Tracks progress and timing for each phase of the workflow."""
@@ -124,6 +129,93 @@ class PhaseTracker:
         return table
 
 
+class NewsFeed:
+    """
+    Thread-safe buffer of streamed news items.
+    Producers only append under a lock; the live view renders a snapshot at its own refresh rate.
+    """
+
+    def __init__(self, tail_size: int = NEWS_TAIL_SIZE):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._tail: deque = deque(maxlen=tail_size)
+        self.total = 0
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._tail.clear()
+            self.total = 0
+
+    def add(self, title: str, date: str, source: str):
+        with self._lock:
+            self._counts[source or "unknown"] += 1
+            self._tail.append((title, date, source))
+            self.total += 1
+
+    def summary(self) -> str:
+        """One-line summary: total headlines and the busiest sources."""
+        with self._lock:
+            top = ", ".join(f"{src} {n}" for src, n in self._counts.most_common(4))
+            return f"📰 {self.total} headlines from {len(self._counts)} sources [dim]({top})[/dim]"
+
+    def render(self) -> Optional[Panel]:
+        """Panel with counts per source and the most recent headlines (None if empty)."""
+        with self._lock:
+            if not self.total:
+                return None
+            counts = self._counts.most_common(6)
+            tail = list(self._tail)
+            total, n_sources = self.total, len(self._counts)
+
+        counts_line = Text.from_markup("  ".join(f"[cyan]{src}[/cyan] {n}" for src, n in counts))
+        table = Table.grid(padding=(0, 1))
+        table.add_column(style="cyan", width=18, no_wrap=True)
+        table.add_column(style="white", ratio=1, no_wrap=True, overflow="ellipsis")
+        table.add_column(style="dim", width=20, no_wrap=True)
+        for title, date, source in tail:
+            table.add_row(source, title, date)
+        return Panel(
+            Group(counts_line, table),
+            title=f"📰 News ({total} headlines, {n_sources} sources)",
+            border_style="dim cyan",
+            box=ROUNDED,
+            width=96,
+        )
+
+
+class LiveStatus:
+    """
+    Spinner plus news feed rendered through a single rich.live.Live at a fixed refresh rate.
+    Drop-in for rich.status.Status (update/start/stop).
+    """
+
+    def __init__(self, console: Console, message: str, news: NewsFeed):
+        self.message = message
+        self._spinner = Spinner("dots", text=Text.from_markup(message), style="status.spinner")
+        self._news = news
+        self._live = Live(
+            console=console,
+            refresh_per_second=LIVE_REFRESH_PER_SECOND,
+            transient=True,
+            get_renderable=self._render,
+        )
+
+    def _render(self):
+        panel = self._news.render()
+        return Group(self._spinner, panel) if panel is not None else self._spinner
+
+    def update(self, message: str):
+        self.message = message
+        self._spinner.update(text=Text.from_markup(message))
+
+    def start(self):
+        self._live.start()
+
+    def stop(self):
+        self._live.stop()
+
+
 class IntrepidQLogger:
     """
     Manages structured logging for the FIntrepidQ application.
@@ -135,7 +227,8 @@ class IntrepidQLogger:
         self.verbose = verbose
         self.tracker = PhaseTracker()
         self._live: Optional[Live] = None
-        self._status: Optional[Status] = None
+        self._status: Optional[LiveStatus] = None
+        self.news = NewsFeed()
         
     def print_header(self):
         """Print the application header."""
@@ -159,19 +252,41 @@ class IntrepidQLogger:
         """Display the current progress table."""
         self.console.print(self.tracker.build_progress_table())
         
+    @contextmanager
+    def live_status(self, message: str):
+        """
+        Show a spinner with a live news feed underneath until the block exits.
+        News items streamed meanwhile are coalesced into frames instead of printed one by one.
+        """
+        if self._status is not None:  # Already inside a live view (only one may be active)
+            status, previous = self._status, self._status.message
+            status.update(message)
+            try:
+                yield status
+            finally:
+                status.update(previous)
+            return
+
+        self.news.reset()
+        status = LiveStatus(self.console, message, self.news)
+        self._status = status
+        status.start()
+        try:
+            yield status
+        finally:
+            status.stop()
+            self._status = None
+            if self.news.total:
+                self.console.print(f"  {self.news.summary()}")
+
     @contextmanager
     def phase(self, phase_name: str):
         """Context manager for tracking a phase with spinner."""
         self.tracker.start_phase(phase_name)
         try:
-            with self.console.status(
-                f"[bold blue]{phase_name}...[/bold blue]",
-                spinner="dots"
-            ) as status:
-                self._status = status
+            with self.live_status(f"[bold blue]{phase_name}...[/bold blue]") as status:
                 yield status
         finally:
-            self._status = None
             self.tracker.complete_phase(phase_name)
             
     def update_status(self, message: str):
@@ -326,6 +441,8 @@ class IntrepidQLogger:
             table.add_row("📊 Risk Metrics", "Sharpe Ratio", fmt(r.sharpe_ratio, "ratio"))
             table.add_row("", "Volatility", fmt(r.volatility_annualized, "percent"))
             table.add_row("", "Max Drawdown", fmt(r.max_drawdown, "percent"))
+            if r.current_drawdown is not None:
+                table.add_row("", "Current Drawdown", fmt(r.current_drawdown, "percent"))
         
         self.console.print()
         self.console.print(table)
@@ -337,14 +454,20 @@ class IntrepidQLogger:
     
     def log_news_item(self, title: str, date: str, source: str) -> None:
         """
-        Log a single news item in real-time as it's fetched.
+        Log a single news item as it's fetched. Safe to call from any thread.
+        Inside a live view the item is only buffered; the view renders it on its next frame.
         
         Args:
             title: News headline
             date: Publication date
             source: Source domain (e.g., reuters.com)
         """
-        # Truncate title if too long
+        title, date = title or "", date or ""
+        self.news.add(title, date, source)
+        if self._status is not None:
+            return
+
+        # No live view: print directly
         if len(title) > 60:
             title = title[:57] + "..."
         
@@ -426,11 +549,16 @@ logger = IntrepidQLogger(verbose=False)
 # STRUCTURED FILE LOGGING (Production/Debug)
 
 import sys
+import copy
+import queue
+import atexit
 import logging
 import json
 from datetime import datetime
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+from utils import config, metrics
 
 # Log directory
 LOG_DIR = Path(__file__).parent.parent / "logs"
@@ -447,7 +575,8 @@ class JSONFormatter(logging.Formatter):
     
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # record.created, not "now": records are formatted later on the listener thread
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -457,25 +586,137 @@ class JSONFormatter(logging.Formatter):
         }
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
         if hasattr(record, "extra_data"):
             log_data["data"] = record.extra_data
         return json.dumps(log_data, default=str)
 
 
+DROP_POLICIES = ("drop_new", "drop_oldest", "block")
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler with a bounded buffer and a drop policy for when it is full.
+    - drop_new:    discard the incoming record (caller never waits)
+    - drop_oldest: evict the oldest buffered record to make room
+    - block:       wait for the listener to free a slot (never loses records)
+    Dropped records are counted in metrics.log_dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop_new"):
+        super().__init__(log_queue)
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown log drop policy '{policy}'. Use one of {DROP_POLICIES}")
+        self.policy = policy
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Freeze the record for the listener thread: merge args into the message and
+        render the traceback now, but leave JSON formatting to the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.policy == "drop_new":
+                metrics.log_dropped.inc(logger=record.name)
+                return
+        # drop_oldest: make room, retrying if another producer refilled the slot
+        while True:
+            try:
+                dropped = self.queue.get_nowait()
+                metrics.log_dropped.inc(logger=dropped.name)
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                continue
+
+
+class _StructuredQueueListener(QueueListener):
+    """QueueListener whose stop() cannot fail on a full queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class _LogWriter:
+    """
+    One background thread writing every structured logger's records to its file.
+    File I/O, rotation and JSON serialization happen off the caller's thread
+    (async graph nodes, tool loops, the WhatsApp event loop).
+    """
+
+    def __init__(self, maxsize: int, policy: str):
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.policy = policy
+        self.file_handlers: List[logging.Handler] = []
+        self.listener: Optional[_StructuredQueueListener] = None
+        self._lock = threading.Lock()
+
+    def attach(self, logger: logging.Logger, log_file: Path):
+        """Route `logger` through the queue into a rotating JSON file handler."""
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=10*1024*1024, backupCount=5, encoding="utf-8"
+        )
+        file_handler.setFormatter(JSONFormatter())
+        file_handler.addFilter(logging.Filter(logger.name))  # Only this logger's records go to this file
+        logger.addHandler(BoundedQueueHandler(self.queue, self.policy))
+
+        with self._lock:
+            self.file_handlers.append(file_handler)
+            if self.listener is None:
+                self.listener = _StructuredQueueListener(self.queue, respect_handler_level=True)
+                self.listener.start()
+            self.listener.handlers = tuple(self.file_handlers)
+
+    def flush(self):
+        """Write out everything buffered so far and stop the background thread."""
+        with self._lock:
+            if self.listener is None:
+                return
+            self.listener.stop()
+            self.listener = None
+            for handler in self.file_handlers:
+                handler.flush()
+
+
+_log_writer = _LogWriter(config.LOG_QUEUE_SIZE, config.LOG_DROP_POLICY)
+
+
+def flush_logs():
+    """Drain the structured log buffer to disk. Registered with atexit."""
+    _log_writer.flush()
+
+
+atexit.register(flush_logs)
+
+
 class StructuredLogger:
-    """File logger with JSON format and rotation."""
+    """File logger with JSON format and rotation, written by a background thread."""
     
     def __init__(self, name: str, log_file: Path = ANALYSIS_LOG, level: int = logging.INFO):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
         self.logger.propagate = False
         self.logger.handlers.clear()
-        
-        file_handler = RotatingFileHandler(
-            log_file, maxBytes=10*1024*1024, backupCount=5, encoding="utf-8"
-        )
-        file_handler.setFormatter(JSONFormatter())
-        self.logger.addHandler(file_handler)
+        _log_writer.attach(self.logger, log_file)
     
     def info(self, message: str, data: Optional[Dict[str, Any]] = None):
         self.logger.info(message, extra={"extra_data": data} if data else {})
@@ -499,6 +740,7 @@ class AnalysisLogger(StructuredLogger):
         self.info(f"Phase started: {phase}", {"event": "phase_start", "phase": phase, "ticker": ticker})
     
     def log_phase_complete(self, phase: str, ticker: str, duration_seconds: float):
+        metrics.phase_duration.observe(duration_seconds, phase=phase)
         self.info(f"Phase completed: {phase}", {"event": "phase_complete", "phase": phase, "ticker": ticker, "duration_seconds": round(duration_seconds, 2)})
 
 
@@ -510,8 +752,26 @@ class APILogger(StructuredLogger):
     def log_request(self, service: str, endpoint: str, ticker: str):
         self.info(f"API request: {service}", {"event": "api_request", "service": service, "endpoint": endpoint, "ticker": ticker})
     
-    def log_response(self, service: str, status: str, duration_ms: float, data_size: int = 0):
-        self.info(f"API response: {service}", {"event": "api_response", "service": service, "status": status, "duration_ms": round(duration_ms, 2)})
+    def log_response(self, service: str, status: str, duration_ms: float, data_size: int = 0, endpoint: str = "", ticker: str = ""):
+        metrics.observe_api_call(service, endpoint, status, duration_ms / 1000, data_size)
+        self.info(f"API response: {service}", {"event": "api_response", "service": service, "endpoint": endpoint, "ticker": ticker, "status": status, "duration_ms": round(duration_ms, 2), "data_size": data_size})
+    
+    @contextmanager
+    def call(self, service: str, endpoint: str, ticker: str = ""):
+        """
+        Time a single provider call and log its response.
+        Yields a dict; set `data_size` (bytes or items) and optionally `status` on it.
+        Exceptions raised inside the block are logged with status "error".
+        """
+        result = {"data_size": 0, "status": "success"}
+        start = time.perf_counter()
+        try:
+            yield result
+        except BaseException:
+            result["status"] = "error"
+            raise
+        finally:
+            self.log_response(service, result["status"], (time.perf_counter() - start) * 1000, result["data_size"], endpoint, ticker)
 
 
 class ErrorLogger(StructuredLogger):
@@ -520,6 +780,7 @@ class ErrorLogger(StructuredLogger):
         super().__init__("intrepidq.errors", ERROR_LOG, level=logging.ERROR)
     
     def log_exception(self, context: str, ticker: str = "", phase: str = ""):
+        metrics.errors.inc(context=context)
         self.error(f"Exception in {context}", {"event": "exception", "context": context, "ticker": ticker, "phase": phase}, exc_info=True)
     
     def log_validation_error(self, field: str, value: Any, reason: str):
@@ -17,6 +17,13 @@ MODEL_NAME = os.getenv("MODEL_NAME", "gemini-2.5-flash")
 TEMPERATURE = 0.0  # 0 = deterministic, higher = more creative
 
 
+def _llm_callbacks() -> list:
+    """Callback handlers attached to every LLM (tracing and metrics)."""
+    from utils.tracing import TracingCallbackHandler
+    from utils.metrics import MetricsCallbackHandler
+    return [TracingCallbackHandler(), MetricsCallbackHandler()]
+
+
 def get_llm_with_fallback(temperature: float = 0.0, use_fallback: bool = False) -> BaseChatModel:
     """
     Get the configured LLM (Gemini).
@@ -30,7 +37,8 @@ def get_llm_with_fallback(temperature: float = 0.0, use_fallback: bool = False)
     """
     return ChatGoogleGenerativeAI(
         model=MODEL_NAME,
-        temperature=temperature
+        temperature=temperature,
+        callbacks=_llm_callbacks()
     )
 
 
@@ -38,7 +46,8 @@ def get_primary_llm(temperature: float = 0.0) -> BaseChatModel:
     """Get the primary LLM (Gemini)."""
     return ChatGoogleGenerativeAI(
         model=MODEL_NAME,
-        temperature=temperature
+        temperature=temperature,
+        callbacks=_llm_callbacks()
     )
 
 
@@ -60,4 +69,22 @@ DB_RETENTION = {
 WHATSAPP_DEFAULT_TO_NUMBER = os.getenv("WHATSAPP_DEFAULT_TO_NUMBER")
 
 # Logging
-VERBOSE = os.getenv("VERBOSE", "false").lower() == "true"
\ No newline at end of file
+VERBOSE = os.getenv("VERBOSE", "false").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # Max records buffered for the background log writer
+LOG_DROP_POLICY = os.getenv("LOG_DROP_POLICY", "drop_new")  # When the buffer is full: drop_new | drop_oldest | block
+
+# Finance kernels (tools/finance_kernels): auto | rust | numpy, plus an optional per-function profile
+FINANCE_BACKEND = os.getenv("FINANCE_BACKEND", "auto")
+FINANCE_BACKEND_PROFILE = os.getenv("FINANCE_BACKEND_PROFILE")  # JSON from `python -m tools.finance_kernels profile`
+
+# Benchmark for locally computed beta / correlation: a yfinance symbol (SPY, ^NSEI, ...) or
+# "auto" (^NSEI for .NS / .BO tickers, SPY otherwise). History is cached in memory and on disk.
+BENCHMARK_TICKER = os.getenv("BENCHMARK_TICKER", "auto")
+BENCHMARK_CACHE_DIR = os.getenv("BENCHMARK_CACHE_DIR", ".cache/benchmarks")
+BENCHMARK_CACHE_HOURS = float(os.getenv("BENCHMARK_CACHE_HOURS", "12"))  # Refetch the disk copy after this age
+
+# Memory-mapped daily closes / returns / volumes of every ticker compared so far (tools/price_store.py)
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", ".cache/prices")
+
+# Metrics (Prometheus text served on localhost while the WhatsApp bot runs)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
\ No newline at end of file
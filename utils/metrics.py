@@ -0,0 +1,332 @@
+"""
+FIntrepidQ Metrics
+In-process metrics registry: counters, gauges and fixed-bucket histograms.
+Fed by provider calls, caches, LLM calls and graph phases; exposed as
+Prometheus text on a local port (WhatsApp bot) and as a CLI snapshot.
+"""
+
+import json
+import math
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Default latency buckets (seconds): 5ms .. 2min
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Response size buckets (bytes or items, as reported by the caller)
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labelnames: Tuple[str, ...], labels: Dict[str, Any]) -> LabelKey:
+    return tuple((name, str(labels.get(name, ""))) for name in labelnames)
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(self.labelnames, labels), 0.0)
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram (cumulative buckets in Prometheus output)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.labelnames, labels)
+        # First bucket whose upper bound holds the value
+        index = len(self.buckets) - 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * len(self.buckets)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def samples(self) -> List[Tuple[LabelKey, List[int], float]]:
+        with self._lock:
+            return [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+    def quantile(self, q: float, counts: List[int]) -> Optional[float]:
+        """Estimate a quantile from bucket counts (linear interpolation, like histogram_quantile)."""
+        total = sum(counts)
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, counts):
+            if cumulative + count >= rank and count > 0:
+                if math.isinf(bound):
+                    return lower  # Open-ended bucket: best estimate is its lower bound
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            if not math.isinf(bound):
+                lower = bound
+        return lower
+
+
+class MetricsRegistry:
+    """Holds all metrics of the process and renders them."""
+
+    def __init__(self, prefix: str = "intrepidq_"):
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(self.prefix + name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(self.prefix + name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(self.prefix + name, help_text, labelnames, buckets))
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (v0.0.4)."""
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                for key, counts, total in metric.samples():
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets, counts):
+                        cumulative += count
+                        le = _format_value(bound)
+                        lines.append(f"{metric.name}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+                    lines.append(f"{metric.name}_sum{_format_labels(key)} {_format_value(total)}")
+                    lines.append(f"{metric.name}_count{_format_labels(key)} {cumulative}")
+            else:
+                for key, value in metric.samples():
+                    lines.append(f"{metric.name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot with histogram percentiles."""
+        snap: Dict[str, Any] = {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "counters": [],
+            "gauges": [],
+            "histograms": [],
+        }
+        for metric in self.metrics():
+            if isinstance(metric, Histogram):
+                for key, counts, total in metric.samples():
+                    count = sum(counts)
+                    snap["histograms"].append({
+                        "name": metric.name,
+                        "labels": dict(key),
+                        "count": count,
+                        "sum": total,
+                        "mean": total / count if count else None,
+                        "p50": metric.quantile(0.50, counts),
+                        "p95": metric.quantile(0.95, counts),
+                        "p99": metric.quantile(0.99, counts),
+                    })
+            else:
+                section = "gauges" if isinstance(metric, Gauge) else "counters"
+                for key, value in metric.samples():
+                    snap[section].append({"name": metric.name, "labels": dict(key), "value": value})
+        return snap
+
+
+# Global registry and application metrics
+registry = MetricsRegistry()
+
+api_requests = registry.counter("api_requests_total", "Provider API calls", ("service", "endpoint", "status"))
+api_latency = registry.histogram("api_request_duration_seconds", "Provider API call latency", ("service", "endpoint"))
+api_response_size = registry.histogram(
+    "api_response_size", "Provider response size (bytes or items as reported)", ("service", "endpoint"), SIZE_BUCKETS
+)
+cache_requests = registry.counter("cache_requests_total", "Cache lookups", ("cache", "result"))
+cache_entries = registry.gauge("cache_entries", "Entries currently held by a cache", ("cache",))
+llm_requests = registry.counter("llm_requests_total", "LLM calls", ("model", "status"))
+llm_latency = registry.histogram("llm_request_duration_seconds", "LLM call latency", ("model",))
+llm_tokens = registry.counter("llm_tokens_total", "LLM tokens", ("model", "direction"))
+phase_duration = registry.histogram("analysis_phase_duration_seconds", "Graph phase duration", ("phase",))
+errors = registry.counter("errors_total", "Logged exceptions", ("context",))
+log_dropped = registry.counter("log_records_dropped_total", "Structured log records dropped because the log buffer was full", ("logger",))
+
+
+def observe_api_call(service: str, endpoint: str, status: str, duration_seconds: float, data_size: int = 0):
+    """Record one provider API call."""
+    endpoint = endpoint or "-"
+    api_requests.inc(service=service, endpoint=endpoint, status=status)
+    api_latency.observe(duration_seconds, service=service, endpoint=endpoint)
+    if data_size:
+        api_response_size.observe(data_size, service=service, endpoint=endpoint)
+
+
+def observe_cache(cache_name: str, hit: bool, size: Optional[int] = None):
+    """Record a cache lookup (and optionally the current cache size)."""
+    cache_requests.inc(cache=cache_name, result="hit" if hit else "miss")
+    if size is not None:
+        cache_entries.set(size, cache=cache_name)
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """LangChain callback handler recording LLM latency, errors and token usage."""
+
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[str, float]] = {}
+
+    def _start(self, serialized: Dict[str, Any], run_id: UUID):
+        kwargs = (serialized or {}).get("kwargs", {})
+        model = kwargs.get("model") or kwargs.get("model_name") or (serialized or {}).get("name", "llm")
+        self._runs[run_id] = (str(model), time.perf_counter())
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._start(serialized, run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._start(serialized, run_id)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        model, started = run
+        llm_latency.observe(time.perf_counter() - started, model=model)
+        llm_requests.inc(model=model, status="success")
+        for generations in response.generations:
+            for gen in generations:
+                usage = getattr(getattr(gen, "message", None), "usage_metadata", None)
+                if usage:
+                    llm_tokens.inc(usage.get("input_tokens", 0), model=model, direction="input")
+                    llm_tokens.inc(usage.get("output_tokens", 0), model=model, direction="output")
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        model, started = run
+        llm_latency.observe(time.perf_counter() - started, model=model)
+        llm_requests.inc(model=model, status="error")
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves /metrics (Prometheus text) and /snapshot (JSON)."""
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = registry.render_prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/snapshot":
+            body = json.dumps(registry.snapshot(), default=str).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the console
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Start the metrics HTTP server on a daemon thread and return it."""
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
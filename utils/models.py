@@ -14,9 +14,41 @@ class Technicals(BaseModel):
     sma_50: float | None = None
     sma_200: float | None = None
     sma_200_weeks: float | None = None
+    sma_10_months: float | None = None  # 10-month SMA of month-end closes
     rsi: float | None = None
     macd: float | None = None
     macd_signal: float | None = None
+    macd_histogram: float | None = None
+    macd_crossover: str | None = None  # "bullish" / "bearish" when the signal line was crossed on the last bar
+    ma_regime: str | None = None  # "bullish" when SMA 50 is above SMA 200, else "bearish"
+    last_ma_cross: str | None = None  # "golden" / "death"
+    last_ma_cross_date: str | None = None
+    days_since_ma_cross: int | None = None  # Trading days
+    recent_ma_crosses: list[dict] = []  # Up to 3 most recent {"type", "date"}
+    bollinger_upper: float | None = None  # 20-day, 2 std
+    bollinger_lower: float | None = None
+    bollinger_percent_b: float | None = None  # 0 at the lower band, 1 at the upper band
+    bollinger_bandwidth: float | None = None  # (upper - lower) / middle
+    atr: float | None = None  # 14-day Wilder ATR
+    atr_percent: float | None = None  # ATR / price
+    stochastic_k: float | None = None  # 14-day %K
+    stochastic_d: float | None = None  # 3-day SMA of %K
+    adx: float | None = None  # 14-day trend strength
+    plus_di: float | None = None
+    minus_di: float | None = None
+    mfi: float | None = None  # 14-day Money Flow Index
+    vwap_20: float | None = None  # Rolling 20-day VWAP of the typical price
+    obv_trend_20d: str = "unknown"
+
+
+class DrawdownEpisode(BaseModel):
+    """One peak-to-trough-to-recovery episode."""
+    depth: float | None = None  # Trough vs peak (negative)
+    peak_date: str | None = None
+    trough_date: str | None = None
+    recovery_date: str | None = None  # None while still under water
+    days_to_trough: int | None = None  # Trading days
+    days_to_recover: int | None = None
 
 
 class RiskMetrics(BaseModel):
@@ -24,7 +56,39 @@ class RiskMetrics(BaseModel):
     volatility_annualized: float | None = None
     max_drawdown: float | None = None
     sharpe_ratio: float | None = None
+    sortino_ratio: float | None = None
+    downside_deviation: float | None = None  # Annualized
+    calmar_ratio: float | None = None  # CAGR / |max drawdown|
     value_at_risk_95: float | None = None
+    cvar_95: float | None = None  # Mean daily return on the worst 5% of days
+    value_at_risk_99: float | None = None
+    cvar_99: float | None = None
+    skewness: float | None = None
+    kurtosis: float | None = None  # Excess kurtosis (0 for a normal distribution)
+    rolling_volatility_3m: float | None = None  # Annualized, last 63 trading days
+    rolling_volatility_3m_percentile_1y: float | None = None  # 0-100 rank of the current value in the past year
+    rolling_sharpe_3m: float | None = None
+    rolling_sharpe_3m_percentile_1y: float | None = None
+    var_95_10d_monte_carlo: float | None = None  # 10-day compounded return, 100k simulated paths
+    cvar_95_10d_monte_carlo: float | None = None
+    var_99_10d_monte_carlo: float | None = None
+    cvar_99_10d_monte_carlo: float | None = None
+    var_95_10d_historical: float | None = None  # 10-day bootstrap of past daily returns
+    cvar_95_10d_historical: float | None = None
+    benchmark: str | None = None  # Symbol the local beta / correlation are measured against
+    beta_3m: float | None = None  # Daily returns aligned with the benchmark, last 63 / 252 / 756 shared days
+    beta_1y: float | None = None
+    beta_3y: float | None = None
+    correlation_3m: float | None = None
+    correlation_1y: float | None = None
+    correlation_3y: float | None = None
+    current_drawdown: float | None = None  # Latest close vs its running peak (0 at a new high)
+    time_under_water: float | None = None  # Share of trading days below the running peak
+    longest_under_water_days: int | None = None  # Trading days, peak to recovery
+    current_under_water_days: int | None = None  # Trading days since the last peak
+    average_recovery_days: float | None = None  # Trough to recovery, episodes of at least 5%
+    drawdown_episode_count: int | None = None  # Episodes of at least 5%
+    drawdown_episodes: list[DrawdownEpisode] = []  # 5 deepest, deepest first
 
 
 class QuarterlyTrends(BaseModel):
@@ -40,6 +104,7 @@ class QuarterlyTrends(BaseModel):
     capex_trend_qoq: str = "unknown"
     retained_earnings_trend_qoq: str = "unknown"
     net_income_trend_qoq: str = "unknown"
+    growth_qoq: dict[str, dict] = {}  # Per line: slope, r_squared, cagr, pct_change, consistency
 
 
 class AnnualTrends(BaseModel):
@@ -57,6 +122,7 @@ class AnnualTrends(BaseModel):
     retained_earnings_trend_yoy: str = "unknown"
     net_income_trend_yoy: str = "unknown"
     assets_trend_yoy: str = "unknown"
+    growth_yoy: dict[str, dict] = {}  # Per line: slope, r_squared, cagr, pct_change, consistency
 
 
 class FinancialTrends(BaseModel):
@@ -71,6 +137,7 @@ class VolumeTrends(BaseModel):
     avg_volume_10d: int | None = None
     avg_volume_50d: int | None = None
     avg_volume_200d: int | None = None
+    volume_zscore_50d: float | None = None  # Today's volume vs the previous 50 days
     volume_spike: bool = False
     volume_trend: str = "unknown"
 
@@ -82,6 +149,18 @@ class DividendTrends(BaseModel):
     dividend_trend: str = "unknown"
 
 
+class FundamentalRatios(BaseModel):
+    """Ratio history per annual period, [Newest, ..., Oldest]."""
+    period_dates: list[str] = []
+    roce: list[float | None] = []
+    roe: list[float | None] = []
+    debt_to_equity: list[float | None] = []
+    icr: list[float | None] = []  # None where there was no interest to cover
+    fcf_margin: list[float | None] = []
+    capex_intensity: list[float | None] = []  # |CapEx| / Revenue
+    accruals: list[float | None] = []  # (Net Income - Operating Cash Flow) / Total Assets
+
+
 class FinancialData(BaseModel):
     """
     Complete financial data for a ticker.
@@ -116,6 +195,7 @@ class FinancialData(BaseModel):
     
     # Risk
     beta: float | None = None
+    beta_source: str | None = None  # "local" (vs benchmark, longest lookback) or "yfinance"
     
     # Debt & Cash
     debt_to_equity: float | None = None
@@ -129,6 +209,7 @@ class FinancialData(BaseModel):
     financial_trends: FinancialTrends | None = None
     volume_trends: VolumeTrends | None = None
     dividend_trends: DividendTrends | None = None
+    fundamental_ratios: FundamentalRatios | None = None
     
     class Config:
         # Allow extra fields that might come from yfinance
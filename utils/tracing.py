@@ -0,0 +1,290 @@
+"""
+FIntrepidQ Tracing
+Lightweight span tracer for the analysis pipeline.
+Records nested spans around graph nodes, tools, provider HTTP calls and LLM calls,
+and exports them as Chrome trace / Perfetto JSON (open in ui.perfetto.dev or chrome://tracing).
+"""
+
+import os
+import json
+import time
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Trace output directory
+TRACE_DIR = Path(__file__).parent.parent / "logs" / "traces"
+
+# Span currently active in this thread / asyncio task
+_current_span: ContextVar[Optional["Span"]] = ContextVar("intrepidq_current_span", default=None)
+
+
+class Span:
+    """A single timed operation with attributes."""
+
+    __slots__ = ("name", "category", "span_id", "parent_id", "tid", "start_ns", "end_ns", "attributes", "_tracer")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, span_id: int,
+                 parent_id: Optional[int], attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.category = category
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.tid = threading.get_native_id()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute (ticker, query, bytes, cache_hit, ...) to the span."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        """Close the span and hand it to the tracer. Safe to call twice."""
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+            self._tracer._record(self)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled so call sites never branch."""
+
+    __slots__ = ()
+    name = ""
+    span_id = 0
+    duration_ms = 0.0
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def end(self):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects spans for one run at a time.
+    Disabled by default; `start()` enables collection, `stop()` disables it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+        self._thread_names: Dict[int, str] = {}
+        self._next_id = 1
+        self._origin_ns = time.perf_counter_ns()
+        self._wall_origin = time.time()
+
+    def start(self):
+        """Enable tracing and discard spans from any previous run."""
+        with self._lock:
+            self._spans = []
+            self._thread_names = {}
+            self._next_id = 1
+            self._origin_ns = time.perf_counter_ns()
+            self._wall_origin = time.time()
+        self.enabled = True
+
+    def stop(self):
+        """Disable tracing. Collected spans are kept until the next `start()`."""
+        self.enabled = False
+
+    def start_span(self, name: str, category: str = "app", **attributes) -> Span:
+        """Open a span manually. The caller must call `span.end()`."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        parent = _current_span.get()
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+        return Span(self, name, category, span_id, parent.span_id if parent else None, attributes)
+
+    @contextmanager
+    def span(self, name: str, category: str = "app", **attributes):
+        """Context manager that opens a nested span for the enclosed block."""
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+        span = self.start_span(name, category, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_attribute("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def traced(self, name: Optional[str] = None, category: str = "function",
+               attributes: Optional[Callable[..., Dict[str, Any]]] = None):
+        """
+        Decorator that wraps a sync or async function in a span.
+
+        Args:
+            name: Span name (defaults to the function's qualified name)
+            category: Span category shown in the trace viewer
+            attributes: Optional callable receiving the function's arguments
+                        and returning span attributes (e.g. lambda state: {"ticker": ...})
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            def _attrs(args, kwargs):
+                if attributes is None:
+                    return {}
+                try:
+                    return attributes(*args, **kwargs) or {}
+                except Exception:
+                    return {}
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with self.span(span_name, category, **_attrs(args, kwargs)):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name, category, **_attrs(args, kwargs)):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _record(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            if span.tid not in self._thread_names:
+                self._thread_names[span.tid] = threading.current_thread().name
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build the Chrome trace event format (complete 'X' events, microseconds)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            thread_names = dict(self._thread_names)
+
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "FIntrepidQ"}}
+        ]
+        for tid, thread_name in thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+
+        for span in sorted(spans, key=lambda s: s.start_ns):
+            args = {"span_id": span.span_id, "parent_id": span.parent_id, **span.attributes}
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self._origin_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.tid,
+                "args": args,
+            })
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"started_at": datetime.fromtimestamp(self._wall_origin).isoformat()},
+        }
+
+    def export_chrome_trace(self, path: Path) -> Path:
+        """Write the collected spans to `path` as Chrome trace JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), default=str), encoding="utf-8")
+        return path
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """LangChain callback handler that records one span per LLM call."""
+
+    run_inline = True  # Keep callbacks on the caller's thread so spans nest correctly
+
+    def __init__(self, tracer_instance: Optional[Tracer] = None):
+        self._tracer = tracer_instance or tracer
+        self._spans: Dict[UUID, Span] = {}
+
+    def _start(self, serialized: Dict[str, Any], run_id: UUID, **attributes):
+        if not self._tracer.enabled:
+            return
+        kwargs = (serialized or {}).get("kwargs", {})
+        model = kwargs.get("model") or kwargs.get("model_name") or (serialized or {}).get("name", "llm")
+        self._spans[run_id] = self._tracer.start_span(f"llm.{model}", category="llm", model=model, **attributes)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        n_messages = sum(len(batch) for batch in messages)
+        self._start(serialized, run_id, messages=n_messages)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._start(serialized, run_id, prompts=len(prompts), prompt_chars=sum(len(p) for p in prompts))
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if not usage:
+            for generations in response.generations:
+                for gen in generations:
+                    metadata = getattr(getattr(gen, "message", None), "usage_metadata", None)
+                    if metadata:
+                        usage = dict(metadata)
+        if usage:
+            span.set_attributes(
+                input_tokens=usage.get("input_tokens", usage.get("prompt_tokens")),
+                output_tokens=usage.get("output_tokens", usage.get("completion_tokens")),
+            )
+        span.end()
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        span.set_attribute("error", f"{type(error).__name__}: {error}")
+        span.end()
+
+
+# Global tracer instance
+tracer = Tracer()
+
+
+def default_trace_path(ticker: str) -> Path:
+    """Per-run trace file path: logs/traces/<TICKER>_<timestamp>.json"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return TRACE_DIR / f"{ticker}_{timestamp}.json"